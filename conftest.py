@@ -0,0 +1,10 @@
+"""pytest 공통 설정 - v7_dual 모듈 경로 + PyQt5가 없으면 워커용 QtCore 대체 모듈 설치"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_headless_qt import install_headless_qt  # noqa: E402
+
+install_headless_qt()
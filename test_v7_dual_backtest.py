@@ -0,0 +1,318 @@
+"""v7_dual 백테스트 테스트 (pytest) - 시뮬레이션 거래소 체결/수수료/청산/펀딩 계산, 가격 경로, 엔진 사이클 집계"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_backtest import BacktestEngine, SimClock, SimExchange, format_report, kline_ticks, trade_ticks
+
+
+SYMBOL = "XRPUSDT"
+RULES = {'priceFilter': {'tickSize': '0.0001'},
+         'lotSizeFilter': {'qtyStep': '1', 'minOrderQty': '1', 'minNotionalValue': '5'}}
+T0 = 1_767_225_600_000  # 2026-01-01 00:00 UTC (15분 경계)
+MINUTE = 60_000
+
+
+def make_exchange(balance=1000.0, price=100.0, **kwargs):
+    """레버리지 10배, 테이커 0.1%, 메이커 0.02%, 유지증거금률 0.5%, 슬리피지 없음"""
+    options = dict(leverage=10, taker_fee=0.001, maker_fee=0.0002, maint_margin_rate=0.005, slippage_bps=0.0)
+    options.update(kwargs)
+    ex = SimExchange(SYMBOL, {}, balance, SimClock(0), **options)
+    ex.set_price(price)
+    return ex
+
+
+def test_market_round_trip_fee_and_pnl():
+    ex = make_exchange()
+    assert 'orderId' in ex.place_market_order(SYMBOL, "BUY", "1", position_side="LONG")
+    pos = ex.positions["LONG"]
+    assert pos.qty == 1.0 and pos.entry == 100.0
+    assert pos.margin == pytest.approx(10.0)
+    assert ex.balance == pytest.approx(1000.0 - 0.1)
+
+    ex.set_price(110.0)
+    assert ex.equity() == pytest.approx(1000.0 - 0.1 + 10.0)
+    ex.place_market_order(SYMBOL, "SELL", "1", reduce_only=True, position_side="LONG")
+    assert pos.qty == 0.0 and pos.margin == 0.0
+    assert ex.fees_paid == pytest.approx(0.1 + 0.11)
+    assert ex.balance == pytest.approx(1000.0 + 10.0 - 0.21)
+    assert ex.fills == 2
+
+
+def test_average_entry_and_partial_close_release_margin():
+    ex = make_exchange()
+    ex.place_market_order(SYMBOL, "BUY", "1", position_side="LONG")
+    ex.set_price(96.0)
+    ex.place_market_order(SYMBOL, "BUY", "1", position_side="LONG")
+    pos = ex.positions["LONG"]
+    assert pos.entry == pytest.approx(98.0)
+    assert pos.margin == pytest.approx(19.6)
+
+    ex.set_price(98.0)
+    ex.place_market_order(SYMBOL, "SELL", "1", reduce_only=True, position_side="LONG")
+    assert pos.qty == pytest.approx(1.0)
+    assert pos.margin == pytest.approx(9.8)
+
+
+def test_market_slippage_is_adverse():
+    ex = make_exchange(slippage_bps=10.0)
+    ex.place_market_order(SYMBOL, "BUY", "1", position_side="LONG")
+    ex.place_market_order(SYMBOL, "SELL", "1", position_side="SHORT")
+    assert ex.positions["LONG"].entry == pytest.approx(100.1)
+    assert ex.positions["SHORT"].entry == pytest.approx(99.9)
+
+
+def test_resting_limit_fills_at_limit_with_maker_fee():
+    ex = make_exchange()
+    result = ex.place_limit_order(SYMBOL, "BUY", "2", "95", position_side="LONG")
+    assert result['orderId'] in ex.orders
+    assert ex.fills == 0
+
+    ex.set_price(96.0)
+    assert ex.fills == 0
+    ex.set_price(94.0)
+    assert not ex.orders
+    assert ex.positions["LONG"].entry == 95.0
+    assert ex.fees_paid == pytest.approx(2 * 95.0 * 0.0002)
+    assert ex.updates[-1].status == 'FILLED'
+
+
+def test_long_liquidation_at_bankruptcy_price():
+    ex = make_exchange()
+    ex.place_market_order(SYMBOL, "BUY", "1", position_side="LONG")
+    stop = ex.place_stop_loss_order(SYMBOL, "SELL", "1", 80, position_side="LONG")
+    pos = ex.positions["LONG"]
+    liq = pos.liq_price(ex.mmr)
+    assert liq == pytest.approx(90.0 / 0.995)
+
+    ex.set_price(liq + 0.01)
+    assert not ex.liquidations
+    ex.set_price(liq - 0.01)
+    assert len(ex.liquidations) == 1
+    record = ex.liquidations[0]
+    assert record['side'] == "LONG"
+    assert record['price'] == pytest.approx(90.0)  # 파산가 = 진입가 - 증거금/수량
+    assert record['loss'] == pytest.approx(10.0)
+    assert pos.qty == 0.0
+    assert ex.balance == pytest.approx(1000.0 - 0.1 - 10.0)
+    assert stop['orderId'] not in ex.orders  # 청산된 포지션의 감소 주문 취소
+    assert ex.updates[-1].reason == 'liquidation'
+
+
+def test_short_liquidation_price():
+    ex = make_exchange()
+    ex.place_market_order(SYMBOL, "SELL", "2", position_side="SHORT")
+    pos = ex.positions["SHORT"]
+    assert pos.liq_price(ex.mmr) == pytest.approx(220.0 / (2 * 1.005))
+    assert pos.bankruptcy_price() == pytest.approx(110.0)
+    ex.set_price(109.4)
+    assert not ex.liquidations
+    ex.set_price(109.5)
+    assert ex.liquidations and ex.liquidations[0]['side'] == "SHORT"
+
+
+def test_funding_long_pays_short_receives():
+    ex = make_exchange()
+    ex.place_market_order(SYMBOL, "BUY", "2", position_side="LONG")
+    ex.place_market_order(SYMBOL, "SELL", "1", position_side="SHORT")
+    balance = ex.balance
+    ex.apply_funding(0.0001)
+    assert ex.funding_paid == pytest.approx(2 * 100.0 * 0.0001 - 1 * 100.0 * 0.0001)
+    assert ex.balance == pytest.approx(balance - ex.funding_paid)
+
+
+def test_rejects_and_idempotent_client_order_id():
+    ex = make_exchange(balance=10.0)
+    result = ex.place_market_order(SYMBOL, "SELL", "1", reduce_only=True, position_side="LONG")
+    assert result['code'] == 110017
+    result = ex.place_market_order(SYMBOL, "BUY", "5", position_side="LONG")
+    assert result['code'] == 110007  # 증거금 50 > 잔액 10
+    assert ex.rejects == 2
+
+    first = ex.place_market_order(SYMBOL, "BUY", "0.5", position_side="LONG", client_order_id="c-1")
+    again = ex.place_market_order(SYMBOL, "BUY", "0.5", position_side="LONG", client_order_id="c-1")
+    assert again == first
+    assert ex.positions["LONG"].qty == 0.5
+    assert ex.fills == 1
+
+
+# ==================== 가격 경로 / 캔들 ====================
+
+def bars(closes, start=1.0):
+    """종가 목록 -> 1분봉 [(time, open, high, low, close), ...] (시가 = 이전 종가)"""
+    rows = []
+    o = start
+    for i, c in enumerate(closes):
+        rows.append((T0 + i * MINUTE, o, max(o, c), min(o, c), c))
+        o = c
+    return rows
+
+
+def test_kline_ticks_walk_inside_bar_and_close_strategy_candle():
+    rows = [(T0, 10.0, 12.0, 9.0, 11.0), (T0 + MINUTE, 11.0, 11.5, 8.0, 9.0)]
+    ticks = list(kline_ticks(rows, candle_interval='1m'))
+    # 양봉 O -> L -> H -> C, 음봉 O -> H -> L -> C (봉 내부 시각 0, 1/3, 2/3, 끝)
+    assert [(ts - T0, price) for ts, price, _ in ticks] == [
+        (0, 10.0), (20000, 9.0), (40000, 12.0), (59999, 11.0),
+        (60000, 11.0), (80000, 11.5), (100000, 8.0), (119999, 9.0)]
+    closed = [c for _, _, c in ticks if c is not None]
+    assert [(c['start'] - T0, c['open'], c['high'], c['low'], c['close']) for c in closed] == [
+        (0, 10.0, 12.0, 9.0, 11.0), (MINUTE, 11.0, 11.5, 8.0, 9.0)]
+
+
+def test_kline_ticks_aggregate_to_strategy_interval_and_close_gaps():
+    rows = [(T0 + i * MINUTE, 1.0 + i, 1.5 + i, 0.5 + i, 1.0 + i) for i in range(15)]
+    rows.append((T0 + 40 * MINUTE, 20.0, 20.0, 20.0, 20.0))  # 15~39분 봉 없음
+    ticks = list(kline_ticks(rows, candle_interval='15m'))
+    closed = [(ts, c) for ts, _, c in ticks if c is not None]
+
+    first_ts, first = closed[0]
+    assert first_ts == T0 + 15 * MINUTE - 1  # 마지막 1분봉의 끝에서 바로 확정
+    assert (first['open'], first['high'], first['low'], first['close']) == (1.0, 15.5, 0.5, 15.0)
+    # 다음 입력이 다른 버킷이고 열린 버킷이 없으면 추가 확정 없음, 데이터 끝 버킷은 미확정
+    assert len(closed) == 1
+
+    rows.insert(15, (T0 + 15 * MINUTE, 16.0, 16.0, 16.0, 16.0))
+    closed = [(ts, c) for ts, _, c in kline_ticks(rows, candle_interval='15m') if c is not None]
+    gap_ts, gap = closed[1]
+    assert gap_ts == T0 + 40 * MINUTE - 1  # 빠진 구간: 다음 봉 직전에 이전 버킷을 마지막 가격으로 확정
+    assert gap['start'] == T0 + 15 * MINUTE and gap['close'] == 16.0
+
+
+def test_trade_ticks_close_candle_before_first_trade_of_next_bucket():
+    trades = [(T0 + 1000, 1.0), (T0 + 30000, 1.2), (T0 + MINUTE + 5, 1.1)]
+    ticks = list(trade_ticks(trades, candle_interval='1m'))
+    assert [(ts - T0, price, c is not None) for ts, price, c in ticks] == [
+        (1000, 1.0, False), (30000, 1.2, False), (MINUTE - 1, 1.2, True), (MINUTE + 5, 1.1, False),
+        (2 * MINUTE - 1, 1.1, True)]
+    assert ticks[2][2]['high'] == 1.2 and ticks[2][2]['low'] == 1.0
+
+
+# ==================== 엔진 ====================
+
+def make_engine(**kwargs):
+    options = dict(side_mode="LONG", balance=1000.0, slippage_bps=0.0)
+    options.update(kwargs)
+    return BacktestEngine(SYMBOL, RULES, {}, **options)
+
+
+def spy_orders(ex):
+    """SimExchange 주문/취소 호출 기록 [(메서드, (side, qty, ...)), ...]"""
+    calls = []
+    for name in ('place_market_order', 'place_limit_order', 'place_batch_orders', 'place_stop_loss_order',
+                 'place_trailing_stop_order', 'cancel_order'):
+        original = getattr(ex, name)
+
+        def wrapper(*args, _name=name, _original=original, **kwargs):
+            calls.append((_name, args[1:4]))
+            return _original(*args, **kwargs)
+        setattr(ex, name, wrapper)
+    return calls
+
+
+def uptrend_closes():
+    """15분 보합 -> 45분 0.4%씩 상승 (상승진입으로 전 단계 체결) -> 10분 0.2%씩 하락 (익절) -> 보합"""
+    closes = [1.0] * 15 + [1.004 ** i for i in range(1, 46)]
+    top = closes[-1]
+    closes += [top * 0.998 ** i for i in range(1, 11)]
+    return closes + [closes[-1]] * 15
+
+
+def test_path_stops_at_levels_between_prices_in_travel_order():
+    engine = make_engine()
+    engine.worker = engine._create_worker()
+    ex = engine.exchange
+    ex.set_price(1.0)
+    ex.place_limit_order(SYMBOL, "BUY", "10", "0.95", position_side="LONG")
+    ex.place_limit_order(SYMBOL, "BUY", "10", "0.80", position_side="LONG")
+    engine.worker.profit_target_price = 0.97
+    engine.worker.uptrend_threshold_price = 1.05
+
+    assert engine._path(1.0, 0.9) == [0.97, 0.95]
+    assert engine._path(0.9, 1.1) == [0.95, 0.97, 1.05]
+    assert engine._path(1.0, 1.01) == []
+
+
+def test_run_profit_cycle_goes_through_sim_exchange():
+    engine = make_engine(max_cycles=1)
+    calls = spy_orders(engine.exchange)
+    result = engine.run(kline_ticks(bars(uptrend_closes()), candle_interval='15m'))
+    ex = engine.exchange
+    worker = engine.worker
+
+    # 사이클 1회: 익절 종료 후 max_cycles로 중단
+    assert result['closed_cycles'] == 1
+    assert result['halted'] == 'max_cycles'
+    cycle = result['cycles'][0]
+    assert cycle['reason'] == 'profit'
+    assert cycle['max_step'] == 9 and result['step_distribution'] == {10: 1}
+    assert result['events']['profit_taken'] == 1
+
+    # 실현손익 = 사이클 종료 잔액 - 시작 잔액 (포지션 / 미체결 주문 없음)
+    assert cycle['pnl'] > 0
+    assert cycle['pnl'] == pytest.approx(cycle['end_balance'] - 1000.0)
+    assert result['final_balance'] == pytest.approx(cycle['end_balance'])
+    assert result['total_pnl'] == pytest.approx(cycle['pnl'])
+    assert cycle['fees'] == pytest.approx(ex.fees_paid)
+    assert ex.positions["LONG"].qty == 0.0 and ex.positions["SHORT"].qty == 0.0
+    assert not ex.orders
+
+    # 워커 주문은 전부 SimExchange로: Step 0 일괄 주문 -> 단계별 진입 -> 익절 시 전체 수량 시장가 청산
+    assert calls[0][0] == 'place_batch_orders'
+    entries = [args[1] for name, args in calls
+               if name == 'place_market_order' and args[0] == "BUY" and args[2:3] == (False,)]
+    assert entries == [str(qty) for qty in worker.entry_qty_list]
+    assert calls[-1] == ('place_market_order', ("SELL", str(sum(worker.entry_qty_list)), False))
+    assert result['fills'] == ex.fills == cycle['fills']
+    assert not engine._signals and not ex.updates
+
+
+def test_run_is_deterministic_and_cycles_chain_balances():
+    closes = uptrend_closes() + [0.999 ** i for i in range(1, 61)]
+    first = make_engine().run(kline_ticks(bars(closes), candle_interval='15m'))
+    second = make_engine().run(kline_ticks(bars(closes), candle_interval='15m'))
+    for key in ('elapsed_sec', 'ticks_per_sec'):
+        first.pop(key)
+        second.pop(key)
+    assert first == second
+
+    cycles = first['cycles']
+    assert len(cycles) == 2 and cycles[-1]['reason'] == 'open'
+    assert cycles[1]['start_balance'] == pytest.approx(cycles[0]['end_balance'])  # 재시작 = 종료 잔액 기준
+    assert sum(c['pnl'] for c in cycles) == pytest.approx(first['final_equity'] - 1000.0)
+
+
+def test_restart_closes_positions_and_starts_next_cycle():
+    engine = make_engine(max_cycles=2)
+    ex = engine.exchange
+    ex.set_price(1.0)
+    engine.worker = engine._create_worker()
+    engine._start_cycle()
+    engine._tick(1.0)
+    assert ex.positions["LONG"].qty > 0
+
+    engine._restart('closed')
+    assert [c['reason'] for c in engine.cycles] == ['closed']
+    assert engine.cycles[0]['pnl'] == pytest.approx(-ex.fees_paid)  # 같은 가격 청산 -> 수수료만큼 손실
+    assert ex.positions["LONG"].qty == 0.0 and ex.positions["SHORT"].qty == 0.0
+    assert engine.worker.is_running and engine._cycle['start_balance'] == ex.balance
+
+    engine._restart('closed')
+    assert len(engine.cycles) == 2
+    assert engine.halted == 'max_cycles' and engine._cycle is None
+
+
+def test_format_report_lists_each_cycle():
+    result = make_engine(max_cycles=1).run(kline_ticks(bars(uptrend_closes()), candle_interval='15m'))
+    report = format_report(result).splitlines()
+    assert report[0] == "[백테스트] XRPUSDT LONG  2026-01-01 00:00 ~ 2026-01-01 01:05 (UTC)"
+    assert "사이클 1회 완료 (승률 100.0%)" in report[3]
+    assert "중단: max_cycles" in report[4]
+    assert any(line.startswith("    Step 10:    1회") for line in report)
+    cycle_line = report[-1].split()
+    assert cycle_line[0] == '1' and cycle_line[-1] == 'profit'
+    assert cycle_line[7] == f"{result['cycles'][0]['pnl']:+.2f}"
@@ -0,0 +1,179 @@
+"""v7_dual DCA 단계 계산 / 상태 저널 테스트 (pytest)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_auto_trader import AutoTradeWorker
+from v7_dual_dca_state_machine import (
+    PHASE_CLOSING, PHASE_ENTERING, PHASE_FINAL_STEP, PHASE_IDLE, PHASE_PLACING_ORDERS,
+    PHASE_PROFIT_MONITORING, PHASE_WAITING_FILL, EVENT_STARTED, EVENT_STEP_FILLED, EVENT_TRANSITION_REJECTED,
+    DcaJournal, derive_phase,
+)
+
+
+SYMBOL = "XRPUSDT"
+
+
+def make_worker(**flags):
+    worker = AutoTradeWorker('long')
+    worker.is_running = True
+    worker.symbol = SYMBOL
+    worker.side_mode = "LONG"
+    worker.total_steps = 5
+    for name, value in flags.items():
+        setattr(worker, name, value)
+    return worker
+
+
+def test_derive_phase_follows_flags():
+    worker = make_worker()
+    worker.is_running = False
+    assert derive_phase(worker) == PHASE_IDLE
+
+    worker.is_running = True
+    assert derive_phase(worker) == PHASE_ENTERING
+
+    worker.initial_entry_done = True
+    assert derive_phase(worker) == PHASE_PLACING_ORDERS
+
+    worker.next_step_orders_placed = True
+    assert derive_phase(worker) == PHASE_WAITING_FILL
+
+    worker.current_step = worker.total_steps - 1
+    assert derive_phase(worker) == PHASE_FINAL_STEP
+
+    worker.entry_price_at_step = 1.0
+    assert derive_phase(worker) == PHASE_PROFIT_MONITORING
+
+    worker.monitoring_final_step_closure = True
+    assert derive_phase(worker) == PHASE_CLOSING
+
+
+def test_final_step_uptrend_fill_keeps_profit_monitoring():
+    """최종 단계 역방향진입 체결 후 (closing 단계) 에도 익절 트레일링 모니터링이 실행되어야 함"""
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True, current_step=4,
+                         entry_price_at_step=1.0, monitoring_final_step_closure=True,
+                         final_step_protection_placed=True)
+    assert derive_phase(worker) == PHASE_CLOSING
+
+    calls = []
+    worker._monitor_profit_target = lambda price, position_data: calls.append(price)
+    position_data = {f"{SYMBOL}_LONG": {'amount': 10, 'entry': 1.0},
+                     f"{SYMBOL}_SHORT": {'amount': -5, 'entry': 1.1}}
+    worker.process_tick({'s': SYMBOL, 'c': '1.05'}, position_data, None)
+
+    assert calls == [1.05]
+
+
+def test_profit_monitoring_needs_main_position():
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True, current_step=1,
+                         entry_price_at_step=1.0)
+    calls = []
+    worker._monitor_profit_target = lambda price, position_data: calls.append(price)
+    worker.process_tick({'s': SYMBOL, 'c': '1.05'}, {}, None)
+
+    assert calls == []
+
+
+def test_process_tick_runs_only_current_phase_handler():
+    """체결 대기 중에는 공통 처리만, 최종 단계에서는 보호 주문 / 청산 감지까지"""
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True, current_step=1)
+    guards = []
+    worker._tick_final_step_guards = lambda position_data, price: guards.append(price)
+    position_data = {f"{SYMBOL}_LONG": {'amount': 10, 'entry': 1.0}}
+
+    worker.process_tick({'s': SYMBOL, 'c': '0.98'}, position_data, None)
+    assert worker.lifecycle.phase == PHASE_WAITING_FILL
+    assert worker.current_price == 0.98
+    assert guards == []
+
+    worker.current_step = 4
+    worker.process_tick({'s': SYMBOL, 'c': '0.97'}, position_data, None)
+    assert worker.lifecycle.phase == PHASE_FINAL_STEP
+    assert guards == [0.97]
+
+
+def test_illegal_transition_is_rejected():
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True, current_step=4,
+                         monitoring_final_step_closure=True)
+    assert worker.lifecycle.observe(worker) == PHASE_CLOSING
+    worker.lifecycle.drain()
+
+    # closing -> waiting_fill: 사이클 재시작 없이 청산 모니터링 해제 + 단계 감소
+    worker.monitoring_final_step_closure = False
+    worker.current_step = 1
+    ticks = []
+    worker._tick_common = lambda *args: ticks.append(args)
+    for _ in range(2):
+        worker.process_tick({'s': SYMBOL, 'c': '1.0'}, {}, None)
+
+    assert ticks == []
+    assert worker.lifecycle.phase == PHASE_CLOSING
+    assert worker.lifecycle.rejected == 2
+    events = worker.lifecycle.drain()
+    assert [(e.type, e.phase_from, e.phase_to) for e in events] == [
+        (EVENT_TRANSITION_REJECTED, PHASE_CLOSING, PHASE_WAITING_FILL)]
+
+    # 사이클 재시작 (entering) 은 허용
+    worker.initial_entry_done = False
+    assert worker.lifecycle.observe(worker) == PHASE_ENTERING
+
+
+def test_restore_starts_from_idle():
+    """복구 모드 시작은 단계를 idle로 두므로 복원된 플래그의 단계로 바로 전이"""
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True, current_step=2)
+    assert worker.lifecycle.observe(worker) == PHASE_WAITING_FILL
+
+    worker.lifecycle.record(worker, EVENT_STARTED, {'restore': True}, phase=PHASE_IDLE)
+    assert worker.lifecycle.phase == PHASE_IDLE
+    worker.current_step = 4
+    worker.monitoring_final_step_closure = True
+    assert worker.lifecycle.observe(worker) == PHASE_CLOSING
+    assert worker.lifecycle.rejected == 0
+
+
+def test_journal_replays_only_lines_after_checkpoint(tmp_path):
+    path = str(tmp_path / "dca_journal_long.jsonl")
+    journal = DcaJournal(path)
+    saved = {}
+
+    state = {'current_step': 1, 'profit_target_price': None}
+    journal.checkpoint(dict(state), saved.update)
+    journal.append({'current_step': 1, 'profit_target_price': 1.2})
+    journal.append({'current_step': 1, 'profit_target_price': 1.3})
+
+    replayed, applied, last_seq, _ = DcaJournal.replay(path, saved)
+    assert applied == 2
+    assert last_seq == 2
+    assert replayed['profit_target_price'] == 1.3
+
+    # 체크포인트 이후 seq는 다시 재생하지 않음
+    journal.checkpoint(dict(replayed), saved.update)
+    replayed, applied, _, _ = DcaJournal.replay(path, saved)
+    assert applied == 0
+    assert replayed['profit_target_price'] == 1.3
+
+
+def test_checkpoint_keeps_step_change_events(tmp_path):
+    """단계 변경 저장(체크포인트)의 이벤트도 저널에 남아 restore()/replay()에서 보임"""
+    path = str(tmp_path / "dca_journal_long.jsonl")
+    worker = make_worker(initial_entry_done=True, next_step_orders_placed=True)
+    journal = DcaJournal(path)
+    saved = {}
+
+    journal.checkpoint({'current_step': 0}, saved.update)
+    worker.current_step = 1
+    worker.lifecycle.record(worker, EVENT_STEP_FILLED, {'price': 1.0})
+    journal.checkpoint({'current_step': 1}, saved.update, worker.lifecycle.drain())
+    assert saved['current_step'] == 1
+
+    replayed, applied, _, events = DcaJournal.replay(path, dict(saved))
+    assert applied == 1
+    assert replayed['current_step'] == 1
+    assert [e['type'] for e in events] == [EVENT_STEP_FILLED]
+    assert events[0]['step'] == 1 and events[0]['data'] == {'price': 1.0}
+
+    restored, applied, events = DcaJournal(path).restore(dict(saved))
+    assert applied == 1 and [e['type'] for e in events] == [EVENT_STEP_FILLED]
@@ -0,0 +1,84 @@
+"""v7_dual 캔들 저장소 테스트 (pytest)"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_kline_store import HEAD_MARKER, INTERVAL_MS, KlineStore
+
+
+INTERVAL = '1m'
+STEP = INTERVAL_MS[INTERVAL]
+
+
+class FakeApi:
+    """listed_ms 이후 캔들만 있는 거래소 (get_ohlcv_data 호출 기록)"""
+
+    def __init__(self, listed_ms):
+        self.listed_ms = listed_ms
+        self.calls = []
+
+    def get_market_key(self):
+        return "Bybit", "linear"
+
+    def get_ohlcv_data(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        self.calls.append((start_time, end_time))
+        now_ms = int(time.time() * 1000)
+        end_time = now_ms if end_time is None else end_time
+        t = max(start_time or 0, self.listed_ms)
+        t += (-t) % STEP
+        rows = []
+        while t <= end_time and len(rows) < limit:
+            rows.append([t, 1.0, 2.0, 0.5, 1.5, 10.0, t + STEP - 1, 15.0, 0, 0, 0, 0])
+            t += STEP
+        return rows
+
+
+def test_load_caches_closed_candles(tmp_path):
+    now_ms = int(time.time() * 1000)
+    api = FakeApi(listed_ms=now_ms - 1000 * STEP)
+    store = KlineStore(cache_dir=str(tmp_path))
+
+    rows = store.load(api, "XRPUSDT", INTERVAL, limit=200)
+    assert 199 <= len(rows) <= 200
+    assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+
+    api.calls.clear()
+    again = store.load(api, "XRPUSDT", INTERVAL, limit=200)
+    assert again[0][0] >= rows[0][0]
+    assert len(api.calls) == 1  # 꼬리 구간만 조회
+
+
+def test_short_history_backfill_runs_once(tmp_path):
+    """거래소 이력이 limit보다 짧으면 앞쪽 보충은 한 번 빈 응답을 받은 뒤 더 이상 시도하지 않음"""
+    now_ms = int(time.time() * 1000)
+    api = FakeApi(listed_ms=now_ms - 50 * STEP)
+    store = KlineStore(cache_dir=str(tmp_path))
+
+    store.load(api, "NEWUSDT", INTERVAL, limit=500)
+    key_dir = store._key_dir("Bybit", "linear", "NEWUSDT", INTERVAL)
+    assert not os.path.exists(os.path.join(key_dir, HEAD_MARKER))
+
+    store.load(api, "NEWUSDT", INTERVAL, limit=500)  # 꼬리 + 앞쪽 보충(빈 응답)
+    assert os.path.exists(os.path.join(key_dir, HEAD_MARKER))
+
+    api.calls.clear()
+    rows = store.load(api, "NEWUSDT", INTERVAL, limit=500)
+    assert len(api.calls) == 1  # 꼬리 구간만 조회
+    assert 49 <= len(rows) <= 51
+
+    store.invalidate("Bybit", "linear", "NEWUSDT", INTERVAL)
+    assert not os.path.exists(os.path.join(key_dir, HEAD_MARKER))
+
+
+def test_read_returns_stored_range(tmp_path):
+    now_ms = int(time.time() * 1000)
+    api = FakeApi(listed_ms=now_ms - 1000 * STEP)
+    store = KlineStore(cache_dir=str(tmp_path))
+    rows = store.load(api, "XRPUSDT", INTERVAL, limit=100)
+
+    start, end = rows[10][0], rows[20][0]
+    columns = store.read("Bybit", "linear", "XRPUSDT", INTERVAL, start, end)
+    assert [int(t) for t in columns['time']] == [r[0] for r in rows[10:21]]
@@ -0,0 +1,100 @@
+"""v7_dual 재연결 백오프 / 보충 이벤트 중복 제거 테스트 (pytest)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_events import OrderUpdate
+from v7_dual_reconnect import OrderStateTracker, ReconnectBackoff, order_to_event, positions_to_event
+
+
+SYMBOL = "XRPUSDT"
+
+
+def order(order_id, status, filled=0.0):
+    return OrderUpdate(SYMBOL, order_id, status, 'LIMIT', 'BUY', 1.0, 10.0, filled)
+
+
+def test_backoff_grows_to_cap_without_jitter():
+    backoff = ReconnectBackoff(base=1.0, cap=10.0, factor=2.0, jitter=0.0)
+    assert [backoff.next_delay() for _ in range(6)] == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+def test_backoff_jitter_only_shortens_delay():
+    backoff = ReconnectBackoff(base=4.0, cap=60.0, jitter=0.5)
+    for _ in range(50):
+        backoff.attempts = 0
+        assert 2.0 <= backoff.next_delay() <= 4.0
+
+
+def test_backoff_resets_after_stable_connection():
+    backoff = ReconnectBackoff(jitter=0.0, stable_after=0.0)
+    assert backoff.mark_down() is False  # 연결된 적 없음 (재시도 중 실패)
+    assert backoff.mark_up() is None
+    backoff.next_delay()
+    backoff.next_delay()
+
+    assert backoff.mark_down() is True
+    assert backoff.attempts == 0
+    assert backoff.down_since_ms is not None
+    assert backoff.downtime() >= 0.0
+    assert backoff.mark_up() >= 0.0
+    assert backoff.downtime() == 0.0
+
+
+def test_backoff_keeps_growing_when_connection_flaps():
+    backoff = ReconnectBackoff(jitter=0.0, stable_after=3600.0)
+    backoff.mark_up()
+    backoff.next_delay()
+    backoff.next_delay()
+    backoff.mark_down()
+    assert backoff.attempts == 2
+
+
+def test_tracker_drops_already_delivered_states():
+    tracker = OrderStateTracker()
+    assert tracker.is_new(order('1', 'NEW'))
+    tracker.remember(order('1', 'NEW'))
+
+    assert not tracker.is_new(order('1', 'NEW'))
+    assert tracker.is_new(order('1', 'PARTIALLY_FILLED', 4.0))
+    tracker.remember(order('1', 'PARTIALLY_FILLED', 4.0))
+    assert not tracker.is_new(order('1', 'PARTIALLY_FILLED', 2.0))
+    assert tracker.is_new(order('1', 'FILLED', 10.0))
+
+    tracker.remember(order('1', 'FILLED', 10.0))
+    assert not tracker.is_new(order('1', 'CANCELED', 10.0))
+
+
+def test_tracker_open_order_ids_and_eviction():
+    tracker = OrderStateTracker(max_orders=3)
+    tracker.remember(order('1', 'NEW'))
+    tracker.remember(order('2', 'FILLED', 10.0))
+    tracker.remember(order('3', 'PARTIALLY_FILLED', 1.0))
+    assert tracker.open_order_ids() == ['1', '3']
+
+    tracker.remember(order('4', 'NEW'))
+    assert tracker.open_order_ids() == ['3', '4']
+    assert tracker.is_new(order('1', 'NEW'))  # 밀려난 주문은 다시 전달
+
+
+def test_order_to_event_infers_status_from_fill():
+    event = order_to_event({'orderId': 7, 'symbol': SYMBOL, 'side': 'SELL', 'origQty': '5',
+                            'executedQty': '2', 'price': '1.5'})
+    assert event.order_id == '7'
+    assert event.status == 'PARTIALLY_FILLED'
+    assert event.backfill is True
+    assert order_to_event({'orderId': 8, 'symbol': SYMBOL}, status='NEW').status == 'NEW'
+
+
+def test_positions_to_event_zero_fills_missing_sides():
+    event = positions_to_event([
+        {'symbol': SYMBOL, 'positionSide': 'LONG', 'positionAmt': '3', 'entryPrice': '1.0'},
+        {'symbol': 'BTCUSDT', 'positionSide': 'SHORT', 'positionAmt': '-1', 'entryPrice': '1.0'},
+    ], SYMBOL)
+    sides = {p.position_side: p for p in event.positions}
+    assert set(sides) == {'LONG', 'SHORT', 'BOTH'}
+    assert sides['LONG'].amount == 3.0
+    assert sides['SHORT'].amount == 0.0 and sides['SHORT'].symbol == SYMBOL
+    assert event.backfill is True
@@ -0,0 +1,89 @@
+"""v7_dual 티커 병합 단계 테스트 (pytest, PyQt5 필요)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+try:
+    from PyQt5.QtCore import QCoreApplication
+    from v7_dual_tick_conflator import TickConflator, compute_trigger_price
+except ImportError:  # PyQt5 미설치 (v7_dual_headless_qt 대체 모듈에는 QCoreApplication이 없음)
+    pytest.skip("PyQt5 QtCore가 필요합니다", allow_module_level=True)
+
+
+KEY = 'long'
+SYMBOL = "XRPUSDT"
+
+
+class FakeFeed:
+    """워커 전달자 (WorkerEventQueue) 대체 - 전달된 가격 기록"""
+
+    def __init__(self, price_source='last', side_mode="LONG"):
+        self.price_source = price_source
+        self.side_mode = side_mode
+        self.ticks = []
+
+    def push_tick(self, symbol, price, stamp=None):
+        self.ticks.append((symbol, price))
+
+
+_app = None
+
+
+@pytest.fixture
+def conflator():
+    global _app
+    _app = QCoreApplication.instance() or QCoreApplication([])  # QTimer용 (테스트 동안 유지)
+    c = TickConflator(fps=10)
+    snapshots = []
+    c.snapshot_ready.connect(snapshots.append)
+    c.snapshots = snapshots
+    return c
+
+
+def test_compute_trigger_price_sources():
+    quote = {'last': 100.0, 'bid': 99.0, 'ask': 101.0, 'mark': 100.5}
+    assert compute_trigger_price(quote, 'last') == 100.0
+    assert compute_trigger_price(quote, 'mid') == 100.0
+    assert compute_trigger_price(quote, 'bidask', "LONG") == 99.0
+    assert compute_trigger_price(quote, 'bidask', "SHORT") == 101.0
+    assert compute_trigger_price(quote, 'mark') == 100.5
+    assert compute_trigger_price({'last': 100.0, 'bid': 99.0}, 'mid') == 100.0  # 호가 한쪽만 있으면 체결가
+
+
+def test_gui_snapshot_keeps_only_latest_price(conflator):
+    for price in (1.0, 1.1, 1.2):
+        conflator.push(KEY, SYMBOL, 'last', price)
+    conflator.push(KEY, SYMBOL, 'bid', 1.15)  # 호가 변경은 GUI 스냅샷에 영향 없음
+    conflator._flush()
+    conflator._flush()  # 변경분이 없으면 스냅샷 없음
+
+    assert conflator.snapshots == [{KEY: (SYMBOL, 1.2)}]
+    stats = conflator.get_stats()
+    assert stats['pushed'] == 4
+    assert stats['gui_updates'] == 1
+    assert stats['conflated'] == 3
+
+
+def test_worker_feed_receives_every_change_of_its_source(conflator):
+    feed = FakeFeed('bidask', "LONG")
+    conflator.attach_feed(KEY, feed)
+    conflator.push(KEY, SYMBOL, 'last', 1.0)    # 호가 없음 -> 체결가
+    conflator.push(KEY, SYMBOL, 'bid', 0.99)
+    conflator.push(KEY, SYMBOL, 'ask', 1.01)    # 판단 가격(bid) 그대로 -> 전달 안 함
+    conflator.push(KEY, SYMBOL, 'bid', 0.99)    # 같은 값 반복 -> 버림
+    conflator.push(KEY, SYMBOL, 'bid', 0.98)
+
+    assert feed.ticks == [(SYMBOL, 1.0), (SYMBOL, 0.99), (SYMBOL, 0.98)]
+    assert conflator.trigger_price(KEY) == 0.98
+
+
+def test_forget_clears_key(conflator):
+    conflator.push(KEY, SYMBOL, 'last', 1.0)
+    conflator.forget(KEY)
+    conflator._flush()
+    assert conflator.latest(KEY) is None
+    assert conflator.snapshots == []
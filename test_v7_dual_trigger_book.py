@@ -0,0 +1,119 @@
+"""v7_dual 가격 레벨 트리거 북 테스트 (pytest)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+from v7_dual_auto_trader import AutoTradeWorker
+from v7_dual_trigger_book import DOWN, UP, TriggerBook
+
+
+def recorder(fired, name, result=None):
+    def callback(price):
+        fired.append((name, price))
+        return result
+    return callback
+
+
+def test_check_without_crossing_returns_zero():
+    book = TriggerBook()
+    fired = []
+    book.arm('up', 110, UP, recorder(fired, 'up'))
+    book.arm('down', 90, DOWN, recorder(fired, 'down'))
+    assert book.check(100) == 0
+    assert fired == []
+    assert book.nearest() == (110.0, 90.0)
+
+
+def test_crossed_levels_fire_nearest_first_and_are_released():
+    book = TriggerBook()
+    fired = []
+    for price in (98, 95, 92):
+        book.arm(('hedge', price), price, DOWN, recorder(fired, price))
+    book.arm('up1', 101, UP, recorder(fired, 'up1'))
+    book.arm('up2', 103, UP, recorder(fired, 'up2'))
+
+    assert book.check(94) == 2
+    assert fired == [(98, 94), (95, 94)]
+    assert ('hedge', 92) in book and ('hedge', 98) not in book
+
+    fired.clear()
+    assert book.check(105) == 2
+    assert fired == [('up1', 105), ('up2', 105)]
+    assert len(book) == 1
+
+
+def test_callback_false_or_error_keeps_level():
+    book = TriggerBook()
+    fired = []
+    book.arm('keep', 100, UP, recorder(fired, 'keep', result=False))
+
+    def broken(price):
+        raise RuntimeError("boom")
+
+    book.arm('broken', 100, UP, broken)
+    assert book.check(100) == 0
+    assert 'keep' in book and 'broken' in book
+    assert fired == [('keep', 100)]
+
+
+def test_arm_replaces_same_key_and_disarm():
+    book = TriggerBook()
+    fired = []
+    book.arm('x', 100, UP, recorder(fired, 'old'))
+    book.arm('x', 120, UP, recorder(fired, 'new'))
+    assert len(book) == 1
+    assert book.check(110) == 0
+    assert book.check(120) == 1
+    assert fired == [('new', 120)]
+
+    book.arm('y', 80, DOWN, recorder(fired, 'y'))
+    assert book.disarm('y') is True
+    assert book.disarm('y') is False
+    assert book.snapshot() == []
+
+    with pytest.raises(ValueError):
+        book.arm('z', 100, 'sideways', recorder(fired, 'z'))
+
+
+def test_callback_disarming_later_level_skips_it():
+    book = TriggerBook()
+    fired = []
+    book.arm('second', 95, DOWN, recorder(fired, 'second'))
+
+    def first(price):
+        fired.append(('first', price))
+        book.disarm('second')
+
+    book.arm('first', 98, DOWN, first)
+    assert book.check(90) == 1
+    assert fired == [('first', 90)]
+    assert len(book) == 0
+
+
+def test_worker_rebuilds_book_when_hedge_triggers_change():
+    """헷지 트리거를 바꾸는 경로(대입 / 복원 / 항목 변경)는 모두 다음 동기화에서 재등록"""
+    worker = AutoTradeWorker('long')
+    worker.side_mode = "LONG"
+    worker.next_step_orders_placed = True
+    worker.hedge_trigger_prices = [[95.0, 1.0, False], [90.0, 1.0, False]]
+    worker._sync_trigger_book()
+    assert worker.trigger_book.nearest() == (None, 95.0)
+
+    # GUI 상태 복원: 같은 길이의 새 목록
+    worker.restore_hedge_triggers([[93.0, 1.0, False], [88.0, 1.0, False]])
+    worker._sync_trigger_book()
+    assert worker.trigger_book.nearest() == (None, 93.0)
+
+    # 제자리 변경 (슬리피지 가격 조정 / 발동 표시)
+    worker._update_hedge_trigger(worker.hedge_trigger_prices[1], price=89.0)
+    worker._update_hedge_trigger(worker.hedge_trigger_prices[0], executed=True)
+    worker._sync_trigger_book()
+    assert worker.trigger_book.snapshot() == [(('hedge', 2), 89.0, DOWN)]
+
+    assert worker.cancel_hedge_triggers() == 2
+    worker._sync_trigger_book()
+    assert len(worker.trigger_book) == 0
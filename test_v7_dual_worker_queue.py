@@ -0,0 +1,72 @@
+"""v7_dual 워커 이벤트 큐 테스트 (pytest, PyQt5 필요)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v7_dual'))
+
+try:
+    from PyQt5.QtCore import QCoreApplication, QObject
+    from v7_dual_worker_queue import WorkerEventQueue
+except ImportError:  # PyQt5 미설치 (v7_dual_headless_qt 대체 모듈에는 QCoreApplication이 없음)
+    pytest.skip("PyQt5 QtCore가 필요합니다", allow_module_level=True)
+
+
+_app = None
+
+
+class FakeWorker(QObject):
+    """process_tick / on_order_update 호출 순서 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self.is_running = True
+        self.calls = []
+
+    def process_tick(self, ticker_data, position_data, candle_data=None):
+        self.calls.append(('tick', ticker_data['s'], ticker_data['c']))
+
+    def on_order_update(self, update):
+        self.calls.append(('order', update))
+
+
+@pytest.fixture
+def queue():
+    global _app
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    q = WorkerEventQueue(FakeWorker(), name="test")
+    q.update_context(position_data={})
+    return q
+
+
+def test_pending_ticks_collapse_to_latest_per_symbol(queue):
+    for price in (1.0, 1.1, 1.2):
+        queue.push_tick("XRPUSDT", price)
+    queue.push_tick("BTCUSDT", 50000.0)
+    queue.push_tick("XRPUSDT", 1.3)
+    assert queue.depth() == 2
+
+    queue._drain()
+    assert queue.worker.calls == [('tick', "XRPUSDT", '1.3'), ('tick', "BTCUSDT", '50000.0')]
+    assert queue.get_stats()['conflated'] == 3
+
+
+def test_ticks_do_not_merge_across_other_events(queue):
+    queue.push_tick("XRPUSDT", 1.0)
+    queue.submit_order('filled')
+    queue.push_tick("XRPUSDT", 1.1)
+    queue.push_tick("XRPUSDT", 1.2)
+
+    queue._drain()
+    assert queue.worker.calls == [('tick', "XRPUSDT", '1.0'), ('order', 'filled'), ('tick', "XRPUSDT", '1.2')]
+
+
+def test_tick_after_drain_starts_new_slot(queue):
+    queue.push_tick("XRPUSDT", 1.0)
+    queue._drain()
+    queue.push_tick("XRPUSDT", 1.1)
+    assert queue.depth() == 1
+    queue._drain()
+    assert [c[2] for c in queue.worker.calls] == ['1.0', '1.1']
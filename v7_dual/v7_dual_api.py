@@ -10,7 +10,16 @@ import requests
 import json
 import sys
 import os
+import threading
 from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+
+from v7_dual_rate_limiter import get_rate_limit_governor, classify_endpoint, binance_request_weight
+from v7_dual_clock_sync import get_clock
+from v7_dual_events import BYBIT_ORDER_STATUS
+from v7_dual_instrument_cache import get_instrument_store
+from v7_dual_metrics import get_request_metrics
+from v7_dual_trading_utils import SymbolQuantizer
 
 # PyInstaller 환경에서 certifi 인증서 경로 설정
 if getattr(sys, 'frozen', False):
@@ -34,6 +43,209 @@ if getattr(sys, 'frozen', False):
     os.environ['SSL_CERT_FILE'] = cert_path
     os.environ['REQUESTS_CA_BUNDLE'] = cert_path
 
+# =============================================================================
+# HTTP Connection Pool
+# =============================================================================
+
+class ClientRateLimitError(requests.exceptions.RequestException):
+    """클라이언트측 레이트 리밋 대기 시간 초과 (요청을 보내지 않음)"""
+
+class PooledHttpClient:
+    """
+    keep-alive 커넥션 풀을 유지하는 HTTP 클라이언트
+
+    요청마다 requests.Session()을 새로 만들면 매번 TCP + TLS 핸드셰이크가
+    발생하므로, API 인스턴스당 하나의 세션을 재사용합니다.
+    - HTTPAdapter 풀 크기 지정 (GUI/워커/셋업 스레드 동시 요청 대비)
+    - 기본 타임아웃 (connect, read) 적용
+    - 일정 시간 사용하지 않은 세션은 폐기 후 재생성 (서버측 idle close 대비)
+    - 엔드포인트별 호출 수 / 지연시간 / 신규 연결(핸드셰이크) 횟수 집계
+    - rate_limit 인자가 주어지면 RateLimitGovernor로 예산 확보 후 전송
+    - 모든 요청을 RequestMetrics(지연 히스토그램 / 상태 코드 / 송수신 바이트)에 기록
+    """
+
+    DEFAULT_TIMEOUT = (3.05, 10)     # (connect, read) 초
+    IDLE_EVICT_SECONDS = 50          # 거래소 LB의 idle timeout(약 60초)보다 짧게
+    DEFAULT_POOL_CONNECTIONS = 4     # 호스트별 풀 개수 (fapi/dapi/api 등)
+    DEFAULT_POOL_MAXSIZE = 8         # 호스트당 동시 연결 수
+
+    def __init__(self, name, pool_connections=None, pool_maxsize=None,
+                 timeout=None, idle_evict_seconds=None):
+        self.name = name
+        self._pool_connections = pool_connections or self.DEFAULT_POOL_CONNECTIONS
+        self._pool_maxsize = pool_maxsize or self.DEFAULT_POOL_MAXSIZE
+        self._timeout = timeout or self.DEFAULT_TIMEOUT
+        self._idle_evict_seconds = idle_evict_seconds or self.IDLE_EVICT_SECONDS
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._adapter = None
+        self._last_used = 0.0
+        self._evict_count = 0
+        self._endpoint_stats = {}  # endpoint -> 집계 dict
+        self._governor = get_rate_limit_governor()  # 프로세스 전역 공유
+        self._metrics = get_request_metrics()  # 프로세스 전역 공유
+
+    def _build_session(self):
+        """풀 설정이 적용된 새 세션 생성"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=0  # 재시도는 상위 로직에서 판단 (주문 중복 방지)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session, adapter
+
+    def _get_session(self):
+        """현재 세션 반환 (idle 시간이 길면 폐기 후 재생성)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._session is not None and now - self._last_used > self._idle_evict_seconds:
+                try:
+                    self._session.close()
+                except Exception:
+                    pass
+                self._session = None
+                self._evict_count += 1
+
+            if self._session is None:
+                self._session, self._adapter = self._build_session()
+
+            self._last_used = now
+            return self._session, self._adapter
+
+    @staticmethod
+    def _count_connections(adapter):
+        """어댑터 풀에서 지금까지 생성된 연결 수 합계 (핸드셰이크 횟수 근사치)"""
+        total = 0
+        try:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    total += getattr(pool, 'num_connections', 0)
+        except Exception:
+            pass
+        return total
+
+    def request(self, method, url, endpoint=None, rate_limit=None, **kwargs):
+        """
+        풀링된 세션으로 요청을 전송합니다.
+
+        Args:
+            method: 'GET' / 'POST' / 'DELETE'
+            url: 전체 URL
+            endpoint: 통계 집계용 키 (기본값: URL 경로)
+            rate_limit: (account, endpoint_class, weight) 튜플. None이면 레이트 리밋 미적용
+            **kwargs: requests 인자 (params, data, headers, timeout 등)
+
+        Returns:
+            requests.Response (예외는 호출자에게 그대로 전달)
+
+        Raises:
+            ClientRateLimitError: 레이트 리밋 대기 시간 초과
+        """
+        if rate_limit is not None:
+            account, endpoint_class, weight = rate_limit
+            if not self._governor.acquire(self.name, account, endpoint_class, weight):
+                raise ClientRateLimitError(f"{self.name} {endpoint_class} 요청 예산 부족 ({endpoint or url})")
+
+        session, adapter = self._get_session()
+        kwargs.setdefault('timeout', self._timeout)
+        key = endpoint or url.split('?', 1)[0]
+
+        conn_before = self._count_connections(adapter)
+        start = time.perf_counter()
+        ok = False
+        status = None
+        response = None
+        try:
+            response = session.request(method, url, **kwargs)
+            ok = True
+            status = response.status_code
+            if rate_limit is not None:
+                self._governor.update_from_headers(self.name, rate_limit[0], rate_limit[1],
+                                                   response.headers, response.status_code)
+            return response
+        except requests.RequestException as e:
+            status = type(e).__name__
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            new_conns = max(0, self._count_connections(adapter) - conn_before)
+            self._record(key, elapsed_ms, new_conns, ok)
+            if status is not None:
+                self._metrics.record_request(
+                    self.name, rate_limit[0] if rate_limit is not None else None, key, elapsed_ms, status,
+                    bytes_sent=self._request_size(url, response, kwargs),
+                    bytes_received=len(response.content) if response is not None else 0)
+
+    @staticmethod
+    def _request_size(url, response, kwargs):
+        """송신 바이트 근사치 (URL + 본문, 헤더 제외)"""
+        if response is not None and response.request is not None:
+            body = response.request.body
+            return len(response.request.url or '') + (len(body) if body else 0)
+        data = kwargs.get('data')
+        return len(url) + (len(data) if isinstance(data, (str, bytes)) else 0)
+
+    def _record(self, key, elapsed_ms, new_conns, ok):
+        """엔드포인트별 통계 갱신"""
+        with self._lock:
+            stats = self._endpoint_stats.get(key)
+            if stats is None:
+                stats = {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                         'last_ms': 0.0, 'new_connections': 0}
+                self._endpoint_stats[key] = stats
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['last_ms'] = elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['new_connections'] += new_conns
+            if not ok:
+                stats['errors'] += 1
+
+    def get_stats(self):
+        """
+        엔드포인트별 통계 스냅샷 반환
+
+        Returns:
+            dict: {endpoint: {'count', 'errors', 'avg_ms', 'max_ms', 'last_ms',
+                              'new_connections', 'reuse_ratio'}}
+        """
+        with self._lock:
+            result = {}
+            for key, s in self._endpoint_stats.items():
+                count = s['count']
+                result[key] = {
+                    'count': count,
+                    'errors': s['errors'],
+                    'avg_ms': s['total_ms'] / count if count else 0.0,
+                    'max_ms': s['max_ms'],
+                    'last_ms': s['last_ms'],
+                    'new_connections': s['new_connections'],
+                    'reuse_ratio': 1.0 - (s['new_connections'] / count) if count else 0.0,
+                }
+            return result
+
+    def get_evict_count(self):
+        """idle 폐기로 세션을 재생성한 횟수"""
+        return self._evict_count
+
+    def close(self):
+        """세션 및 풀 연결 종료"""
+        with self._lock:
+            if self._session is not None:
+                try:
+                    self._session.close()
+                except Exception:
+                    pass
+            self._session = None
+            self._adapter = None
+
+
 # =============================================================================
 # Binance API Implementation
 # =============================================================================
@@ -50,6 +262,9 @@ class BinanceAPI:
         self._active_key = None
         self._active_secret = None
         self._active_market = "fapi"
+        self._http = PooledHttpClient("Binance")  # keep-alive 세션 (fapi/dapi/api 공용)
+        self._clock = None  # 서버 시간 오프셋 추정기 (마켓별 공유, 최초 서명 요청 시 생성)
+        self._quantizers = {}  # "카테고리:심볼" -> SymbolQuantizer
     
     def set_active_api_keys(self, api_key, api_secret):
         """API 키를 활성화합니다."""
@@ -69,6 +284,8 @@ class BinanceAPI:
         if market_type in self.MARKET_URLS:
             self._active_market = market_type
             market_name = "USDⓈ-M" if market_type == "fapi" else "COIN-M"
+            self._clock = None  # fapi/dapi 서버별로 시계를 따로 추정
+            self._quantizers = {}
             print(f"활성 마켓이 {market_type} ({market_name})로 설정되었습니다.")
         else:
             raise ValueError(f"지원되지 않는 마켓 타입: {market_type}")
@@ -82,17 +299,84 @@ class BinanceAPI:
             endpoint_path = endpoint_path.replace("/fapi/v2/", "/dapi/v1/").replace("/fapi/v1/", "/dapi/v1/")
         
         return f"https://{base_url}{endpoint_path}"
+
+    def _rate_limit_for(self, method, endpoint_path, params=None):
+        """레이트 리밋 키 (계정, 분류, 가중치). 계정은 API 키 끝자리로 구분"""
+        account = self._active_key[-6:] if self._active_key else None
+        return (account, classify_endpoint(method, endpoint_path), binance_request_weight(endpoint_path, params))
     
+    TIMESTAMP_ERROR_CODE = -1021  # Timestamp for this request is outside of the recvWindow
+
+    def _get_clock(self):
+        """활성 마켓의 서버 시간 오프셋 추정기"""
+        if self._clock is None:
+            self._clock = get_clock(f"Binance-{self._active_market}", self.get_server_time)
+        return self._clock
+
+    def sync_clock(self):
+        """서버 시간과 즉시 동기화하고 추정치를 반환합니다."""
+        clock = self._get_clock()
+        clock.sync_now()
+        return clock.get_stats()
+
+    def _metrics_account(self):
+        """계측 키의 계정 (레이트 리밋과 동일하게 API 키 끝 6자리)"""
+        return self._active_key[-6:] if self._active_key else None
+
+    def _record_response_code(self, endpoint_path, data):
+        """응답 코드 계측 (정상 응답은 0, 네트워크 오류로 응답이 없으면 기록 안 함)"""
+        if data is None:
+            return
+        code = data.get('code', 0) if isinstance(data, dict) else 0
+        get_request_metrics().record_code("Binance", self._metrics_account(), endpoint_path, code)
+
     def _send_signed_request(self, method, endpoint_path, params={}):
-        """서명된 요청을 바이낸스에 전송합니다."""
+        """서명된 요청을 바이낸스에 전송합니다 (타임스탬프 오류 시 재동기화 후 1회 재전송)."""
+        data = self._send_signed_request_once(method, endpoint_path, params)
+        self._record_response_code(endpoint_path, data)
+        if isinstance(data, dict) and data.get('code') == self.TIMESTAMP_ERROR_CODE:
+            print(f"Binance 타임스탬프 오류 ({endpoint_path}) - 서버 시간 재동기화 후 재전송")
+            get_request_metrics().record_retry("Binance", self._metrics_account(), endpoint_path, 'timestamp')
+            self._get_clock().sync_now(samples=2)
+            data = self._send_signed_request_once(method, endpoint_path, params)
+            self._record_response_code(endpoint_path, data)
+        if method == 'POST':
+            self._check_precision_reject(endpoint_path, params, data)
+        return data
+
+    # 정밀도/필터 위반으로 주문이 거부된 경우 (캐시된 거래 규칙이 바뀌었을 수 있음)
+    PRECISION_ERROR_CODES = (-1111, -1013, -4014, -4023, -4164)
+
+    def _check_precision_reject(self, endpoint_path, params, data):
+        """주문이 정밀도 오류로 거부되면 해당 심볼의 캐시된 거래 규칙을 무효화합니다."""
+        if '/order' not in endpoint_path and 'batchOrders' not in endpoint_path:
+            return
+        results = data if isinstance(data, list) else [data]
+        if not any(isinstance(r, dict) and r.get('code') in self.PRECISION_ERROR_CODES for r in results):
+            return
+
+        symbols = set()
+        if params.get('symbol'):
+            symbols.add(params['symbol'])
+        if params.get('batchOrders'):
+            try:
+                symbols.update(o.get('symbol') for o in json.loads(params['batchOrders']) if o.get('symbol'))
+            except (TypeError, ValueError):
+                pass
+        for symbol in symbols:
+            self.invalidate_instrument_info(symbol)
+
+    def _send_signed_request_once(self, method, endpoint_path, params={}):
+        """서명된 요청을 바이낸스에 1회 전송합니다."""
         if not self._active_key or not self._active_secret:
             raise Exception("Binance API 키가 활성화되지 않았습니다.")
         
-        session = requests.Session()
-        session.headers.update({'X-MBX-APIKEY': self._active_key})
+        headers = {'X-MBX-APIKEY': self._active_key}
+        clock = self._get_clock()
         
         params_copy = params.copy()
-        params_copy['timestamp'] = int(time.time() * 1000)
+        params_copy['timestamp'] = clock.now_ms()
+        params_copy['recvWindow'] = clock.recv_window_ms()
         
         query_string = urlencode(params_copy)
         signature = hmac.new(
@@ -105,12 +389,9 @@ class BinanceAPI:
         url = self._get_url(endpoint_path)
         
         try:
-            if method == 'GET':
-                response = session.get(url, params=params_copy)
-            elif method == 'POST':
-                response = session.post(url, params=params_copy)
-            elif method == 'DELETE':
-                response = session.delete(url, params=params_copy)
+            response = self._http.request(method, url, endpoint=endpoint_path,
+                                          rate_limit=self._rate_limit_for(method, endpoint_path, params_copy),
+                                          params=params_copy, headers=headers)
             
             response.raise_for_status()
             return response.json()
@@ -127,15 +408,28 @@ class BinanceAPI:
             return None
 
     def _send_algo_signed_request(self, method, endpoint_path, params={}):
+        """Algo 주문 API용 서명된 요청 (타임스탬프 오류 시 재동기화 후 1회 재전송)."""
+        data = self._send_algo_signed_request_once(method, endpoint_path, params)
+        self._record_response_code(endpoint_path, data)
+        if isinstance(data, dict) and data.get('code') == self.TIMESTAMP_ERROR_CODE:
+            print(f"Binance Algo 타임스탬프 오류 ({endpoint_path}) - 서버 시간 재동기화 후 재전송")
+            get_request_metrics().record_retry("Binance", self._metrics_account(), endpoint_path, 'timestamp')
+            self._get_clock().sync_now(samples=2)
+            data = self._send_algo_signed_request_once(method, endpoint_path, params)
+            self._record_response_code(endpoint_path, data)
+        return data
+
+    def _send_algo_signed_request_once(self, method, endpoint_path, params={}):
         """Algo 주문 API용 서명된 요청 (api.binance.com 사용)."""
         if not self._active_key or not self._active_secret:
             raise Exception("Binance API 키가 활성화되지 않았습니다.")
 
-        session = requests.Session()
-        session.headers.update({'X-MBX-APIKEY': self._active_key})
+        headers = {'X-MBX-APIKEY': self._active_key}
+        clock = self._get_clock()
 
         params_copy = params.copy()
-        params_copy['timestamp'] = int(time.time() * 1000)
+        params_copy['timestamp'] = clock.now_ms()
+        params_copy['recvWindow'] = clock.recv_window_ms()
 
         query_string = urlencode(params_copy)
         signature = hmac.new(
@@ -146,15 +440,12 @@ class BinanceAPI:
 
         params_copy['signature'] = signature
         # Algo 주문은 api.binance.com 사용 (fapi/dapi가 아님)
+        # SAPI는 fapi와 한도가 별개이므로 fapi 가중치 버킷에 합산하지 않음
         url = f"https://api.binance.com{endpoint_path}"
 
         try:
-            if method == 'GET':
-                response = session.get(url, params=params_copy)
-            elif method == 'POST':
-                response = session.post(url, params=params_copy)
-            elif method == 'DELETE':
-                response = session.delete(url, params=params_copy)
+            response = self._http.request(method, url, endpoint=endpoint_path,
+                                          params=params_copy, headers=headers)
 
             response.raise_for_status()
             return response.json()
@@ -267,19 +558,122 @@ class BinanceAPI:
         print(f"✅ 총 미체결 주문: {len(orders)}개 (일반: {normal_count}개, Algo: {algo_count}개)")
         return orders
     
-    def place_market_order(self, symbol, side, quantity, reduce_only=False, position_side="BOTH"):
-        """시장가 주문을 전송합니다."""
+    def place_market_order(self, symbol, side, quantity, reduce_only=False, position_side="BOTH", client_order_id=None):
+        """시장가 주문을 전송합니다 (client_order_id가 있으면 결과 불확실 시 안전 재시도)."""
         print(f"Binance 시장가 주문 요청: {side} {quantity} {symbol} (reduceOnly={reduce_only}, positionSide={position_side})")
-        
+
         params = {
             'symbol': symbol,
             'side': side,
             'type': 'MARKET',
-            'quantity': quantity,
+            'quantity': self.format_quantity(symbol, quantity),
             'positionSide': position_side
         }
-        
+        if client_order_id:
+            params['newClientOrderId'] = client_order_id
+
+        return self._submit_order(params)
+
+    # ==================== 멱등 주문 전송 (newClientOrderId) ====================
+
+    DUPLICATE_CLIENT_ID_CODE = -4116  # ClientOrderId is duplicated
+    AMBIGUOUS_ORDER_CODES = (-1000, -1001, -1006, -1007)  # UNKNOWN / DISCONNECTED / UNEXPECTED_RESP / TIMEOUT
+    ORDER_RETRY_BACKOFF = (0.3, 0.8)  # 결과 불확실 시 조회/재전송 전 대기 (초)
+
+    def _is_ambiguous_result(self, data):
+        """주문이 거래소에 접수됐는지 알 수 없는 응답인지 (네트워크 오류, 타임아웃, HTTP 5xx)"""
+        if not isinstance(data, dict):
+            return True
+        code = data.get('code')
+        return code in self.AMBIGUOUS_ORDER_CODES or (isinstance(code, int) and 500 <= code < 600)
+
+    def get_order_by_client_id(self, symbol, client_order_id):
+        """origClientOrderId로 주문을 조회합니다. 없거나 조회 실패 시 None"""
+        params = {'symbol': symbol, 'origClientOrderId': client_order_id}
+        data = self._send_signed_request('GET', '/fapi/v1/order', params)
+        if isinstance(data, dict) and data.get('orderId'):
+            return data
+        return None
+
+    def get_order_history(self, symbol, start_time=None, limit=500):
+        """
+        심볼의 주문 내역 (/fapi/v1/allOrders - 미체결/체결/취소 포함, 최신 상태)
+
+        웹소켓 재연결 후 끊긴 구간의 주문 상태 변화를 보충할 때 사용합니다.
+        start_time (ms) 이후 생성/갱신된 주문만 조회합니다. 실패 시 []
+        """
+        params = {'symbol': symbol, 'limit': limit}
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        data = self._send_signed_request('GET', '/fapi/v1/allOrders', params)
+        if isinstance(data, list):
+            return data
+        print(f"Binance 주문 내역 조회 실패: {data}")
+        return []
+
+    def get_order(self, symbol, order_id):
+        """
+        orderId로 주문 1건의 최신 상태를 조회합니다 (/fapi/v1/order, allOrders 항목과 같은 형식).
+
+        웹소켓 재연결 후, 끊기기 전에 생성돼 allOrders 조회 구간에 없는 주문의 체결/취소를 확인할 때 사용합니다.
+        없거나 조회 실패 시 None
+        """
+        params = {'symbol': symbol, 'orderId': order_id}
+        data = self._send_signed_request('GET', '/fapi/v1/order', params)
+        if isinstance(data, dict) and data.get('orderId'):
+            return data
+        return None
+
+    def get_fill_order_ids(self, symbol, start_time, limit=500):
+        """
+        start_time (ms) 이후 체결(/fapi/v1/userTrades)이 있었던 주문 ID 목록 (체결 시각 순, 중복 제거)
+
+        allOrders는 주문 생성 시각으로 조회되므로, 끊기기 전에 낸 주문이 끊긴 동안 체결된 경우는
+        체결 내역으로 찾아야 합니다. 실패 시 []
+        """
+        params = {'symbol': symbol, 'startTime': int(start_time), 'limit': limit}
+        data = self._send_signed_request('GET', '/fapi/v1/userTrades', params)
+        if not isinstance(data, list):
+            print(f"Binance 체결 내역 조회 실패: {data}")
+            return []
+        trades = sorted(data, key=lambda t: t.get('time', 0))
+        return list(dict.fromkeys(str(t.get('orderId')) for t in trades if t.get('orderId')))
+
+    def _submit_order(self, params):
+        """
+        주문 생성 요청 (/fapi/v1/order)
+
+        newClientOrderId가 있으면 결과가 불확실할 때(타임아웃/네트워크 오류) 제한된 백오프로
+        먼저 클라이언트 ID로 접수 여부를 조회하고, 없을 때만 같은 ID로 재전송합니다.
+        같은 ID의 주문이 이미 있으면 거래소가 중복(-4116)으로 거부하므로 이중 체결되지 않습니다.
+
+        Returns:
+            dict: 거래소 응답 (성공 시 orderId 포함) 또는 {"code", "msg"}
+        """
+        client_id = params.get('newClientOrderId')
         data = self._send_signed_request('POST', '/fapi/v1/order', params)
+
+        for delay in (self.ORDER_RETRY_BACKOFF if client_id else ()):
+            if not self._is_ambiguous_result(data):
+                break
+            print(f"Binance 주문 결과 불확실 ({client_id}): {data} - {delay}초 후 접수 여부 조회")
+            time.sleep(delay)
+            existing = self.get_order_by_client_id(params['symbol'], client_id)
+            if existing:
+                print(f"Binance 주문 접수 확인 ({client_id}) - 재전송 생략")
+                return existing
+            print(f"Binance 주문 미접수 확인 ({client_id}) - 같은 newClientOrderId로 재전송")
+            get_request_metrics().record_retry("Binance", self._metrics_account(), '/fapi/v1/order', 'order_ambiguous')
+            data = self._send_signed_request('POST', '/fapi/v1/order', params)
+
+        if client_id and isinstance(data, dict) and data.get('code') == self.DUPLICATE_CLIENT_ID_CODE:
+            existing = self.get_order_by_client_id(params['symbol'], client_id)
+            if existing:
+                print(f"Binance 중복 주문 거부 ({client_id}) - 기존 주문 {existing.get('orderId')} 사용")
+                return existing
+
+        if data is None:
+            return {"code": -1000, "msg": "Order request failed"}
         return data
     
     def cancel_order(self, symbol, order_id, order_category='normal'):
@@ -302,9 +696,128 @@ class BinanceAPI:
             }
             data = self._send_signed_request('DELETE', '/fapi/v1/order', params)
             return data
+
+    BATCH_PLACE_MAX = 5    # /fapi/v1/batchOrders 최대 주문 수
+    BATCH_CANCEL_MAX = 10  # DELETE /fapi/v1/batchOrders 최대 orderId 수
+
+    def place_batch_orders(self, orders):
+        """
+        여러 주문을 일괄 전송합니다 (/fapi/v1/batchOrders, 5개씩 분할).
+
+        Args:
+            orders: [{'symbol', 'side', 'quantity', 'order_type'('MARKET'/'LIMIT'),
+                      'price'(LIMIT만), 'reduce_only', 'position_side', 'client_order_id'(선택)}, ...]
+
+        Returns:
+            list: 입력 순서와 동일한 결과 목록. 성공 시 {"orderId": ...},
+                  실패 시 {"code": ..., "msg": ...}
+        """
+        results = []
+        for i in range(0, len(orders), self.BATCH_PLACE_MAX):
+            chunk = orders[i:i + self.BATCH_PLACE_MAX]
+            batch = []
+            for o in chunk:
+                order_type = o.get('order_type', 'MARKET').upper()
+                item = {
+                    'symbol': o['symbol'],
+                    'side': o['side'].upper(),
+                    'type': order_type,
+                    'quantity': self.format_quantity(o['symbol'], o['quantity']),
+                    'positionSide': o.get('position_side', 'BOTH'),
+                }
+                if order_type == 'LIMIT':
+                    item['price'] = self.format_price(o['symbol'], o['price'])
+                    item['timeInForce'] = 'GTC'
+                if o.get('client_order_id'):
+                    item['newClientOrderId'] = o['client_order_id']
+                # 헤지 모드(positionSide LONG/SHORT)에서는 reduceOnly를 보낼 수 없음
+                if o.get('reduce_only') and item['positionSide'] == 'BOTH':
+                    item['reduceOnly'] = 'true'
+                batch.append(item)
+
+            print(f"Binance 일괄 주문 요청: {len(batch)}건 ({', '.join(b['side'] + ' ' + b['quantity'] for b in batch)})")
+            params = {'batchOrders': json.dumps(batch, separators=(',', ':'))}
+            data = self._send_signed_request('POST', '/fapi/v1/batchOrders', params)
+
+            if isinstance(data, list) and len(data) == len(batch):
+                chunk_results = []
+                for item in data:
+                    if isinstance(item, dict) and item.get('orderId'):
+                        chunk_results.append({"orderId": item.get('orderId')})
+                    else:
+                        # 코드 없는 항목은 접수 여부를 알 수 없음
+                        chunk_results.append({"code": (item or {}).get('code', -1000),
+                                              "msg": (item or {}).get('msg', 'Batch item failed')})
+            else:
+                error = data if isinstance(data, dict) else {}
+                chunk_results = [{"code": error.get('code', -1000), "msg": error.get('msg', 'Batch request failed')}
+                                 for _ in batch]
+
+            # 결과가 불확실한(타임아웃/5xx/응답 누락) 항목은 newClientOrderId로 접수 여부를 먼저 조회하고
+            # 실제로 없는 항목만 단건 경로로 재전송
+            for idx, (item, result) in enumerate(zip(batch, chunk_results)):
+                if 'orderId' in result or not item.get('newClientOrderId'):
+                    continue
+                code = result.get('code')
+                if self._is_ambiguous_result({'code': code}) or code == self.DUPLICATE_CLIENT_ID_CODE:
+                    chunk_results[idx] = self._recover_batch_item(item, result)
+            results.extend(chunk_results)
+        return results
+
+    def _recover_batch_item(self, params, result):
+        """일괄 주문에서 결과가 불확실한 항목 복구 (접수 확인 → 없으면 같은 newClientOrderId로 단건 재전송)"""
+        client_id = params['newClientOrderId']
+        existing = self.get_order_by_client_id(params['symbol'], client_id)
+        if existing:
+            print(f"Binance 일괄 주문 항목 접수 확인 ({client_id}) - 재전송 생략")
+            return {"orderId": existing.get('orderId')}
+        if result.get('code') == self.DUPLICATE_CLIENT_ID_CODE:
+            return result
+        print(f"Binance 일괄 주문 항목 미접수 확인 ({client_id}): {result} - 단건 재전송")
+        get_request_metrics().record_retry("Binance", self._metrics_account(), '/fapi/v1/batchOrders', 'order_ambiguous')
+        data = self._submit_order(dict(params))
+        if isinstance(data, dict) and data.get('orderId'):
+            return {"orderId": data.get('orderId')}
+        data = data if isinstance(data, dict) else {}
+        return {"code": data.get('code', -1000), "msg": data.get('msg', 'Batch item failed')}
+
+    def cancel_batch_orders(self, symbol, order_ids):
+        """
+        같은 심볼의 여러 일반 주문을 일괄 취소합니다 (10개씩 분할).
+        Algo(조건부) 주문은 일괄 취소를 지원하지 않으므로 cancel_order()를 사용하세요.
+
+        Returns:
+            list: 입력 순서와 동일한 결과 목록 ({"orderId": ...} 또는 {"code", "msg"})
+        """
+        results = []
+        order_ids = [str(oid) for oid in order_ids]
+        for i in range(0, len(order_ids), self.BATCH_CANCEL_MAX):
+            chunk = order_ids[i:i + self.BATCH_CANCEL_MAX]
+            print(f"Binance 일괄 취소 요청: {symbol} {len(chunk)}건")
+            params = {
+                'symbol': symbol,
+                'orderIdList': json.dumps([int(oid) for oid in chunk], separators=(',', ':')),
+            }
+            data = self._send_signed_request('DELETE', '/fapi/v1/batchOrders', params)
+
+            if isinstance(data, list) and len(data) == len(chunk):
+                for oid, item in zip(chunk, data):
+                    if isinstance(item, dict) and item.get('orderId'):
+                        results.append({"orderId": item.get('orderId')})
+                    else:
+                        results.append({"code": (item or {}).get('code', -1), "msg": (item or {}).get('msg', f'Cancel failed ({oid})')})
+            else:
+                error = data if isinstance(data, dict) else {}
+                results.extend({"code": error.get('code', -1000), "msg": error.get('msg', 'Batch cancel failed')}
+                               for _ in chunk)
+        return results
     
-    def get_ohlcv_data(self, symbol, interval='1h', limit=500):
-        """(공개 API) OHLCV 캔들 데이터를 가져옵니다."""
+    def get_ohlcv_data(self, symbol, interval='1h', limit=500, start_time=None, end_time=None):
+        """
+        (공개 API) OHLCV 캔들 데이터를 가져옵니다 (1회 최대 1500개).
+
+        start_time / end_time (ms)을 주면 해당 구간의 캔들을 시간 오름차순으로 반환합니다.
+        """
         if self._active_market == "dapi":
             base_url = "https://dapi.binance.com"
             endpoint = "/dapi/v1/klines"
@@ -318,9 +831,14 @@ class BinanceAPI:
             'interval': interval,
             'limit': limit
         }
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        if end_time is not None:
+            params['endTime'] = int(end_time)
         
         try:
-            response = requests.get(url, params=params)
+            response = self._http.request('GET', url, endpoint=endpoint,
+                                          rate_limit=self._rate_limit_for('GET', endpoint, params), params=params)
             response.raise_for_status()
             data = response.json()
             return data
@@ -330,6 +848,177 @@ class BinanceAPI:
                 print(f"오류 응답: {e.response.json()}")
             return None
 
+    def get_order_book(self, symbol, limit=1000):
+        """
+        (공개 API) 호가 스냅샷을 가져옵니다 (로컬 호가창 동기화용).
+
+        Returns:
+            dict: {'lastUpdateId': int, 'bids': [[가격, 수량], ...], 'asks': [...]} (실패 시 None)
+        """
+        if self._active_market == "dapi":
+            base_url = "https://dapi.binance.com"
+            endpoint = "/dapi/v1/depth"
+        else:
+            base_url = "https://fapi.binance.com"
+            endpoint = "/fapi/v1/depth"
+
+        url = f"{base_url}{endpoint}"
+        params = {'symbol': symbol, 'limit': limit}
+        try:
+            response = self._http.request('GET', url, endpoint=endpoint,
+                                          rate_limit=self._rate_limit_for('GET', endpoint, params), params=params)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Binance 호가 스냅샷 요청 오류 ({url}): {e}")
+            return None
+
+    def get_server_time(self):
+        """(공개 API) Binance 서버의 현재 시간(ms)을 가져옵니다."""
+        endpoint = '/fapi/v1/time'
+        url = self._get_url(endpoint)
+        try:
+            response = self._http.request('GET', url, endpoint=endpoint,
+                                          rate_limit=self._rate_limit_for('GET', endpoint), timeout=5)
+            response.raise_for_status()
+            data = response.json()
+            if data.get('serverTime'):
+                return int(data['serverTime'])
+            print(f"Binance 서버 시간 로드 실패: {data}")
+            return None
+        except Exception as e:
+            print(f"Binance 서버 시간 요청 오류: {e}")
+            return None
+
+    # ==================== 거래 규칙 (디스크 캐시) ====================
+
+    def _rules_category(self):
+        """거래 규칙 캐시 카테고리 (Bybit와 동일한 linear/inverse 명칭 사용)"""
+        return 'inverse' if self._active_market == 'dapi' else 'linear'
+
+    def get_market_key(self):
+        """로컬 캐시(캔들 저장소 등)용 (거래소, 카테고리) 키"""
+        return "Binance", self._rules_category()
+
+    @staticmethod
+    def _normalize_symbol_rules(symbol_data):
+        """
+        exchangeInfo의 심볼 항목을 Bybit V5 형식(priceFilter / lotSizeFilter)으로 변환합니다.
+        (trading_utils / 자동매매 코드가 같은 키로 규칙을 읽을 수 있도록)
+        """
+        filters = {f.get('filterType'): f for f in symbol_data.get('filters', [])}
+        price_filter = filters.get('PRICE_FILTER', {})
+        lot_size = filters.get('LOT_SIZE', {})
+        market_lot_size = filters.get('MARKET_LOT_SIZE', {})
+        min_notional = filters.get('MIN_NOTIONAL', {})
+
+        lot_size_filter = {
+            'qtyStep': lot_size.get('stepSize'),
+            'minOrderQty': lot_size.get('minQty'),
+            'maxOrderQty': lot_size.get('maxQty'),
+            'maxMktOrderQty': market_lot_size.get('maxQty'),
+            'minNotionalValue': min_notional.get('notional') or min_notional.get('minNotional'),
+        }
+        if symbol_data.get('contractSize') is not None:
+            lot_size_filter['contractSize'] = str(symbol_data['contractSize'])
+
+        return {
+            'symbol': symbol_data.get('symbol'),
+            'status': symbol_data.get('status') or symbol_data.get('contractStatus'),
+            'priceFilter': {
+                'tickSize': price_filter.get('tickSize'),
+                'minPrice': price_filter.get('minPrice'),
+                'maxPrice': price_filter.get('maxPrice'),
+            },
+            'lotSizeFilter': lot_size_filter,
+        }
+
+    def prefetch_instruments(self):
+        """
+        (공개 API) exchangeInfo 1회 호출로 전체 심볼의 거래 규칙을 받아 디스크 캐시에 저장합니다.
+
+        Returns:
+            int: 저장한 심볼 수 (실패 시 0)
+        """
+        endpoint = '/fapi/v1/exchangeInfo'
+        url = self._get_url(endpoint)
+        try:
+            response = self._http.request('GET', url, endpoint=endpoint,
+                                          rate_limit=self._rate_limit_for('GET', endpoint))
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            print(f"Binance exchangeInfo 요청 오류: {e}")
+            return 0
+
+        rules_by_symbol = {
+            item['symbol']: self._normalize_symbol_rules(item)
+            for item in data.get('symbols', []) if item.get('symbol')
+        }
+        get_instrument_store().put_many("Binance", self._rules_category(), rules_by_symbol, complete=True)
+        print(f"Binance 거래 규칙 {len(rules_by_symbol)}개 심볼 캐시 저장 ({self._active_market})")
+        return len(rules_by_symbol)
+
+    def get_instrument_info(self, category, symbol):
+        """
+        거래 규칙을 조회합니다 (디스크 캐시 -> exchangeInfo 일괄 조회).
+
+        category 인자는 BybitAPI와의 인터페이스 호환용이며, 실제 마켓은 활성 마켓(fapi/dapi)을 따릅니다.
+
+        Returns:
+            dict: Bybit 형식으로 정규화된 규칙 (priceFilter / lotSizeFilter) 또는 None
+        """
+        store = get_instrument_store()
+        rules = store.get("Binance", self._rules_category(), symbol)
+        if rules is None and self.prefetch_instruments():
+            rules = store.get("Binance", self._rules_category(), symbol)
+        if rules is None:
+            print(f"Binance Instrument Info 조회 실패: {symbol}")
+        return rules
+
+    def invalidate_instrument_info(self, symbol):
+        """심볼의 캐시된 거래 규칙을 무효화합니다 (정밀도 오류로 주문 거부 시)."""
+        self._quantizers.pop(f"{self._rules_category()}:{symbol}", None)
+        get_instrument_store().invalidate("Binance", self._rules_category(), symbol)
+
+    def get_quantizer(self, symbol):
+        """심볼의 SymbolQuantizer (거래 규칙으로 1회 생성 후 재사용, 규칙이 없으면 None)"""
+        key = f"{self._rules_category()}:{symbol}"
+        quantizer = self._quantizers.get(key)
+        if quantizer is None:
+            info = self.get_instrument_info(self._rules_category(), symbol)
+            if not info:
+                return None
+            quantizer = SymbolQuantizer.from_rules(info)
+            self._quantizers[key] = quantizer
+        return quantizer
+
+    def format_quantity(self, symbol, quantity):
+        """stepSize 배수로 내림한 주문 수량 문자열 (규칙이 없으면 원본 그대로)"""
+        quantizer = self.get_quantizer(symbol)
+        if quantizer is None or quantizer.qty_step is None:
+            return str(quantity)
+        return quantizer.format_qty(quantity)
+
+    def format_price(self, symbol, price):
+        """tickSize에 맞춘 주문 가격 문자열 (규칙이 없으면 원본 그대로)"""
+        quantizer = self.get_quantizer(symbol)
+        if quantizer is None:
+            return str(price)
+        return quantizer.format_price(price)
+
+    def get_connection_stats(self):
+        """엔드포인트별 HTTP 지연시간/연결 재사용 통계를 반환합니다."""
+        return self._http.get_stats()
+
+    def get_request_metrics(self):
+        """(엔드포인트, 계정)별 지연 히스토그램 / 응답 코드 / 재시도 / 바이트 통계를 반환합니다."""
+        return get_request_metrics().snapshot(exchange=self._http.name)
+
+    def close(self):
+        """HTTP 커넥션 풀을 닫습니다."""
+        self._http.close()
+
 
 # =============================================================================
 # Bybit API Implementation
@@ -344,8 +1033,11 @@ class BybitAPI:
         self._active_key = None
         self._active_secret = None
         self._active_category = "linear"  # linear or inverse
-        self._recv_window = 60000  # 60초 (시간 동기화 여유 확보)
+        self._recv_window = 60000  # recvWindow 상한 (동기화 전에는 이 값 사용)
+        self._clock = None  # 서버 시간 오프셋 추정기 (최초 서명 요청 시 생성)
         self._symbol_info_cache = {}  # 심볼별 거래 규칙 캐시
+        self._quantizers = {}  # "카테고리:심볼" -> SymbolQuantizer
+        self._http = PooledHttpClient("Bybit")  # keep-alive 세션 (서명/공개 요청 공용)
     
     def set_active_api_keys(self, api_key, api_secret):
         """API 키를 활성화합니다."""
@@ -372,16 +1064,89 @@ class BybitAPI:
         else:
             self._active_category = "linear"
             print(f"활성 마켓이 {market_type} (Bybit: linear)로 설정되었습니다.")
+
+    def _rate_limit_for(self, method, endpoint_path):
+        """레이트 리밋 키 (계정, 분류, 가중치). 계정은 API 키 끝자리로 구분"""
+        account = self._active_key[-6:] if self._active_key else None
+        return (account, classify_endpoint(method, endpoint_path), 1)
+
+    def get_market_key(self):
+        """로컬 캐시(캔들 저장소 등)용 (거래소, 카테고리) 키"""
+        return "Bybit", self._active_category
     
+    TIMESTAMP_ERROR_CODE = 10002  # invalid request, please check your server timestamp or recv_window
+
+    def _get_clock(self):
+        """Bybit 서버 시간 오프셋 추정기"""
+        if self._clock is None:
+            self._clock = get_clock("Bybit", self.get_server_time)
+        return self._clock
+
+    def sync_clock(self):
+        """서버 시간과 즉시 동기화하고 추정치를 반환합니다."""
+        clock = self._get_clock()
+        clock.sync_now()
+        return clock.get_stats()
+
+    def _metrics_account(self):
+        """계측 키의 계정 (레이트 리밋과 동일하게 API 키 끝 6자리)"""
+        return self._active_key[-6:] if self._active_key else None
+
+    def _record_response_code(self, endpoint_path, data):
+        """retCode 계측 (API 키 미설정 / 네트워크 오류처럼 응답이 없는 경우는 기록 안 함)"""
+        if isinstance(data, dict) and data.get('retCode') not in (-999, -1000):
+            get_request_metrics().record_code("Bybit", self._metrics_account(), endpoint_path, data.get('retCode'))
+
     def _send_signed_request(self, method, endpoint_path, params={}):
-        """서명된 요청을 Bybit V5에 전송합니다."""
+        """서명된 요청을 Bybit V5에 전송합니다 (타임스탬프 오류 시 재동기화 후 1회 재전송)."""
+        data = self._send_signed_request_once(method, endpoint_path, params)
+        self._record_response_code(endpoint_path, data)
+        if isinstance(data, dict) and data.get('retCode') == self.TIMESTAMP_ERROR_CODE:
+            print(f"[ERROR] Bybit 타임스탬프 오류 ({endpoint_path}) - 서버 시간 재동기화 후 재전송")
+            get_request_metrics().record_retry("Bybit", self._metrics_account(), endpoint_path, 'timestamp')
+            self._get_clock().sync_now(samples=2)
+            data = self._send_signed_request_once(method, endpoint_path, params)
+            self._record_response_code(endpoint_path, data)
+        if method == 'POST' and endpoint_path.startswith('/v5/order/'):
+            self._check_precision_reject(params, data)
+        return data
+
+    # 수량/가격 정밀도 또는 최소 주문 규칙 위반 (캐시된 거래 규칙이 바뀌었을 수 있음)
+    PRECISION_ERROR_CODES = (170134, 170136, 170137, 170140, 170148)
+
+    def _is_precision_error(self, code, msg):
+        if code in self.PRECISION_ERROR_CODES:
+            return True
+        # 10001 (params error)은 메시지로 수량/가격 관련 여부를 구분
+        msg = (msg or "").lower()
+        return code == 10001 and ('qty' in msg or 'price' in msg or 'decimal' in msg)
+
+    def _check_precision_reject(self, params, data):
+        """주문이 정밀도 오류로 거부되면 해당 심볼의 캐시된 거래 규칙을 무효화합니다."""
+        if not isinstance(data, dict):
+            return
+        requests_list = params.get('request') or [params]
+        if self._is_precision_error(data.get('retCode'), data.get('retMsg')):
+            rejected = requests_list
+        else:
+            # 일괄 주문은 항목별 결과가 retExtInfo.list에 있음
+            ext_list = (data.get('retExtInfo') or {}).get('list') or []
+            rejected = [
+                req for req, ext in zip(requests_list, ext_list)
+                if isinstance(ext, dict) and self._is_precision_error(ext.get('code'), ext.get('msg'))
+            ]
+        for symbol in {req.get('symbol') for req in rejected if req.get('symbol')}:
+            self.invalidate_instrument_info(params.get('category', self._active_category), symbol)
+
+    def _send_signed_request_once(self, method, endpoint_path, params={}):
+        """서명된 요청을 Bybit V5에 1회 전송합니다."""
         if not self._active_key or not self._active_secret:
             print("Bybit API 키가 활성화되지 않았습니다.")
             return {"retCode": -999, "retMsg": "API Key not set"}
 
-        session = requests.Session()
-        timestamp = str(int(time.time() * 1000))
-        recv_window = str(self._recv_window)
+        clock = self._get_clock()
+        timestamp = str(clock.now_ms())
+        recv_window = str(clock.recv_window_ms(cap=self._recv_window))
         
         headers = {
             'X-BAPI-API-KEY': self._active_key,
@@ -410,7 +1175,8 @@ class BybitAPI:
                     url = f"{self.BASE_URL}{endpoint_path}?{query_string}"
                 else:
                     url = f"{self.BASE_URL}{endpoint_path}"
-                response = session.get(url, headers=headers)
+                response = self._http.request('GET', url, endpoint=endpoint_path,
+                                              rate_limit=self._rate_limit_for('GET', endpoint_path), headers=headers)
             
             elif method == 'POST':
                 if params:
@@ -427,7 +1193,9 @@ class BybitAPI:
                 
                 headers['X-BAPI-SIGN'] = signature
                 headers['Content-Type'] = 'application/json'
-                response = session.post(f"{self.BASE_URL}{endpoint_path}", data=body_string, headers=headers)
+                response = self._http.request('POST', f"{self.BASE_URL}{endpoint_path}", endpoint=endpoint_path,
+                                              rate_limit=self._rate_limit_for('POST', endpoint_path),
+                                              data=body_string, headers=headers)
             
             response.raise_for_status()
             return response.json()
@@ -550,7 +1318,7 @@ class BybitAPI:
             "amount": str(amount),
             "accountType": "FUND",
             "forceChain": 2,
-            "timestamp": int(time.time() * 1000)
+            "timestamp": self._get_clock().now_ms()
         }
         print(f"Bybit 내부 이체 요청: {coin} {amount} → UID {to_uid}")
         data = self._send_signed_request('POST', '/v5/asset/withdraw/create', params)
@@ -677,7 +1445,146 @@ class BybitAPI:
         print(f"📊 총 미체결 주문: {len(orders)}개 (일반: {normal_count}, 조건부: {conditional_count})")
         return orders
     
-    def place_market_order(self, symbol, side, quantity, reduce_only=False, position_side="BOTH"):
+    # ==================== 멱등 주문 전송 (orderLinkId) ====================
+
+    DUPLICATE_CLIENT_ID_CODE = 110072        # OrderLinkedID is duplicate
+    AMBIGUOUS_ORDER_CODES = (-1000, 10000, 10016)  # 네트워크 오류 / Server Timeout / 서버 내부 오류
+    ORDER_RETRY_BACKOFF = (0.3, 0.8)         # 결과 불확실 시 조회/재전송 전 대기 (초)
+
+    def _is_ambiguous_result(self, data):
+        """주문이 거래소에 접수됐는지 알 수 없는 응답인지 (네트워크 오류, 타임아웃, HTTP 5xx)"""
+        if not isinstance(data, dict):
+            return True
+        code = data.get('retCode')
+        return code in self.AMBIGUOUS_ORDER_CODES or (isinstance(code, int) and 500 <= code < 600)
+
+    def get_order_by_client_id(self, symbol, client_order_id):
+        """orderLinkId로 주문을 조회합니다 (미체결 + 최근 종료 주문). 없거나 조회 실패 시 None"""
+        params = {
+            'category': self._active_category,
+            'symbol': symbol,
+            'orderLinkId': client_order_id,
+        }
+        data = self._send_signed_request('GET', '/v5/order/realtime', params)
+        if isinstance(data, dict) and data.get('retCode') == 0:
+            orders = data.get('result', {}).get('list') or []
+            if orders:
+                return orders[0]
+        return None
+
+    def get_order_history(self, symbol, start_time=None, limit=50):
+        """
+        심볼의 주문 내역 (/v5/order/history), Binance allOrders 형식으로 변환
+
+        웹소켓 재연결 후 끊긴 구간의 주문 상태 변화를 보충할 때 사용합니다.
+        start_time (ms) 이후 생성/갱신된 주문만 조회합니다. 실패 시 []
+        """
+        params = {
+            'category': self._active_category,
+            'symbol': symbol,
+            'limit': limit,
+        }
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        data = self._send_signed_request('GET', '/v5/order/history', params)
+        if not (isinstance(data, dict) and data.get('retCode') == 0):
+            print(f"Bybit 주문 내역 조회 실패: {data}")
+            return []
+
+        return [self._normalize_order(o) for o in data.get('result', {}).get('list') or []]
+
+    @staticmethod
+    def _normalize_order(o):
+        """Bybit 주문 항목을 Binance allOrders 형식으로 변환"""
+        status = o.get('orderStatus', '')
+        return {
+            'orderId': o.get('orderId'),
+            'symbol': o.get('symbol'),
+            'status': BYBIT_ORDER_STATUS.get(status, status.upper()),
+            'type': o.get('orderType'),
+            'side': o.get('side'),
+            'price': o.get('price', '0'),
+            'origQty': o.get('qty', '0'),
+            'executedQty': o.get('cumExecQty', '0'),
+            'avgPrice': o.get('avgPrice') or '0',
+            'updateTime': int(o.get('updatedTime') or 0),
+        }
+
+    def get_order(self, symbol, order_id):
+        """
+        orderId로 주문 1건의 최신 상태를 조회합니다 (미체결 + 최근 종료는 /v5/order/realtime, 그 외 /v5/order/history).
+
+        웹소켓 재연결 후, 끊기기 전에 생성돼 주문 내역 조회 구간에 없는 주문의 체결/취소를 확인할 때 사용합니다.
+        Binance allOrders 형식으로 변환해 반환하며, 없거나 조회 실패 시 None
+        """
+        params = {'category': self._active_category, 'symbol': symbol, 'orderId': order_id}
+        for endpoint in ('/v5/order/realtime', '/v5/order/history'):
+            data = self._send_signed_request('GET', endpoint, params)
+            if isinstance(data, dict) and data.get('retCode') == 0:
+                orders = data.get('result', {}).get('list') or []
+                if orders:
+                    return self._normalize_order(orders[0])
+        return None
+
+    def get_fill_order_ids(self, symbol, start_time, limit=100):
+        """
+        start_time (ms) 이후 체결(/v5/execution/list)이 있었던 주문 ID 목록 (체결 시각 순, 중복 제거)
+
+        주문 내역은 주문 생성 시각으로 조회되므로, 끊기기 전에 낸 주문이 끊긴 동안 체결된 경우는
+        체결 내역으로 찾아야 합니다. 실패 시 []
+        """
+        params = {
+            'category': self._active_category,
+            'symbol': symbol,
+            'startTime': int(start_time),
+            'limit': limit,
+        }
+        data = self._send_signed_request('GET', '/v5/execution/list', params)
+        if not (isinstance(data, dict) and data.get('retCode') == 0):
+            print(f"Bybit 체결 내역 조회 실패: {data}")
+            return []
+        executions = sorted(data.get('result', {}).get('list') or [], key=lambda e: int(e.get('execTime') or 0))
+        return list(dict.fromkeys(str(e.get('orderId')) for e in executions if e.get('orderId')))
+
+    def _submit_order(self, params, default_msg):
+        """
+        주문 생성 요청 (/v5/order/create)
+
+        orderLinkId가 있으면 결과가 불확실할 때(타임아웃/네트워크 오류) 제한된 백오프로
+        먼저 orderLinkId로 접수 여부를 조회하고, 없을 때만 같은 ID로 재전송합니다.
+        같은 ID의 주문이 이미 있으면 거래소가 중복(110072)으로 거부하므로 이중 체결되지 않습니다.
+
+        Returns:
+            dict: 성공 시 {"orderId", "clientOrderId"}, 실패 시 {"code", "msg"}
+        """
+        link_id = params.get('orderLinkId')
+        data = self._send_signed_request('POST', '/v5/order/create', params)
+
+        for delay in (self.ORDER_RETRY_BACKOFF if link_id else ()):
+            if not self._is_ambiguous_result(data):
+                break
+            print(f"[WARNING] Bybit 주문 결과 불확실 ({link_id}): {data} - {delay}초 후 접수 여부 조회")
+            time.sleep(delay)
+            existing = self.get_order_by_client_id(params['symbol'], link_id)
+            if existing:
+                print(f"Bybit 주문 접수 확인 ({link_id}) - 재전송 생략")
+                return {"orderId": existing.get('orderId'), "clientOrderId": link_id}
+            print(f"Bybit 주문 미접수 확인 ({link_id}) - 같은 orderLinkId로 재전송")
+            get_request_metrics().record_retry("Bybit", self._metrics_account(), '/v5/order/create', 'order_ambiguous')
+            data = self._send_signed_request('POST', '/v5/order/create', params)
+
+        if link_id and isinstance(data, dict) and data.get('retCode') == self.DUPLICATE_CLIENT_ID_CODE:
+            existing = self.get_order_by_client_id(params['symbol'], link_id)
+            if existing:
+                print(f"Bybit 중복 주문 거부 ({link_id}) - 기존 주문 {existing.get('orderId')} 사용")
+                return {"orderId": existing.get('orderId'), "clientOrderId": link_id}
+
+        if data and data.get('retCode') == 0:
+            return {"orderId": data['result'].get('orderId'), "clientOrderId": link_id}
+        data = data if isinstance(data, dict) else {}
+        return {"code": data.get('retCode', -1000), "msg": data.get('retMsg', default_msg)}
+
+    def place_market_order(self, symbol, side, quantity, reduce_only=False, position_side="BOTH", client_order_id=None):
         """시장가 주문을 전송합니다."""
         # 수량 포맷 적용 (심볼별 정밀도 규칙에 맞게)
         formatted_qty = self.format_quantity(symbol, quantity)
@@ -705,14 +1612,12 @@ class BybitAPI:
             'positionIdx': position_idx
         }
 
-        data = self._send_signed_request('POST', '/v5/order/create', params)
+        if client_order_id:
+            params['orderLinkId'] = client_order_id
 
-        if data and data.get('retCode') == 0:
-            return {"orderId": data['result'].get('orderId')}
-        else:
-            return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to place order')}
+        return self._submit_order(params, 'Failed to place order')
 
-    def place_limit_order(self, symbol, side, quantity, price, reduce_only=False, position_side="BOTH"):
+    def place_limit_order(self, symbol, side, quantity, price, reduce_only=False, position_side="BOTH", client_order_id=None):
         """지정가 주문을 전송합니다."""
         # 수량 포맷 적용 (심볼별 정밀도 규칙에 맞게)
         formatted_qty = self.format_quantity(symbol, quantity)
@@ -735,19 +1640,17 @@ class BybitAPI:
             'side': bybit_side,
             'orderType': 'Limit',
             'qty': formatted_qty,
-            'price': str(price),
+            'price': self.format_price(symbol, price),
             'reduceOnly': reduce_only,
             'positionIdx': position_idx
         }
 
-        data = self._send_signed_request('POST', '/v5/order/create', params)
+        if client_order_id:
+            params['orderLinkId'] = client_order_id
 
-        if data and data.get('retCode') == 0:
-            return {"orderId": data['result'].get('orderId')}
-        else:
-            return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to place limit order')}
+        return self._submit_order(params, 'Failed to place limit order')
 
-    def place_stop_loss_order(self, symbol, side, quantity, stop_loss_price, position_side="BOTH"):
+    def place_stop_loss_order(self, symbol, side, quantity, stop_loss_price, position_side="BOTH", client_order_id=None):
         """Stop Loss 주문을 전송합니다."""
         # 수량 포맷 적용 (심볼별 정밀도 규칙에 맞게)
         formatted_qty = self.format_quantity(symbol, quantity)
@@ -770,19 +1673,17 @@ class BybitAPI:
             'side': bybit_side,
             'orderType': 'Market',  # Stop Loss는 Market 타입으로 발동
             'qty': formatted_qty,
-            'stopLoss': str(stop_loss_price),
+            'stopLoss': self.format_price(symbol, stop_loss_price),
             'reduceOnly': True,  # Stop Loss는 항상 포지션 청산용
             'positionIdx': position_idx
         }
 
-        data = self._send_signed_request('POST', '/v5/order/create', params)
+        if client_order_id:
+            params['orderLinkId'] = client_order_id
 
-        if data and data.get('retCode') == 0:
-            return {"orderId": data['result'].get('orderId')}
-        else:
-            return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to place stop loss order')}
+        return self._submit_order(params, 'Failed to place stop loss order')
 
-    def place_trailing_stop_order(self, symbol, side, quantity, activation_price, callback_rate, position_side="BOTH"):
+    def place_trailing_stop_order(self, symbol, side, quantity, activation_price, callback_rate, position_side="BOTH", client_order_id=None):
         """Trailing Stop 주문을 전송합니다.
 
         Args:
@@ -814,21 +1715,19 @@ class BybitAPI:
             'side': bybit_side,
             'orderType': 'Market',  # Trailing Stop은 시장가로 체결
             'qty': formatted_qty,
-            'triggerPrice': str(activation_price),  # 활성화 가격
+            'triggerPrice': self.format_price(symbol, activation_price),  # 활성화 가격
             'triggerBy': 'LastPrice',  # 마지막 거래 가격 기준
             'trailingStop': str(callback_rate),  # 콜백 비율 (%)
             'reduceOnly': True,  # Trailing Stop은 항상 포지션 청산용
             'positionIdx': position_idx
         }
 
-        data = self._send_signed_request('POST', '/v5/order/create', params)
+        if client_order_id:
+            params['orderLinkId'] = client_order_id
 
-        if data and data.get('retCode') == 0:
-            return {"orderId": data['result'].get('orderId')}
-        else:
-            return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to place trailing stop order')}
+        return self._submit_order(params, 'Failed to place trailing stop order')
 
-    def place_stop_market_order(self, symbol, side, quantity, stop_price, reduce_only=False, position_side="BOTH"):
+    def place_stop_market_order(self, symbol, side, quantity, stop_price, reduce_only=False, position_side="BOTH", client_order_id=None):
         """STOP MARKET 주문을 전송합니다 (조건부 주문).
 
         Args:
@@ -865,19 +1764,17 @@ class BybitAPI:
             'side': bybit_side,
             'orderType': 'Market',  # 시장가로 체결
             'qty': formatted_qty,
-            'triggerPrice': str(stop_price),  # 트리거 가격
+            'triggerPrice': self.format_price(symbol, stop_price),  # 트리거 가격
             'triggerDirection': trigger_direction,  # 트리거 방향 (필수)
             'triggerBy': 'LastPrice',  # 마지막 거래 가격 기준
             'reduceOnly': reduce_only,
             'positionIdx': position_idx
         }
 
-        data = self._send_signed_request('POST', '/v5/order/create', params)
+        if client_order_id:
+            params['orderLinkId'] = client_order_id
 
-        if data and data.get('retCode') == 0:
-            return {"orderId": data['result'].get('orderId')}
-        else:
-            return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to place stop market order')}
+        return self._submit_order(params, 'Failed to place stop market order')
 
     def cancel_order(self, symbol, order_id, order_category='normal'):
         """특정 주문을 취소합니다."""
@@ -896,9 +1793,141 @@ class BybitAPI:
             return {"orderId": data['result'].get('orderId')}
         else:
             return {"code": data.get('retCode'), "msg": data.get('retMsg', 'Failed to cancel order')}
+
+    BATCH_MAX = 10  # create-batch / cancel-batch 요청당 최대 주문 수 (linear/inverse 보수적 기준)
+
+    @staticmethod
+    def _map_batch_results(data, count, default_msg):
+        """일괄 요청 응답(result.list + retExtInfo.list)을 항목별 결과로 변환"""
+        if not data or data.get('retCode') != 0:
+            code = data.get('retCode', -1000) if data else -1000
+            msg = data.get('retMsg', default_msg) if data else default_msg
+            return [{"code": code, "msg": msg} for _ in range(count)]
+
+        items = (data.get('result') or {}).get('list') or []
+        ext_items = (data.get('retExtInfo') or {}).get('list') or []
+        results = []
+        for idx in range(count):
+            item = items[idx] if idx < len(items) else {}
+            ext = ext_items[idx] if idx < len(ext_items) else {}
+            ext_code = ext.get('code', 0)
+            if ext_code == 0 and item.get('orderId'):
+                results.append({"orderId": item.get('orderId')})
+            else:
+                results.append({"code": ext_code or -1, "msg": ext.get('msg', default_msg)})
+        return results
+
+    def place_batch_orders(self, orders):
+        """
+        여러 주문을 일괄 전송합니다 (/v5/order/create-batch).
+
+        Args:
+            orders: [{'symbol', 'side', 'quantity', 'order_type'('MARKET'/'LIMIT'),
+                      'price'(LIMIT만), 'reduce_only', 'position_side', 'client_order_id'(선택)}, ...]
+
+        Returns:
+            list: 입력 순서와 동일한 결과 목록. 성공 시 {"orderId": ...},
+                  실패 시 {"code": ..., "msg": ...}
+        """
+        results = []
+        for i in range(0, len(orders), self.BATCH_MAX):
+            chunk = orders[i:i + self.BATCH_MAX]
+            request_list = []
+            for o in chunk:
+                order_type = o.get('order_type', 'MARKET').upper()
+
+                # positionIdx: 0=One-Way, 1=Hedge Long, 2=Hedge Short
+                position_side = o.get('position_side', 'BOTH')
+                position_idx = 0
+                if position_side == "LONG":
+                    position_idx = 1
+                elif position_side == "SHORT":
+                    position_idx = 2
+
+                item = {
+                    'symbol': o['symbol'],
+                    'side': o['side'].capitalize(),
+                    'orderType': 'Limit' if order_type == 'LIMIT' else 'Market',
+                    'qty': self.format_quantity(o['symbol'], o['quantity']),
+                    'reduceOnly': bool(o.get('reduce_only', False)),
+                    'positionIdx': position_idx,
+                }
+                if order_type == 'LIMIT':
+                    item['price'] = self.format_price(o['symbol'], o['price'])
+                if o.get('client_order_id'):
+                    item['orderLinkId'] = o['client_order_id']
+                request_list.append(item)
+
+            print(f"Bybit 일괄 주문 요청: {len(request_list)}건 ({', '.join(r['side'] + ' ' + r['qty'] for r in request_list)})")
+            params = {'category': self._active_category, 'request': request_list}
+            data = self._send_signed_request('POST', '/v5/order/create-batch', params)
+            chunk_results = self._map_batch_results(data, len(request_list), 'Failed to place batch order')
+
+            # 결과가 불확실한 항목은 orderLinkId로 접수 여부를 먼저 조회하고 실제로 없는 항목만 단건 재전송
+            for idx, (item, result) in enumerate(zip(request_list, chunk_results)):
+                if item.get('orderLinkId') and 'orderId' not in result and self._is_ambiguous_result(
+                        {'retCode': result.get('code')}):
+                    existing = self.get_order_by_client_id(item['symbol'], item['orderLinkId'])
+                    if existing:
+                        print(f"Bybit 일괄 주문 항목 접수 확인 ({item['orderLinkId']}) - 재전송 생략")
+                        chunk_results[idx] = {"orderId": existing.get('orderId')}
+                        continue
+                    submitted = self._submit_order(dict(item, category=self._active_category),
+                                                   'Failed to place batch order')
+                    chunk_results[idx] = ({"orderId": submitted['orderId']} if submitted.get('orderId')
+                                          else submitted)
+            results.extend(chunk_results)
+        return results
+
+    def cancel_batch_orders(self, symbol, order_ids):
+        """
+        같은 심볼의 여러 주문(일반/조건부)을 일괄 취소합니다 (/v5/order/cancel-batch).
+
+        Returns:
+            list: 입력 순서와 동일한 결과 목록 ({"orderId": ...} 또는 {"code", "msg"})
+        """
+        results = []
+        order_ids = [str(oid) for oid in order_ids]
+        for i in range(0, len(order_ids), self.BATCH_MAX):
+            chunk = order_ids[i:i + self.BATCH_MAX]
+            print(f"Bybit 일괄 취소 요청: {symbol} {len(chunk)}건")
+            params = {
+                'category': self._active_category,
+                'request': [{'symbol': symbol, 'orderId': oid} for oid in chunk],
+            }
+            data = self._send_signed_request('POST', '/v5/order/cancel-batch', params)
+            results.extend(self._map_batch_results(data, len(chunk), 'Failed to cancel batch order'))
+        return results
     
-    def get_ohlcv_data(self, symbol, interval='1h', limit=500):
-        """(공개 API) OHLCV 캔들 데이터를 가져옵니다."""
+    def get_order_book(self, symbol, limit=50):
+        """
+        (공개 API) 호가 스냅샷을 가져옵니다.
+
+        Returns:
+            dict: {'lastUpdateId': int, 'bids': [[가격, 수량], ...], 'asks': [...]} (Binance와 같은 형식, 실패 시 None)
+        """
+        params = {'category': self._active_category, 'symbol': symbol, 'limit': limit}
+        url = f"{self.BASE_URL}/v5/market/orderbook"
+        try:
+            response = self._http.request('GET', url, endpoint='/v5/market/orderbook',
+                                          rate_limit=self._rate_limit_for('GET', '/v5/market/orderbook'), params=params)
+            response.raise_for_status()
+            data = response.json()
+            if data.get('retCode') == 0:
+                result = data.get('result', {})
+                return {'lastUpdateId': result.get('u'), 'bids': result.get('b', []), 'asks': result.get('a', [])}
+            print(f"Bybit 호가 스냅샷 오류: {data.get('retMsg')}")
+            return None
+        except requests.RequestException as e:
+            print(f"Bybit 호가 스냅샷 요청 오류 ({url}): {e}")
+            return None
+
+    def get_ohlcv_data(self, symbol, interval='1h', limit=500, start_time=None, end_time=None):
+        """
+        (공개 API) OHLCV 캔들 데이터를 가져옵니다 (1회 최대 1000개).
+
+        start_time / end_time (ms)을 주면 해당 구간의 캔들을 시간 오름차순으로 반환합니다.
+        """
         mapped_interval = self._map_interval(interval)
         
         params = {
@@ -907,11 +1936,16 @@ class BybitAPI:
             'interval': mapped_interval,
             'limit': limit
         }
+        if start_time is not None:
+            params['start'] = int(start_time)
+        if end_time is not None:
+            params['end'] = int(end_time)
         
         url = f"{self.BASE_URL}/v5/market/kline"
         
         try:
-            response = requests.get(url, params=params)
+            response = self._http.request('GET', url, endpoint='/v5/market/kline',
+                                          rate_limit=self._rate_limit_for('GET', '/v5/market/kline'), params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -938,7 +1972,8 @@ class BybitAPI:
         """(공개 API) Bybit 서버의 현재 시간을 가져옵니다."""
         url = f"{self.BASE_URL}/v5/market/time"
         try:
-            response = requests.get(url, timeout=5)
+            response = self._http.request('GET', url, endpoint='/v5/market/time',
+                                          rate_limit=self._rate_limit_for('GET', '/v5/market/time'), timeout=5)
             response.raise_for_status()
             data = response.json()
             if data.get('retCode') == 0 and data['result'].get('timeNano'):
@@ -1080,12 +2115,21 @@ class BybitAPI:
     def get_instrument_info(self, category, symbol):
         """
         거래 규칙(Instrument Info)을 조회합니다.
+
+        메모리 캐시 -> 디스크 캐시(TTL) -> REST 순으로 확인하며,
+        REST로 받은 규칙은 디스크 캐시에 저장하여 재시작 후에도 재사용합니다.
         """
         # 캐시에서 확인
         cache_key = f"{category}:{symbol}"
         if cache_key in self._symbol_info_cache:
             return self._symbol_info_cache[cache_key]
 
+        store = get_instrument_store()
+        info = store.get("Bybit", category, symbol)
+        if info is not None:
+            self._symbol_info_cache[cache_key] = info
+            return info
+
         params = {
             'category': category,
             'symbol': symbol
@@ -1094,7 +2138,8 @@ class BybitAPI:
         url = f"{self.BASE_URL}/v5/market/instruments-info"
 
         try:
-            response = requests.get(url, params=params)
+            response = self._http.request('GET', url, endpoint='/v5/market/instruments-info',
+                                          rate_limit=self._rate_limit_for('GET', '/v5/market/instruments-info'), params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -1102,6 +2147,7 @@ class BybitAPI:
                 info = data['result']['list'][0]
                 # 캐시 저장
                 self._symbol_info_cache[cache_key] = info
+                store.put("Bybit", category, symbol, info)
                 return info
             else:
                 print(f"Bybit Instrument Info 조회 실패: {data.get('retMsg')}")
@@ -1111,6 +2157,66 @@ class BybitAPI:
             print(f"Bybit Instrument Info 요청 오류: {e}")
             return None
 
+    def prefetch_instruments(self, category=None):
+        """
+        (공개 API) instruments-info 일괄 조회로 카테고리 전체 심볼의 거래 규칙을 디스크 캐시에 저장합니다.
+        (limit=1000 커서 페이지네이션 - linear 전체도 보통 1~2회 호출)
+
+        Returns:
+            int: 저장한 심볼 수 (실패 시 0)
+        """
+        category = category or self._active_category
+        url = f"{self.BASE_URL}/v5/market/instruments-info"
+        rules_by_symbol = {}
+        cursor = None
+
+        try:
+            for _ in range(10):  # 안전장치: 최대 10페이지
+                params = {'category': category, 'limit': 1000}
+                if cursor:
+                    params['cursor'] = cursor
+                response = self._http.request('GET', url, endpoint='/v5/market/instruments-info',
+                                              rate_limit=self._rate_limit_for('GET', '/v5/market/instruments-info'), params=params)
+                response.raise_for_status()
+                data = response.json()
+                if data.get('retCode') != 0:
+                    print(f"Bybit Instrument Info 일괄 조회 실패: {data.get('retMsg')}")
+                    break
+
+                for item in data['result'].get('list', []):
+                    if item.get('symbol'):
+                        rules_by_symbol[item['symbol']] = item
+                cursor = data['result'].get('nextPageCursor')
+                if not cursor:
+                    break
+        except requests.RequestException as e:
+            print(f"Bybit Instrument Info 일괄 조회 오류: {e}")
+
+        if rules_by_symbol:
+            get_instrument_store().put_many("Bybit", category, rules_by_symbol, complete=not cursor)
+            for symbol, info in rules_by_symbol.items():
+                self._symbol_info_cache[f"{category}:{symbol}"] = info
+            print(f"Bybit 거래 규칙 {len(rules_by_symbol)}개 심볼 캐시 저장 ({category})")
+        return len(rules_by_symbol)
+
+    def invalidate_instrument_info(self, category, symbol):
+        """심볼의 캐시된 거래 규칙을 무효화합니다 (정밀도 오류로 주문 거부 시)."""
+        self._symbol_info_cache.pop(f"{category}:{symbol}", None)
+        self._quantizers.pop(f"{category}:{symbol}", None)
+        get_instrument_store().invalidate("Bybit", category, symbol)
+
+    def get_quantizer(self, symbol):
+        """심볼의 SymbolQuantizer (거래 규칙으로 1회 생성 후 재사용, 규칙이 없으면 None)"""
+        key = f"{self._active_category}:{symbol}"
+        quantizer = self._quantizers.get(key)
+        if quantizer is None:
+            info = self.get_instrument_info(self._active_category, symbol)
+            if not info:
+                return None
+            quantizer = SymbolQuantizer.from_rules(info)
+            self._quantizers[key] = quantizer
+        return quantizer
+
     def format_quantity(self, symbol, quantity):
         """
         심볼별 수량 정밀도 규칙에 맞게 수량을 포맷합니다.
@@ -1123,49 +2229,31 @@ class BybitAPI:
             str: 포맷된 수량 문자열
         """
         try:
-            qty_float = float(quantity)
-
-            # Instrument Info 조회
-            info = self.get_instrument_info(self._active_category, symbol)
-            if not info:
+            quantizer = self.get_quantizer(symbol)
+            if quantizer is None:
                 print(f"[WARNING] {symbol} 심볼 정보를 가져올 수 없어 수량을 그대로 사용합니다: {quantity}")
                 return str(quantity)
-
-            # lotSizeFilter에서 qtyStep 확인
-            lot_size_filter = info.get('lotSizeFilter', {})
-            qty_step = lot_size_filter.get('qtyStep')
-
-            if not qty_step:
+            if quantizer.qty_step is None:
                 print(f"[WARNING] {symbol}의 qtyStep을 찾을 수 없어 수량을 그대로 사용합니다: {quantity}")
                 return str(quantity)
 
-            # qtyStep 단위로 내림 처리 (모든 경우에 decimal 사용)
-            import decimal
-            decimal.getcontext().rounding = decimal.ROUND_DOWN
-
-            qty_decimal = decimal.Decimal(str(qty_float))
-            step_decimal = decimal.Decimal(str(qty_step))
-
-            # 내림 처리 (qtyStep의 배수로)
-            formatted_qty = (qty_decimal // step_decimal) * step_decimal
-
-            # 소수점 자릿수 계산
-            step_float = float(qty_step)
-            if step_float >= 1:
-                # qtyStep이 1 이상이면 소수점 1자리 (예: qtyStep="1" -> 4.74 -> 4.7)
-                formatted_str = f"{float(formatted_qty):.1f}"
-            else:
-                # qtyStep이 1 미만이면 qtyStep의 소수점 자릿수만큼 (예: qtyStep="0.01" -> 4.747 -> 4.74)
-                decimal_places = abs(decimal.Decimal(str(step_float)).as_tuple().exponent)
-                formatted_str = f"{formatted_qty:.{decimal_places}f}"
-
-            print(f"[Qty Format] {symbol}: {quantity} -> {formatted_str} (qtyStep={qty_step})")
-            return formatted_str
+            if quantizer.qty_step >= 1:
+                # qtyStep이 1 이상이면 소수점 1자리 (예: qtyStep="1" -> 4.74 -> 4.0)
+                return f"{quantizer.floor_qty(quantity):.1f}"
+            # qtyStep이 1 미만이면 qtyStep의 소수점 자릿수만큼 (예: qtyStep="0.01" -> 4.747 -> 4.74)
+            return quantizer.format_qty(quantity)
 
         except Exception as e:
             print(f"[ERROR] 수량 포맷 중 오류 발생 ({symbol}, {quantity}): {e}")
             return str(quantity)
 
+    def format_price(self, symbol, price):
+        """tickSize에 맞춘 주문 가격 문자열 (규칙이 없으면 원본 그대로)"""
+        quantizer = self.get_quantizer(symbol)
+        if quantizer is None:
+            return str(price)
+        return quantizer.format_price(price)
+
     def get_mark_price(self, category, symbol):
         """
         마크 프라이스를 조회합니다.
@@ -1178,7 +2266,8 @@ class BybitAPI:
         url = f"{self.BASE_URL}/v5/market/tickers"
 
         try:
-            response = requests.get(url, params=params)
+            response = self._http.request('GET', url, endpoint='/v5/market/tickers',
+                                          rate_limit=self._rate_limit_for('GET', '/v5/market/tickers'), params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -1194,6 +2283,18 @@ class BybitAPI:
             print(f"Bybit Mark Price 요청 오류: {e}")
             return None
 
+    def get_connection_stats(self):
+        """엔드포인트별 HTTP 지연시간/연결 재사용 통계를 반환합니다."""
+        return self._http.get_stats()
+
+    def get_request_metrics(self):
+        """(엔드포인트, 계정)별 지연 히스토그램 / 응답 코드 / 재시도 / 바이트 통계를 반환합니다."""
+        return get_request_metrics().snapshot(exchange=self._http.name)
+
+    def close(self):
+        """HTTP 커넥션 풀을 닫습니다."""
+        self._http.close()
+
 
 # =============================================================================
 # NOTE: v7_dual에서는 글로벌 싱글톤 패턴을 제거했습니다.
@@ -0,0 +1,187 @@
+"""
+비동기 거래소 API 모듈 (Binance & Bybit)
+
+v7_dual_api.py의 BinanceAPI / BybitAPI와 동일한 메서드 이름을 갖는
+asyncio 버전을 제공합니다.
+
+- 모든 인스턴스가 하나의 공유 이벤트 루프(네트워크 리액터, WebSocket 스트림과 공용)를 사용합니다.
+- 실제 HTTP 전송은 각 API 인스턴스의 PooledHttpClient(keep-alive 풀)를 재사용하며,
+  풀 크기와 같은 수의 I/O 워커로 여러 요청을 동시에 진행합니다.
+- Qt 스레드(QThread, GUI)에서는 submit()/run()/run_concurrently()로 호출합니다.
+
+사용 예:
+    async_api = make_async_api(api_module)
+    results = async_api.run_concurrently([
+        ('cancel_order', (symbol, id1), {}),
+        ('cancel_order', (symbol, id2), {}),
+    ])
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from v7_dual_api import BinanceAPI, BybitAPI, PooledHttpClient
+from v7_dual_network_reactor import NetworkReactor
+
+
+# =============================================================================
+# 공유 이벤트 루프
+# =============================================================================
+
+class SharedEventLoop:
+    """
+    프로세스 전역 asyncio 이벤트 루프 (NetworkReactor 루프 + REST I/O 워커 풀)
+
+    루프 스레드는 WebSocket 스트림과 공유하고, 블로킹 HTTP 호출은 I/O 워커에서 실행합니다.
+    I/O 워커 수는 HTTP 풀 크기와 맞춰 커넥션 풀이 넘치지 않게 합니다.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    IO_WORKERS = PooledHttpClient.DEFAULT_POOL_MAXSIZE
+
+    def __init__(self):
+        reactor = NetworkReactor.get()
+        self.loop = reactor.loop
+        self.thread = reactor.thread
+        self.executor = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix="exchange-io")
+        self.loop.call_soon_threadsafe(self.loop.set_default_executor, self.executor)
+
+    @classmethod
+    def get(cls):
+        """공유 루프 인스턴스 반환 (최초 호출 시 생성)"""
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.thread.is_alive():
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """공유 루프 종료 (프로그램 종료 시, 리액터의 모든 스트림도 함께 종료)"""
+        with cls._instance_lock:
+            inst = cls._instance
+            cls._instance = None
+        NetworkReactor.shutdown()
+        if inst is not None:
+            inst.executor.shutdown(wait=False)
+
+
+def get_shared_loop():
+    """공유 asyncio 이벤트 루프를 반환합니다."""
+    return SharedEventLoop.get().loop
+
+
+# =============================================================================
+# 비동기 API 래퍼
+# =============================================================================
+
+class AsyncExchangeAPI:
+    """
+    동기 API 인스턴스를 감싸는 비동기 API
+
+    동기 API의 공개 메서드는 모두 같은 이름의 코루틴 함수로 노출됩니다.
+    (예: await async_api.place_limit_order(symbol, "BUY", qty, price))
+    키/마켓 설정 상태는 감싼 동기 인스턴스와 공유합니다.
+    """
+
+    def __init__(self, sync_api):
+        self._sync_api = sync_api
+        self._async_methods = {}
+
+    @property
+    def sync_api(self):
+        """감싸고 있는 동기 API 인스턴스"""
+        return self._sync_api
+
+    def __getattr__(self, name):
+        # __init__ 이전 접근 / 비공개 속성은 위임하지 않음
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        cached = self.__dict__.get('_async_methods', {}).get(name)
+        if cached is not None:
+            return cached
+
+        target = getattr(self._sync_api, name)
+        if not callable(target):
+            return target
+
+        @functools.wraps(target)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(target, *args, **kwargs))
+
+        self._async_methods[name] = method
+        return method
+
+    # ==================== Qt 스레드용 진입점 ====================
+
+    def submit(self, coro):
+        """
+        코루틴을 공유 루프에 예약합니다 (논블로킹).
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, get_shared_loop())
+
+    def run(self, coro, timeout=None):
+        """코루틴을 공유 루프에서 실행하고 결과를 기다립니다 (공유 루프 스레드에서 호출 금지)."""
+        return self.submit(coro).result(timeout)
+
+    async def gather_calls(self, calls):
+        """
+        여러 API 호출을 동시에 실행합니다.
+
+        Args:
+            calls: [(method_name, args_tuple, kwargs_dict), ...]
+
+        Returns:
+            list: 입력 순서와 동일한 결과 목록 (예외는 {"code": -1000, "msg": ...}로 변환)
+        """
+        coros = [getattr(self, name)(*args, **(kwargs or {})) for name, args, kwargs in calls]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        return [
+            {"code": -1000, "msg": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+    def run_concurrently(self, calls, timeout=None):
+        """gather_calls()의 블로킹 버전 (QThread/GUI에서 사용)"""
+        if not calls:
+            return []
+        return self.run(self.gather_calls(calls), timeout)
+
+
+class AsyncBinanceAPI(AsyncExchangeAPI):
+    """BinanceAPI의 비동기 버전"""
+
+    def __init__(self, sync_api=None):
+        super().__init__(sync_api or BinanceAPI())
+
+
+class AsyncBybitAPI(AsyncExchangeAPI):
+    """BybitAPI의 비동기 버전"""
+
+    def __init__(self, sync_api=None):
+        super().__init__(sync_api or BybitAPI())
+
+
+def make_async_api(sync_api):
+    """
+    동기 API 인스턴스에 맞는 비동기 래퍼를 생성합니다.
+
+    Args:
+        sync_api: BinanceAPI 또는 BybitAPI 인스턴스
+
+    Returns:
+        AsyncBinanceAPI 또는 AsyncBybitAPI
+    """
+    if isinstance(sync_api, BybitAPI):
+        return AsyncBybitAPI(sync_api)
+    if isinstance(sync_api, BinanceAPI):
+        return AsyncBinanceAPI(sync_api)
+    return AsyncExchangeAPI(sync_api)
@@ -1,6 +1,27 @@
+import functools
+import threading
 import time
 from PyQt5.QtCore import QObject, pyqtSlot, pyqtSignal
 import v7_dual_trading_utils as trading_utils
+from v7_dual_dca_state_machine import (
+    DcaLifecycle,
+    PHASE_IDLE, PHASE_ENTERING, PHASE_PLACING_ORDERS, PHASE_WAITING_FILL, PHASE_FINAL_STEP,
+    PHASE_PROFIT_MONITORING, PHASE_CLOSING,
+    EVENT_STARTED, EVENT_STOPPED, EVENT_INITIAL_ENTRY, EVENT_STEP_FILLED, EVENT_STEP_ORDERS_PLACED,
+    EVENT_HEDGE_FIRED, EVENT_SLIPPAGE_ADJUSTED, EVENT_UPTREND_HEDGE_REDUCED, EVENT_PROFIT_TAKEN,
+    EVENT_FINAL_PROTECTION_PLACED, EVENT_CYCLE_CLOSED, EVENT_SAFETY_ORDER_FILLED,
+)
+from v7_dual_position_store import get_position_store
+from v7_dual_trigger_book import TriggerBook, UP, DOWN
+
+
+def _serialized(method):
+    """워커 상태를 바꾸는 진입점 직렬화 (틱/주문 이벤트는 워커 이벤트 큐, start/stop_trading은 GUI 스레드에서 호출됨)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.state_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class AutoTradeWorker(QObject):
     """
@@ -11,11 +32,16 @@ class AutoTradeWorker(QObject):
     # GUI의 상태 라벨을 업데이트하기 위한 시그널
     log_message = pyqtSignal(str)
 
-    # GUI에 시장가 주문을 요청하기 위한 시그널 (symbol, side, quantity, is_hedge)
-    execute_trade_signal = pyqtSignal(str, str, str, bool)
+    # GUI에 시장가 주문을 요청하기 위한 시그널 (symbol, side, quantity, is_hedge, client_order_id, hedge_trigger)
+    # hedge_trigger: 헷지 트리거 발동 주문이면 (트리거 가격, 수량) - GUI가 주문 ID와 함께 돌려줌 (슬리피지 추적), 그 외 None
+    execute_trade_signal = pyqtSignal(str, str, str, bool, str, object)
 
     # GUI에 지정가 주문을 요청하기 위한 새 시그널 (symbol, side, quantity, price, is_hedge)
-    execute_limit_order_signal = pyqtSignal(str, str, str, str, bool)
+    execute_limit_order_signal = pyqtSignal(str, str, str, str, bool, str)
+
+    # GUI에 여러 주문을 일괄 요청하기 위한 시그널
+    # (orders: [{'symbol', 'side', 'quantity', 'order_type', 'price', 'is_hedge'}, ...])
+    execute_batch_orders_signal = pyqtSignal(list)
 
     # 헷지 트리거 업데이트 시그널 (hedge_triggers, side_mode, current_step)
     hedge_triggers_updated = pyqtSignal(list, str, int)
@@ -87,12 +113,24 @@ class AutoTradeWorker(QObject):
             side: 'long' 또는 'short' (패널 구분자)
         """
         super().__init__(parent)
+        self.state_lock = threading.RLock()  # process_tick / 주문 이벤트 직렬화
         self.is_running = False
         self.symbol = "BTCUSDT"
         self.assigned_side = side  # v7_dual: 패널 구분자 저장
         self.side_mode = "LONG" if side == 'long' else "SHORT"  # v7_dual: side에 따라 자동 설정
+        self.price_source = 'last'  # 판단 가격 소스: last / mid / bidask / mark (v7_dual_tick_conflator)
+        self.order_book = None  # 로컬 L2 호가창 (v7_dual_order_book.LocalOrderBook, GUI가 연결 시 지정)
         self._lp = "[L]" if side == 'long' else "[S]"  # log prefix
         self._el = "상승진입" if side == 'long' else "하강진입"  # entry label (LONG=상승진입, SHORT=하강진입)
+        self.lifecycle = DcaLifecycle(f"worker({side})")  # 사이클 단계 + 상태 저장 이벤트 (v7_dual_dca_state_machine)
+        self._phase_handlers = {  # process_tick 단계별 처리 (idle은 처리 없음)
+            PHASE_ENTERING: self._tick_entering,
+            PHASE_PLACING_ORDERS: self._tick_placing_orders,
+            PHASE_WAITING_FILL: self._tick_waiting_fill,
+            PHASE_FINAL_STEP: self._tick_final_step,
+            PHASE_PROFIT_MONITORING: self._tick_profit_monitoring,
+            PHASE_CLOSING: self._tick_closing,
+        }
 
         # DCA 전략 상태
         self.current_step = 0
@@ -106,12 +144,25 @@ class AutoTradeWorker(QObject):
         self.m_orders_data = []  # NSO 주문 데이터 (슬리피지 조정 시 마커 업데이트용)
 
 
-        # 가격 정밀도 (기본값, start_trading에서 심볼별로 설정됨)
+        # 클라이언트 주문 ID (newClientOrderId / orderLinkId) 생성용 사이클 ID와 (step, leg)별 순번
+        self.cycle_id = None
+        self._client_order_seq = {}
+
+        # 가격 정밀도 / 양자화기 (기본값, start_trading에서 심볼별로 설정됨)
         self.price_precision = 4
+        self.quantizer = trading_utils.SymbolQuantizer.from_rules({})
 
         # 헷지 가격 조건부 주문 상태 (가격별로 실행 여부 추적)
         self.hedge_trigger_prices = []  # [(price, quantity, executed), ...]
         self.remaining_hedge_qty = 0
+
+        # 가격 레벨 트리거 (헷지 트리거 / 2차 임계값 / 프론트로드 재진입) - _sync_trigger_book 참조
+        self.trigger_book = TriggerBook()
+        self._trigger_book_state = None
+        self._trigger_book_dirty = True  # hedge_trigger_prices 대입 / _add_hedge_trigger / _update_hedge_trigger가 설정
+
+        # 마지막 체결 이벤트의 거래소 시각 (ms) - 포지션 저장소에서 이 체결이 반영된 값만 읽음
+        self._last_fill_event_ms = 0
         self.previous_cumulative_hedge_qty = 0  # 이전 Step까지의 누적 헷지 수량
 
         # 헷지 주문 추적 (슬리피지 계산용)
@@ -204,6 +255,7 @@ class AutoTradeWorker(QObject):
             print(self._lp, **kwargs)
 
     @pyqtSlot()
+    @_serialized
     def start_trading(self, symbol, entry_quantity, side_mode, strategy_settings=None, current_step=0, total_steps=10,
                      entry_qty_list=None, hedge_qty_list=None, api_module=None, symbol_info=None, category="linear",
                      current_price=0):
@@ -216,6 +268,9 @@ class AutoTradeWorker(QObject):
         self.symbol = symbol
         self.side_mode = side_mode
         self.current_step = current_step
+        # 새 사이클 ID (상태 복원 시 저장된 값으로 덮어씀)
+        self.cycle_id = self._new_cycle_id()
+        self._client_order_seq = {}
         self.total_steps = total_steps
         self.category = category
         self.current_price = current_price  # 현재 가격 저장
@@ -226,10 +281,11 @@ class AutoTradeWorker(QObject):
         self.api_module = api_module
         self.symbol_info = symbol_info if symbol_info else {}
 
-        # 가격 정밀도 계산 (tickSize 기반)
-        tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-        self.price_precision = trading_utils.count_decimal_places(tick_size)
-        self._log(f"[DCA] 가격 정밀도: {self.price_precision}자리 (tickSize={tick_size})")
+        # 가격/수량 양자화기 (거래 규칙으로 1회 생성, 모든 주문 가격/수량 조정에 사용)
+        self.quantizer = trading_utils.SymbolQuantizer.from_rules(self.symbol_info)
+        tick_size = self.quantizer.tick_size
+        self.price_precision = self.quantizer.price_decimals
+        self._log(f"[DCA] 가격 정밀도: {self.price_precision}자리 (tickSize={tick_size}, qtyStep={self.quantizer.qty_step})")
 
         # 전략 설정
         self.strategy_settings = strategy_settings if strategy_settings else {}
@@ -238,6 +294,9 @@ class AutoTradeWorker(QObject):
 
         self.uptrend_threshold_2_multiplier = self.strategy_settings.get("UPTREND_THRESHOLD_2_MULTIPLIER", 2.0)
         self.hedge_exponent = self.strategy_settings.get("HEDGE_EXPONENT", 3.0)  # 헷지 곡선 지수
+        # 시장가 익절 최대 허용 슬리피지 (%) - 0이면 호가창 추정만 기록하고 수량은 줄이지 않음
+        self.market_exit_max_slippage = self.strategy_settings.get("MARKET_EXIT_MAX_SLIPPAGE_PERCENT", 0.0)
+        self._log(f"[가격 소스] 트리거 판단 가격: {self.price_source}")
 
         # 헷지 청산가 보호 설정 (3단계 긴급 탈출 라인)
         self.hedge_liq_protection_enabled = self.strategy_settings.get("HEDGE_LIQ_PROTECTION_ENABLED", True)
@@ -289,6 +348,8 @@ class AutoTradeWorker(QObject):
             self.uptrend_threshold_price_2 = None
             self.hedge_trigger_prices = []
             self.remaining_hedge_qty = 0
+            self.trigger_book.clear()
+            self._trigger_book_state = None
             self.next_step_order_id = None
             self.last_step_entry_price = None
             self.step_filled_need_threshold_recalc = False
@@ -375,14 +436,8 @@ class AutoTradeWorker(QObject):
 
             # 헷지 수량을 qtyStep에 맞춰 조정
             if symbol_info and 'lotSizeFilter' in symbol_info:
-                qty_step = float(symbol_info.get('lotSizeFilter', {}).get('qtyStep', '0.01'))
-                min_order_qty = float(symbol_info.get('lotSizeFilter', {}).get('minOrderQty', '0.01'))
-                qty_precision = trading_utils.count_decimal_places(qty_step)
-
-                self.hedge_quantity = trading_utils.adjust_quantity(
-                    hedge_quantity_raw, qty_step, qty_precision, min_order_qty
-                )
-                self._log(f"[DCA] 헷지 수량 조정: {hedge_quantity_raw:.4f} → {self.hedge_quantity} (qtyStep={qty_step})")
+                self.hedge_quantity = self.quantizer.adjust_qty(hedge_quantity_raw)
+                self._log(f"[DCA] 헷지 수량 조정: {hedge_quantity_raw:.4f} → {self.hedge_quantity} (qtyStep={self.quantizer.qty_step})")
             else:
                 self.hedge_quantity = hedge_quantity_raw
 
@@ -395,6 +450,10 @@ class AutoTradeWorker(QObject):
         self.log_message.emit(f"Status: <b style='color: {log_color};'>DCA Running</b>|||Step: <b>{self.current_step+1}/{self.total_steps}</b>")
         self._log(f"AutoTradeWorker: DCA 시작. Mode: {self.side_mode}, Symbol: {self.symbol}, Entry: {self.entry_quantity}, Hedge: {self.hedge_quantity:.4f}")
 
+        # 복구 모드: 상태 플래그는 GUI가 start_trading 직후 복원 -> 단계는 idle에서 다음 틱에 다시 계산
+        self.lifecycle.record(self, EVENT_STARTED, {'restore': bool(is_restore_mode)},
+                              phase=PHASE_IDLE if is_restore_mode else None)
+
         # 복구 모드가 아니고 초기 진입이 안 되었으면 즉시 초기 진입 실행
         if not is_restore_mode and not self.initial_entry_done:
             self._log("[DCA] Step 0 초기 진입 실행 (자동)")
@@ -403,12 +462,13 @@ class AutoTradeWorker(QObject):
 
             # 실시간 상태 저장 (초기 진입 후에만)
             self._log("[DCA 상태] 초기 진입 후 상태 저장 요청")
-            self.request_save_state.emit()
+            self._save_state(EVENT_INITIAL_ENTRY)
         elif is_restore_mode:
             self._log(f"[DCA 복구] 복구 모드: 초기 진입 건너뜀 (initial_entry_done={self.initial_entry_done})")
             # 복구 모드에서는 상태 저장하지 않음 (GUI에서 복원한 값 유지)
 
     @pyqtSlot()
+    @_serialized
     def stop_trading(self):
         """자동매매 중지"""
         if not self.is_running:
@@ -420,14 +480,22 @@ class AutoTradeWorker(QObject):
         # 헷지 안전망 주문 취소
         self._cancel_hedge_safety_order()
 
+        self.lifecycle.record(self, EVENT_STOPPED)
+
         self.log_message.emit("Status: <b style='color: gray;'>Stopped</b>|||Step: <b>-</b>")
         self._log("AutoTradeWorker: DCA 중지.")
 
+    def _save_state(self, event_type, **data):
+        """사이클 이벤트 기록 후 GUI에 상태 저장 요청 (저장은 이벤트와 바뀐 값만 저널에 추가)"""
+        self.lifecycle.record(self, event_type, data or None)
+        self.request_save_state.emit()
+
     def fmt_price(self, price):
         """가격을 심볼의 정밀도에 맞게 포맷"""
         return f"{price:.{self.price_precision}f}"
 
     @pyqtSlot(str)
+    @_serialized
     def on_order_id_received(self, order_id):
         """GUI로부터 다음 단계 진입 주문 ID를 받음"""
         # 초기 진입(Step 0) 시장가 주문 ID는 무시
@@ -439,6 +507,7 @@ class AutoTradeWorker(QObject):
         self._log(f"[DCA] 다음 단계 주문 ID 저장: {order_id}")
 
     @pyqtSlot(str, float, float)
+    @_serialized
     def on_hedge_order_id_received(self, order_id, trigger_price, quantity):
         """GUI로부터 헷지 주문 ID를 받음 (슬리피지 추적용)"""
         # 트리거 인덱스 찾기 (hedge_trigger_prices에서 해당 트리거의 인덱스)
@@ -451,16 +520,60 @@ class AutoTradeWorker(QObject):
         self.pending_hedge_orders[order_id] = (trigger_price, quantity, trigger_index)
         self._log(f"[DCA 슬리피지] 헷지 주문 추적 시작: ID={order_id}, 트리거가=${trigger_price}, 수량={quantity}, 인덱스={trigger_index}")
 
-    @pyqtSlot(dict)
-    def on_order_update(self, order_data):
-        """WebSocket으로부터 주문 업데이트 수신"""
+    @_serialized
+    def set_next_step_order_id(self, order_id):
+        """GUI가 대신 낸 다음 단계 진입 주문 ID 기록 (슬리피지 조정 재주문, 역방향진입 시장가)"""
+        self.next_step_order_id = order_id
+        self._log(f"[DCA] 다음 단계 주문 ID 갱신: {order_id}")
+
+    @_serialized
+    def cancel_hedge_triggers(self):
+        """
+        헷지 트리거(소프트 트리거)와 슬리피지 추적 초기화 (GUI 역방향진입 요청)
+
+        Returns:
+            int: 비활성화한 트리거 수
+        """
+        count = len(self.hedge_trigger_prices)
+        self.hedge_trigger_prices = []
+        self.remaining_hedge_qty = 0
+        self.pending_hedge_orders.clear()
+        return count
+
+    @_serialized
+    def restore_hedge_triggers(self, triggers):
+        """
+        저장된 헷지 트리거 복원 (GUI DCA 상태 복구)
+
+        Args:
+            triggers: [[가격, 수량, 실행여부], ...]
+        """
+        self.hedge_trigger_prices = [list(trigger) for trigger in triggers]
+
+    @_serialized
+    def snapshot_next_entry(self):
+        """
+        다음 단계 시장가 진입 정보 (GUI 역방향진입 요청용, 워커 상태를 락 안에서 읽음)
+
+        Returns:
+            tuple: (다음 단계 인덱스, 진입 수량, side_mode). 다음 단계가 없으면 수량은 None
+        """
+        next_step = self.current_step + 1
+        qty = self.entry_qty_list[next_step] if next_step < len(self.entry_qty_list) else None
+        return next_step, qty, self.side_mode
+
+    @pyqtSlot(object)
+    @_serialized
+    def on_order_update(self, update):
+        """WebSocket으로부터 주문 업데이트 수신 (update: v7_dual_events.OrderUpdate)"""
         if not self.is_running:
             return
 
         try:
-            o = order_data.get('o', {})
-            order_id = str(o.get('i'))
-            status = o.get('X')
+            order_id = update.order_id
+            status = update.status
+            if update.filled_qty > 0 and update.symbol == self.symbol:
+                self._last_fill_event_ms = max(self._last_fill_event_ms, update.event_time)
 
             # 0. 헷지 안전망 주문 체결 확인
             if self.hedge_safety_order_id and order_id == self.hedge_safety_order_id and status == 'FILLED':
@@ -471,12 +584,11 @@ class AutoTradeWorker(QObject):
             # 1. 헷지 주문 체결 확인 (슬리피지 계산)
             if order_id in self.pending_hedge_orders and status == 'FILLED':
                 trigger_price, quantity, trigger_index = self.pending_hedge_orders[order_id]
-                avg_price = float(o.get('ap', 0))  # 평균 체결가
+                avg_price = update.avg_price  # 평균 체결가
 
                 if avg_price > 0:
-                    # 가격 정밀도 가져오기 (tickSize 기반)
-                    tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-                    price_precision = trading_utils.count_decimal_places(tick_size)
+                    # 가격 정밀도 (tickSize 기반, 양자화기에서 계산됨)
+                    price_precision = self.price_precision
 
                     # 슬리피지 계산
                     slippage = avg_price - trigger_price
@@ -539,7 +651,7 @@ class AutoTradeWorker(QObject):
                     self._log(f"[{self._el}] 체결 완료 - 중복 방지 플래그 리셋")
 
                 # 체결가 조회 (평균 진입가 업데이트를 위해 필요)
-                avg_fill_price = float(o.get('ap', 0))
+                avg_fill_price = update.avg_price
 
                 # 역방향진입인 경우만 익절 트리거 설정
                 if self.is_uptrend_entry:
@@ -587,7 +699,7 @@ class AutoTradeWorker(QObject):
                 # 헷지 트리거 최종 상태 동기화 (NSO 체결 시 H1-H4도 모두 체결된 상태)
                 for trigger in self.hedge_trigger_prices:
                     if len(trigger) > 2 and not trigger[2]:
-                        trigger[2] = True
+                        self._update_hedge_trigger(trigger, executed=True)
                 self.hedge_triggers_updated.emit(self.hedge_trigger_prices, self.side_mode, self.current_step)
 
                 # 단계 증가 전 이전 Step 스냅샷 저장 시그널 발송
@@ -639,7 +751,7 @@ class AutoTradeWorker(QObject):
 
                 # 상태 저장 (GUI에 저장 요청)
                 self._log(f"[DCA] 현재 단계 업데이트: Step {self.current_step+1}/{self.total_steps}")
-                self.request_save_state.emit()
+                self._save_state(EVENT_STEP_FILLED)
 
                 # 마지막 단계가 아니면 계속 진행
                 if self.current_step + 1 < self.total_steps:
@@ -662,6 +774,7 @@ class AutoTradeWorker(QObject):
             traceback.print_exc()
 
     @pyqtSlot(dict, dict, dict)
+    @_serialized
     def process_tick(self, ticker_data, position_data, candle_data=None):
         """실시간 가격 및 포지션 데이터 처리
 
@@ -731,393 +844,479 @@ class AutoTradeWorker(QObject):
 
             has_main_position = (long_pos_amt > 0 if self.side_mode == "LONG" else short_pos_amt < 0)
 
-            # 3. Step 0 초기 진입 로직
-            if not self.initial_entry_done:
-                # 10초 타임아웃
-                if time.time() - self.last_trade_time > 10:
-                    self._log("AutoTradeWorker: Step 0 초기 진입 타임아웃. 중지.")
-                    self.stop_trading()
-                    return
+            # 단계별 처리 (v7_dual_dca_state_machine) - 단계는 플래그에서 O(1)로 계산
+            # 허용되지 않은 전이는 거부되어 단계가 그대로이고 이번 틱은 처리하지 않음 (observe()가 None 반환)
+            phase = self.lifecycle.observe(self)
+            handler = self._phase_handlers.get(phase)
+            if handler is not None:
+                handler(ticker_data, position_data, has_main_position, candle_updated)
 
-                # 포지션 없으면 즉시 진입
-                if not has_main_position:
-                    self._execute_initial_entry()
-                    self.initial_entry_done = True
+        except Exception as e:
+            self._log(f"AutoTradeWorker: process_tick 오류: {e}")
+            import traceback
+            traceback.print_exc()
 
-                    # 실시간 상태 저장 (Step 0 초기 진입 후)
-                    self._log("[DCA 상태] Step 0 진입 후 상태 저장 요청")
-                    self.request_save_state.emit()
-                    return
+    # ==================== 단계별 틱 처리 ====================
 
-            # 4. Step 0 체결 후 → Step 1 지정가 주문 생성
-            # [중요] 익절 모니터링 모드(역방향진입 후)에서는 주문 생성 안 함
-            if self.initial_entry_done and not self.next_step_orders_placed:
-                # 익절 모니터링 모드 확인: entry_price_at_step이 있으면 역방향진입 완료 상태
-                if self.entry_price_at_step is not None:
-                    # 역방향진입 완료 → 익절만 모니터링, 새 주문 생성 안 함
-                    self._log(f"[DCA] 익절 모니터링 모드 감지 ({self._el} 완료) - 다음 단계 주문 생성 스킵")
-                    # 플래그를 True로 설정하여 반복 실행 방지
-                    self.next_step_orders_placed = True
-                elif has_main_position:
-                    self._log(f"[DCA] Step {self.current_step+1} 체결 확인. 다음 단계 주문 생성 시작...")
-                    self._place_next_step_orders(position_data)
-                    self.next_step_orders_placed = True
+    def _tick_entering(self, ticker_data, position_data, has_main_position, candle_updated):
+        """entering: Step 0 초기 진입 (포지션이 이미 보이면 체결 반영 전이므로 가격 감시만 계속)"""
+        # 10초 타임아웃
+        if time.time() - self.last_trade_time > 10:
+            self._log("AutoTradeWorker: Step 0 초기 진입 타임아웃. 중지.")
+            self.stop_trading()
+            return
 
-                    # 초기 임계값 계산 플래그 설정 (다음 단계 주문 생성 후)
-                    self.step_filled_need_threshold_recalc = True
+        # 포지션 없으면 즉시 진입
+        if not has_main_position:
+            self._execute_initial_entry()
+            self.initial_entry_done = True
 
-                    # 마지막 단계가 아닌 경우에만 "다음 주문 대기" 로그 출력
-                    if self.current_step + 1 < self.total_steps:
-                        self._log(f"[DCA] Step {self.current_step+2} 지정가 주문 완료. 체결 대기 중...")
+            # 실시간 상태 저장 (Step 0 초기 진입 후)
+            self._log("[DCA 상태] Step 0 진입 후 상태 저장 요청")
+            self._save_state(EVENT_INITIAL_ENTRY)
+            return
 
-                        # 실시간 상태 저장 (다음 단계 주문 생성 후)
-                        self._log(f"[DCA 상태] Step {self.current_step+2} 주문 생성 후 상태 저장 요청")
-                        self.request_save_state.emit()
+        current_price = self._tick_common(ticker_data, position_data, candle_updated)
+        if current_price:
+            self._tick_final_step_guards(position_data, current_price)
+
+    def _tick_placing_orders(self, ticker_data, position_data, has_main_position, candle_updated):
+        """placing_orders: 단계 체결 확인 -> 다음 단계 지정가 주문 + 헷지 트리거 생성"""
+        if has_main_position:
+            self._log(f"[DCA] Step {self.current_step+1} 체결 확인. 다음 단계 주문 생성 시작...")
+            self._place_next_step_orders(position_data)
+            self.next_step_orders_placed = True
+
+            # 초기 임계값 계산 플래그 설정 (다음 단계 주문 생성 후)
+            self.step_filled_need_threshold_recalc = True
+
+            # 마지막 단계가 아닌 경우에만 "다음 주문 대기" 로그 출력
+            if self.current_step + 1 < self.total_steps:
+                self._log(f"[DCA] Step {self.current_step+2} 지정가 주문 완료. 체결 대기 중...")
+
+                # 실시간 상태 저장 (다음 단계 주문 생성 후)
+                self._log(f"[DCA 상태] Step {self.current_step+2} 주문 생성 후 상태 저장 요청")
+                self._save_state(EVENT_STEP_ORDERS_PLACED)
+
+                # Step 업데이트 (다음 단계 대기 중)
+                log_color = "green" if self.side_mode == "LONG" else "red"
+                self.log_message.emit(f"Status: <b style='color: {log_color};'>Waiting for Step {self.current_step+2}</b>|||Step: <b>{self.current_step+1}/{self.total_steps}</b>")
+
+        # 다음 단계 지정가 체결은 주문 ID 기반으로 WebSocket 주문 업데이트에서 처리 (on_order_update)
+        current_price = self._tick_common(ticker_data, position_data, candle_updated)
+        if current_price:
+            self._tick_final_step_guards(position_data, current_price)
+
+    def _tick_waiting_fill(self, ticker_data, position_data, has_main_position, candle_updated):
+        """waiting_fill: 다음 단계 지정가 체결 대기 - 공통 처리만 (레벨 비교 O(1), 체결은 on_order_update)"""
+        self._tick_common(ticker_data, position_data, candle_updated)
+
+    def _tick_final_step(self, ticker_data, position_data, has_main_position, candle_updated):
+        """final_step: 최종 단계 - 보호 주문 재시도 / 메인·헷지 강제 청산 감지"""
+        current_price = self._tick_common(ticker_data, position_data, candle_updated)
+        if current_price:
+            self._tick_final_step_guards(position_data, current_price)
+
+    def _tick_profit_monitoring(self, ticker_data, position_data, has_main_position, candle_updated):
+        """profit_monitoring: 역방향진입 체결 후 익절 모니터링 (최종 단계면 보호 주문 / 청산 감지도 진행)"""
+        if not self.next_step_orders_placed:
+            # 역방향진입 완료 → 익절만 모니터링, 새 주문 생성 안 함
+            self._log(f"[DCA] 익절 모니터링 모드 감지 ({self._el} 완료) - 다음 단계 주문 생성 스킵")
+            # 플래그를 True로 설정하여 반복 실행 방지
+            self.next_step_orders_placed = True
 
-                        # Step 업데이트 (다음 단계 대기 중)
-                        log_color = "green" if self.side_mode == "LONG" else "red"
-                        self.log_message.emit(f"Status: <b style='color: {log_color};'>Waiting for Step {self.current_step+2}</b>|||Step: <b>{self.current_step+1}/{self.total_steps}</b>")
+        current_price = self._tick_common(ticker_data, position_data, candle_updated)
+        if not current_price:
+            return
+        if has_main_position:
+            self._monitor_profit_target(current_price, position_data)
+        self._tick_final_step_guards(position_data, current_price)
+
+    def _tick_closing(self, ticker_data, position_data, has_main_position, candle_updated):
+        """closing: 최종 단계 보호 주문 후 포지션 청산 모니터링 (최종 단계 역방향진입 체결 후면 익절 모니터링도 함께)"""
+        current_price = self._tick_common(ticker_data, position_data, candle_updated)
+        if not current_price:
+            return
 
-            # 4-1. 다음 단계 지정가 주문 체결 확인
-            # (이제 주문 ID 기반으로 WebSocket 주문 업데이트에서 처리됨 - on_order_update 참조)
+        # 7. 익절 트리거 모니터링 (상향 돌파 후 하향 돌파 감지)
+        # entry_price_at_step이 설정되어 있으면 익절 모니터링 시작 (첫 계산 포함)
+        # 최종 단계 역방향진입 체결 후에는 청산 모니터링(closing 단계)과 함께 실행됨
+        if self.entry_price_at_step is not None and has_main_position:
+            self._monitor_profit_target(current_price, position_data)
 
-            # 현재가 조회 (헷지 모니터링 및 익절 모니터링에 공통 사용)
-            current_price = float(ticker_data.get('c', 0))
-            if current_price == 0:
-                return
-            
-            # 현재가 저장 (헷지 청산 시 최소 금액 계산용)
-            self.current_price = current_price
-
-            # 고가/저가 추적 업데이트 (익절가 계산용 - 역방향진입 후에만 활성화)
-            if self.high_price_since_entry is not None and self.low_price_since_entry is not None:
-                if current_price > self.high_price_since_entry:
-                    self.high_price_since_entry = current_price
-                if current_price < self.low_price_since_entry:
-                    self.low_price_since_entry = current_price
-
-            # 4-2. 헷지 프로토콜: 되돌림 감지 및 익절 체크
-            if self.hedge_protocol_active and not self.is_uptrend_entry:
-                self._check_hedge_protocol_retracement(current_price)
-
-            # 4-3. 헷지 프로토콜: 대기 중인 활성화 조건 체크 (WebSocket 포지션 업데이트 후)
-            if self.hedge_protocol_pending_check is not None and not self.is_uptrend_entry:
-                pending_trigger_index, pending_fill_price = self.hedge_protocol_pending_check
-                self.hedge_protocol_pending_check = None  # 플래그 초기화
-                self._log(f"[헷지 프로토콜] H{pending_trigger_index+1} 포지션 업데이트 완료 - 활성화 조건 체크 시작")
-                self._handle_hedge_protocol_trigger(pending_trigger_index, pending_fill_price)
-
-            # 4-4. 헷지 프론트로드: 최종 단계에서 프로토콜 미활성이면 즉시 활성화
-            if (self.hedge_protocol_enabled and self.hedge_frontload_final_step
-                    and self.current_step + 1 >= self.total_steps
-                    and not self.hedge_protocol_active
-                    and not self.hedge_protocol_executed
-                    and not self.is_uptrend_entry):
-                self._update_hedge_protocol_avg_price()
-                if self.hedge_protocol_hedge_avg_price and self.hedge_protocol_hedge_avg_price > 0:
-                    self.hedge_protocol_active = True
-                    self.hedge_protocol_exited_qty = 0
-                    self.hedge_protocol_waiting_for_be = False
-                    self.hedge_protocol_lowest_price = self.hedge_protocol_hedge_avg_price
-                    self._log(f"[헷지 프론트로드] 최종 단계 프로토콜 활성화 (복구) - 최저가 추적 시작")
-
-            # 4-5. 헷지 프론트로드: 최종단계 재진입 모니터링 (익절 후 H4 가격에서 재진입)
-            if self.hedge_frontload_reentry_pending and self.hedge_frontload_reentry_price:
-                reentry_triggered = False
-                if self.side_mode == "LONG" and current_price <= self.hedge_frontload_reentry_price:
-                    reentry_triggered = True
-                    hedge_side = "SELL"
-                elif self.side_mode == "SHORT" and current_price >= self.hedge_frontload_reentry_price:
-                    reentry_triggered = True
-                    hedge_side = "BUY"
-
-                if reentry_triggered:
-                    reentry_qty = self.hedge_frontload_reentry_qty
-                    self._log(f"[헷지 프론트로드] 재진입 가격 도달! 현재가: ${self.fmt_price(current_price)}, H4: ${self.fmt_price(self.hedge_frontload_reentry_price)}")
-                    self._log(f"[헷지 프론트로드] 재진입 시장가 주문: {hedge_side} {reentry_qty}")
-                    self.execute_trade_signal.emit(self.symbol, hedge_side, str(reentry_qty), True)
-                    self.hedge_frontload_reentry_pending = False
-                    self.hedge_frontload_reentry_price = None
-                    self.hedge_frontload_reentry_qty = 0
-                    self.hedge_protocol_exited_qty = 0
+        self._tick_final_step_guards(position_data, current_price)
 
-            # 5. 헷지 가격 조건 모니터링 (가격 돌파 시 시장가 주문)
-            if self.next_step_orders_placed and self.hedge_trigger_prices:
+        # 10. 최종 단계 포지션 청산 모니터링
+        if self.monitoring_final_step_closure:
+            self._monitor_final_step_position_closure(position_data)
 
-                for trigger in self.hedge_trigger_prices:
-                    trigger_price, qty, executed = trigger
+    def _tick_common(self, ticker_data, position_data, candle_updated):
+        """
+        활성 단계 공통 처리: 현재가 -> 헷지 프로토콜 -> 임계값 재계산 -> 가격 레벨 트리거 -> 봉 마감 역방향진입
 
-                    if executed:
-                        continue  # 이미 실행된 트리거는 스킵
+        Returns:
+            float: 현재가 (0이면 이번 틱의 나머지 처리 생략)
+        """
+        # 현재가 조회 (헷지 모니터링 및 익절 모니터링에 공통 사용)
+        current_price = float(ticker_data.get('c', 0))
+        if current_price == 0:
+            return 0
 
-                    # LONG 포지션: 가격 하방 돌파 확인 (현재가 <= 트리거 가격)
-                    # SHORT 포지션: 가격 상방 돌파 확인 (현재가 >= 트리거 가격)
-                    triggered = False
+        # 현재가 저장 (헷지 청산 시 최소 금액 계산용)
+        self.current_price = current_price
 
-                    if self.side_mode == "LONG" and current_price <= trigger_price:
-                        triggered = True
-                        hedge_side = "SELL"
-                    elif self.side_mode == "SHORT" and current_price >= trigger_price:
-                        triggered = True
-                        hedge_side = "BUY"
+        # 고가/저가 추적 업데이트 (익절가 계산용 - 역방향진입 후에만 활성화)
+        if self.high_price_since_entry is not None and self.low_price_since_entry is not None:
+            if current_price > self.high_price_since_entry:
+                self.high_price_since_entry = current_price
+            if current_price < self.low_price_since_entry:
+                self.low_price_since_entry = current_price
 
-                    if triggered:
-                        self._log(f"[DCA 헷지] 가격 돌파 감지! 현재가: ${current_price}, 트리거: ${trigger_price}")
+        # 4-2. 헷지 프로토콜: 되돌림 감지 및 익절 체크
+        if self.hedge_protocol_active and not self.is_uptrend_entry:
+            self._check_hedge_protocol_retracement(current_price)
+
+        # 4-3. 헷지 프로토콜: 대기 중인 활성화 조건 체크 (WebSocket 포지션 업데이트 후)
+        if self.hedge_protocol_pending_check is not None and not self.is_uptrend_entry:
+            pending_trigger_index, pending_fill_price = self.hedge_protocol_pending_check
+            self.hedge_protocol_pending_check = None  # 플래그 초기화
+            self._log(f"[헷지 프로토콜] H{pending_trigger_index+1} 포지션 업데이트 완료 - 활성화 조건 체크 시작")
+            self._handle_hedge_protocol_trigger(pending_trigger_index, pending_fill_price)
+
+        # 4-4. 헷지 프론트로드: 최종 단계에서 프로토콜 미활성이면 즉시 활성화
+        if (self.hedge_protocol_enabled and self.hedge_frontload_final_step
+                and self.current_step + 1 >= self.total_steps
+                and not self.hedge_protocol_active
+                and not self.hedge_protocol_executed
+                and not self.is_uptrend_entry):
+            self._update_hedge_protocol_avg_price()
+            if self.hedge_protocol_hedge_avg_price and self.hedge_protocol_hedge_avg_price > 0:
+                self.hedge_protocol_active = True
+                self.hedge_protocol_exited_qty = 0
+                self.hedge_protocol_waiting_for_be = False
+                self.hedge_protocol_lowest_price = self.hedge_protocol_hedge_avg_price
+                self._log(f"[헷지 프론트로드] 최종 단계 프로토콜 활성화 (복구) - 최저가 추적 시작")
+
+        # 6. 상승 중 추가진입 임계값 가격 계산 및 차트 표시 (재계산 플래그가 있을 때만)
+        self._recalc_uptrend_threshold(position_data)
+
+        # 4-5 / 5 / 2차 임계값: 가격 레벨 트리거 (프론트로드 재진입, 헷지 트리거, 2차 임계값 즉시 진입)
+        # 닿은 레벨이 없으면 가장 가까운 레벨 2개와의 비교만 수행
+        self._sync_trigger_book()
+        entry_in_progress = self.uptrend_entry_in_progress
+        self.trigger_book.check(current_price)
+        if self.uptrend_entry_in_progress and not entry_in_progress:
+            # 2차 임계값 즉시 진입 요청 후 나머지 로직 스킵 (1차 임계값 체크 불필요)
+            return 0
 
-                        # 최소 주문 금액 체크 (주문 전에 확인)
-                        min_order_value = float(self.symbol_info.get('lotSizeFilter', {}).get('minNotionalValue', '5'))
-                        order_value = qty * current_price
-                        if order_value < min_order_value:
-                            self._log(f"[DCA 헷지] 주문 금액(${order_value:.2f})이 최소 주문 금액(${min_order_value}) 미만으로 스킵")
-                            # 실행 완료 표시 (재시도 방지)
-                            trigger[2] = True
-                            self.remaining_hedge_qty -= qty
-                            # GUI에 헷지 트리거 업데이트 알림
-                            self.hedge_triggers_updated.emit(self.hedge_trigger_prices, self.side_mode, self.current_step)
-                            continue
+        # 상승 중 추가진입 조건 확인 (봉 마감 시에만 체크 - 1차 임계값)
+        # [수정] 익절 모니터링 중에도 추가 역방향진입 허용 (entry_price_at_step 체크 제거)
+        if candle_updated and not self.uptrend_entry_in_progress:
+            condition_result = self._check_uptrend_entry_condition(position_data)
+            self._log(f"[DEBUG {self._el}] 봉마감 체크 - 결과: {condition_result}, entry_price_at_step: {self.entry_price_at_step}")
 
-                        self._log(f"[DCA 헷지] {hedge_side} {qty} 시장가 주문 실행")
+            if condition_result:
+                self._log(f"[{self._el}] 조건 만족! 시장가 즉시 진입")
 
-                        # 헷지 주문 추적 정보 저장 (시그널 emit 전에 먼저 저장)
-                        # GUI는 이 정보를 사용하여 주문 ID를 다시 워커로 전달
-                        self.last_hedge_trigger_info = (trigger_price, qty)
+                # 중복 진입 방지 플래그 설정
+                self.uptrend_entry_in_progress = True
 
-                        # 시장가 헷지 주문 실행 (트리거 가격과 수량 포함)
-                        self.execute_trade_signal.emit(self.symbol, hedge_side, str(qty), True)
+                # ========== 헷지 청산을 역방향진입보다 먼저 실행 ==========
+                self._reduce_hedge_on_uptrend_entry()
 
-                        # 실행 완료 표시
-                        trigger[2] = True
-                        self.remaining_hedge_qty -= qty
+                # 지정가 주문이 있으면 취소 요청과 함께 전송 (order_id 포함)
+                # 지정가 주문이 없으면 빈 문자열로 전송 (GUI에서 취소 스킵하고 바로 시장가 진입)
+                order_id_to_cancel = self.next_step_order_id if self.next_step_order_id else ""
 
-                        # GUI에 헷지 트리거 업데이트 알림 (마커 색상 변경을 위해)
-                        self.hedge_triggers_updated.emit(self.hedge_trigger_prices, self.side_mode, self.current_step)
+                # next_step_order_id 초기화 (시장가 주문은 취소 불가하므로 즉시 제거)
+                self.next_step_order_id = None
 
-                        # 실시간 상태 저장 (헷지 트리거 발동 시)
-                        self._log(f"[DCA 상태] 헷지 트리거 ${trigger_price} 발동 후 상태 저장 요청")
-                        self.request_save_state.emit()
+                # 역방향진입 플래그 설정 (체결 시 익절 트리거 설정용)
+                self.is_uptrend_entry = True
 
-            # 6. 상승 중 추가진입 임계값 가격 계산 및 차트 표시
-            # 임계값 재계산이 필요한 경우만 계산 (매 ticker마다 계산하지 않음)
-            should_recalculate_threshold = False
-            
-            # 조건 1: 헷지 주문 체결 시 (플래그로 트리거됨)
-            if self.hedge_filled_need_threshold_recalc:
-                should_recalculate_threshold = True
-                self._log("[임계값] 헷지 체결 감지 - 임계값 재계산")
-            
-            # 조건 2: 다음 단계 주문 체결 시 또는 초기 주문 생성 시 (플래그로 트리거됨)
-            if self.step_filled_need_threshold_recalc:
-                should_recalculate_threshold = True
-                self._log("[임계값] 주문 생성/체결 감지 - 임계값 재계산")
+                # GUI에 주문 취소 및 시장가 진입 요청
+                self.uptrend_entry_request.emit(order_id_to_cancel)
 
-            # 조건 3: Break Even 없이 임계값 계산되었던 경우, Break Even이 가능해지면 재계산
-            if self.threshold_needs_break_even_update and not should_recalculate_threshold:
-                pos_key_main = f"{self.symbol}_{self.side_mode}"
-                pos_key_hedge = f"{self.symbol}_{'SHORT' if self.side_mode == 'LONG' else 'LONG'}"
-                main_pos = position_data.get(pos_key_main, {})
-                hedge_pos = position_data.get(pos_key_hedge, {})
-                if abs(float(hedge_pos.get('amount', 0))) > 0 and float(hedge_pos.get('entry_price', hedge_pos.get('entry', 0))) > 0:
-                    if abs(float(main_pos.get('amount', 0))) > 0 and float(main_pos.get('entry_price', main_pos.get('entry', 0))) > 0:
-                        should_recalculate_threshold = True
-                        self._log("[임계값] Break Even 데이터 확보 - 임계값 재계산")
-            
-            if should_recalculate_threshold:
-                # 기준 가격 결정: Break Even 가격 우선, 계산 불가 시 평균 진입가 사용
-                base_price = 0.0
-                is_break_even_base = False
+        return current_price
 
-                if self.entry_price_at_step is not None:
-                    # 역방향진입 완료: 역방향진입 체결가 기준
-                    base_price = self.entry_price_at_step
-                    self.threshold_needs_break_even_update = False
-                    self._log(f"[임계값] 기준가: {self._el} 체결가 ${self.fmt_price(base_price)}")
-                else:
-                    # 정상 DCA: Break Even 가격 계산 시도
-                    pos_key_main = f"{self.symbol}_{self.side_mode}"
-                    pos_key_hedge = f"{self.symbol}_{'SHORT' if self.side_mode == 'LONG' else 'LONG'}"
+    def _recalc_uptrend_threshold(self, position_data):
+        """상승 중 추가진입 임계값 재계산 (헷지/단계 체결 또는 Break Even 확보 시에만 - 매 틱 계산하지 않음)"""
+        should_recalculate_threshold = False
 
-                    main_position = position_data.get(pos_key_main, {})
-                    hedge_position = position_data.get(pos_key_hedge, {})
+        # 조건 1: 헷지 주문 체결 시 (플래그로 트리거됨)
+        if self.hedge_filled_need_threshold_recalc:
+            should_recalculate_threshold = True
+            self._log("[임계값] 헷지 체결 감지 - 임계값 재계산")
 
-                    main_qty = abs(float(main_position.get('amount', 0)))
-                    main_entry = float(main_position.get('entry_price', main_position.get('entry', 0)))
-                    hedge_qty = abs(float(hedge_position.get('amount', 0)))
-                    hedge_entry = float(hedge_position.get('entry_price', hedge_position.get('entry', 0)))
+        # 조건 2: 다음 단계 주문 체결 시 또는 초기 주문 생성 시 (플래그로 트리거됨)
+        if self.step_filled_need_threshold_recalc:
+            should_recalculate_threshold = True
+            self._log("[임계값] 주문 생성/체결 감지 - 임계값 재계산")
 
-                    # Break Even 계산 가능 여부 확인
-                    if main_qty > 0 and hedge_qty > 0 and main_entry > 0 and hedge_entry > 0:
-                        # Break Even 계산
-                        if self.side_mode == "LONG":
-                            numerator = main_qty * main_entry - hedge_qty * hedge_entry
-                            denominator = main_qty - hedge_qty
-                        else:
-                            numerator = hedge_qty * hedge_entry - main_qty * main_entry
-                            denominator = hedge_qty - main_qty
-
-                        if abs(denominator) >= 0.0001:
-                            break_even_price = numerator / denominator
-                            if break_even_price > 0:
-                                # LONG: max(Break Even, 평균 진입가), SHORT: min(Break Even, 평균 진입가)
-                                if self.side_mode == "LONG":
-                                    base_price = max(break_even_price, main_entry)
-                                    comparison = "높은 값"
-                                else:  # SHORT
-                                    base_price = min(break_even_price, main_entry)
-                                    comparison = "낮은 값"
-
-                                is_break_even_base = True
-                                self.threshold_needs_break_even_update = False
-                                self._log(f"[임계값] Break Even: ${self.fmt_price(break_even_price)}, 메인 평균가: ${self.fmt_price(main_entry)}")
-                                self._log(f"[임계값] 기준가: ${self.fmt_price(base_price)} ({comparison} 선택) (메인: {main_qty}@${self.fmt_price(main_entry)}, 헷지: {hedge_qty}@${self.fmt_price(hedge_entry)})")
-
-                    # Break Even 계산 실패 시 메인 평균가 사용
-                    if base_price == 0:
-                        base_price = main_entry if main_entry > 0 else 0
-                        self.threshold_needs_break_even_update = True
-                        self._log(f"[임계값] 기준가: 메인 평균가 ${self.fmt_price(base_price)} (Break Even 계산 불가)")
-
-                if base_price > 0:
-                    # 임계값 조정: Break Even 기준일 때는 조정 없음, 역방향진입 후에도 조정 없음
-                    threshold_adjustment = 0.0
-
-                    if is_break_even_base:
-                        # Break Even 기준: 조정값 없이 설정값만 사용
-                        self._log(f"[임계값] Break Even 기준 - 추가 조정 없음")
-                    elif self.entry_price_at_step is not None:
-                        # 역방향진입 완료: 조정값 없이 설정값만 사용
-                        self._log(f"[임계값] {self._el} 완료 후 - 추가 조정 없음")
-
-                    # 임계값 가격 계산
-                    adjusted_threshold = self.uptrend_entry_profit_threshold + threshold_adjustment
+        # 조건 3: Break Even 없이 임계값 계산되었던 경우, Break Even이 가능해지면 재계산
+        if self.threshold_needs_break_even_update and not should_recalculate_threshold:
+            pos_key_main = f"{self.symbol}_{self.side_mode}"
+            pos_key_hedge = f"{self.symbol}_{'SHORT' if self.side_mode == 'LONG' else 'LONG'}"
+            main_pos = position_data.get(pos_key_main, {})
+            hedge_pos = position_data.get(pos_key_hedge, {})
+            if abs(float(hedge_pos.get('amount', 0))) > 0 and float(hedge_pos.get('entry_price', hedge_pos.get('entry', 0))) > 0:
+                if abs(float(main_pos.get('amount', 0))) > 0 and float(main_pos.get('entry_price', main_pos.get('entry', 0))) > 0:
+                    should_recalculate_threshold = True
+                    self._log("[임계값] Break Even 데이터 확보 - 임계값 재계산")
+
+        if should_recalculate_threshold:
+            # 기준 가격 결정: Break Even 가격 우선, 계산 불가 시 평균 진입가 사용
+            base_price = 0.0
+            is_break_even_base = False
+
+            if self.entry_price_at_step is not None:
+                # 역방향진입 완료: 역방향진입 체결가 기준
+                base_price = self.entry_price_at_step
+                self.threshold_needs_break_even_update = False
+                self._log(f"[임계값] 기준가: {self._el} 체결가 ${self.fmt_price(base_price)}")
+            else:
+                # 정상 DCA: Break Even 가격 계산 시도
+                pos_key_main = f"{self.symbol}_{self.side_mode}"
+                pos_key_hedge = f"{self.symbol}_{'SHORT' if self.side_mode == 'LONG' else 'LONG'}"
+
+                main_position = position_data.get(pos_key_main, {})
+                hedge_position = position_data.get(pos_key_hedge, {})
+
+                main_qty = abs(float(main_position.get('amount', 0)))
+                main_entry = float(main_position.get('entry_price', main_position.get('entry', 0)))
+                hedge_qty = abs(float(hedge_position.get('amount', 0)))
+                hedge_entry = float(hedge_position.get('entry_price', hedge_position.get('entry', 0)))
 
+                # Break Even 계산 가능 여부 확인
+                if main_qty > 0 and hedge_qty > 0 and main_entry > 0 and hedge_entry > 0:
+                    # Break Even 계산
                     if self.side_mode == "LONG":
-                        # LONG: 기준가 × (1 + 조정된 임계값%)
-                        threshold_price = base_price * (1 + adjusted_threshold / 100.0)
-                        # 2차 임계값: 1차 임계값의 2배 거리
-                        threshold_price_2 = base_price * (1 + adjusted_threshold * self.uptrend_threshold_2_multiplier / 100.0)
+                        numerator = main_qty * main_entry - hedge_qty * hedge_entry
+                        denominator = main_qty - hedge_qty
                     else:
-                        # SHORT: 기준가 × (1 - 조정된 임계값%)
-                        threshold_price = base_price * (1 - adjusted_threshold / 100.0)
-                        # 2차 임계값: 1차 임계값의 2배 거리
-                        threshold_price_2 = base_price * (1 - adjusted_threshold * self.uptrend_threshold_2_multiplier / 100.0)
-
-                    self._log(f"[DEBUG 임계값] 기준가: ${self.fmt_price(base_price)}, 조정 임계값: {adjusted_threshold:.4f}%, 1차: ${self.fmt_price(threshold_price)}, 2차: ${self.fmt_price(threshold_price_2)}")
-
-                    # 임계값 저장 및 GUI 업데이트 (변경된 경우에만)
-                    if self.uptrend_threshold_price is None or abs(self.uptrend_threshold_price - threshold_price) > 0.0001:
-                        self.uptrend_threshold_price = threshold_price
-                        self.uptrend_threshold_price_2 = threshold_price_2
-                        self._log(f"[임계값 갱신] 1차: ${self.fmt_price(threshold_price)}, 2차: ${self.fmt_price(threshold_price_2)}")
-                        # GUI에 임계값 가격 업데이트 알림 (차트에 표시)
-                        self.uptrend_threshold_updated.emit(threshold_price)
-                        self.uptrend_threshold_2_updated.emit(threshold_price_2)
-                    
-                    # 임계값 계산 완료 - 플래그 리셋
-                    self.hedge_filled_need_threshold_recalc = False
-                    self.step_filled_need_threshold_recalc = False
-                else:
-                    # base_price가 0이면 임계값 계산 불가 - 플래그 유지하여 다음 틱에서 재시도
-                    self._log("[임계값] 기준가 없음 (0) - 플래그 유지, 다음 틱에서 재시도")
-
-            # 2차 임계값 즉시 진입 확인 (실시간 가격 체크)
-            if self.uptrend_threshold_price_2 is not None and not self.uptrend_entry_in_progress:
-                threshold_2_breached = False
+                        numerator = hedge_qty * hedge_entry - main_qty * main_entry
+                        denominator = hedge_qty - main_qty
+
+                    if abs(denominator) >= 0.0001:
+                        break_even_price = numerator / denominator
+                        if break_even_price > 0:
+                            # LONG: max(Break Even, 평균 진입가), SHORT: min(Break Even, 평균 진입가)
+                            if self.side_mode == "LONG":
+                                base_price = max(break_even_price, main_entry)
+                                comparison = "높은 값"
+                            else:  # SHORT
+                                base_price = min(break_even_price, main_entry)
+                                comparison = "낮은 값"
+
+                            is_break_even_base = True
+                            self.threshold_needs_break_even_update = False
+                            self._log(f"[임계값] Break Even: ${self.fmt_price(break_even_price)}, 메인 평균가: ${self.fmt_price(main_entry)}")
+                            self._log(f"[임계값] 기준가: ${self.fmt_price(base_price)} ({comparison} 선택) (메인: {main_qty}@${self.fmt_price(main_entry)}, 헷지: {hedge_qty}@${self.fmt_price(hedge_entry)})")
+
+                # Break Even 계산 실패 시 메인 평균가 사용
+                if base_price == 0:
+                    base_price = main_entry if main_entry > 0 else 0
+                    self.threshold_needs_break_even_update = True
+                    self._log(f"[임계값] 기준가: 메인 평균가 ${self.fmt_price(base_price)} (Break Even 계산 불가)")
+
+            if base_price > 0:
+                # 임계값 조정: Break Even 기준일 때는 조정 없음, 역방향진입 후에도 조정 없음
+                threshold_adjustment = 0.0
+
+                if is_break_even_base:
+                    # Break Even 기준: 조정값 없이 설정값만 사용
+                    self._log(f"[임계값] Break Even 기준 - 추가 조정 없음")
+                elif self.entry_price_at_step is not None:
+                    # 역방향진입 완료: 조정값 없이 설정값만 사용
+                    self._log(f"[임계값] {self._el} 완료 후 - 추가 조정 없음")
+
+                # 임계값 가격 계산
+                adjusted_threshold = self.uptrend_entry_profit_threshold + threshold_adjustment
 
                 if self.side_mode == "LONG":
-                    # LONG: 현재가가 2차 임계값 이상이면 즉시 진입
-                    if current_price >= self.uptrend_threshold_price_2:
-                        threshold_2_breached = True
+                    # LONG: 기준가 × (1 + 조정된 임계값%)
+                    threshold_price = base_price * (1 + adjusted_threshold / 100.0)
+                    # 2차 임계값: 1차 임계값의 2배 거리
+                    threshold_price_2 = base_price * (1 + adjusted_threshold * self.uptrend_threshold_2_multiplier / 100.0)
                 else:
-                    # SHORT: 현재가가 2차 임계값 이하면 즉시 진입
-                    if current_price <= self.uptrend_threshold_price_2:
-                        threshold_2_breached = True
-
-                if threshold_2_breached:
-                    self._log(f"[{self._el} 2차 임계값] 돌파 감지! 현재가 ${self.fmt_price(current_price)}, 2차 임계값 ${self.fmt_price(self.uptrend_threshold_price_2)}")
-                    self._log(f"[{self._el} 2차 임계값] 캔들 패턴 무시하고 즉시 진입")
-
-                    # 중복 진입 방지 플래그 설정
-                    self.uptrend_entry_in_progress = True
-
-                    # ========== 헷지 청산을 역방향진입보다 먼저 실행 ==========
-                    self._reduce_hedge_on_uptrend_entry()
-
-                    # 지정가 주문이 있으면 취소 요청과 함께 전송
-                    order_id_to_cancel = self.next_step_order_id if self.next_step_order_id else ""
+                    # SHORT: 기준가 × (1 - 조정된 임계값%)
+                    threshold_price = base_price * (1 - adjusted_threshold / 100.0)
+                    # 2차 임계값: 1차 임계값의 2배 거리
+                    threshold_price_2 = base_price * (1 - adjusted_threshold * self.uptrend_threshold_2_multiplier / 100.0)
+
+                self._log(f"[DEBUG 임계값] 기준가: ${self.fmt_price(base_price)}, 조정 임계값: {adjusted_threshold:.4f}%, 1차: ${self.fmt_price(threshold_price)}, 2차: ${self.fmt_price(threshold_price_2)}")
+
+                # 임계값 저장 및 GUI 업데이트 (변경된 경우에만)
+                if self.uptrend_threshold_price is None or abs(self.uptrend_threshold_price - threshold_price) > 0.0001:
+                    self.uptrend_threshold_price = threshold_price
+                    self.uptrend_threshold_price_2 = threshold_price_2
+                    self._log(f"[임계값 갱신] 1차: ${self.fmt_price(threshold_price)}, 2차: ${self.fmt_price(threshold_price_2)}")
+                    # GUI에 임계값 가격 업데이트 알림 (차트에 표시)
+                    self.uptrend_threshold_updated.emit(threshold_price)
+                    self.uptrend_threshold_2_updated.emit(threshold_price_2)
+
+                # 임계값 계산 완료 - 플래그 리셋
+                self.hedge_filled_need_threshold_recalc = False
+                self.step_filled_need_threshold_recalc = False
+            else:
+                # base_price가 0이면 임계값 계산 불가 - 플래그 유지하여 다음 틱에서 재시도
+                self._log("[임계값] 기준가 없음 (0) - 플래그 유지, 다음 틱에서 재시도")
+
+    def _tick_final_step_guards(self, position_data, current_price):
+        """최종 단계 보호: 보호 주문 재시도 (2초 간격) + 메인/헷지 강제 청산 감지 (최종 단계가 아니면 건너뜀)"""
+        # 8. 최종 단계: 보호 주문 미완료 시 재시도 (2초 간격)
+        if self.current_step + 1 >= self.total_steps and not self.final_step_protection_placed:
+            if time.time() - self._last_final_step_protection_attempt >= 2:
+                self._last_final_step_protection_attempt = time.time()
+                self._place_final_step_protection()
+
+        # 9. 최종 단계: 메인 포지션 강제 청산 감지 → 헷지 트레일링 스탑
+        if self.current_step + 1 >= self.total_steps and not self.main_liquidation_handled:
+            self._check_main_liquidation_and_protect_hedge(position_data, current_price)
+
+        # 9.5. 최종 단계: 헷지 포지션 청산 감지 → 메인 트레일링 스탑
+        if self.current_step + 1 >= self.total_steps and not self.hedge_liquidation_handled:
+            self._check_hedge_liquidation_and_protect_main(position_data, current_price)
+
+    # ==================== 가격 레벨 트리거 ====================
+
+    @property
+    def hedge_trigger_prices(self):
+        """헷지 트리거 목록 [[가격, 수량, 실행여부], ...] (항목을 바꿀 때는 _update_hedge_trigger 사용)"""
+        return self._hedge_trigger_prices
+
+    @hedge_trigger_prices.setter
+    def hedge_trigger_prices(self, triggers):
+        self._hedge_trigger_prices = triggers
+        self._trigger_book_dirty = True
+
+    def _add_hedge_trigger(self, price, qty):
+        """헷지 트리거 1개 추가 (미발동)"""
+        self._hedge_trigger_prices.append([price, qty, False])
+        self._trigger_book_dirty = True
+
+    def _update_hedge_trigger(self, trigger, price=None, qty=None, executed=None):
+        """헷지 트리거 항목 변경 (가격 조정 / 수량 합산 / 발동 표시)"""
+        if price is not None:
+            trigger[0] = price
+        if qty is not None:
+            trigger[1] = qty
+        if executed is not None:
+            trigger[2] = executed
+        self._trigger_book_dirty = True
+
+    def _sync_trigger_book(self):
+        """
+        트리거 북을 현재 상태와 맞춤 (상태 키가 바뀌었거나 헷지 트리거가 바뀐 틱에서만 다시 등록)
 
-                    # next_step_order_id 초기화 (시장가 주문은 취소 불가하므로 즉시 제거)
-                    self.next_step_order_id = None
+        헷지 트리거 목록은 hedge_trigger_prices 대입(setter), _add_hedge_trigger, _update_hedge_trigger로만
+        바꾸며, 이 세 경로가 트리거 북 재등록 표시(_trigger_book_dirty)를 남깁니다.
+        """
+        state = (self.side_mode, self.next_step_orders_placed,
+                 self.uptrend_threshold_price_2, self.uptrend_entry_in_progress,
+                 self.hedge_frontload_reentry_pending, self.hedge_frontload_reentry_price)
+        if not self._trigger_book_dirty and state == self._trigger_book_state:
+            return
+        self._trigger_book_state = state
+        self._trigger_book_dirty = False
 
-                    # 역방향진입 플래그 설정 (체결 시 익절 트리거 설정용)
-                    self.is_uptrend_entry = True
+        book = self.trigger_book
+        book.clear()
+        # LONG: 헷지/재진입은 하방 돌파, 2차 임계값은 상방 돌파 (SHORT는 반대)
+        adverse = DOWN if self.side_mode == "LONG" else UP
+        favorable = UP if self.side_mode == "LONG" else DOWN
 
-                    # GUI에 주문 취소 및 시장가 진입 요청
-                    self.uptrend_entry_request.emit(order_id_to_cancel)
+        if self.next_step_orders_placed:
+            for trigger_index, trigger in enumerate(self.hedge_trigger_prices, 1):
+                if not trigger[2]:
+                    book.arm(('hedge', trigger_index), trigger[0], adverse,
+                             functools.partial(self._fire_hedge_trigger, trigger_index, trigger))
 
-                    # 임계값 체크 방지를 위해 임계값을 None으로 설정 (중복 진입 방지)
-                    self.uptrend_threshold_price = None
-                    self.uptrend_threshold_price_2 = None
+        if self.hedge_frontload_reentry_pending and self.hedge_frontload_reentry_price:
+            book.arm(('reentry',), self.hedge_frontload_reentry_price, adverse, self._fire_frontload_reentry)
 
-                    # 즉시 진입 요청 후 나머지 로직 스킵 (1차 임계값 체크 불필요)
-                    return
+        if self.uptrend_threshold_price_2 is not None and not self.uptrend_entry_in_progress:
+            book.arm(('threshold2',), self.uptrend_threshold_price_2, favorable, self._fire_uptrend_threshold_2)
 
-            # 상승 중 추가진입 조건 확인 (봉 마감 시에만 체크 - 1차 임계값)
-            # [수정] 익절 모니터링 중에도 추가 역방향진입 허용 (entry_price_at_step 체크 제거)
-            if candle_updated and not self.uptrend_entry_in_progress:
-                condition_result = self._check_uptrend_entry_condition(position_data)
-                self._log(f"[DEBUG {self._el}] 봉마감 체크 - 결과: {condition_result}, entry_price_at_step: {self.entry_price_at_step}")
+    def _fire_hedge_trigger(self, trigger_index, trigger, current_price):
+        """헷지 트리거 가격 돌파 -> 시장가 헷지 주문"""
+        trigger_price, qty, executed = trigger
+        if executed:
+            return  # 다른 경로에서 이미 처리됨 (NSO 체결 동기화, 미발동 합산)
+        hedge_side = "SELL" if self.side_mode == "LONG" else "BUY"
 
-                if condition_result:
-                    self._log(f"[{self._el}] 조건 만족! 시장가 즉시 진입")
+        self._log(f"[DCA 헷지] 가격 돌파 감지! 현재가: ${current_price}, 트리거: ${trigger_price}")
 
-                    # 중복 진입 방지 플래그 설정
-                    self.uptrend_entry_in_progress = True
+        # 최소 주문 금액 체크 (주문 전에 확인)
+        min_order_value = float(self.symbol_info.get('lotSizeFilter', {}).get('minNotionalValue', '5'))
+        order_value = qty * current_price
+        if order_value < min_order_value:
+            self._log(f"[DCA 헷지] 주문 금액(${order_value:.2f})이 최소 주문 금액(${min_order_value}) 미만으로 스킵")
+            # 실행 완료 표시 (재시도 방지)
+            self._update_hedge_trigger(trigger, executed=True)
+            self.remaining_hedge_qty -= qty
+            # GUI에 헷지 트리거 업데이트 알림
+            self.hedge_triggers_updated.emit(self.hedge_trigger_prices, self.side_mode, self.current_step)
+            return
 
-                    # ========== 헷지 청산을 역방향진입보다 먼저 실행 ==========
-                    self._reduce_hedge_on_uptrend_entry()
+        self._log(f"[DCA 헷지] {hedge_side} {qty} 시장가 주문 실행")
 
-                    # 지정가 주문이 있으면 취소 요청과 함께 전송 (order_id 포함)
-                    # 지정가 주문이 없으면 빈 문자열로 전송 (GUI에서 취소 스킵하고 바로 시장가 진입)
-                    order_id_to_cancel = self.next_step_order_id if self.next_step_order_id else ""
+        # 시장가 헷지 주문 실행 (트리거 가격과 수량 포함 - GUI가 주문 ID와 함께 워커로 돌려줌)
+        self.execute_trade_signal.emit(self.symbol, hedge_side, str(qty), True,
+                                       self.make_client_order_id(f"H{trigger_index}"), (trigger_price, qty))
 
-                    # next_step_order_id 초기화 (시장가 주문은 취소 불가하므로 즉시 제거)
-                    self.next_step_order_id = None
+        # 실행 완료 표시
+        self._update_hedge_trigger(trigger, executed=True)
+        self.remaining_hedge_qty -= qty
 
-                    # 역방향진입 플래그 설정 (체결 시 익절 트리거 설정용)
-                    self.is_uptrend_entry = True
+        # GUI에 헷지 트리거 업데이트 알림 (마커 색상 변경을 위해)
+        self.hedge_triggers_updated.emit(self.hedge_trigger_prices, self.side_mode, self.current_step)
 
-                    # GUI에 주문 취소 및 시장가 진입 요청
-                    self.uptrend_entry_request.emit(order_id_to_cancel)
+        # 실시간 상태 저장 (헷지 트리거 발동 시)
+        self._log(f"[DCA 상태] 헷지 트리거 ${trigger_price} 발동 후 상태 저장 요청")
+        self._save_state(EVENT_HEDGE_FIRED, trigger=trigger_index, price=trigger_price)
+
+    def _fire_frontload_reentry(self, current_price):
+        """헷지 프론트로드: 최종단계 재진입 (익절 후 H4 가격 도달)"""
+        hedge_side = "SELL" if self.side_mode == "LONG" else "BUY"
+        reentry_qty = self.hedge_frontload_reentry_qty
+        self._log(f"[헷지 프론트로드] 재진입 가격 도달! 현재가: ${self.fmt_price(current_price)}, H4: ${self.fmt_price(self.hedge_frontload_reentry_price)}")
+        self._log(f"[헷지 프론트로드] 재진입 시장가 주문: {hedge_side} {reentry_qty}")
+        self.execute_trade_signal.emit(self.symbol, hedge_side, str(reentry_qty), True,
+                                       self.make_client_order_id("HR"), None)
+        self.hedge_frontload_reentry_pending = False
+        self.hedge_frontload_reentry_price = None
+        self.hedge_frontload_reentry_qty = 0
+        self.hedge_protocol_exited_qty = 0
+
+    def _fire_uptrend_threshold_2(self, current_price):
+        """2차 임계값 돌파 -> 캔들 패턴 무시하고 역방향 즉시 진입"""
+        if self.uptrend_entry_in_progress:
+            return
+        self._log(f"[{self._el} 2차 임계값] 돌파 감지! 현재가 ${self.fmt_price(current_price)}, 2차 임계값 ${self.fmt_price(self.uptrend_threshold_price_2)}")
+        self._log(f"[{self._el} 2차 임계값] 캔들 패턴 무시하고 즉시 진입")
 
-            # 7. 익절 트리거 모니터링 (상향 돌파 후 하향 돌파 감지)
-            # entry_price_at_step이 설정되어 있으면 익절 모니터링 시작 (첫 계산 포함)
-            if self.entry_price_at_step is not None and has_main_position:
-                self._monitor_profit_target(current_price, position_data)
+        # 중복 진입 방지 플래그 설정
+        self.uptrend_entry_in_progress = True
 
-            # 7.5. 헷지 긴급 탈출 라인 제거됨 (항상 안전망 주문 사용)
+        # ========== 헷지 청산을 역방향진입보다 먼저 실행 ==========
+        self._reduce_hedge_on_uptrend_entry()
 
-            # 8. 최종 단계: 보호 주문 미완료 시 재시도 (2초 간격)
-            if self.current_step + 1 >= self.total_steps and not self.final_step_protection_placed:
-                if time.time() - self._last_final_step_protection_attempt >= 2:
-                    self._last_final_step_protection_attempt = time.time()
-                    self._place_final_step_protection()
+        # 지정가 주문이 있으면 취소 요청과 함께 전송
+        order_id_to_cancel = self.next_step_order_id if self.next_step_order_id else ""
 
-            # 9. 최종 단계: 메인 포지션 강제 청산 감지 → 헷지 트레일링 스탑
-            if self.current_step + 1 >= self.total_steps and not self.main_liquidation_handled:
-                self._check_main_liquidation_and_protect_hedge(position_data, current_price)
+        # next_step_order_id 초기화 (시장가 주문은 취소 불가하므로 즉시 제거)
+        self.next_step_order_id = None
 
-            # 9.5. 최종 단계: 헷지 포지션 청산 감지 → 메인 트레일링 스탑
-            if self.current_step + 1 >= self.total_steps and not self.hedge_liquidation_handled:
-                self._check_hedge_liquidation_and_protect_main(position_data, current_price)
+        # 역방향진입 플래그 설정 (체결 시 익절 트리거 설정용)
+        self.is_uptrend_entry = True
 
-            # 10. 최종 단계 포지션 청산 모니터링
-            if self.monitoring_final_step_closure:
-                self._monitor_final_step_position_closure(position_data)
+        # GUI에 주문 취소 및 시장가 진입 요청
+        self.uptrend_entry_request.emit(order_id_to_cancel)
 
-        except Exception as e:
-            self._log(f"AutoTradeWorker: process_tick 오류: {e}")
-            import traceback
-            traceback.print_exc()
+        # 임계값 체크 방지를 위해 임계값을 None으로 설정 (중복 진입 방지)
+        self.uptrend_threshold_price = None
+        self.uptrend_threshold_price_2 = None
 
     def calculate_break_even(self, position_data):
         """
@@ -1354,15 +1553,18 @@ class AutoTradeWorker(QObject):
         min_order_qty = float(self.symbol_info.get('lotSizeFilter', {}).get('minOrderQty', '0.01'))
         min_order_value = float(self.symbol_info.get('lotSizeFilter', {}).get('minNotionalValue', '5'))
 
+        # 주거래 + 헷지 진입을 한 번의 일괄 주문으로 전송
+        batch_orders = []
+
         if self.side_mode == "LONG":
             self._log(f"[DCA Step {self.current_step+1}] LONG 진입 (주거래 Qty: {self.entry_quantity})")
-            self.execute_trade_signal.emit(self.symbol, "BUY", str(self.entry_quantity), False)
+            batch_orders.append(self._market_order_item("BUY", self.entry_quantity, False, "E"))
 
             # 헷지 주문: 최소 수량 AND 최소 금액 체크
             hedge_value = self.hedge_quantity * self.current_price if self.current_price else 0
             if self.hedge_quantity >= min_order_qty and (hedge_value >= min_order_value or self.current_price == 0):
                 self._log(f"[DCA Step {self.current_step+1}] 헷지 SHORT 진입 (헷지 Qty: {self.hedge_quantity:.4f}, 금액: ${hedge_value:.2f})")
-                self.execute_trade_signal.emit(self.symbol, "SELL", str(self.hedge_quantity), True)
+                batch_orders.append(self._market_order_item("SELL", self.hedge_quantity, True, "EH"))
             else:
                 if self.hedge_quantity > 0:
                     if self.hedge_quantity < min_order_qty:
@@ -1372,13 +1574,13 @@ class AutoTradeWorker(QObject):
 
         elif self.side_mode == "SHORT":
             self._log(f"[DCA Step {self.current_step+1}] SHORT 진입 (주거래 Qty: {self.entry_quantity})")
-            self.execute_trade_signal.emit(self.symbol, "SELL", str(self.entry_quantity), False)
+            batch_orders.append(self._market_order_item("SELL", self.entry_quantity, False, "E"))
 
             # 헷지 주문: 최소 수량 AND 최소 금액 체크
             hedge_value = self.hedge_quantity * self.current_price if self.current_price else 0
             if self.hedge_quantity >= min_order_qty and (hedge_value >= min_order_value or self.current_price == 0):
                 self._log(f"[DCA Step {self.current_step+1}] 헷지 LONG 진입 (헷지 Qty: {self.hedge_quantity:.4f}, 금액: ${hedge_value:.2f})")
-                self.execute_trade_signal.emit(self.symbol, "BUY", str(self.hedge_quantity), True)
+                batch_orders.append(self._market_order_item("BUY", self.hedge_quantity, True, "EH"))
             else:
                 if self.hedge_quantity > 0:
                     if self.hedge_quantity < min_order_qty:
@@ -1386,8 +1588,64 @@ class AutoTradeWorker(QObject):
                     elif hedge_value < min_order_value:
                         self._log(f"[DCA Step {self.current_step+1}] 헷지 금액(${hedge_value:.2f})이 최소 주문 금액(${min_order_value}) 미만이므로 헷지 주문 건너뜀")
 
+        if batch_orders:
+            self.execute_batch_orders_signal.emit(batch_orders)
+
         self.last_trade_time = time.time() - 20  # 중복 실행 방지
 
+    def _market_order_item(self, side, quantity, is_hedge, leg):
+        """일괄 주문 시그널용 시장가 주문 항목 생성 (leg: 클라이언트 주문 ID 구분자)"""
+        return {
+            'symbol': self.symbol,
+            'side': side,
+            'quantity': str(quantity),
+            'order_type': 'MARKET',
+            'price': None,
+            'is_hedge': is_hedge,
+            'client_order_id': self.make_client_order_id(leg),
+        }
+
+    @staticmethod
+    def _new_cycle_id():
+        """사이클 ID (시작 시각의 36진수, 6~7자)"""
+        n = int(time.time())
+        digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+        out = ""
+        while n:
+            n, r = divmod(n, 36)
+            out = digits[r] + out
+        return out or "0"
+
+    def make_client_order_id(self, leg):
+        """
+        결정적 클라이언트 주문 ID 생성 (Binance newClientOrderId / Bybit orderLinkId)
+
+        형식: tm{L|S}{사이클}-{스텝}-{레그}-{순번} (최대 36자, 영숫자/하이픈)
+        같은 사이클/스텝/레그의 n번째 주문은 항상 같은 ID가 되므로,
+        전송 결과가 불확실한 주문을 재전송해도 거래소가 중복으로 거부하고
+        API 모듈이 기존 주문을 찾아 반환합니다 (이중 체결 방지).
+        순번은 DCA 상태와 함께 저장/복원되므로 (client_order_seq_state) 재시작 후 새 주문이
+        이미 쓴 ID를 다시 받지 않습니다.
+        """
+        key = (self.current_step, leg)
+        seq = self._client_order_seq.get(key, 0)
+        self._client_order_seq[key] = seq + 1
+        side_char = "L" if self.assigned_side == 'long' else "S"
+        return f"tm{side_char}{self.cycle_id or '0'}-{self.current_step}-{leg}-{seq}"[:36]
+
+    def client_order_seq_state(self):
+        """클라이언트 주문 ID 순번 저장용 dict ({"스텝:레그": 다음 순번}, JSON 호환)"""
+        return {f"{step}:{leg}": seq for (step, leg), seq in self._client_order_seq.items()}
+
+    def restore_client_order_seq(self, state):
+        """저장된 클라이언트 주문 ID 순번 복원 (client_order_seq_state 형식, 잘못된 항목은 무시)"""
+        for key, seq in (state or {}).items():
+            step, _, leg = str(key).partition(':')
+            try:
+                self._client_order_seq[(int(step), leg)] = int(seq)
+            except (TypeError, ValueError):
+                continue
+
     def _place_next_step_orders(self, position_data):
         """다음 단계 지정가 주문 생성 (Step 1)"""
         try:
@@ -1443,9 +1701,9 @@ class AutoTradeWorker(QObject):
             next_entry_price = trading_utils.calculate_next_step_entry_price(base_price_for_calculation, liq_price, interval_percent)
 
             # 5. 가격 정밀도 조정
-            tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-            price_precision = trading_utils.count_decimal_places(tick_size)
-            next_entry_price_adjusted = trading_utils.adjust_price(next_entry_price, tick_size, price_precision)
+            quantizer = self.quantizer
+            tick_size = quantizer.tick_size
+            next_entry_price_adjusted = quantizer.floor_price(next_entry_price)
 
             # 6. 청산가 안전장치 (다음 진입가가 청산가에 너무 가깝지 않도록)
             # 안전 마진: 청산가로부터 최소 N% 이상 떨어져야 함 (Settings에서 설정 가능)
@@ -1454,7 +1712,7 @@ class AutoTradeWorker(QObject):
             if self.side_mode == "LONG":
                 # LONG: 진입가가 청산가보다 낮으면 안됨 (청산가 + 0.5% 이상)
                 safe_price_min = liq_price * (1 + safety_margin_percent / 100)
-                safe_price = trading_utils.adjust_price(safe_price_min, tick_size, price_precision)
+                safe_price = quantizer.floor_price(safe_price_min)
 
                 if next_entry_price_adjusted < safe_price:
                     self._log(f"[DCA 안전장치] 진입가 ${self.fmt_price(next_entry_price_adjusted)}가 청산가 ${self.fmt_price(liq_price)}에 너무 가까움!")
@@ -1464,7 +1722,7 @@ class AutoTradeWorker(QObject):
             else:  # SHORT
                 # SHORT: 진입가가 청산가보다 높으면 안됨 (청산가 - 0.5% 이하)
                 safe_price_max = liq_price * (1 - safety_margin_percent / 100)
-                safe_price = trading_utils.adjust_price(safe_price_max, tick_size, price_precision)
+                safe_price = quantizer.floor_price(safe_price_max)
 
                 if next_entry_price_adjusted > safe_price:
                     self._log(f"[DCA 안전장치] 진입가 ${self.fmt_price(next_entry_price_adjusted)}가 청산가 ${self.fmt_price(liq_price)}에 너무 가까움!")
@@ -1501,9 +1759,11 @@ class AutoTradeWorker(QObject):
                     hedge_orders[3] = (h4_price, h4_qty_with_reentry)
                     self._log(f"[헷지 프로토콜] H4 수량 조정: {h4_qty:.4f} → {h4_qty_with_reentry:.4f} (재진입 +{self.hedge_protocol_exited_qty:.4f})")
 
-                qty_step = float(self.symbol_info.get('lotSizeFilter', {}).get('qtyStep', '0.01'))
-                qty_precision = trading_utils.count_decimal_places(qty_step)
-                min_order_qty = float(self.symbol_info.get('lotSizeFilter', {}).get('minOrderQty', '0.01'))
+                min_order_qty = quantizer.min_qty
+
+                # 헷지 트리거 가격/수량 일괄 양자화
+                adj_prices = quantizer.quantize_prices([price for price, _ in hedge_orders])
+                adj_qtys = quantizer.quantize_qtys([qty for _, qty in hedge_orders])
 
                 # 헷지 트리거 가격 목록 초기화
                 self.hedge_trigger_prices = []
@@ -1512,11 +1772,11 @@ class AutoTradeWorker(QObject):
                 m_orders_data = []
 
                 # 헷지 트리거 생성
-                for i, (price, qty) in enumerate(hedge_orders):
-                    # 가격 및 수량 조정
+                for i in range(len(hedge_orders)):
+                    # 가격 및 수량 조정 (위에서 일괄 양자화)
                     # 참고: 헷지 트리거는 base_price_for_calculation과 next_entry_price_adjusted 사이를 4등분
                     # next_entry_price_adjusted가 이미 청산가 안전장치를 통과했으므로 헷지 트리거도 자동으로 안전함
-                    adj_price = trading_utils.adjust_price(price, tick_size, price_precision)
+                    adj_price = adj_prices[i]
 
                     # 마지막 헷지는 다음 스텝 진입가보다 1틱 아래로 설정
                     # (다음 스텝 메인 주문이 체결된 후에만 마지막 헷지가 실행되도록)
@@ -1528,10 +1788,10 @@ class AutoTradeWorker(QObject):
                         else:
                             # SHORT: 진입가보다 1틱 위
                             adj_price = next_entry_price_adjusted + tick_size
-                        adj_price = trading_utils.adjust_price(adj_price, tick_size, price_precision)
+                        adj_price = quantizer.floor_price(adj_price)
                         self._log(f"[DCA] 마지막 헷지 트리거 가격 조정: 다음 스텝 진입가 ± 1틱 = ${self.fmt_price(adj_price)}")
 
-                    adj_qty = trading_utils.adjust_quantity(qty, qty_step, qty_precision, min_order_qty)
+                    adj_qty = adj_qtys[i]
 
                     # 최소 주문 수량 체크 (수량 미달은 트리거 생성 자체를 스킵)
                     if adj_qty < min_order_qty:
@@ -1540,18 +1800,19 @@ class AutoTradeWorker(QObject):
 
                     # (가격, 수량, 실행여부) 튜플로 저장
                     # 주문 금액 체크는 실행 시점에서 수행 (가격 변동 고려)
-                    self.hedge_trigger_prices.append([adj_price, adj_qty, False])
+                    self._add_hedge_trigger(adj_price, adj_qty)
                     self._log(f"[DCA] 헷지 트리거 {i+1}/4 설정: ${self.fmt_price(adj_price)} (수량: {adj_qty})")
 
                 # NSO(Next Step Order): 다음 단계 메인 진입 지정가 주문
-                nso_qty = trading_utils.adjust_quantity(next_entry_qty, qty_step, qty_precision, min_order_qty)
+                nso_qty = quantizer.adjust_qty(next_entry_qty)
 
                 if nso_qty >= min_order_qty:
                     self._log(f"[DCA] NSO 메인 진입 주문 (다음 Step 주문): {nso_qty} @ ${next_entry_price_adjusted}")
                     # 시그널 emit 전에 플래그 설정 (on_order_id_received 콜백이 ID를 수락하도록)
                     self.next_step_orders_placed = True
                     self.execute_limit_order_signal.emit(
-                        self.symbol, side, str(nso_qty), str(next_entry_price_adjusted), False
+                        self.symbol, side, str(nso_qty), str(next_entry_price_adjusted), False,
+                        self.make_client_order_id("N")
                     )
                     # NSO 주문 ID는 on_order_id_received() 콜백에서 self.next_step_order_id에 저장됨
                     m_orders_data.append({
@@ -1596,7 +1857,8 @@ class AutoTradeWorker(QObject):
         try:
             self._log(f"[DCA 슬리피지] 주문 조정 시작: 슬리피지=${self.fmt_price(slippage)}")
 
-            tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
+            quantizer = self.quantizer
+            tick_size = quantizer.tick_size
 
             # 1. NSO 안전 마진을 고려한 조정 슬리피지 계산 (H 트리거에도 동일 적용)
             adjusted_slippage = slippage
@@ -1610,7 +1872,7 @@ class AutoTradeWorker(QObject):
                     new_order_price = current_order_price + slippage
 
                     if self.side_mode == "LONG":
-                        safe_price = main_liq_price + tick_size
+                        safe_price = quantizer.round_price(main_liq_price + tick_size)
                         if new_order_price < safe_price:
                             self._log(f"[DCA 슬리피지] ⚠️ 청산가 충돌 감지!")
                             self._log(f"[DCA 슬리피지]   슬리피지 적용 가격: ${self.fmt_price(new_order_price)}")
@@ -1624,7 +1886,7 @@ class AutoTradeWorker(QObject):
                                 adjusted_slippage = safe_price - current_order_price
                                 self._log(f"[DCA 슬리피지]   안전 가격으로 조정: 슬리피지 ${self.fmt_price(slippage)} → ${self.fmt_price(adjusted_slippage)}")
                     else:  # SHORT
-                        safe_price = main_liq_price - tick_size
+                        safe_price = quantizer.round_price(main_liq_price - tick_size)
                         if new_order_price > safe_price:
                             self._log(f"[DCA 슬리피지] ⚠️ 청산가 충돌 감지!")
                             self._log(f"[DCA 슬리피지]   슬리피지 적용 가격: ${self.fmt_price(new_order_price)}")
@@ -1650,8 +1912,8 @@ class AutoTradeWorker(QObject):
             for trigger in self.hedge_trigger_prices:
                 trigger_price, qty, executed = trigger
                 if not executed:
-                    new_price = trigger_price + adjusted_slippage
-                    trigger[0] = new_price
+                    new_price = quantizer.round_price(trigger_price + adjusted_slippage)
+                    self._update_hedge_trigger(trigger, price=new_price)
                     adjusted_count += 1
                     self._log(f"[DCA 슬리피지] 헷지 트리거 조정: ${self.fmt_price(trigger_price)} → ${self.fmt_price(new_price)}")
 
@@ -1663,7 +1925,7 @@ class AutoTradeWorker(QObject):
                 self.adjust_next_step_order_signal.emit(self.next_step_order_id, adjusted_slippage)
 
                 # last_step_entry_price 업데이트 (다음 슬리피지 계산 시 누적 적용 방지)
-                self.last_step_entry_price += adjusted_slippage
+                self.last_step_entry_price = quantizer.round_price(self.last_step_entry_price + adjusted_slippage)
                 self._log(f"[DCA 슬리피지] 마지막 진입 주문 가격 업데이트: ${self.fmt_price(self.last_step_entry_price)}")
 
                 # NSO 차트 마커 업데이트
@@ -1674,7 +1936,7 @@ class AutoTradeWorker(QObject):
 
             # 실시간 상태 저장
             self._log(f"[DCA 상태] 슬리피지 조정 후 상태 저장 요청")
-            self.request_save_state.emit()
+            self._save_state(EVENT_SLIPPAGE_ADJUSTED)
 
             self._log(f"[DCA 슬리피지] 주문 조정 완료: {adjusted_count}개 헷지 트리거 + NSO 동기화 조정됨")
 
@@ -1683,48 +1945,86 @@ class AutoTradeWorker(QObject):
             import traceback
             traceback.print_exc()
 
+    def _check_book_liquidity(self, order_side, quantity, reference_price, tag):
+        """
+        시장가 주문 전 호가창 기준 체결가/슬리피지 추정 및 기록
+
+        Returns:
+            dict 또는 None: LocalOrderBook.estimate_fill 결과 (호가창 없음/동기화 전이면 None)
+        """
+        book = self.order_book
+        if book is None or book.symbol != self.symbol:
+            return None
+        fill = book.estimate_fill(order_side, quantity)
+        if fill is None:
+            return None
+        reference_price = reference_price or book.mid_price()
+        slippage = book.slippage_percent(order_side, quantity, reference_price)
+        self._log(f"[{tag}] 호가창 추정: {order_side} {quantity} → 평균 ${self.fmt_price(fill['avg_price'])}, "
+                  f"최악 ${self.fmt_price(fill['worst_price'])}, {fill['levels']}레벨"
+                  + (f", 슬리피지 {slippage:.3f}%" if slippage is not None else "")
+                  + ("" if fill['complete'] else f" (호가 부족: {fill['filled_qty']}만 체결 가능)"))
+        fill['slippage_percent'] = slippage
+        return fill
+
+    def _size_market_exit(self, order_side, quantity, reference_price, tag):
+        """
+        시장가 청산 수량을 실제 유동성에 맞게 조정 (MARKET_EXIT_MAX_SLIPPAGE_PERCENT 초과분 제외)
+
+        Returns:
+            (수량, 추정 체결 정보 또는 None)
+        """
+        fill = self._check_book_liquidity(order_side, quantity, reference_price, tag)
+        if fill is None or not self.market_exit_max_slippage:
+            return quantity, fill
+        slippage = fill.get('slippage_percent')
+        if slippage is None or slippage <= self.market_exit_max_slippage:
+            return quantity, fill
+
+        max_qty = self.order_book.max_qty_within_slippage(order_side, self.market_exit_max_slippage, reference_price)
+        sized = self.quantizer.adjust_qty(min(quantity, max_qty or 0))
+        if sized < self.quantizer.min_qty:
+            self._log(f"[{tag}] 허용 슬리피지 {self.market_exit_max_slippage}% 이내 유동성 부족 - 원래 수량 유지")
+            return quantity, fill
+        self._log(f"[{tag}] 허용 슬리피지 {self.market_exit_max_slippage}% 초과 → 수량 조정 {quantity} → {sized}")
+        return sized, self._check_book_liquidity(order_side, sized, reference_price, tag)
+
+    def _position_snapshot(self, position_side, need_liq=False):
+        """포지션 저장소에서 현재 심볼 포지션 조회 (오래됐거나 마지막 체결 미반영이면 REST 동기화 후 다시 조회)
+
+        Returns:
+            PositionSnapshot 또는 None (REST 동기화도 실패)
+        """
+        store = get_position_store(self.api_module)
+        snap = store.get(self.symbol, position_side, need_liq=need_liq, since_ms=self._last_fill_event_ms)
+        if snap is None:
+            self._log(f"[포지션 저장소] {self.symbol} {position_side} 값이 오래됨 - REST 동기화")
+            store.reconcile(self.api_module)
+            snap = store.get(self.symbol, position_side, need_liq=need_liq)
+        return snap
+
     def _get_liquidation_price(self):
-        """API를 통해 청산가 조회"""
+        """메인 포지션 청산가 조회 (포지션 저장소, 오래된 값이면 REST)"""
         try:
             if not self.api_module:
                 self._log("[DCA] API 모듈이 없습니다.")
                 return 0
 
-            # Bybit API로 포지션 정보 조회
-            positions = self.api_module.get_initial_positions()
-
-            self._log(f"[DCA] 포지션 정보 조회 결과: {positions}")
-
-            if not positions:
-                self._log("[DCA] 포지션 정보가 비어있습니다.")
+            snap = self._position_snapshot(self.side_mode, need_liq=True)
+            if snap is None or snap.amount == 0:
+                self._log(f"[DCA] 일치하는 포지션을 찾지 못했습니다. (symbol={self.symbol}, side_mode={self.side_mode})")
                 return 0
 
-            for pos in positions:
-                symbol = pos.get('symbol')
-                pos_side = pos.get('positionSide', 'BOTH')
-
-                self._log(f"[DCA] 포지션 확인 중: symbol={symbol}, side={pos_side}, 찾는 심볼={self.symbol}, 찾는 사이드={self.side_mode}")
-
-                # 현재 심볼 및 사이드 매칭
-                if symbol == self.symbol:
-                    if (self.side_mode == "LONG" and pos_side == "LONG") or \
-                       (self.side_mode == "SHORT" and pos_side == "SHORT"):
-                        liq_price_str = pos.get('liqPrice', '0')
-                        liq_price = float(liq_price_str) if liq_price_str else 0
-
-                        # Bybit API에서 청산가를 못 가져온 경우 (빈 문자열 또는 0)
-                        if liq_price == 0:
-                            self._log(f"[DCA 오류] API에서 청산가를 조회할 수 없습니다.")
-                            self._log(f"[DCA 오류] 격리 마진(Isolated Margin) 모드로 설정되어 있는지 확인하세요.")
-                            self._log(f"[DCA 오류] Bybit 웹 거래소 → 설정 → Margin Mode → Isolated Margin 선택")
-                            self._log(f"[DCA 오류] 또는 자동매매를 중지하고 재시작하여 마진 모드를 다시 설정하세요.")
-                            return 0
+            # 거래소에서 청산가를 못 가져온 경우 (빈 문자열 또는 0)
+            if snap.liq_price == 0:
+                self._log(f"[DCA 오류] API에서 청산가를 조회할 수 없습니다.")
+                self._log(f"[DCA 오류] 격리 마진(Isolated Margin) 모드로 설정되어 있는지 확인하세요.")
+                self._log(f"[DCA 오류] Bybit 웹 거래소 → 설정 → Margin Mode → Isolated Margin 선택")
+                self._log(f"[DCA 오류] 또는 자동매매를 중지하고 재시작하여 마진 모드를 다시 설정하세요.")
+                return 0
 
-                        self._log(f"[DCA] 청산가 반환: {liq_price}")
-                        return liq_price
-
-            self._log(f"[DCA] 일치하는 포지션을 찾지 못했습니다. (symbol={self.symbol}, side_mode={self.side_mode})")
-            return 0
+            self._log(f"[DCA] 청산가 반환: {snap.liq_price} ({snap.source}, {snap.age():.1f}초 전 확인)")
+            return snap.liq_price
 
         except Exception as e:
             self._log(f"[DCA] 청산가 조회 오류: {e}")
@@ -1733,36 +2033,18 @@ class AutoTradeWorker(QObject):
             return 0
 
     def _get_hedge_liquidation_price(self):
-        """헷지 포지션의 청산가 조회"""
+        """헷지 포지션의 청산가 조회 (포지션 저장소, 오래된 값이면 REST)"""
         try:
             if not self.api_module:
                 self._log("[헷지 보호] API 모듈이 없습니다.")
                 return 0
 
-            # Bybit API로 포지션 정보 조회
-            positions = self.api_module.get_initial_positions()
-
-            if not positions:
-                return 0
-
             # 헷지 포지션의 사이드 결정 (메인 포지션의 반대)
             hedge_side = "SHORT" if self.side_mode == "LONG" else "LONG"
-
-            for pos in positions:
-                symbol = pos.get('symbol')
-                pos_side = pos.get('positionSide', 'BOTH')
-
-                # 헷지 심볼 및 사이드 매칭
-                if symbol == self.symbol and pos_side == hedge_side:
-                    liq_price_str = pos.get('liqPrice', '0')
-                    liq_price = float(liq_price_str) if liq_price_str else 0
-
-                    if liq_price == 0:
-                        return 0
-
-                    return liq_price
-
-            return 0
+            snap = self._position_snapshot(hedge_side, need_liq=True)
+            if snap is None or snap.amount == 0:
+                return 0
+            return snap.liq_price
 
         except Exception as e:
             self._log(f"[헷지 보호] 헷지 청산가 조회 오류: {e}")
@@ -1918,7 +2200,9 @@ class AutoTradeWorker(QObject):
             # 1. 헷지 포지션 전체 청산
             hedge_close_side = "BUY" if self.side_mode == "LONG" else "SELL"
             self._log(f"[헷지 보호] [1/3] 헷지 전체 청산: {hedge_close_side} {hedge_qty}")
-            self.execute_trade_signal.emit(self.symbol, hedge_close_side, str(hedge_qty), True)
+            self._check_book_liquidity(hedge_close_side, float(hedge_qty), current_price, "헷지 보호")
+            self.execute_trade_signal.emit(self.symbol, hedge_close_side, str(hedge_qty), True,
+                                           self.make_client_order_id("PX"), None)
 
             # 2. 메인 포지션 수량 확인
             pos_key_main = f"{self.symbol}_{self.side_mode}"
@@ -1999,7 +2283,7 @@ class AutoTradeWorker(QObject):
             hedge_close_side = "BUY" if self.side_mode == "LONG" else "SELL"
 
             self._log(f"[헷지 보호 1단계] [1/2] 헷지 1/3 청산: {hedge_close_side} {hedge_reduce_qty} (원본: {hedge_qty})")
-            self.execute_trade_signal.emit(self.symbol, hedge_close_side, str(hedge_reduce_qty), True)
+            batch_orders = [self._market_order_item(hedge_close_side, hedge_reduce_qty, True, "P1H")]
 
             # 2. 메인 포지션 1/3 시장가 청산
             pos_key_main = f"{self.symbol}_{self.side_mode}"
@@ -2020,10 +2304,13 @@ class AutoTradeWorker(QObject):
                 self._log(f"[헷지 보호 1단계] [2/2] 메인 1/3 시장가 청산: {main_close_side} {main_reduce_qty} (원본: {main_qty})")
 
                 # 시장가 청산 실행
-                self.execute_trade_signal.emit(self.symbol, main_close_side, str(main_reduce_qty), True)
+                batch_orders.append(self._market_order_item(main_close_side, main_reduce_qty, True, "P1M"))
             else:
                 self._log(f"[헷지 보호 1단계] [2/2] 메인 포지션 없음 - 청산 생략")
 
+            # 헷지/메인 청산 일괄 전송
+            self.execute_batch_orders_signal.emit(batch_orders)
+
             # GUI 알림
             self.hedge_liquidation_warning.emit(0, current_price, "STAGE1_EXECUTED")
 
@@ -2066,7 +2353,7 @@ class AutoTradeWorker(QObject):
             hedge_close_side = "BUY" if self.side_mode == "LONG" else "SELL"
 
             self._log(f"[헷지 보호 2단계] [1/2] 헷지 추가 1/3 청산 (누적 2/3): {hedge_close_side} {hedge_reduce_qty} (현재: {hedge_qty})")
-            self.execute_trade_signal.emit(self.symbol, hedge_close_side, str(hedge_reduce_qty), True)
+            batch_orders = [self._market_order_item(hedge_close_side, hedge_reduce_qty, True, "P2H")]
 
             # 2. 메인 포지션 추가 1/3 시장가 청산
             pos_key_main = f"{self.symbol}_{self.side_mode}"
@@ -2088,10 +2375,13 @@ class AutoTradeWorker(QObject):
                 self._log(f"[헷지 보호 2단계] [2/2] 메인 추가 1/3 시장가 청산 (누적 2/3): {main_close_side} {main_reduce_qty} (현재: {main_qty})")
 
                 # 시장가 청산 실행
-                self.execute_trade_signal.emit(self.symbol, main_close_side, str(main_reduce_qty), True)
+                batch_orders.append(self._market_order_item(main_close_side, main_reduce_qty, True, "P2M"))
             else:
                 self._log(f"[헷지 보호 2단계] [2/2] 메인 포지션 없음 - 청산 생략")
 
+            # 헷지/메인 청산 일괄 전송
+            self.execute_batch_orders_signal.emit(batch_orders)
+
             # GUI 알림
             self.hedge_liquidation_warning.emit(0, current_price, "STAGE2_EXECUTED")
 
@@ -2123,7 +2413,7 @@ class AutoTradeWorker(QObject):
             # 1. 남은 헷지 전체 청산
             hedge_close_side = "BUY" if self.side_mode == "LONG" else "SELL"
             self._log(f"[헷지 보호 3단계] [1/3] 남은 헷지 전체 청산: {hedge_close_side} {hedge_qty}")
-            self.execute_trade_signal.emit(self.symbol, hedge_close_side, str(hedge_qty), True)
+            batch_orders = [self._market_order_item(hedge_close_side, hedge_qty, True, "P3H")]
 
             # 2. 메인 포지션 나머지 전체 시장가 청산
             pos_key_main = f"{self.symbol}_{self.side_mode}"
@@ -2137,10 +2427,13 @@ class AutoTradeWorker(QObject):
                 self._log(f"[헷지 보호 3단계] [2/3] 메인 나머지 전체 시장가 청산: {main_close_side} {main_qty}")
 
                 # 시장가 청산 실행
-                self.execute_trade_signal.emit(self.symbol, main_close_side, str(main_qty), True)
+                batch_orders.append(self._market_order_item(main_close_side, main_qty, True, "P3M"))
             else:
                 self._log(f"[헷지 보호 3단계] [2/3] 메인 포지션 없음 - 청산 생략")
 
+            # 헷지/메인 청산 일괄 전송
+            self.execute_batch_orders_signal.emit(batch_orders)
+
             # 3. DCA 중단
             self._log(f"[헷지 보호 3단계] [3/3] DCA 자동매매 중단")
             self.is_running = False
@@ -2419,7 +2712,7 @@ class AutoTradeWorker(QObject):
             self._log("[익절] GUI에 전체 청산 및 자동매매 재시작 요청 전송")
 
             # 3. 상태 저장 (초기화된 상태로 저장 → 삭제 목적)
-            self.request_save_state.emit()
+            self._save_state(EVENT_PROFIT_TAKEN)
 
         except Exception as e:
             self._log(f"[익절] 청산 및 재시작 오류: {e}")
@@ -2439,19 +2732,9 @@ class AutoTradeWorker(QObject):
                 self._log("[최종단계] 청산가를 가져올 수 없습니다. 재시도 필요.")
                 return
 
-            # 2. 평균 진입가 조회 (API 사용)
-            positions = self.api_module.get_initial_positions()
-            avg_entry_price = 0
-
-            for pos in positions:
-                symbol = pos.get('symbol')
-                pos_side = pos.get('positionSide', 'BOTH')
-
-                if symbol == self.symbol:
-                    if (self.side_mode == "LONG" and pos_side == "LONG") or \
-                       (self.side_mode == "SHORT" and pos_side == "SHORT"):
-                        avg_entry_price = float(pos.get('entryPrice', '0'))
-                        break
+            # 2. 평균 진입가 조회 (포지션 저장소 - 청산가 조회에서 이미 동기화됨)
+            snap = self._position_snapshot(self.side_mode)
+            avg_entry_price = snap.entry_price if snap else 0
 
             if avg_entry_price == 0:
                 self._log("[최종단계] 평균 진입가를 가져올 수 없습니다. 재시도 필요.")
@@ -2463,9 +2746,7 @@ class AutoTradeWorker(QObject):
             stop_loss_price = avg_entry_price - (avg_entry_price - liq_price) * stop_loss_ratio
 
             # 가격 정밀도 조정
-            tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-            price_precision = trading_utils.count_decimal_places(tick_size)
-            stop_loss_price_adjusted = trading_utils.adjust_price(stop_loss_price, tick_size, price_precision)
+            stop_loss_price_adjusted = self.quantizer.floor_price(stop_loss_price)
 
             self._log(f"[최종단계] 평균진입가: ${self.fmt_price(avg_entry_price)}")
             self._log(f"[최종단계] 청산가: ${self.fmt_price(liq_price)}")
@@ -2510,7 +2791,7 @@ class AutoTradeWorker(QObject):
             self._log("[최종단계] 포지션 청산 모니터링 시작")
 
             # 9. 상태 저장
-            self.request_save_state.emit()
+            self._save_state(EVENT_FINAL_PROTECTION_PLACED)
 
         except Exception as e:
             self._log(f"[최종단계] 손실 방지 주문 오류: {e}")
@@ -2544,9 +2825,7 @@ class AutoTradeWorker(QObject):
                 trailing_callback_rate = str(self.strategy_settings.get("TRAILING_CALLBACK_RATE", 0.5))
 
                 # 활성화 가격 = 현재가
-                tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-                price_precision = trading_utils.count_decimal_places(tick_size)
-                activation_price = trading_utils.adjust_price(current_price, tick_size, price_precision)
+                activation_price = self.quantizer.floor_price(current_price)
 
                 self._log(f"[최종단계] 트레일링 스탑: {trailing_stop_side} {hedge_amt} @ Activation=${activation_price}, Callback={trailing_callback_rate}%")
 
@@ -2594,9 +2873,7 @@ class AutoTradeWorker(QObject):
                 trailing_callback_rate = str(self.strategy_settings.get("TRAILING_CALLBACK_RATE", 0.5))
 
                 # 활성화 가격 = 현재가
-                tick_size = float(self.symbol_info.get('priceFilter', {}).get('tickSize', '0.0001'))
-                price_precision = trading_utils.count_decimal_places(tick_size)
-                activation_price = trading_utils.adjust_price(current_price, tick_size, price_precision)
+                activation_price = self.quantizer.floor_price(current_price)
 
                 self._log(f"[최종단계] 트레일링 스탑: {trailing_stop_side} {main_amt} @ Activation=${activation_price}, Callback={trailing_callback_rate}%")
 
@@ -2671,7 +2948,7 @@ class AutoTradeWorker(QObject):
                 self._log("[최종단계] DCA 상태 초기화 완료")
 
                 # 상태 저장 (초기화된 상태로 저장 → 삭제 목적)
-                self.request_save_state.emit()
+                self._save_state(EVENT_CYCLE_CLOSED)
 
                 # 자동매매 재시작 요청 (GUI에 전달)
                 self.profit_taking_request.emit()
@@ -2708,10 +2985,8 @@ class AutoTradeWorker(QObject):
                 return
             
             # 수량 정밀도 및 최소 주문 수량/금액 조회
-            step_size = float(self.symbol_info.get('lotSizeFilter', {}).get('qtyStep', '1'))
             min_qty = float(self.symbol_info.get('lotSizeFilter', {}).get('minQty', '1'))
             min_notional = float(self.symbol_info.get('lotSizeFilter', {}).get('minNotionalValue', '5'))
-            qty_precision = trading_utils.count_decimal_places(step_size)
             
             # 현재가 확인
             current_price = self.current_price if self.current_price and self.current_price > 0 else 0
@@ -2720,9 +2995,8 @@ class AutoTradeWorker(QObject):
             min_qty_by_notional = 0
             if current_price > 0:
                 min_qty_by_notional = min_notional / current_price
-                # step_size에 맞게 올림 처리
-                min_qty_by_notional = float(int(min_qty_by_notional / step_size + 0.9999) * step_size)
-                min_qty_by_notional = round(min_qty_by_notional, qty_precision)
+                # qtyStep에 맞게 올림 처리
+                min_qty_by_notional = self.quantizer.ceil_qty(min_qty_by_notional)
             
             # 실제 적용할 최소 수량 (수량 기준과 금액 기준 중 큰 값)
             effective_min_qty = max(min_qty, min_qty_by_notional)
@@ -2746,8 +3020,7 @@ class AutoTradeWorker(QObject):
                 ratio_desc = f"1/{remaining_steps}"
             
             # 내림 처리 (안전하게)
-            reduce_qty = float(int(reduce_qty / step_size) * step_size)
-            reduce_qty = round(reduce_qty, qty_precision)
+            reduce_qty = self.quantizer.floor_qty(reduce_qty)
             
             # ========== 최소 주문 수량/금액 처리 ==========
             adjustment_reason = ""
@@ -2814,7 +3087,7 @@ class AutoTradeWorker(QObject):
             self._log(f"[{self._el} 헷지청산] {self._el} 카운트 업데이트: {self.uptrend_entry_count}")
             
             # 상태 저장 요청
-            self.request_save_state.emit()
+            self._save_state(EVENT_UPTREND_HEDGE_REDUCED)
             
         except Exception as e:
             self._log(f"[{self._el} 헷지청산] 오류: {e}")
@@ -2832,20 +3105,17 @@ class AutoTradeWorker(QObject):
             # 기존 안전망 주문이 있으면 먼저 취소
             self._cancel_hedge_safety_order()
 
-            # API를 통해 헷지 포지션 직접 조회 (WebSocket보다 빠름)
+            # 포지션 저장소에서 헷지 포지션 조회 (마지막 체결이 반영되지 않았으면 REST)
             hedge_qty = 0
             hedge_side = "SHORT" if self.side_mode == "LONG" else "LONG"
 
-            try:
-                positions = self.api_module.get_initial_positions()
-                for pos in positions:
-                    if pos.get('symbol') == self.symbol and pos.get('positionSide') == hedge_side:
-                        hedge_qty = abs(float(pos.get('positionAmt', 0)))
-                        self._log(f"[헷지 안전망] API로부터 헷지 포지션 조회: {hedge_qty}")
-                        break
-            except Exception as e:
-                self._log(f"[헷지 안전망] API 포지션 조회 실패: {e}")
-                # API 실패 시 self.current_position_data 사용 (fallback)
+            snap = self._position_snapshot(hedge_side)
+            if snap is not None:
+                hedge_qty = snap.qty
+                self._log(f"[헷지 안전망] 헷지 포지션 조회: {hedge_qty} ({snap.source}, {snap.age():.1f}초 전 확인)")
+            else:
+                self._log(f"[헷지 안전망] 포지션 조회 실패")
+                # 조회 실패 시 self.current_position_data 사용 (fallback)
                 for _, pos_data in self.current_position_data.items():
                     if pos_data.get('side', pos_data.get('positionSide')) == hedge_side:
                         hedge_qty = abs(float(pos_data.get('amount', 0)))
@@ -2871,7 +3141,7 @@ class AutoTradeWorker(QObject):
                 close_side = "SELL"
 
             # 가격 반올림
-            safety_price = round(safety_price, self.price_precision)
+            safety_price = self.quantizer.round_price(safety_price)
 
             self._log(f"[헷지 안전망] ==================== 안전망 주문 설정 ====================")
             self._log(f"[헷지 안전망] 헷지 청산가: ${self.fmt_price(hedge_liq_price)}")
@@ -3060,7 +3330,7 @@ class AutoTradeWorker(QObject):
                     pass
 
             # GUI 업데이트 (상태 저장 요청)
-            self.request_save_state.emit()
+            self._save_state(EVENT_SAFETY_ORDER_FILLED)
 
     def _calculate_current_break_even(self):
         """현재 Break Even 계산 (헷지 프로토콜용 헬퍼)
@@ -3526,11 +3796,9 @@ class AutoTradeWorker(QObject):
                             self._log(f"[헷지 프로토콜] 계산된 익절 수량: {tp_qty:.4f} (헷지 {hedge_qty}의 {(tp_qty/hedge_qty*100):.1f}%)")
 
             # 수량 조정
-            qty_step = float(self.symbol_info.get('lotSizeFilter', {}).get('qtyStep', '0.001'))
-            qty_precision = trading_utils.count_decimal_places(qty_step)
-            min_order_qty = float(self.symbol_info.get('lotSizeFilter', {}).get('minOrderQty', '0.001'))
+            min_order_qty = self.quantizer.min_qty
 
-            tp_qty = trading_utils.adjust_quantity(tp_qty, qty_step, qty_precision, min_order_qty)
+            tp_qty = self.quantizer.adjust_qty(tp_qty)
 
             if tp_qty < min_order_qty:
                 self._log(f"[헷지 프로토콜] 익절 수량({tp_qty})이 최소 주문 수량 미만 - 스킵")
@@ -3541,10 +3809,14 @@ class AutoTradeWorker(QObject):
             # 시장가로 헷지 익절 (포지션 일부 청산)
             close_side = "BUY" if self.side_mode == "LONG" else "SELL"
 
+            # 호가창 유동성 기준 수량/슬리피지 확인 (추정 체결가는 손익 기록에 사용)
+            tp_qty, book_fill = self._size_market_exit(close_side, tp_qty, current_price, "헷지 프로토콜")
+
             self._log(f"[헷지 프로토콜] 헷지 익절 실행: {close_side} {tp_qty} (현재 헷지: {hedge_qty})")
 
             # 헷지 포지션 일부 청산
-            self.execute_trade_signal.emit(self.symbol, close_side, str(tp_qty), True)
+            self.execute_trade_signal.emit(self.symbol, close_side, str(tp_qty), True,
+                                           self.make_client_order_id("TP"), None)
 
             # 탈출 수량 저장 (H4에서 재진입 시 사용)
             self.hedge_protocol_exited_qty = tp_qty
@@ -3558,11 +3830,12 @@ class AutoTradeWorker(QObject):
 
             # Statistics 탭: 헷지 프로토콜 발동 기록 (추정 손익 포함)
             hedge_avg = getattr(self, 'hedge_protocol_hedge_avg_price', 0)
-            if current_price > 0 and hedge_avg > 0:
+            exit_price = book_fill['avg_price'] if book_fill else current_price  # 호가창 추정 체결가 우선
+            if exit_price > 0 and hedge_avg > 0:
                 if self.side_mode == "LONG":
-                    estimated_pnl = tp_qty * (hedge_avg - current_price)
+                    estimated_pnl = tp_qty * (hedge_avg - exit_price)
                 else:
-                    estimated_pnl = tp_qty * (current_price - hedge_avg)
+                    estimated_pnl = tp_qty * (exit_price - hedge_avg)
             else:
                 estimated_pnl = 0.0
             self.hedge_protocol_fired.emit(self.current_step, estimated_pnl)
@@ -3615,14 +3888,14 @@ class AutoTradeWorker(QObject):
             if not trigger[2]:  # 미발동인 것만
                 consolidated_qty += trigger[1]
                 consolidated_names.append(f"H{i+1}({trigger[1]:.4f})")
-                trigger[2] = True  # executed 마킹 (개별 발동 방지)
+                self._update_hedge_trigger(trigger, executed=True)  # 개별 발동 방지
 
         if consolidated_qty <= 0:
             return
 
         # H4에 수량 합산
         original_h4_qty = last_trigger[1]
-        last_trigger[1] = original_h4_qty + consolidated_qty
+        self._update_hedge_trigger(last_trigger, qty=original_h4_qty + consolidated_qty)
 
         self._log(f"[헷지 프로토콜] 미발동 헷지 합산: {', '.join(consolidated_names)} → H{last_idx+1}")
         self._log(f"[헷지 프로토콜] H{last_idx+1} 수량: {original_h4_qty:.4f} → {last_trigger[1]:.4f} (+{consolidated_qty:.4f})")
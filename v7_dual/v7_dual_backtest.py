@@ -0,0 +1,1266 @@
+"""
+백테스트 엔진 (저장된 캔들/체결로 AutoTradeWorker를 그대로 구동)
+
+DCA/헷지 설정(get_default_strategy_settings)은 실거래로 돌려 보는 것 외에는 평가할 방법이 없었습니다.
+이 모듈은 수정하지 않은 AutoTradeWorker에 과거 가격을 순서대로 넣고,
+GUI(주문 실행/재시작)와 거래소 역할을 BacktestEngine과 SimExchange가 대신합니다.
+
+- 가격 경로: 1분봉 OHLC로 봉 내부 경로를 합성 (양봉 O→L→H→C, 음봉 O→H→L→C)
+  구간 사이에 있는 레벨(워커 TriggerBook/익절가/임계값, 미체결·조건부 주문 가격, 청산가)에서 멈춰
+  틱을 추가로 넣으므로 워커는 실거래처럼 "레벨에 닿은 가격"으로 판단합니다.
+  체결 CSV가 있으면 실제 체결가를 그대로 재생합니다 (trade_ticks).
+- 캔들 확정: 1분봉을 전략 인터벌(기본 15m)로 묶어 GUI와 같은 prev/current 형식으로 전달
+- 거래소: 헤지 모드(LONG/SHORT 별도 포지션), 격리 마진 청산(유지증거금률, 파산가 체결),
+  지정가 메이커/시장가·조건부 테이커 수수료, 8시간 펀딩, 감소 전용(reduce-only) 규칙, 중복 client_order_id
+- 체결마다 OrderUpdate(FILLED)를 워커에, AccountUpdate를 포지션 저장소에 전달 (실시간과 같은 경로)
+- 시간: 워커/포지션 저장소/사이클 기록 모듈의 time을 시뮬레이션 시계로 교체 -> 실행마다 결과가 같음
+- Qt: PyQt5가 없는 서버에서는 v7_dual_headless_qt.install_headless_qt()로 시그널을 동기 호출로 바꾼
+  대체 모듈을 설치합니다 (main()이 호출, 라이브러리로 쓸 때는 run() 전에 직접 호출 - import만으로는 설치 안 함).
+  워커 시그널은 실제 교차 스레드 연결처럼 큐에 쌓았다가 워커 호출이 끝난 뒤 처리합니다.
+
+단순화: 부분 체결 없음, 호가 깊이는 슬리피지(bps)로 대체, 마크가격 = 체결가격,
+펀딩은 고정 비율 또는 {시각 ms: 비율}, 비축금/설정 스레드 지연 없음 (사이클 종료 즉시 잔액으로 수량 재계산 후 재시작)
+
+사용:
+    python v7_dual_backtest.py --symbol XRPUSDT --start 2026-01-01 --end 2026-04-01 --side long --balance 1000
+
+    install_headless_qt()  # PyQt5가 없을 때만
+    engine = BacktestEngine("XRPUSDT", symbol_info, strategy_settings, side_mode="LONG", balance=1000)
+    columns = get_kline_store().read("Bybit", "linear", "XRPUSDT", "1m", start_ms, end_ms)
+    result = engine.run(kline_ticks(columns, "15m"))
+    print(format_report(result))
+"""
+
+import argparse
+import bisect
+import contextlib
+import csv
+import logging
+import sys
+import time as _real_time
+from collections import deque
+from datetime import datetime, timezone
+
+import v7_dual_dca_state_machine
+import v7_dual_events
+import v7_dual_position_store
+import v7_dual_trading_utils as trading_utils
+from v7_dual_config_manager import get_default_strategy_settings, load_config_data
+from v7_dual_dca_state_machine import EVENT_CYCLE_CLOSED, EVENT_HEDGE_FIRED, EVENT_PROFIT_TAKEN, EVENT_SAFETY_ORDER_FILLED
+from v7_dual_events import AccountUpdate, OrderUpdate, PositionUpdate
+from v7_dual_headless_qt import install_headless_qt
+from v7_dual_kline_store import INTERVAL_MS, get_kline_store
+from v7_dual_position_store import get_position_store
+
+
+TAKER_FEE_RATE = 0.00055         # 시장가/조건부 주문 수수료 (Bybit 기본 0.055%)
+MAKER_FEE_RATE = 0.0002          # 지정가 체결 수수료 (0.02%)
+MAINT_MARGIN_RATE = 0.005        # 유지증거금률 (격리 마진 청산가 계산)
+SLIPPAGE_BPS = 1.0               # 시장가/조건부 체결 슬리피지 (bps, 불리한 방향)
+FUNDING_INTERVAL_MS = 8 * 3_600_000  # 펀딩 주기 (UTC 0/8/16시)
+
+MAX_LEVEL_STOPS = 16             # 가격 구간 1개에 추가로 넣을 레벨 틱 최대 수
+MAX_DRAIN_ROUNDS = 10_000        # 시그널/주문 이벤트 처리 반복 한도 (무한 루프 방지)
+STALL_RESTART_MS = 30 * 60_000   # 포지션/주문 없이 이 시간이 지나면 사이클 강제 종료 후 재시작
+
+# 워커가 레벨로 비교하는 가격 속성 (TriggerBook 밖의 값 포함)
+_WORKER_LEVEL_ATTRS = ('profit_target_price', 'uptrend_threshold_price', 'uptrend_threshold_price_2',
+                       'hedge_protocol_retracement_price', 'hedge_safety_order_price')
+
+# 사이클 종료 사유 (워커가 남긴 마지막 종료 이벤트 기준)
+_EXIT_REASONS = {
+    EVENT_PROFIT_TAKEN: 'profit',
+    EVENT_CYCLE_CLOSED: 'final_step',
+    EVENT_SAFETY_ORDER_FILLED: 'safety_order',
+}
+
+
+# ==================== 시뮬레이션 시계 ====================
+
+class SimClock:
+    """시뮬레이션 시계 - 모듈의 time 대신 주입 (time()/monotonic()은 현재 틱 시각, 나머지는 실제 time 모듈)"""
+
+    def __init__(self, now_ms=0):
+        self.now_ms = now_ms
+
+    def time(self):
+        return self.now_ms / 1000.0
+
+    monotonic = time
+
+    def sleep(self, seconds):
+        self.now_ms += int(seconds * 1000)
+
+    def advance_to(self, ts_ms):
+        if ts_ms > self.now_ms:
+            self.now_ms = ts_ms
+
+    def __getattr__(self, name):
+        return getattr(_real_time, name)
+
+
+@contextlib.contextmanager
+def _sim_time(clock):
+    """워커가 쓰는 모듈의 time을 시뮬레이션 시계로 교체 (종료 시 복원)"""
+    import v7_dual_auto_trader  # PyQt5 필요 (없으면 먼저 install_headless_qt())
+    modules = (v7_dual_auto_trader, v7_dual_position_store, v7_dual_dca_state_machine, v7_dual_events)
+    saved = [(module, module.time) for module in modules]
+    for module in modules:
+        module.time = clock
+    try:
+        yield
+    finally:
+        for module, original in saved:
+            module.time = original
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+@contextlib.contextmanager
+def _quiet(enabled):
+    """워커 로그(print)와 수량 계산 로그 숨김 - 로그 출력이 백테스트 시간의 대부분을 차지함"""
+    if not enabled:
+        yield
+        return
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(_NullWriter()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+# ==================== 시뮬레이션 거래소 ====================
+
+ORDER_LIMIT = 'Limit'
+ORDER_STOP = 'StopMarket'
+ORDER_TRAILING = 'TrailingStop'
+
+
+class _SimPosition:
+    """헤지 모드 포지션 1개 (격리 마진)"""
+
+    __slots__ = ('side', 'sign', 'qty', 'entry', 'margin')
+
+    def __init__(self, side):
+        self.side = side
+        self.sign = 1 if side == "LONG" else -1
+        self.qty = 0.0
+        self.entry = 0.0
+        self.margin = 0.0
+
+    def unrealized(self, price):
+        return (price - self.entry) * self.qty * self.sign if self.qty else 0.0
+
+    def liq_price(self, mmr):
+        """포지션 증거금 + 미실현손익 = 유지증거금이 되는 가격"""
+        if not self.qty:
+            return 0.0
+        if self.sign > 0:
+            return max((self.entry * self.qty - self.margin) / (self.qty * (1 - mmr)), 0.0)
+        return (self.entry * self.qty + self.margin) / (self.qty * (1 + mmr))
+
+    def bankruptcy_price(self):
+        """증거금이 0이 되는 가격 (청산 체결가)"""
+        return max(self.entry - self.sign * self.margin / self.qty, 0.0)
+
+
+class _SimOrder:
+    """미체결 주문 1건 (지정가 / 스탑 마켓 / 트레일링 스탑)"""
+
+    __slots__ = ('order_id', 'client_id', 'kind', 'side', 'position_side', 'qty', 'price',
+                 'reduce_only', 'callback_rate', 'armed', 'extreme')
+
+    def __init__(self, order_id, client_id, kind, side, position_side, qty, price, reduce_only, callback_rate=0.0):
+        self.order_id = order_id
+        self.client_id = client_id
+        self.kind = kind
+        self.side = side
+        self.position_side = position_side
+        self.qty = qty
+        self.price = price              # 지정가 / 트리거 가격 / 트레일링 활성화 가격
+        self.reduce_only = reduce_only
+        self.callback_rate = callback_rate
+        self.armed = False              # 트레일링: 활성화 가격 도달 여부
+        self.extreme = 0.0              # 트레일링: 활성화 이후 고점(SELL) / 저점(BUY)
+
+
+class SimExchange:
+    """
+    API 모듈 대체 시뮬레이션 거래소 (워커와 엔진이 BybitAPI와 같은 메서드로 호출)
+
+    - set_price(): 틱 1건 반영 -> 지정가/조건부 주문 체결, 격리 마진 청산
+    - 체결은 updates(OrderUpdate 큐)에 쌓이고, 포지션 변경은 즉시 포지션 저장소에 반영
+    - 주문 거부는 실제 API처럼 {"code", "msg"} 반환
+    """
+
+    def __init__(self, symbol, symbol_info, balance, clock, leverage=15, taker_fee=TAKER_FEE_RATE,
+                 maker_fee=MAKER_FEE_RATE, maint_margin_rate=MAINT_MARGIN_RATE, slippage_bps=SLIPPAGE_BPS):
+        self.symbol = symbol
+        self.symbol_info = symbol_info
+        self.clock = clock
+        self.leverage = float(leverage)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.mmr = maint_margin_rate
+        self.slippage = slippage_bps / 10_000.0
+
+        self.balance = float(balance)   # 지갑 잔액 (포지션 증거금 포함)
+        self.price = 0.0
+        self.positions = {"LONG": _SimPosition("LONG"), "SHORT": _SimPosition("SHORT")}
+        self.orders = {}                # 주문 ID -> _SimOrder (미체결)
+        self._client_ids = {}           # client_order_id -> 주문 ID
+        self._seq = 0
+        self.updates = deque()          # 워커에 전달할 OrderUpdate
+        self.position_version = 0       # 포지션이 바뀔 때마다 증가
+
+        # 통계
+        self.fees_paid = 0.0
+        self.funding_paid = 0.0
+        self.fills = 0
+        self.rejects = 0
+        self.liquidations = []          # [{'ts', 'side', 'price', 'qty', 'loss'}]
+
+        self.store = get_position_store(self)
+
+    # ==================== API 모듈 인터페이스 ====================
+
+    def is_api_key_active(self):
+        return True
+
+    def get_market_key(self):
+        return "fapi"
+
+    def get_instrument_info(self, category, symbol):
+        return self.symbol_info
+
+    def get_mark_price(self, category, symbol):
+        return self.price
+
+    def get_initial_positions(self):
+        now = self.clock.time()
+        return [{
+            'symbol': self.symbol,
+            'positionAmt': str(pos.qty * pos.sign),
+            'entryPrice': str(pos.entry),
+            'unRealizedProfit': str(pos.unrealized(self.price)),
+            'initialMargin': str(pos.margin),
+            'positionSide': side,
+            'liqPrice': str(pos.liq_price(self.mmr)),
+            'markPrice': str(self.price),
+            'updatedTime': str(int(now * 1000)),
+        } for side, pos in self.positions.items() if pos.qty > 0]
+
+    def get_initial_open_orders(self):
+        return [{
+            'symbol': self.symbol,
+            'type': o.kind,
+            'side': o.side,
+            'price': str(o.price),
+            'origQty': str(o.qty),
+            'executedQty': '0',
+            'orderId': o.order_id,
+            'orderCategory': 'normal' if o.kind == ORDER_LIMIT else 'conditional',
+        } for o in self.orders.values()]
+
+    def place_market_order(self, symbol, side, quantity, reduce_only=False, position_side="BOTH", client_order_id=None):
+        existing = self._existing(client_order_id)
+        if existing:
+            return existing
+        side = side.upper()
+        position_side = self._resolve_position_side(side, position_side, reduce_only)
+        order_id = self._next_id()
+        error = self._fill(order_id, 'Market', side, position_side, float(quantity),
+                           self._slipped(side, self.price), self.taker_fee, reduce_only)
+        return self._result(order_id, client_order_id, error)
+
+    def place_limit_order(self, symbol, side, quantity, price, reduce_only=False, position_side="BOTH", client_order_id=None):
+        existing = self._existing(client_order_id)
+        if existing:
+            return existing
+        side = side.upper()
+        position_side = self._resolve_position_side(side, position_side, reduce_only)
+        qty = float(quantity)
+        price = float(price)
+        order_id = self._next_id()
+
+        # 즉시 체결 가능한 지정가는 현재가로 테이커 체결
+        if (side == "BUY" and price >= self.price) or (side == "SELL" and price <= self.price):
+            error = self._fill(order_id, ORDER_LIMIT, side, position_side, qty, self.price, self.taker_fee, reduce_only)
+            return self._result(order_id, client_order_id, error)
+
+        error = self._check_new_order(side, position_side, qty, price, reduce_only)
+        if error is None:
+            self.orders[order_id] = _SimOrder(order_id, client_order_id, ORDER_LIMIT, side, position_side,
+                                              qty, price, reduce_only)
+        return self._result(order_id, client_order_id, error)
+
+    def place_batch_orders(self, orders):
+        results = []
+        for o in orders:
+            if str(o.get('order_type', 'MARKET')).upper() == 'LIMIT':
+                results.append(self.place_limit_order(o['symbol'], o['side'], o['quantity'], o['price'],
+                                                      o.get('reduce_only', False), o.get('position_side', "BOTH"),
+                                                      o.get('client_order_id')))
+            else:
+                results.append(self.place_market_order(o['symbol'], o['side'], o['quantity'],
+                                                       o.get('reduce_only', False), o.get('position_side', "BOTH"),
+                                                       o.get('client_order_id')))
+        return results
+
+    def place_stop_market_order(self, symbol, side, quantity, stop_price, reduce_only=False, position_side="BOTH",
+                                client_order_id=None):
+        return self._place_conditional(ORDER_STOP, side, quantity, stop_price, reduce_only, position_side,
+                                       client_order_id)
+
+    def place_stop_loss_order(self, symbol, side, quantity, stop_loss_price, position_side="BOTH", client_order_id=None):
+        return self._place_conditional(ORDER_STOP, side, quantity, stop_loss_price, True, position_side,
+                                       client_order_id)
+
+    def place_trailing_stop_order(self, symbol, side, quantity, activation_price, callback_rate, position_side="BOTH",
+                                  client_order_id=None):
+        return self._place_conditional(ORDER_TRAILING, side, quantity, activation_price, True, position_side,
+                                       client_order_id, callback_rate=float(callback_rate))
+
+    def cancel_order(self, symbol, order_id, order_category='normal', **kwargs):
+        order = self.orders.pop(str(order_id), None)
+        if order is None:
+            return {"code": 110001, "msg": "order not exists or too late to cancel"}
+        self._publish_order(order, 'CANCELED', 0.0, 0.0)
+        return {"orderId": order.order_id}
+
+    # ==================== 엔진 인터페이스 ====================
+
+    def set_price(self, price):
+        """틱 1건 반영 - 닿은 주문 체결, 청산가 도달 포지션 청산"""
+        self.price = price
+        if self.orders:
+            self._match_orders(price)
+        for pos in self.positions.values():
+            if pos.qty:
+                liq = pos.liq_price(self.mmr)
+                if (pos.sign > 0 and price <= liq) or (pos.sign < 0 and price >= liq):
+                    self._liquidate(pos)
+
+    def apply_funding(self, rate):
+        """펀딩비 정산 (양수 비율: LONG 지불 / SHORT 수령)"""
+        for pos in self.positions.values():
+            if pos.qty:
+                payment = pos.qty * self.price * rate * pos.sign
+                self.balance -= payment
+                self.funding_paid += payment
+
+    def equity(self):
+        """지갑 잔액 + 미실현손익"""
+        price = self.price
+        return self.balance + sum(pos.unrealized(price) for pos in self.positions.values() if pos.qty)
+
+    def levels(self):
+        """다음 틱 전에 멈춰야 할 가격 (미체결/조건부 주문 가격, 청산가)"""
+        prices = [o.price for o in self.orders.values()]
+        for pos in self.positions.values():
+            if pos.qty:
+                prices.append(pos.liq_price(self.mmr))
+        return prices
+
+    def cancel_all(self):
+        for order_id in list(self.orders):
+            self.cancel_order(self.symbol, order_id)
+
+    # ==================== 체결 ====================
+
+    def _next_id(self):
+        self._seq += 1
+        return f"sim-{self._seq}"
+
+    def _existing(self, client_order_id):
+        """같은 client_order_id가 이미 접수됐으면 기존 주문 결과 반환 (재전송 중복 방지와 동일)"""
+        if client_order_id and client_order_id in self._client_ids:
+            return {"orderId": self._client_ids[client_order_id]}
+        return None
+
+    def _result(self, order_id, client_order_id, error):
+        if error is not None:
+            self.rejects += 1
+            return {"code": error[0], "msg": error[1]}
+        if client_order_id:
+            self._client_ids[client_order_id] = order_id
+        return {"orderId": order_id}
+
+    def _slipped(self, side, price):
+        return price * (1 + self.slippage) if side == "BUY" else price * (1 - self.slippage)
+
+    @staticmethod
+    def _resolve_position_side(side, position_side, reduce_only):
+        if position_side in ("LONG", "SHORT"):
+            return position_side
+        # BOTH(단방향 표기): 감소 주문이면 반대 포지션, 아니면 주문 방향 포지션
+        if reduce_only:
+            return "SHORT" if side == "BUY" else "LONG"
+        return "LONG" if side == "BUY" else "SHORT"
+
+    def _available(self):
+        """주문 가능 잔액 (포지션 증거금과 미체결 증가 주문의 예약 증거금 제외)"""
+        used = sum(pos.margin for pos in self.positions.values())
+        for o in self.orders.values():
+            if o.kind == ORDER_LIMIT and not o.reduce_only:
+                used += o.qty * o.price / self.leverage
+        return self.balance - used
+
+    def _check_new_order(self, side, position_side, qty, price, reduce_only):
+        if qty <= 0:
+            return (10001, "qty must be greater than 0")
+        increasing = (position_side == "LONG") == (side == "BUY")
+        if increasing:
+            if reduce_only:
+                return (110017, "reduce-only order would increase position")
+            if self._available() < qty * price / self.leverage:
+                return (110007, "ab not enough for new order")
+        elif self.positions[position_side].qty <= 0:
+            return (110017, "current position is zero, cannot fix reduce-only order qty")
+        return None
+
+    def _place_conditional(self, kind, side, quantity, trigger_price, reduce_only, position_side, client_order_id,
+                           callback_rate=0.0):
+        existing = self._existing(client_order_id)
+        if existing:
+            return existing
+        side = side.upper()
+        position_side = self._resolve_position_side(side, position_side, reduce_only)
+        qty = float(quantity)
+        trigger_price = float(trigger_price)
+        error = None
+        if kind == ORDER_STOP:
+            # 이미 지난 트리거 가격은 거래소가 거부 (triggerDirection 불일치)
+            if (side == "BUY" and trigger_price <= self.price) or (side == "SELL" and trigger_price >= self.price):
+                error = (110093, f"trigger price {trigger_price} already crossed (last {self.price})")
+        if error is None and reduce_only and self.positions[position_side].qty <= 0:
+            error = (110017, "current position is zero, cannot fix reduce-only order qty")
+        order_id = self._next_id()
+        if error is None:
+            order = _SimOrder(order_id, client_order_id, kind, side, position_side, qty, trigger_price,
+                              reduce_only, callback_rate)
+            if kind == ORDER_TRAILING:
+                self._update_trailing(order, self.price)
+            self.orders[order_id] = order
+        return self._result(order_id, client_order_id, error)
+
+    def _update_trailing(self, o, price):
+        """트레일링 스탑 고점/저점 갱신 - 발동 조건을 만족하면 True"""
+        if o.side == "SELL":
+            if not o.armed:
+                if price < o.price:
+                    return False
+                o.armed = True
+                o.extreme = price
+            if price > o.extreme:
+                o.extreme = price
+            return price <= o.extreme * (1 - o.callback_rate / 100.0)
+        if not o.armed:
+            if price > o.price:
+                return False
+            o.armed = True
+            o.extreme = price
+        if price < o.extreme:
+            o.extreme = price
+        return price >= o.extreme * (1 + o.callback_rate / 100.0)
+
+    def _match_orders(self, price):
+        for o in list(self.orders.values()):
+            if o.order_id not in self.orders:
+                continue  # 앞선 체결(청산)로 취소됨
+            if o.kind == ORDER_LIMIT:
+                if (o.side == "BUY" and price <= o.price) or (o.side == "SELL" and price >= o.price):
+                    del self.orders[o.order_id]
+                    error = self._fill(o.order_id, o.kind, o.side, o.position_side, o.qty, o.price,
+                                       self.maker_fee, o.reduce_only)
+                    if error is not None:
+                        self._publish_order(o, 'REJECTED', 0.0, 0.0)
+                continue
+            if o.kind == ORDER_STOP:
+                triggered = price >= o.price if o.side == "BUY" else price <= o.price
+            else:
+                triggered = self._update_trailing(o, price)
+            if triggered:
+                del self.orders[o.order_id]
+                error = self._fill(o.order_id, o.kind, o.side, o.position_side, o.qty,
+                                   self._slipped(o.side, price), self.taker_fee, o.reduce_only)
+                if error is not None:
+                    self._publish_order(o, 'REJECTED', 0.0, 0.0)
+
+    def _fill(self, order_id, order_type, side, position_side, qty, price, fee_rate, reduce_only):
+        """
+        체결 1건 반영
+
+        Returns:
+            None: 체결됨 / (코드, 메시지): 거부
+        """
+        if qty <= 0 or price <= 0:
+            return (10001, "invalid qty or price")
+        pos = self.positions[position_side]
+        increasing = (position_side == "LONG") == (side == "BUY")
+        if increasing:
+            if reduce_only:
+                return (110017, "reduce-only order would increase position")
+            margin = qty * price / self.leverage
+            if self._available() < margin + qty * price * fee_rate:
+                return (110007, "ab not enough for new order")
+            total = pos.qty + qty
+            pos.entry = (pos.entry * pos.qty + price * qty) / total
+            pos.qty = total
+            pos.margin += margin
+        else:
+            if pos.qty <= 0:
+                return (110017, "current position is zero, cannot fix reduce-only order qty")
+            qty = min(qty, pos.qty)
+            self.balance += (price - pos.entry) * qty * pos.sign
+            if qty >= pos.qty - 1e-12:
+                pos.qty = pos.entry = pos.margin = 0.0
+            else:
+                pos.margin *= (pos.qty - qty) / pos.qty
+                pos.qty -= qty
+
+        fee = qty * price * fee_rate
+        self.balance -= fee
+        self.fees_paid += fee
+        self.fills += 1
+        self._publish_position(pos)
+        self.updates.append(OrderUpdate(self.symbol, order_id, 'FILLED', order_type, side, price, qty, qty, price,
+                                        event_time=self.clock.now_ms))
+        return None
+
+    def _liquidate(self, pos):
+        """격리 마진 청산 - 파산가로 전량 종료 (손실 = 포지션 증거금), 해당 포지션의 감소 주문 취소"""
+        price = pos.bankruptcy_price()
+        qty = pos.qty
+        loss = pos.margin
+        self.balance -= loss
+        self.liquidations.append({'ts': self.clock.now_ms, 'side': pos.side, 'price': price, 'qty': qty, 'loss': loss})
+        pos.qty = pos.entry = pos.margin = 0.0
+        for o in list(self.orders.values()):
+            if o.position_side == pos.side and (o.reduce_only or o.kind != ORDER_LIMIT):
+                self.cancel_order(self.symbol, o.order_id)
+        self._publish_position(pos)
+        close_side = "SELL" if pos.sign > 0 else "BUY"
+        self.updates.append(OrderUpdate(self.symbol, self._next_id(), 'FILLED', 'Liquidation', close_side, price, qty,
+                                        qty, price, reason='liquidation', event_time=self.clock.now_ms))
+
+    def _publish_position(self, pos):
+        """포지션 변경을 사용자 데이터 스트림 이벤트처럼 포지션 저장소에 반영 (청산가 포함)"""
+        self.position_version += 1
+        update = PositionUpdate(self.symbol, pos.side, pos.qty * pos.sign, pos.entry, pos.unrealized(self.price),
+                                pos.margin, self.price, pos.liq_price(self.mmr))
+        self.store.apply(AccountUpdate(positions=(update,), event_time=self.clock.now_ms))
+
+    def _publish_order(self, o, status, filled_qty, avg_price):
+        self.updates.append(OrderUpdate(self.symbol, o.order_id, status, o.kind, o.side, o.price, o.qty, filled_qty,
+                                        avg_price, event_time=self.clock.now_ms))
+
+
+# ==================== 가격 입력 ====================
+
+def _candle(start_ms, interval_ms, o, h, l, c):
+    return {'start': start_ms, 'end': start_ms + interval_ms - 1, 'open': o, 'high': h, 'low': l, 'close': c}
+
+
+class _CandleAggregator:
+    """가격/1분봉을 전략 인터벌 캔들로 묶음 - 버킷이 바뀌면 확정 캔들 반환"""
+
+    def __init__(self, interval_ms):
+        self.interval_ms = interval_ms
+        self.start = None
+        self.o = self.h = self.l = self.c = 0.0
+
+    def add(self, ts_ms, o, h, l, c):
+        bucket = ts_ms - ts_ms % self.interval_ms
+        closed = None
+        if bucket != self.start:
+            if self.start is not None:
+                closed = _candle(self.start, self.interval_ms, self.o, self.h, self.l, self.c)
+            self.start = bucket
+            self.o, self.h, self.l = o, h, l
+        else:
+            if h > self.h:
+                self.h = h
+            if l < self.l:
+                self.l = l
+        self.c = c
+        return closed
+
+    def is_last(self, ts_ms, step_ms):
+        """ts_ms 다음 입력이 다음 버킷이면 True (봉 마감 시점에 바로 확정)"""
+        return self.start is not None and ts_ms + step_ms >= self.start + self.interval_ms
+
+    def close(self):
+        closed = _candle(self.start, self.interval_ms, self.o, self.h, self.l, self.c)
+        self.start = None
+        return closed
+
+
+def kline_ticks(columns, candle_interval='15m', kline_interval='1m'):
+    """
+    저장된 캔들(KlineStore.read 결과 또는 [(time, open, high, low, close), ...])로 봉 내부 가격 경로 생성
+
+    Yields:
+        (ts_ms, price, closed_candle): closed_candle은 이 틱에서 확정된 전략 인터벌 캔들 (없으면 None)
+    """
+    step_ms = INTERVAL_MS[kline_interval]
+    aggregator = _CandleAggregator(INTERVAL_MS[candle_interval])
+    if isinstance(columns, dict):
+        rows = zip(columns['time'], columns['open'], columns['high'], columns['low'], columns['close'])
+    else:
+        rows = columns
+    offsets = (0, step_ms // 3, (step_ms * 2) // 3, step_ms - 1)
+    for row in rows:
+        t, o, h, l, c = int(row[0]), float(row[1]), float(row[2]), float(row[3]), float(row[4])
+        if aggregator.start is not None and t - t % aggregator.interval_ms != aggregator.start:
+            # 중간 봉이 빠진 경우: 이전 버킷을 마지막 가격으로 확정
+            yield t - 1, aggregator.c, aggregator.close()
+        path = (o, l, h, c) if c >= o else (o, h, l, c)
+        for i in range(3):
+            yield t + offsets[i], path[i], None
+        aggregator.add(t, o, h, l, c)
+        yield t + offsets[3], c, aggregator.close() if aggregator.is_last(t, step_ms) else None
+
+
+def trade_ticks(trades, candle_interval='15m'):
+    """
+    실제 체결 [(ts_ms, price), ...]을 그대로 재생 (캔들 확정은 버킷이 바뀌는 첫 체결 직전)
+
+    Yields:
+        (ts_ms, price, closed_candle)
+    """
+    aggregator = _CandleAggregator(INTERVAL_MS[candle_interval])
+    for ts, price in trades:
+        ts = int(ts)
+        closed = aggregator.add(ts, price, price, price, price)
+        if closed is not None:
+            yield closed['end'], closed['close'], closed
+        yield ts, price, None
+    if aggregator.start is not None:
+        closed = aggregator.close()
+        yield closed['end'], closed['close'], closed
+
+
+def load_trades_csv(path):
+    """
+    체결 CSV 읽기 (Bybit public trading 파일 등) - 시각/가격 컬럼 자동 감지, 초 단위 시각은 ms로 변환
+
+    Returns:
+        list: [(ts_ms, price), ...] 시각 순
+    """
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        ts_field = next((c for c in ('timestamp', 'time', 'T', 'ts', 'trade_time_ms') if c in fields), None)
+        price_field = next((c for c in ('price', 'p') if c in fields), None)
+        if ts_field is None or price_field is None:
+            raise ValueError(f"시각/가격 컬럼을 찾을 수 없습니다: {fields}")
+        trades = []
+        for row in reader:
+            ts = float(row[ts_field])
+            trades.append((int(ts * 1000) if ts < 1e12 else int(ts), float(row[price_field])))
+    trades.sort(key=lambda x: x[0])
+    return trades
+
+
+# ==================== 엔진 ====================
+
+def _order_flags(side_mode, order_side, is_hedge):
+    """GUI _resolve_auto_trade_order_flags와 동일 (reduce_only, position_side)"""
+    if is_hedge:
+        return False, ("SHORT" if side_mode == "LONG" else "LONG")
+    opening = "BUY" if side_mode == "LONG" else "SELL"
+    return order_side.upper() != opening, side_mode
+
+
+class BacktestEngine:
+    """
+    AutoTradeWorker 1개 + SimExchange로 과거 가격을 재생하고 사이클별 결과를 집계
+
+    워커 시그널은 GUI 패널(on_auto_trade_*_for_side, on_profit_taking_request 등)과 같은 방식으로 처리합니다.
+    실제 연결은 워커 스레드 -> GUI 스레드 큐 연결이므로, 시그널은 큐에 쌓았다가 워커 호출이 끝난 뒤 실행합니다.
+    """
+
+    def __init__(self, symbol, symbol_info, strategy_settings=None, side_mode="LONG", balance=1000.0,
+                 category="linear", taker_fee=TAKER_FEE_RATE, maker_fee=MAKER_FEE_RATE,
+                 maint_margin_rate=MAINT_MARGIN_RATE, slippage_bps=SLIPPAGE_BPS, funding_rate=0.0,
+                 max_cycles=None, verbose=False):
+        self.symbol = symbol
+        self.symbol_info = symbol_info
+        self.side_mode = side_mode.upper()
+        self.category = category
+        self.settings = get_default_strategy_settings()
+        self.settings.update(strategy_settings or {})
+        self.start_balance = float(balance)
+        self.max_cycles = max_cycles
+        self.verbose = verbose
+
+        # 펀딩: 고정 비율 또는 {시각 ms: 비율} (해당 시각 이전 마지막 값 사용)
+        if isinstance(funding_rate, dict):
+            self._funding_times = sorted(funding_rate)
+            self._funding_values = [funding_rate[t] for t in self._funding_times]
+            self._funding_const = 0.0
+        else:
+            self._funding_times = None
+            self._funding_const = float(funding_rate)
+
+        self.clock = SimClock()
+        self.exchange = SimExchange(symbol, symbol_info, balance, self.clock,
+                                    leverage=self.settings.get("TARGET_LEVERAGE", 15), taker_fee=taker_fee,
+                                    maker_fee=maker_fee, maint_margin_rate=maint_margin_rate,
+                                    slippage_bps=slippage_bps)
+        self.worker = None
+        self._signals = deque()       # (핸들러, 인자) - 큐 연결 시그널
+        self._position_data = {}
+        self._position_version = -1
+        self._candle_data = None
+
+        self.cycles = []
+        self._cycle = None
+        self._idle_since = None
+        self.halted = None            # 조기 종료 사유
+        self.event_counts = {}
+
+    # ==================== 워커 연결 ====================
+
+    def _post(self, handler):
+        return lambda *args: self._signals.append((handler, args))
+
+    def _create_worker(self):
+        from v7_dual_auto_trader import AutoTradeWorker
+        worker = AutoTradeWorker('long' if self.side_mode == "LONG" else 'short')
+        worker.execute_trade_signal.connect(self._post(self._on_market_order))
+        worker.execute_limit_order_signal.connect(self._post(self._on_limit_order))
+        worker.execute_batch_orders_signal.connect(self._post(self._on_batch_orders))
+        worker.adjust_next_step_order_signal.connect(self._post(self._on_adjust_next_step_order))
+        worker.uptrend_entry_request.connect(self._post(self._on_uptrend_entry))
+        worker.profit_taking_request.connect(self._post(self._on_profit_taking))
+        worker.request_stop_loss.connect(self._post(self._on_stop_loss))
+        worker.request_trailing_stop.connect(self._post(self._on_trailing_stop))
+        worker.reduce_hedge_signal.connect(self._post(self._on_reduce_hedge))
+        worker.request_save_state.connect(self._post(self._on_save_state))
+        worker.order_id_received.connect(worker.on_order_id_received)
+        worker.hedge_order_id_received.connect(worker.on_hedge_order_id_received)
+        return worker
+
+    def _drain(self):
+        """큐에 쌓인 시그널과 거래소 주문 이벤트를 비울 때까지 처리 (처리 중 새로 생긴 것 포함)"""
+        signals = self._signals
+        updates = self.exchange.updates
+        worker = self.worker
+        for _ in range(MAX_DRAIN_ROUNDS):
+            if signals:
+                handler, args = signals.popleft()
+                handler(*args)
+            elif updates:
+                update = updates.popleft()
+                if update.order_id == worker.hedge_safety_order_id and self._cycle is not None:
+                    self._cycle['reason'] = 'safety_order'  # 안전망 체결 경로는 사이클 이벤트를 남기지 않음
+                worker.on_order_update(update)
+            else:
+                return
+        print(f"[백테스트] 이벤트 처리 반복 한도 초과 ({MAX_DRAIN_ROUNDS}) - 남은 이벤트 폐기")
+        signals.clear()
+        updates.clear()
+
+    def _refresh_position_data(self):
+        """GUI live_position_data_by_side와 같은 형식 (포지션 없는 쪽은 키 없음)"""
+        ex = self.exchange
+        data = {}
+        for side, pos in ex.positions.items():
+            if pos.qty:
+                data[f"{self.symbol}_{side}"] = {
+                    'symbol': self.symbol,
+                    'side': side,
+                    'amount': pos.qty * pos.sign,
+                    'entry_price': pos.entry,
+                    'mark_price': ex.price,
+                    'liq_price': pos.liq_price(ex.mmr),
+                    'unrealized_pnl': pos.unrealized(ex.price),
+                }
+        self._position_data = data
+        self._position_version = ex.position_version
+
+    def _tick(self, price):
+        """틱 1건: 거래소 체결 -> 이벤트 처리 -> process_tick (포지션이 바뀌면 GUI처럼 한 번 더)"""
+        ex = self.exchange
+        ex.set_price(price)
+        self._drain()
+        worker = self.worker
+        ticker = {'s': self.symbol, 'c': str(price)}
+        for _ in range(4):
+            if not worker.is_running:
+                break
+            if ex.position_version != self._position_version:
+                self._refresh_position_data()
+            worker.process_tick(ticker, self._position_data, self._candle_data)
+            self._drain()
+            if ex.position_version == self._position_version:
+                break
+        if self._cycle is not None and worker.current_step > self._cycle['max_step']:
+            self._cycle['max_step'] = worker.current_step
+
+    def _path(self, start, end):
+        """start -> end 사이의 레벨 가격 (진행 방향 순서, 최대 MAX_LEVEL_STOPS개)"""
+        worker = self.worker
+        levels = self.exchange.levels()
+        up, down = worker.trigger_book.nearest()
+        if up is not None:
+            levels.append(up)
+        if down is not None:
+            levels.append(down)
+        for attr in _WORKER_LEVEL_ATTRS:
+            value = getattr(worker, attr, None)
+            if value:
+                levels.append(value)
+        if end > start:
+            stops = sorted(p for p in levels if start < p < end)
+        else:
+            stops = sorted((p for p in levels if end < p < start), reverse=True)
+        return stops[:MAX_LEVEL_STOPS]
+
+    def _candle_close(self, candle):
+        """캔들 확정 - handle_kline_update_for_side와 같은 형식 (이후 틱부터 새 캔들 컨텍스트)"""
+        close = candle['close']
+        self._candle_data = {
+            'prev': {'timestamp': candle['start'] / 1000.0, 'open': candle['open'], 'close': close,
+                     'high': candle['high'], 'low': candle['low']},
+            'current': {'timestamp': (candle['end'] + 1) / 1000.0, 'open': close, 'close': close,
+                        'high': close, 'low': close},
+        }
+
+    def _funding_rate_at(self, ts_ms):
+        if self._funding_times is None:
+            return self._funding_const
+        i = bisect.bisect_right(self._funding_times, ts_ms) - 1
+        return self._funding_values[i] if i >= 0 else 0.0
+
+    # ==================== 사이클 ====================
+
+    def _plan_quantities(self, balance, price):
+        """SetupAutoTradeThread와 같은 수량 계산 (잔액 기준 단계별 진입/헷지 수량)"""
+        rules = self.symbol_info
+        qty_step = float(rules['lotSizeFilter']['qtyStep'])
+        min_order_qty = float(rules['lotSizeFilter']['minOrderQty'])
+        params = dict(self.settings)
+        params["BALANCE_ASSET"] = "USDT"
+        params["BALANCE_USAGE_PERCENTAGE"] = params.get("BALANCE_USAGE_PERCENTAGE", 70.0) / 100.0
+        success, entry_qty_list, _ = trading_utils.calculate_entry_quantities(
+            category=self.category, symbol_info=rules, min_order_qty=min_order_qty,
+            current_balance=balance, mark_price=price, config=trading_utils.ConfigHelper(params))
+        if not success:
+            return None
+        entry_qty = entry_qty_list[0] if entry_qty_list[0] > 0 else entry_qty_list[1]
+        if not entry_qty or entry_qty <= 0:
+            return None
+        hedge_qty_list = trading_utils.calculate_hedge_qty_list(
+            entry_qty_list, self.settings.get("STEPS", 10), qty_step, min_order_qty,
+            hedge_start_percent=self.settings.get("HEDGE_START_PERCENT", 40),
+            hedge_end_percent=self.settings.get("HEDGE_END_PERCENT", 100),
+            frontload_final_step=self.settings.get("HEDGE_FRONTLOAD_FINAL_STEP", False))
+        return entry_qty, entry_qty_list, hedge_qty_list
+
+    def _start_cycle(self):
+        ex = self.exchange
+        if self.max_cycles is not None and len(self.cycles) >= self.max_cycles:
+            self.halted = 'max_cycles'
+            return
+        plan = self._plan_quantities(ex.balance, ex.price)
+        if plan is None:
+            self.halted = 'insufficient_balance'
+            print(f"[백테스트] 진입 수량 계산 실패 (잔액 {ex.balance:.2f}) - 중단")
+            return
+        entry_qty, entry_qty_list, hedge_qty_list = plan
+        self._cycle = {
+            'start_ms': self.clock.now_ms, 'start_price': ex.price, 'start_balance': ex.balance,
+            'max_step': 0, 'hedge_fires': 0, 'fills_start': ex.fills, 'fees_start': ex.fees_paid,
+            'funding_start': ex.funding_paid, 'liquidations_start': len(ex.liquidations), 'reason': None,
+        }
+        self._idle_since = None
+        self.worker.start_trading(
+            self.symbol, str(entry_qty), self.side_mode, self.settings, 0, self.settings.get("STEPS", 10),
+            entry_qty_list, hedge_qty_list, ex, self.symbol_info, self.category, 0)
+
+    def _close_positions(self):
+        """on_profit_taking_request와 같은 순서: 미체결 주문 전부 취소 -> LONG/SHORT 시장가 청산"""
+        ex = self.exchange
+        ex.cancel_all()
+        long_qty = ex.positions["LONG"].qty
+        if long_qty > 0:
+            ex.place_market_order(self.symbol, "SELL", str(long_qty), False, "LONG")
+        short_qty = ex.positions["SHORT"].qty
+        if short_qty > 0:
+            ex.place_market_order(self.symbol, "BUY", str(short_qty), True, "SHORT")
+
+    def _end_cycle(self, reason):
+        cycle = self._cycle
+        if cycle is None:
+            return
+        self._cycle = None
+        ex = self.exchange
+        self._count_events(self.worker.lifecycle.drain(), cycle)
+        # 데이터 끝에서 열린 사이클은 미실현손익 포함 평가
+        end_value = ex.equity() if reason == 'open' else ex.balance
+        cycle.update({
+            'end_ms': self.clock.now_ms, 'end_price': ex.price, 'end_balance': ex.balance,
+            'pnl': end_value - cycle['start_balance'],
+            'fees': ex.fees_paid - cycle.pop('fees_start'),
+            'funding': ex.funding_paid - cycle.pop('funding_start'),
+            'fills': ex.fills - cycle.pop('fills_start'),
+            'liquidations': len(ex.liquidations) - cycle.pop('liquidations_start'),
+            'reason': cycle['reason'] or reason,
+        })
+        cycle['pnl_percent'] = cycle['pnl'] / cycle['start_balance'] * 100 if cycle['start_balance'] else 0.0
+        self.cycles.append(cycle)
+
+    def _restart(self, reason):
+        """사이클 종료 -> 포지션 정리 -> 잔액으로 수량 재계산 후 재시작 (예약 중지면 종료)"""
+        worker = self.worker
+        self._close_positions()
+        self._end_cycle(reason)
+        worker.stop_trading()
+        if worker.scheduled_stop:
+            self.halted = 'scheduled_stop'
+            return
+        if self.halted is None:
+            self._start_cycle()
+
+    def _count_events(self, events, cycle):
+        for event in events:
+            self.event_counts[event.type] = self.event_counts.get(event.type, 0) + 1
+            if cycle is None:
+                continue
+            if event.step is not None and event.step > cycle['max_step']:
+                cycle['max_step'] = event.step
+            if event.type == EVENT_HEDGE_FIRED:
+                cycle['hedge_fires'] += 1
+            elif event.type in _EXIT_REASONS:
+                cycle['reason'] = _EXIT_REASONS[event.type]
+
+    def _check_idle(self):
+        """워커가 스스로 멈췄거나, 포지션/주문 없이 오래 머물면 사이클을 닫고 재시작"""
+        worker = self.worker
+        if self._cycle is None:
+            return
+        if not worker.is_running:
+            self._restart('stopped')
+            return
+        ex = self.exchange
+        if ex.positions["LONG"].qty or ex.positions["SHORT"].qty or ex.orders or not worker.initial_entry_done:
+            self._idle_since = None
+            return
+        now = self.clock.now_ms
+        if self._idle_since is None:
+            self._idle_since = now
+        elif now - self._idle_since >= STALL_RESTART_MS:
+            fills = ex.fills - self._cycle['fills_start']
+            self._restart('liquidation' if len(ex.liquidations) > self._cycle['liquidations_start'] else 'stalled')
+            if fills == 0:
+                self.halted = 'no_fills'  # 진입 주문이 계속 거부됨 (잔액/최소 수량)
+
+    # ==================== GUI 핸들러 대응 ====================
+
+    def _handle_market_result(self, result, is_hedge, hedge_trigger=None):
+        """_handle_auto_trade_market_result와 동일 (헷지 트리거 주문이면 트리거 정보와 함께 주문 ID 전달)"""
+        order_id = result.get('orderId') if result else None
+        if not order_id:
+            return
+        worker = self.worker
+        if is_hedge:
+            if hedge_trigger:
+                trigger_price, qty = hedge_trigger
+                worker.on_hedge_order_id_received(order_id, trigger_price, qty)
+        else:
+            worker.order_id_received.emit(order_id)
+
+    def _handle_limit_result(self, result, is_hedge):
+        order_id = result.get('orderId') if result else None
+        if order_id and not is_hedge:
+            self.worker.order_id_received.emit(order_id)
+
+    def _on_market_order(self, symbol, order_side, quantity, is_hedge, client_order_id, hedge_trigger=None):
+        reduce_only, position_side = _order_flags(self.side_mode, order_side, is_hedge)
+        result = self.exchange.place_market_order(symbol, order_side, quantity, reduce_only, position_side,
+                                                  client_order_id=client_order_id or None)
+        self._handle_market_result(result, is_hedge, hedge_trigger)
+
+    def _on_limit_order(self, symbol, order_side, quantity, price, is_hedge, client_order_id):
+        reduce_only, position_side = _order_flags(self.side_mode, order_side, is_hedge)
+        result = self.exchange.place_limit_order(symbol, order_side, quantity, price, reduce_only, position_side,
+                                                 client_order_id=client_order_id or None)
+        self._handle_limit_result(result, is_hedge)
+
+    def _on_batch_orders(self, orders):
+        if not orders:
+            return
+        if len(orders) == 1:
+            o = orders[0]
+            if o.get('order_type', 'MARKET').upper() == 'LIMIT':
+                self._on_limit_order(o['symbol'], o['side'], o['quantity'], o['price'], o.get('is_hedge', False),
+                                     o.get('client_order_id'))
+            else:
+                self._on_market_order(o['symbol'], o['side'], o['quantity'], o.get('is_hedge', False),
+                                      o.get('client_order_id'))
+            return
+        api_orders = []
+        for o in orders:
+            reduce_only, position_side = _order_flags(self.side_mode, o['side'], o.get('is_hedge', False))
+            api_orders.append(dict(o, reduce_only=reduce_only, position_side=position_side))
+        results = self.exchange.place_batch_orders(api_orders)
+        for o, result in zip(orders, results):
+            if o.get('order_type', 'MARKET').upper() == 'LIMIT':
+                self._handle_limit_result(result, o.get('is_hedge', False))
+            else:
+                self._handle_market_result(result, o.get('is_hedge', False))
+
+    def _on_adjust_next_step_order(self, order_id, slippage):
+        """슬리피지만큼 다음 단계 지정가 재주문 (on_adjust_next_step_order)"""
+        ex = self.exchange
+        worker = self.worker
+        order = ex.orders.get(str(order_id))
+        if order is None or order.kind != ORDER_LIMIT:
+            return
+        tick_size = worker.symbol_info.get('priceFilter', {}).get('tickSize', '0.01')
+        new_price = trading_utils.adjust_price(order.price + slippage, tick_size,
+                                               trading_utils.count_decimal_places(tick_size))
+        if 'orderId' not in ex.cancel_order(self.symbol, order_id):
+            return
+        result = ex.place_limit_order(self.symbol, order.side, str(order.qty), str(new_price), False, worker.side_mode)
+        if result.get('orderId'):
+            worker.next_step_order_id = result['orderId']
+            worker.order_id_received.emit(result['orderId'])
+
+    def _on_uptrend_entry(self, order_id):
+        """역방향진입: 다음 단계 주문 취소 + 헷지 트리거 초기화 + 시장가 진입 (on_uptrend_entry_request)"""
+        ex = self.exchange
+        worker = self.worker
+        if order_id and order_id.strip():
+            ex.cancel_order(self.symbol, order_id)
+        if worker.hedge_trigger_prices:
+            worker.cancel_hedge_triggers()
+        next_step = worker.current_step + 1
+        if next_step < len(worker.entry_qty_list):
+            side = "BUY" if worker.side_mode == "LONG" else "SELL"
+            result = ex.place_market_order(self.symbol, side, str(worker.entry_qty_list[next_step]), False,
+                                           worker.side_mode)
+            if result.get('orderId'):
+                worker.next_step_order_id = str(result['orderId'])
+
+    def _on_profit_taking(self):
+        self._restart('closed')
+
+    def _on_stop_loss(self, symbol, side, quantity, stop_loss_price):
+        self.exchange.place_stop_loss_order(symbol, side, quantity, stop_loss_price, self.worker.side_mode)
+
+    def _on_trailing_stop(self, symbol, side, quantity, activation_price, callback_rate):
+        hedge_side = "SHORT" if self.worker.side_mode == "LONG" else "LONG"
+        self.exchange.place_trailing_stop_order(symbol, side, quantity, activation_price, callback_rate, hedge_side)
+
+    def _on_reduce_hedge(self, symbol, side, quantity):
+        hedge_side = "SHORT" if self.worker.side_mode == "LONG" else "LONG"
+        self.exchange.place_market_order(symbol, side, quantity, reduce_only=True, position_side=hedge_side)
+
+    def _on_save_state(self):
+        self._count_events(self.worker.lifecycle.drain(), self._cycle)
+
+    # ==================== 실행 ====================
+
+    def run(self, ticks):
+        """
+        가격 입력 전체 재생
+
+        Args:
+            ticks: (ts_ms, price, closed_candle) 반복자 (kline_ticks / trade_ticks)
+
+        Returns:
+            dict: 결과 (format_report로 출력) - 'cycles', 'max_drawdown', 'step_distribution' 등
+        """
+        started = _real_time.perf_counter()
+        ex = self.exchange
+        clock = self.clock
+        tick_count = 0
+        peak = max_dd = max_dd_pct = 0.0
+        last_price = None
+        next_funding = None
+        first_ms = last_ms = 0
+
+        with _quiet(not self.verbose), _sim_time(clock):
+            self.worker = self._create_worker()
+            for ts, price, closed in ticks:
+                clock.advance_to(ts)
+                if last_price is None:
+                    first_ms = ts
+                    ex.price = last_price = price
+                    next_funding = ts - ts % FUNDING_INTERVAL_MS + FUNDING_INTERVAL_MS
+                    peak = ex.equity()
+                    self._start_cycle()
+                    self._tick(price)  # 초기 진입 주문 처리
+                if self.halted:
+                    break
+                if ts >= next_funding:
+                    ex.apply_funding(self._funding_rate_at(next_funding))
+                    next_funding += FUNDING_INTERVAL_MS
+
+                if price != last_price:
+                    for level in self._path(last_price, price):
+                        self._tick(level)
+                        tick_count += 1
+                    self._tick(price)
+                    tick_count += 1
+                    last_price = price
+                if closed is not None:
+                    self._candle_close(closed)
+
+                self._check_idle()
+                equity = ex.equity()
+                if equity > peak:
+                    peak = equity
+                elif peak - equity > max_dd:
+                    max_dd = peak - equity
+                    max_dd_pct = max_dd / peak * 100 if peak > 0 else 0.0
+                last_ms = ts
+
+            if self._cycle is not None:
+                self._end_cycle('open')
+            if self.worker.is_running:
+                self.worker.stop_trading()
+
+        elapsed = _real_time.perf_counter() - started
+        return self._result(first_ms, last_ms, tick_count, elapsed, max_dd, max_dd_pct, peak)
+
+    def _result(self, first_ms, last_ms, tick_count, elapsed, max_dd, max_dd_pct, peak):
+        ex = self.exchange
+        closed = [c for c in self.cycles if c['reason'] != 'open']
+        step_distribution = {}
+        for c in self.cycles:
+            step = c['max_step'] + 1  # 1부터 (Step 1 = 초기 진입만)
+            step_distribution[step] = step_distribution.get(step, 0) + 1
+        wins = [c for c in closed if c['pnl'] > 0]
+        return {
+            'symbol': self.symbol,
+            'side_mode': self.side_mode,
+            'start_ms': first_ms,
+            'end_ms': last_ms,
+            'start_balance': self.start_balance,
+            'final_balance': ex.balance,
+            'final_equity': ex.equity(),
+            'total_pnl': ex.equity() - self.start_balance,
+            'total_return_percent': (ex.equity() / self.start_balance - 1) * 100 if self.start_balance else 0.0,
+            'max_drawdown': max_dd,
+            'max_drawdown_percent': max_dd_pct,
+            'peak_equity': peak,
+            'cycles': self.cycles,
+            'closed_cycles': len(closed),
+            'win_rate': len(wins) / len(closed) * 100 if closed else 0.0,
+            'step_distribution': dict(sorted(step_distribution.items())),
+            'fees': ex.fees_paid,
+            'funding': ex.funding_paid,
+            'liquidations': list(ex.liquidations),
+            'fills': ex.fills,
+            'rejects': ex.rejects,
+            'events': dict(self.event_counts),
+            'ticks': tick_count,
+            'elapsed_sec': elapsed,
+            'ticks_per_sec': tick_count / elapsed if elapsed > 0 else 0.0,
+            'halted': self.halted,
+        }
+
+
+# ==================== 출력 ====================
+
+def _fmt_ts(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def format_report(result):
+    """run() 결과를 사람이 읽는 표로 변환"""
+    lines = [
+        f"[백테스트] {result['symbol']} {result['side_mode']}  {_fmt_ts(result['start_ms'])} ~ {_fmt_ts(result['end_ms'])} (UTC)",
+        f"  잔액 {result['start_balance']:.2f} -> {result['final_balance']:.2f} "
+        f"(평가 {result['final_equity']:.2f}, {result['total_return_percent']:+.2f}%)",
+        f"  최대 낙폭 {result['max_drawdown']:.2f} ({result['max_drawdown_percent']:.2f}%), 최고 평가 {result['peak_equity']:.2f}",
+        f"  사이클 {result['closed_cycles']}회 완료 (승률 {result['win_rate']:.1f}%), 수수료 {result['fees']:.2f}, "
+        f"펀딩 {result['funding']:.2f}, 청산 {len(result['liquidations'])}회, 체결 {result['fills']}건, 거부 {result['rejects']}건",
+        f"  틱 {result['ticks']:,}개 / {result['elapsed_sec']:.1f}초 ({result['ticks_per_sec']:,.0f} 틱/초)"
+        + (f", 중단: {result['halted']}" if result['halted'] else ""),
+        "",
+        "  도달 단계 분포:",
+    ]
+    total = sum(result['step_distribution'].values()) or 1
+    for step, count in result['step_distribution'].items():
+        lines.append(f"    Step {step:>2}: {count:>4}회 {'#' * max(1, round(count / total * 40))}")
+    lines += ["", "  #   시작(UTC)         종료(UTC)         단계  헷지  손익        손익%    수수료   사유"]
+    for i, c in enumerate(result['cycles'], 1):
+        lines.append(f"  {i:<3} {_fmt_ts(c['start_ms'])}  {_fmt_ts(c['end_ms'])}  {c['max_step'] + 1:>4}  "
+                     f"{c['hedge_fires']:>4}  {c['pnl']:>+10.2f}  {c['pnl_percent']:>+7.2f}%  {c['fees']:>7.2f}  {c['reason']}")
+    return "\n".join(lines)
+
+
+def _parse_date(value):
+    return int(datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="v7_dual DCA/헷지 전략 백테스트 (로컬 캔들 캐시 / 체결 CSV)")
+    parser.add_argument('--symbol', required=True)
+    parser.add_argument('--exchange', default='Bybit')
+    parser.add_argument('--category', default='linear')
+    parser.add_argument('--start', help='시작일 (YYYY-MM-DD, UTC)')
+    parser.add_argument('--end', help='종료일 (YYYY-MM-DD, UTC, 미포함)')
+    parser.add_argument('--side', default='long', choices=('long', 'short'))
+    parser.add_argument('--balance', type=float, default=1000.0)
+    parser.add_argument('--interval', default='15m', help='전략 캔들 인터벌 (차트 인터벌)')
+    parser.add_argument('--trades', help='체결 CSV 경로 (지정하면 캔들 대신 실제 체결 재생)')
+    parser.add_argument('--tick-size', default=None, help='거래 규칙 캐시가 없을 때 tickSize')
+    parser.add_argument('--qty-step', default=None, help='거래 규칙 캐시가 없을 때 qtyStep/minOrderQty')
+    parser.add_argument('--funding-rate', type=float, default=0.0001)
+    parser.add_argument('--slippage-bps', type=float, default=SLIPPAGE_BPS)
+    parser.add_argument('--max-cycles', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true', help='워커 로그 출력')
+    args = parser.parse_args(argv)
+    install_headless_qt()
+
+    start_ms = _parse_date(args.start) if args.start else None
+    end_ms = _parse_date(args.end) - 1 if args.end else None
+
+    from v7_dual_instrument_cache import get_instrument_store
+    rules = get_instrument_store().get(args.exchange, args.category, args.symbol)
+    if rules is None:
+        if not (args.tick_size and args.qty_step):
+            print(f"[백테스트] {args.symbol} 거래 규칙 캐시 없음 - --tick-size / --qty-step 지정 필요")
+            return 1
+        rules = {'priceFilter': {'tickSize': args.tick_size},
+                 'lotSizeFilter': {'qtyStep': args.qty_step, 'minOrderQty': args.qty_step, 'minNotionalValue': '5'}}
+
+    settings = load_config_data().get("strategy_settings") or {}
+
+    if args.trades:
+        trades = [t for t in load_trades_csv(args.trades)
+                  if (start_ms is None or t[0] >= start_ms) and (end_ms is None or t[0] <= end_ms)]
+        if not trades:
+            print("[백테스트] 구간 내 체결이 없습니다.")
+            return 1
+        ticks = trade_ticks(trades, args.interval)
+    else:
+        columns = get_kline_store().read(args.exchange, args.category, args.symbol, '1m', start_ms, end_ms)
+        if not len(columns.get('time', ())):
+            print(f"[백테스트] 로컬 1분봉 없음: {args.exchange} {args.category} {args.symbol} (차트에서 먼저 불러오세요)")
+            return 1
+        ticks = kline_ticks(columns, args.interval)
+
+    engine = BacktestEngine(args.symbol, rules, settings, side_mode=args.side.upper(), balance=args.balance,
+                            category=args.category, funding_rate=args.funding_rate, slippage_bps=args.slippage_bps,
+                            max_cycles=args.max_cycles, verbose=args.verbose)
+    print(format_report(engine.run(ticks)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+거래소 서버 시간 오프셋 추정 모듈
+
+로컬 PC 시계가 NTP 드리프트로 어긋나면 서명 요청이 -1021(Binance) /
+10002(Bybit) 오류로 거부되고 재전송 때문에 주문 지연이 두 배가 됩니다.
+윈도우 시간 동기화(w32tm)에 의존하지 않고, 서버 시간 API를 주기적으로
+샘플링하여 오프셋과 RTT를 추정한 뒤 보정된 타임스탬프를 사용합니다.
+
+- 오프셋 = 서버시간 - (요청 시작 + 응답 수신) / 2
+- RTT가 작은 샘플일수록 신뢰도가 높으므로 RTT가 평균보다 크게 튀는 샘플은 버림
+- 오프셋/RTT는 지수 이동 평균(EWMA)으로 평활화
+- recvWindow = RTT + 지터 + 오프셋 불확실성 + 여유분 (하한/상한 적용)
+"""
+
+import threading
+import time
+
+
+class ClockOffsetEstimator:
+    """
+    서버 시간 오프셋/RTT 추정기 (백그라운드 스레드에서 주기적으로 샘플링)
+
+    Args:
+        name: 로그용 이름 (예: "Bybit")
+        fetch_server_time_ms: 서버 시간(ms)을 반환하는 함수 (실패 시 None)
+        sync_interval: 정기 샘플링 간격 (초)
+    """
+
+    ALPHA = 0.2                 # EWMA 가중치
+    INITIAL_SAMPLES = 3         # 최초 동기화 시 샘플 수
+    OUTLIER_RTT_FACTOR = 3.0    # 평균 RTT의 N배를 넘는 샘플은 무시
+
+    MIN_RECV_WINDOW_MS = 5000   # 거래소 기본값
+    MAX_RECV_WINDOW_MS = 60000  # 거래소 허용 최대값
+    RECV_WINDOW_MARGIN_MS = 1500
+
+    def __init__(self, name, fetch_server_time_ms, sync_interval=60.0):
+        self.name = name
+        self._fetch = fetch_server_time_ms
+        self.sync_interval = sync_interval
+
+        self._lock = threading.Lock()
+        self._offset_ms = 0.0       # 서버 - 로컬 (ms)
+        self._rtt_ms = None         # 평활화된 RTT
+        self._jitter_ms = 0.0       # RTT 평균 편차
+        self._offset_dev_ms = 0.0   # 오프셋 평균 편차 (불확실성)
+        self._samples = 0
+        self._last_sync = 0.0
+
+        self._stop_event = threading.Event()
+        self._resync_event = threading.Event()
+        self._thread = None
+
+    # ==================== 샘플링 ====================
+
+    def sample(self):
+        """
+        서버 시간을 한 번 샘플링하여 추정치를 갱신합니다.
+
+        Returns:
+            bool: 샘플 반영 여부
+        """
+        t0 = time.time()
+        try:
+            server_ms = self._fetch()
+        except Exception as e:
+            print(f"[ClockSync] {self.name} 서버 시간 조회 오류: {e}")
+            return False
+        t1 = time.time()
+
+        if not server_ms:
+            return False
+
+        rtt_ms = (t1 - t0) * 1000.0
+        offset_ms = server_ms - (t0 + t1) * 500.0  # (t0+t1)/2 * 1000
+
+        with self._lock:
+            if self._rtt_ms is not None and rtt_ms > self._rtt_ms * self.OUTLIER_RTT_FACTOR + 50:
+                # 네트워크 지연이 튄 샘플: 오프셋 오차가 커서 RTT 통계에만 약하게 반영
+                self._jitter_ms += self.ALPHA * (abs(rtt_ms - self._rtt_ms) - self._jitter_ms)
+                return False
+
+            if self._samples == 0:
+                self._offset_ms = offset_ms
+                self._rtt_ms = rtt_ms
+            else:
+                self._offset_dev_ms += self.ALPHA * (abs(offset_ms - self._offset_ms) - self._offset_dev_ms)
+                self._offset_ms += self.ALPHA * (offset_ms - self._offset_ms)
+                self._jitter_ms += self.ALPHA * (abs(rtt_ms - self._rtt_ms) - self._jitter_ms)
+                self._rtt_ms += self.ALPHA * (rtt_ms - self._rtt_ms)
+
+            self._samples += 1
+            self._last_sync = time.monotonic()
+        return True
+
+    def sync_now(self, samples=None):
+        """여러 번 샘플링하여 즉시 동기화 (최초 연결 / 타임스탬프 오류 시)"""
+        ok = 0
+        for _ in range(samples or self.INITIAL_SAMPLES):
+            if self.sample():
+                ok += 1
+        return ok > 0
+
+    # ==================== 보정 값 ====================
+
+    def now_ms(self):
+        """서버 시간 기준으로 보정된 현재 타임스탬프 (ms)"""
+        return int(time.time() * 1000 + self._offset_ms)
+
+    def recv_window_ms(self, cap=None):
+        """
+        적응형 recvWindow (ms)
+
+        동기화 전에는 상한값을 사용하고, 동기화 후에는
+        RTT + 4*지터 + 4*오프셋편차 + 여유분으로 줄입니다.
+        """
+        cap = min(cap or self.MAX_RECV_WINDOW_MS, self.MAX_RECV_WINDOW_MS)
+        with self._lock:
+            if self._samples == 0 or self._rtt_ms is None:
+                return cap
+            window = (self._rtt_ms + 4 * self._jitter_ms + 4 * self._offset_dev_ms
+                      + self.RECV_WINDOW_MARGIN_MS)
+        return int(max(self.MIN_RECV_WINDOW_MS, min(cap, window)))
+
+    def is_synced(self):
+        return self._samples > 0
+
+    def get_stats(self):
+        """현재 추정치 (로그/GUI 표시용)"""
+        with self._lock:
+            return {
+                'offset_ms': round(self._offset_ms, 1),
+                'rtt_ms': round(self._rtt_ms, 1) if self._rtt_ms is not None else None,
+                'jitter_ms': round(self._jitter_ms, 1),
+                'offset_dev_ms': round(self._offset_dev_ms, 1),
+                'samples': self._samples,
+                'age_sec': round(time.monotonic() - self._last_sync, 1) if self._samples else None,
+            }
+
+    # ==================== 백그라운드 동기화 ====================
+
+    def start(self):
+        """백그라운드 샘플링 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"clock-sync-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._resync_event.set()
+
+    def request_resync(self):
+        """타임스탬프 오류 발생 시 즉시 재동기화 요청 (논블로킹)"""
+        self._resync_event.set()
+
+    def _run(self):
+        if not self.is_synced():
+            self.sync_now()
+        while not self._stop_event.is_set():
+            triggered = self._resync_event.wait(timeout=self.sync_interval)
+            if self._stop_event.is_set():
+                break
+            self._resync_event.clear()
+            if triggered:
+                self.sync_now()
+            else:
+                self.sample()
+
+
+_clocks = {}
+_clocks_lock = threading.Lock()
+
+
+def get_clock(name, fetch_server_time_ms):
+    """
+    거래소별 공유 ClockOffsetEstimator 반환 (최초 호출 시 생성 및 시작)
+
+    같은 거래소의 두 패널은 같은 서버 시계를 보므로 하나의 추정기를 공유합니다.
+    """
+    with _clocks_lock:
+        clock = _clocks.get(name)
+        if clock is None:
+            clock = ClockOffsetEstimator(name, fetch_server_time_ms)
+            _clocks[name] = clock
+        clock.start()
+        return clock
+
+
+def get_clock_offset_ms(name):
+    """
+    이미 생성된 추정기의 서버-로컬 오프셋 (ms). 없으면 0.0
+
+    수신 지연 계측처럼 추정기를 새로 만들면 안 되는 곳에서 사용합니다 (락 없이 읽음).
+    """
+    clock = _clocks.get(name)
+    return clock._offset_ms if clock is not None else 0.0
+
+
+def clock_name_for(exchange, market_type):
+    """거래소/마켓별 추정기 이름 (BinanceAPI / BybitAPI의 get_clock 이름과 같음)"""
+    if exchange == "Binance":
+        return f"Binance-{'dapi' if market_type == 'dapi' else 'fapi'}"
+    return exchange
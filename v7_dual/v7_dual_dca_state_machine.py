@@ -0,0 +1,352 @@
+"""
+DCA/헷지 사이클 상태 기계 + 상태 저장 저널
+
+AutoTradeWorker의 진행 상태는 불리언 플래그 묶음(initial_entry_done, next_step_orders_placed,
+entry_price_at_step, monitoring_final_step_closure, ...)으로 표현됩니다.
+이 모듈은 플래그 조합을 명시적인 단계(phase)로 정의하고, process_tick은 단계별 처리 함수 1개로 분기합니다
+(AutoTradeWorker._phase_handlers). 상태 저장 시점은 타입이 있는 이벤트로 기록합니다.
+
+단계 (derive_phase):
+- idle:              실행 중 아님
+- entering:          Step 0 초기 진입 대기
+- placing_orders:    단계 체결 -> 다음 단계 지정가/헷지 트리거 생성 대기
+- waiting_fill:      다음 단계 지정가 체결 대기 (가격 트리거는 v7_dual_trigger_book)
+- final_step:        최종 단계 (보호 주문 / 청산 감지)
+- profit_monitoring: 역방향진입 체결 후 익절 모니터링
+- closing:           최종 단계 보호 주문 후 포지션 청산 모니터링
+                     (최종 단계 역방향진입 체결 후에는 익절 모니터링도 함께 진행 - entry_price_at_step 설정)
+
+플래그가 여전히 기준 값이며, 단계는 플래그에서 O(1)로 계산합니다 (상태 복원도 플래그 복원만으로 충분).
+DcaLifecycle.observe()가 틱마다 단계를 계산해 바뀌었으면 전이를 기록하고 처리할 단계를 돌려줍니다.
+TRANSITIONS에 없는 전이는 거부합니다 - 단계는 그대로 두고 observe()가 None을 돌려주므로
+process_tick은 플래그가 허용된 전이로 돌아올 때까지 (정지 / 사이클 재시작 포함) 주문을 내지 않습니다.
+거부는 같은 전이당 1번 transition_rejected 이벤트로 기록합니다.
+상태 복원은 단계를 idle로 두고 시작하므로 (start_trading 복구 모드) 복원된 어느 단계로든 전이할 수 있습니다.
+
+저널 (DcaJournal):
+save_dca_state_for_side는 상태 저장마다 api_config.json 전체를 다시 썼습니다.
+저널은 이전 저장 대비 바뀐 키만 JSONL 1줄로 이어 붙이고 (이벤트 포함),
+config의 dca_state는 체크포인트로 단계 변경 / COMPACT_EVERY줄마다만 씁니다.
+체크포인트에는 journal_seq가 들어가며, 로드 시 그 이후 줄만 재생합니다 (replay()).
+체크포인트 시점의 이벤트(단계 체결 등)는 저널을 비운 직후 이벤트 전용 줄로 남깁니다.
+"""
+
+import os
+import threading
+import time
+
+import v7_dual_fast_json as fast_json
+
+
+# ==================== 단계 ====================
+
+PHASE_IDLE = 'idle'
+PHASE_ENTERING = 'entering'
+PHASE_PLACING_ORDERS = 'placing_orders'
+PHASE_WAITING_FILL = 'waiting_fill'
+PHASE_FINAL_STEP = 'final_step'
+PHASE_PROFIT_MONITORING = 'profit_monitoring'
+PHASE_CLOSING = 'closing'
+
+_ACTIVE_PHASES = (PHASE_ENTERING, PHASE_PLACING_ORDERS, PHASE_WAITING_FILL, PHASE_FINAL_STEP,
+                  PHASE_PROFIT_MONITORING, PHASE_CLOSING)
+
+# 허용 전이 (시작/복원은 idle에서 어느 단계로든, 사이클 종료는 어느 단계에서든 entering/idle로)
+# closing으로는 최종 단계 보호 주문 / 강제 청산 감지를 실행하는 단계에서만
+# (entering: 체결 반영 전 포지션, placing_orders: 최종 단계 주문 생성 틱, profit_monitoring: 최종 단계 역방향진입)
+TRANSITIONS = {
+    PHASE_IDLE: frozenset(_ACTIVE_PHASES),
+    PHASE_ENTERING: frozenset({PHASE_PLACING_ORDERS, PHASE_CLOSING, PHASE_IDLE}),
+    PHASE_PLACING_ORDERS: frozenset({PHASE_WAITING_FILL, PHASE_FINAL_STEP, PHASE_PROFIT_MONITORING,
+                                     PHASE_CLOSING, PHASE_ENTERING, PHASE_IDLE}),
+    PHASE_WAITING_FILL: frozenset({PHASE_PLACING_ORDERS, PHASE_FINAL_STEP, PHASE_PROFIT_MONITORING,
+                                   PHASE_ENTERING, PHASE_IDLE}),
+    PHASE_FINAL_STEP: frozenset({PHASE_CLOSING, PHASE_PLACING_ORDERS, PHASE_PROFIT_MONITORING,
+                                 PHASE_ENTERING, PHASE_IDLE}),
+    PHASE_PROFIT_MONITORING: frozenset({PHASE_PLACING_ORDERS, PHASE_WAITING_FILL, PHASE_FINAL_STEP,
+                                        PHASE_CLOSING, PHASE_ENTERING, PHASE_IDLE}),
+    PHASE_CLOSING: frozenset({PHASE_ENTERING, PHASE_IDLE}),
+}
+
+
+def derive_phase(worker):
+    """워커 플래그 -> 단계"""
+    if not worker.is_running:
+        return PHASE_IDLE
+    if worker.monitoring_final_step_closure:
+        return PHASE_CLOSING
+    if not worker.initial_entry_done:
+        return PHASE_ENTERING
+    if worker.entry_price_at_step is not None:
+        return PHASE_PROFIT_MONITORING
+    if not worker.next_step_orders_placed:
+        return PHASE_PLACING_ORDERS
+    if worker.current_step + 1 >= worker.total_steps:
+        return PHASE_FINAL_STEP
+    return PHASE_WAITING_FILL
+
+
+# ==================== 이벤트 ====================
+
+EVENT_STARTED = 'started'
+EVENT_STOPPED = 'stopped'
+EVENT_PHASE_CHANGED = 'phase_changed'
+EVENT_TRANSITION_REJECTED = 'transition_rejected'
+EVENT_INITIAL_ENTRY = 'initial_entry'
+EVENT_STEP_FILLED = 'step_filled'
+EVENT_STEP_ORDERS_PLACED = 'step_orders_placed'
+EVENT_HEDGE_FIRED = 'hedge_fired'
+EVENT_SLIPPAGE_ADJUSTED = 'slippage_adjusted'
+EVENT_UPTREND_HEDGE_REDUCED = 'uptrend_hedge_reduced'
+EVENT_PROFIT_TAKEN = 'profit_taken'
+EVENT_FINAL_PROTECTION_PLACED = 'final_protection_placed'
+EVENT_CYCLE_CLOSED = 'cycle_closed'
+EVENT_SAFETY_ORDER_FILLED = 'safety_order_filled'
+
+
+class DcaEvent:
+    """사이클 이벤트 1건 (저널에 dict로 기록)"""
+
+    __slots__ = ('type', 'ts', 'phase_from', 'phase_to', 'step', 'data')
+
+    def __init__(self, type, phase_from, phase_to, step, data=None):
+        self.type = type
+        self.ts = time.time()
+        self.phase_from = phase_from
+        self.phase_to = phase_to
+        self.step = step
+        self.data = data
+
+    def to_dict(self):
+        record = {'type': self.type, 'ts': round(self.ts, 3), 'from': self.phase_from,
+                  'to': self.phase_to, 'step': self.step}
+        if self.data:
+            record['data'] = self.data
+        return record
+
+    def __repr__(self):
+        return f"DcaEvent({self.type} {self.phase_from}->{self.phase_to} step={self.step})"
+
+
+class DcaLifecycle:
+    """
+    워커 1개의 단계 추적 + 이벤트 버퍼
+
+    observe()/record()는 워커 스레드, drain()은 GUI 스레드(상태 저장)에서 호출됩니다.
+    """
+
+    MAX_PENDING = 500  # 저장되지 않은 이벤트 보관 한도 (저장이 멈췄을 때 메모리 보호)
+
+    def __init__(self, name="worker"):
+        self.name = name
+        self.phase = PHASE_IDLE
+        self.transitions = 0
+        self.rejected = 0
+        self._last_rejected = None  # 마지막으로 거부한 (이전, 다음) - 같은 전이는 1번만 기록
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def _append(self, event):
+        with self._lock:
+            self._pending.append(event)
+            if len(self._pending) > self.MAX_PENDING:
+                del self._pending[0]
+
+    def _set_phase(self, phase, event_type, step):
+        """
+        단계 전이 - TRANSITIONS에 없으면 거부 (단계 유지)
+
+        Returns:
+            bool: 전이 여부
+        """
+        previous = self.phase
+        if phase not in TRANSITIONS[previous]:
+            self.rejected += 1
+            if self._last_rejected != (previous, phase):
+                self._last_rejected = (previous, phase)
+                print(f"[DCA 단계] {self.name} 허용되지 않은 전이 거부: {previous} -> {phase} ({event_type})")
+                self._append(DcaEvent(EVENT_TRANSITION_REJECTED, previous, phase, step, {'event': event_type}))
+            return False
+        self.phase = phase
+        self.transitions += 1
+        self._last_rejected = None
+        return True
+
+    def observe(self, worker):
+        """
+        플래그에서 단계를 다시 계산해 바뀌었으면 전이 기록 (틱마다 호출, O(1))
+
+        Returns:
+            str: 이번 틱에 처리할 단계 (전이가 거부되면 None)
+        """
+        phase = derive_phase(worker)
+        if phase == self.phase:
+            return phase
+        previous = self.phase
+        if not self._set_phase(phase, EVENT_PHASE_CHANGED, worker.current_step):
+            return None
+        self._append(DcaEvent(EVENT_PHASE_CHANGED, previous, phase, worker.current_step))
+        return phase
+
+    def record(self, worker, event_type, data=None, phase=None):
+        """
+        사이클 이벤트 기록 (상태 저장 요청 시점) - 단계도 함께 갱신 (거부되면 단계 유지)
+
+        Args:
+            phase: 전이할 단계 (None이면 플래그에서 계산)
+
+        Returns:
+            DcaEvent
+        """
+        if phase is None:
+            phase = derive_phase(worker)
+        previous = self.phase
+        if phase != previous:
+            self._set_phase(phase, event_type, worker.current_step)
+        event = DcaEvent(event_type, previous, self.phase, worker.current_step, data)
+        self._append(event)
+        return event
+
+    def reset(self, phase=PHASE_IDLE):
+        self.phase = phase
+        self._last_rejected = None
+
+    def drain(self):
+        """저장되지 않은 이벤트 목록 (꺼낸 뒤 비움)"""
+        with self._lock:
+            events, self._pending = self._pending, []
+        return events
+
+
+# ==================== 저널 ====================
+
+COMPACT_EVERY = 200  # 저널이 이 줄 수를 넘으면 다음 저장에서 체크포인트
+
+
+class DcaJournal:
+    """
+    패널 1개의 DCA 상태 저널 (JSONL, GUI 스레드 전용)
+
+    한 줄: {"seq": n, "ts": t, "events": [...], "patch": {키: 값}}
+    체크포인트(config의 dca_state)에는 "journal_seq"를 넣고 저널 파일을 비웁니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.seq = 0
+        self.lines = 0
+        self._encoded = None  # 마지막 저장 상태 {키: 인코딩된 값} (None이면 체크포인트 필요)
+
+    def _encode(self, state):
+        return {key: fast_json.dumps(value) for key, value in state.items()}
+
+    def needs_checkpoint(self):
+        return self._encoded is None or self.lines >= COMPACT_EVERY
+
+    def checkpoint(self, state, save, events=()):
+        """
+        전체 상태를 기준점으로 저장 - save(state)로 config에 쓴 뒤 저널 파일을 비움
+
+        state에 journal_seq를 기록하므로 저널을 비우기 전에 종료돼도 재생 시 중복 적용되지 않습니다.
+        events가 있으면 비운 저널의 첫 줄(이벤트 전용, 바뀐 값 없음)로 기록합니다.
+        """
+        state['journal_seq'] = self.seq
+        save(state)
+        self._encoded = self._encode(state)
+        self.lines = 0
+        try:
+            with open(self.path, 'w', encoding='utf-8'):
+                pass
+        except OSError as e:
+            print(f"[DCA 저널] 저널 초기화 실패 ({self.path}): {e}")
+        if events:
+            self.append(state, events)
+
+    def append(self, state, events=()):
+        """
+        이전 저장 대비 바뀐 키만 1줄 추가
+
+        Returns:
+            int: 바뀐 키 수 (0이면 이벤트만 기록, 이벤트도 없으면 쓰지 않음)
+        """
+        encoded = self._encode(state)
+        patch = {key: state[key] for key, value in encoded.items() if self._encoded.get(key) != value}
+        if not patch and not events:
+            return 0
+        self.seq += 1
+        state['journal_seq'] = self.seq
+        patch['journal_seq'] = self.seq
+        encoded['journal_seq'] = fast_json.dumps(self.seq)
+        record = {'seq': self.seq, 'ts': round(time.time(), 3),
+                  'events': [e.to_dict() for e in events], 'patch': patch}
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(fast_json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"[DCA 저널] 기록 실패 ({self.path}): {e}")
+            self._encoded = None  # 다음 저장에서 체크포인트
+            return 0
+        self._encoded = encoded
+        self.lines += 1
+        return len(patch) - 1
+
+    def discard(self):
+        """사이클 종료/중지 - 저널 파일 삭제, 다음 저장은 체크포인트"""
+        self._encoded = None
+        self.lines = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[DCA 저널] 삭제 실패 ({self.path}): {e}")
+
+    def restore(self, state):
+        """
+        시작 시 체크포인트 + 저널 재생 (다음 저장은 체크포인트)
+
+        Returns:
+            tuple: (재생된 상태 dict, 재생한 줄 수, 재생한 이벤트 dict 목록)
+        """
+        state, applied, last_seq, events = self.replay(self.path, state)
+        self.seq = last_seq
+        self._encoded = None
+        return state, applied, events
+
+    @staticmethod
+    def replay(path, state):
+        """
+        체크포인트 state에 저널 재생 (journal_seq 이후 줄만)
+
+        Returns:
+            tuple: (재생된 상태 dict, 재생한 줄 수, 마지막 seq, 재생한 이벤트 dict 목록)
+        """
+        if not state:
+            return state, 0, 0, []
+        base_seq = state.get('journal_seq', 0)
+        state = dict(state)
+        applied = 0
+        last_seq = base_seq
+        events = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = fast_json.loads(line)
+                    except fast_json.DecodeError:
+                        print(f"[DCA 저널] 손상된 줄 이후 재생 중단 ({path})")
+                        break  # 기록 도중 종료된 마지막 줄
+                    if record.get('seq', 0) <= base_seq:
+                        continue
+                    state.update(record.get('patch') or {})
+                    events.extend(record.get('events') or ())
+                    last_seq = record['seq']
+                    applied += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[DCA 저널] 읽기 실패 ({path}): {e}")
+        return state, applied, last_seq, events
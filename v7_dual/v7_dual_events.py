@@ -0,0 +1,260 @@
+"""
+사용자 데이터 스트림 이벤트 레코드 (Binance & Bybit 공통)
+
+WebSocketThread가 거래소 원본 payload에서 바로 만들어 GUI/자동매매 워커로 전달합니다.
+기존에는 Bybit 메시지를 필드마다 Binance 형식 dict(문자열 값)로 옮긴 뒤
+소비하는 쪽에서 다시 float()로 파싱했습니다. 레코드는 숫자를 수신 시점에 한 번만 float로 변환하고,
+__slots__로 인스턴스 dict 없이 만들어집니다.
+
+- OrderUpdate: 주문 상태 변화 (ORDER_TRADE_UPDATE / Bybit order)
+- PositionUpdate: 포지션 1건 (ACCOUNT_UPDATE.P / Bybit position)
+- BalanceUpdate: 자산 잔액 1건 (ACCOUNT_UPDATE.B / Bybit wallet)
+- AccountUpdate: 잔액/포지션 묶음 (account_update_received 시그널 단위)
+
+주문 ID는 거래소와 관계없이 문자열입니다 (초기 미체결 주문 목록과 같은 키).
+event_time은 거래소 이벤트 시각(ms), recv_ts는 소켓 수신 시각(time.time())으로 피드 지연 계측에 쓰입니다.
+to_binance()는 Binance 형식 dict가 필요한 기존 단일 패널 핸들러 호환용입니다.
+"""
+
+import time
+
+
+TERMINAL_ORDER_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED')
+
+# Bybit 주문 상태 -> Binance 형식
+BYBIT_ORDER_STATUS = {
+    'Created': 'NEW',
+    'New': 'NEW',
+    'PartiallyFilled': 'PARTIALLY_FILLED',
+    'PartiallyFilledCanceled': 'CANCELED',
+    'Filled': 'FILLED',
+    'Cancelled': 'CANCELED',
+    'Deactivated': 'CANCELED',
+    'Rejected': 'REJECTED',
+    'Untriggered': 'NEW',
+    'Triggered': 'NEW',
+}
+
+
+def _num(value):
+    """거래소 숫자 문자열 -> float (빈 값/형식 오류는 0.0)"""
+    if value is None or value == '':
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _num_or_none(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class OrderUpdate:
+    """주문 상태 변화 1건"""
+
+    __slots__ = ('symbol', 'order_id', 'status', 'order_type', 'side', 'price', 'qty',
+                 'filled_qty', 'avg_price', 'reason', 'event_time', 'backfill', 'recv_ts')
+
+    def __init__(self, symbol, order_id, status, order_type='', side='', price=0.0, qty=0.0,
+                 filled_qty=0.0, avg_price=0.0, reason='', event_time=0, backfill=False):
+        self.symbol = symbol
+        self.order_id = order_id
+        self.status = status
+        self.order_type = order_type
+        self.side = side
+        self.price = price
+        self.qty = qty
+        self.filled_qty = filled_qty
+        self.avg_price = avg_price
+        self.reason = reason
+        self.event_time = event_time
+        self.backfill = backfill
+        self.recv_ts = 0.0
+
+    @classmethod
+    def from_binance(cls, o, event_time=0):
+        """ORDER_TRADE_UPDATE의 'o' 객체에서 생성"""
+        return cls(o.get('s'), str(o.get('i')), o.get('X'), o.get('o', ''), o.get('S', ''),
+                   _num(o.get('p')), _num(o.get('q')), _num(o.get('z')), _num(o.get('ap')),
+                   o.get('r', ''), event_time or o.get('T') or 0)
+
+    @classmethod
+    def from_bybit(cls, o):
+        """Bybit V5 order 토픽 항목에서 생성"""
+        status = o.get('orderStatus') or ''
+        return cls(o.get('symbol'), str(o.get('orderId')), BYBIT_ORDER_STATUS.get(status, status.upper()),
+                   o.get('orderType', ''), o.get('side', ''), _num(o.get('price')), _num(o.get('qty')),
+                   _num(o.get('cumExecQty')), _num(o.get('avgPrice')), o.get('rejectReason', ''),
+                   int(o.get('updatedTime') or 0))
+
+    @classmethod
+    def from_rest(cls, order, status=None, backfill=True):
+        """
+        REST 주문(allOrders / 미체결 주문 정규화 형식)에서 생성
+
+        status를 주지 않고 주문에도 상태 필드가 없으면 체결 수량으로 NEW / PARTIALLY_FILLED를 정합니다.
+        """
+        filled = _num(order.get('executedQty'))
+        if status is None:
+            status = order.get('status') or ('PARTIALLY_FILLED' if filled > 0 else 'NEW')
+        return cls(order.get('symbol'), str(order.get('orderId')), status, order.get('type', ''),
+                   order.get('side', ''), _num(order.get('price')), _num(order.get('origQty')),
+                   filled, _num(order.get('avgPrice')), '', int(order.get('updateTime') or 0) or _now_ms(),
+                   backfill)
+
+    @property
+    def is_terminal(self):
+        return self.status in TERMINAL_ORDER_STATUSES
+
+    def to_binance(self):
+        """Binance ORDER_TRADE_UPDATE 형식 dict (기존 핸들러 호환용)"""
+        return {
+            'e': 'ORDER_TRADE_UPDATE',
+            'E': self.event_time,
+            'o': {
+                'i': self.order_id, 'X': self.status, 's': self.symbol, 'o': self.order_type,
+                'S': self.side, 'p': str(self.price), 'q': str(self.qty), 'z': str(self.filled_qty),
+                'ap': str(self.avg_price), 'r': self.reason,
+            }
+        }
+
+    def __repr__(self):
+        return (f"OrderUpdate({self.symbol} #{self.order_id} {self.status} {self.side} "
+                f"{self.filled_qty}/{self.qty} @ {self.avg_price})")
+
+
+class PositionUpdate:
+    """포지션 1건 (amount: LONG 양수 / SHORT 음수, 0이면 청산)"""
+
+    __slots__ = ('symbol', 'position_side', 'amount', 'entry_price', 'unrealized_pnl',
+                 'initial_margin', 'mark_price', 'liq_price')
+
+    def __init__(self, symbol, position_side, amount, entry_price=0.0, unrealized_pnl=0.0,
+                 initial_margin=0.0, mark_price=0.0, liq_price=0.0):
+        self.symbol = symbol
+        self.position_side = position_side
+        self.amount = amount
+        self.entry_price = entry_price
+        self.unrealized_pnl = unrealized_pnl
+        self.initial_margin = initial_margin
+        self.mark_price = mark_price
+        self.liq_price = liq_price
+
+    @classmethod
+    def from_binance(cls, p):
+        """ACCOUNT_UPDATE의 'P' 항목에서 생성"""
+        return cls(p.get('s'), p.get('ps', 'BOTH'), _num(p.get('pa')), _num(p.get('ep')),
+                   _num(p.get('up')), _num(p.get('iw')), _num(p.get('mp')), _num(p.get('lp')))
+
+    @classmethod
+    def from_bybit(cls, p):
+        """
+        Bybit V5 position 토픽 항목에서 생성
+
+        positionIdx로 헤지 모드 구분: 0 = One-Way, 1 = Hedge Long, 2 = Hedge Short
+        """
+        position_idx = p.get('positionIdx', 0)
+        if position_idx == 1:
+            position_side = 'LONG'
+        elif position_idx == 2:
+            position_side = 'SHORT'
+        else:
+            side = p.get('side')
+            position_side = 'LONG' if side == 'Buy' else 'SHORT' if side == 'Sell' else 'BOTH'
+
+        amount = _num(p.get('size'))
+        if position_side == 'SHORT':
+            amount = -amount
+        return cls(p.get('symbol'), position_side, amount,
+                   _num(p.get('avgPrice') or p.get('entryPrice')), _num(p.get('unrealisedPnl')),
+                   _num(p.get('positionIM')), _num(p.get('markPrice')), _num(p.get('liqPrice')))
+
+    @classmethod
+    def from_rest(cls, p):
+        """get_initial_positions 항목에서 생성"""
+        return cls(p.get('symbol'), p.get('positionSide', 'BOTH'), _num(p.get('positionAmt')),
+                   _num(p.get('entryPrice')), _num(p.get('unRealizedProfit')),
+                   _num(p.get('initialMargin', p.get('isolatedMargin'))), _num(p.get('markPrice')),
+                   _num(p.get('liquidationPrice', p.get('liqPrice'))))
+
+    def to_binance(self):
+        return {'s': self.symbol, 'ps': self.position_side, 'pa': str(self.amount),
+                'ep': str(self.entry_price), 'up': str(self.unrealized_pnl), 'im': str(self.initial_margin),
+                'mp': str(self.mark_price), 'lp': str(self.liq_price)}
+
+    def __repr__(self):
+        return f"PositionUpdate({self.symbol} {self.position_side} {self.amount} @ {self.entry_price})"
+
+
+class BalanceUpdate:
+    """자산 잔액 1건 (wallet_balance가 None이면 값 없음)"""
+
+    __slots__ = ('asset', 'wallet_balance')
+
+    def __init__(self, asset, wallet_balance):
+        self.asset = asset
+        self.wallet_balance = wallet_balance
+
+    @classmethod
+    def from_binance(cls, b):
+        return cls(b.get('a'), _num_or_none(b.get('wb')))
+
+    @classmethod
+    def from_bybit(cls, c):
+        return cls(c.get('coin'), _num_or_none(c.get('walletBalance')))
+
+    def to_binance(self):
+        return {'a': self.asset, 'wb': None if self.wallet_balance is None else str(self.wallet_balance)}
+
+    def __repr__(self):
+        return f"BalanceUpdate({self.asset} {self.wallet_balance})"
+
+
+class AccountUpdate:
+    """잔액/포지션 변경 묶음 (account_update_received 1건)"""
+
+    __slots__ = ('balances', 'positions', 'event_time', 'backfill', 'recv_ts')
+
+    def __init__(self, balances=(), positions=(), event_time=0, backfill=False):
+        self.balances = balances
+        self.positions = positions
+        self.event_time = event_time or _now_ms()
+        self.backfill = backfill
+        self.recv_ts = 0.0
+
+    @classmethod
+    def from_binance(cls, data):
+        """Binance ACCOUNT_UPDATE 메시지에서 생성"""
+        a = data.get('a') or {}
+        return cls(tuple(BalanceUpdate.from_binance(b) for b in a.get('B') or ()),
+                   tuple(PositionUpdate.from_binance(p) for p in a.get('P') or ()),
+                   data.get('E', 0))
+
+    @classmethod
+    def from_bybit_wallet(cls, payload, event_time=0):
+        """Bybit wallet 토픽: [{accountType, coin: [{coin, walletBalance, ...}]}]"""
+        return cls(tuple(BalanceUpdate.from_bybit(c) for account in payload for c in account.get('coin') or ()),
+                   event_time=event_time)
+
+    @classmethod
+    def from_bybit_positions(cls, payload, event_time=0):
+        return cls(positions=tuple(PositionUpdate.from_bybit(p) for p in payload), event_time=event_time)
+
+    def to_binance(self):
+        """Binance ACCOUNT_UPDATE 형식 dict (기존 핸들러 호환용)"""
+        return {'e': 'ACCOUNT_UPDATE', 'E': self.event_time,
+                'a': {'B': [b.to_binance() for b in self.balances],
+                      'P': [p.to_binance() for p in self.positions]}}
+
+    def __repr__(self):
+        return f"AccountUpdate(balances={len(self.balances)}, positions={list(self.positions)})"
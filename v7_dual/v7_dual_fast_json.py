@@ -0,0 +1,53 @@
+"""
+JSON 디코더 선택 (웹소켓 수신 경로용)
+
+설치되어 있으면 orjson -> msgspec 순으로 사용하고, 없으면 표준 json을 사용합니다.
+모든 체결/포지션/티커 메시지가 이 경로로 디코딩되므로 C 구현 디코더가 있으면 그쪽을 씁니다.
+
+- loads(str | bytes) -> 파이썬 객체
+- dumps(obj) -> str (웹소켓 텍스트 프레임 전송용)
+- DecodeError: 디코딩 실패 시 잡을 예외 (튜플)
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 선택 의존성
+    msgspec = None
+
+
+if orjson is not None:
+    DECODER_NAME = "orjson"
+    DecodeError = (orjson.JSONDecodeError, ValueError)
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+elif msgspec is not None:
+    DECODER_NAME = "msgspec"
+    DecodeError = (msgspec.DecodeError, ValueError)
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+    def loads(data):
+        return _decoder.decode(data)
+
+    def dumps(obj):
+        return _encoder.encode(obj).decode('utf-8')
+
+else:
+    DECODER_NAME = "json"
+    DecodeError = (json.JSONDecodeError,)
+    loads = json.loads
+
+    def dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
@@ -0,0 +1,203 @@
+"""
+실시간 데이터 피드 지연 계측 (거래소 이벤트 시각 -> 워커 판단)
+
+이벤트마다 4개 시각을 기록하고 스트림별로 최근 구간 분포를 유지합니다.
+- event:   거래소 이벤트 시각 (Binance 'E' / Bybit 'ts', 'creationTime', 'updatedTime'), ms
+- recv:    소켓 수신 시각 (디코딩 전)
+- deliver: 처리 스레드(GUI/워커)에 전달된 시각
+- consume: 처리 완료 시각 (process_tick / on_order_update 반환)
+
+구간:
+- network: event -> recv (서버 시간 오프셋 보정, v7_dual_clock_sync)
+- queue:   recv -> deliver (리액터 -> 시그널 큐 대기)
+- handler: deliver -> consume
+- total:   event -> consume (피드 지연, 경보 기준)
+
+분포는 ROLLING_WINDOW_SEC 단위로 교체되는 히스토그램 2개로 유지하므로 최근 1~2구간만 반영됩니다.
+ResourceMonitor가 주기적으로 summary()를 GUI에 전달하고, total p95가 임계값을 넘으면 경보를 보냅니다.
+"""
+
+import threading
+import time
+
+from v7_dual_clock_sync import get_clock_offset_ms
+from v7_dual_metrics import LatencyHistogram
+
+
+ROLLING_WINDOW_SEC = 30.0
+DEFAULT_LAG_ALERT_MS = 1500.0   # total p95가 이 값을 넘으면 경보
+MIN_ALERT_SAMPLES = 5           # 표본이 적은 스트림은 경보 판단에서 제외
+
+
+class RollingHistogram:
+    """최근 1~2구간만 반영하는 지연 히스토그램 (현재 구간 + 직전 구간)"""
+
+    __slots__ = ('window', 'current', 'previous', 'started_at')
+
+    def __init__(self, window=ROLLING_WINDOW_SEC):
+        self.window = window
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.started_at = time.monotonic()
+
+    def _rotate(self, now):
+        elapsed = now - self.started_at
+        if elapsed < self.window:
+            return
+        # 두 구간 이상 표본이 없었으면 직전 구간도 비움
+        self.previous = self.current if elapsed < 2 * self.window else LatencyHistogram()
+        self.current = LatencyHistogram()
+        self.started_at = now
+
+    def add(self, elapsed_ms, now):
+        self._rotate(now)
+        self.current.add(elapsed_ms)
+
+    def merged(self, now):
+        self._rotate(now)
+        hist = LatencyHistogram()
+        hist.merge(self.previous)
+        hist.merge(self.current)
+        return hist
+
+
+class _StreamLatency:
+    """스트림 1개의 구간별 분포"""
+
+    __slots__ = ('network', 'queue', 'handler', 'total', 'events', 'last_total_ms', 'last_seen')
+
+    def __init__(self):
+        self.network = RollingHistogram()
+        self.queue = RollingHistogram()
+        self.handler = RollingHistogram()
+        self.total = RollingHistogram()
+        self.events = 0
+        self.last_total_ms = None
+        self.last_seen = 0.0
+
+
+class FeedLatencyMetrics:
+    """프로세스 전역 피드 지연 계측기 (스레드 안전, 리액터/GUI/워커 스레드에서 호출)"""
+
+    def __init__(self, alert_threshold_ms=DEFAULT_LAG_ALERT_MS):
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._alerting = set()
+        self.alert_threshold_ms = alert_threshold_ms
+
+    def set_alert_threshold(self, threshold_ms):
+        try:
+            self.alert_threshold_ms = max(1.0, float(threshold_ms))
+        except (TypeError, ValueError):
+            self.alert_threshold_ms = DEFAULT_LAG_ALERT_MS
+
+    def record(self, stream, event_ms, recv_ts, deliver_ts=None, consume_ts=None, clock_name=None):
+        """
+        이벤트 1건 기록
+
+        Args:
+            stream: 스트림 이름 (예: "ticker(long)", "user(short)")
+            event_ms: 거래소 이벤트 시각 (ms, 없으면 None - network/total 생략)
+            recv_ts / deliver_ts / consume_ts: time.time() 값 (초)
+            clock_name: 서버 시간 오프셋 보정에 쓸 추정기 이름 (v7_dual_clock_sync.clock_name_for)
+        """
+        now = time.monotonic()
+        network_ms = total_ms = None
+        if event_ms:
+            server_recv_ms = recv_ts * 1000 + (get_clock_offset_ms(clock_name) if clock_name else 0.0)
+            network_ms = max(0.0, server_recv_ms - event_ms)
+            if consume_ts is not None:
+                total_ms = network_ms + (consume_ts - recv_ts) * 1000
+
+        with self._lock:
+            entry = self._streams.get(stream)
+            if entry is None:
+                entry = self._streams[stream] = _StreamLatency()
+            entry.events += 1
+            entry.last_seen = now
+            if network_ms is not None:
+                entry.network.add(network_ms, now)
+            if deliver_ts is not None:
+                entry.queue.add(max(0.0, (deliver_ts - recv_ts) * 1000), now)
+                if consume_ts is not None:
+                    entry.handler.add(max(0.0, (consume_ts - deliver_ts) * 1000), now)
+            if total_ms is not None:
+                entry.total.add(total_ms, now)
+                entry.last_total_ms = total_ms
+
+    def summary(self):
+        """
+        스트림별 최근 구간 통계
+
+        Returns:
+            dict: {stream: {'count', 'events', 'network_p50_ms', 'network_p95_ms', 'queue_p95_ms',
+                            'handler_p95_ms', 'total_p50_ms', 'total_p95_ms', 'total_p99_ms',
+                            'last_lag_ms', 'idle_sec'}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for stream, e in self._streams.items():
+                network = e.network.merged(now)
+                queue = e.queue.merged(now)
+                handler = e.handler.merged(now)
+                total = e.total.merged(now)
+                result[stream] = {
+                    'count': max(network.count, queue.count),
+                    'events': e.events,
+                    'network_p50_ms': network.percentile(50),
+                    'network_p95_ms': network.percentile(95),
+                    'queue_p95_ms': queue.percentile(95),
+                    'handler_p95_ms': handler.percentile(95),
+                    'total_p50_ms': total.percentile(50),
+                    'total_p95_ms': total.percentile(95),
+                    'total_p99_ms': total.percentile(99),
+                    'total_count': total.count,
+                    'last_lag_ms': e.last_total_ms,
+                    'idle_sec': now - e.last_seen,
+                }
+            return result
+
+    def update_alerts(self, summary=None):
+        """
+        임계값 기준 경보 상태 갱신
+
+        Returns:
+            list: 상태가 바뀐 스트림 [(stream, total_p95_ms, alerting), ...]
+        """
+        if summary is None:
+            summary = self.summary()
+        changes = []
+        for stream, s in summary.items():
+            alerting = s['total_count'] >= MIN_ALERT_SAMPLES and s['total_p95_ms'] > self.alert_threshold_ms
+            if alerting and stream not in self._alerting:
+                self._alerting.add(stream)
+                changes.append((stream, s['total_p95_ms'], True))
+            elif not alerting and stream in self._alerting:
+                self._alerting.discard(stream)
+                changes.append((stream, s['total_p95_ms'], False))
+        return changes
+
+    def forget(self, stream):
+        """스트림 통계 삭제 (연결 해제 시)"""
+        with self._lock:
+            self._streams.pop(stream, None)
+        self._alerting.discard(stream)
+
+    def reset(self):
+        with self._lock:
+            self._streams.clear()
+        self._alerting.clear()
+
+
+_feed_metrics = None
+_feed_metrics_lock = threading.Lock()
+
+
+def get_feed_metrics():
+    """프로세스 전역 FeedLatencyMetrics 반환 (두 패널이 공유)"""
+    global _feed_metrics
+    with _feed_metrics_lock:
+        if _feed_metrics is None:
+            _feed_metrics = FeedLatencyMetrics()
+        return _feed_metrics
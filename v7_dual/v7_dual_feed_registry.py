@@ -0,0 +1,229 @@
+"""
+공개 피드 공유 레지스트리 (LONG/SHORT 패널이 같은 심볼을 거래할 때)
+
+(거래소, 마켓, 심볼, 스트림) 키마다 스트림(MuxStream) 1개를 만들고 소비자(패널/차트/워커) 참조 수로 관리합니다.
+멀티플렉서(v7_dual_stream_mux)는 연결과 JSON 디코딩만 공유하므로, 패널마다 스트림을 만들면
+같은 메시지를 스트림 수만큼 다시 해석(float 변환/형식 변환)하고 시그널도 따로 보냈습니다.
+레지스트리를 거치면 메시지는 스트림 1개에서 한 번 해석되고 소비자에게 나눠 전달됩니다.
+
+- 스트림 이름: 'ticker' / 'depth' / kline_stream(interval) (Bybit 'kline.{interval}')
+- acquire(): 없으면 생성 후 시작, 있으면 소비자만 추가. slots(시그널 이름 -> 슬롯)은 소비자별로 연결
+- release(): 소비자 슬롯 연결 해제, 마지막 소비자가 빠지면 스트림 중지 (토픽 해지, 지연 통계 삭제)
+- switch(): 심볼/간격 변경 - 새 키를 먼저 획득한 뒤 이전 키를 반환하므로 구독 공백이 없고,
+  다른 패널이 쓰고 있는 이전 피드는 그대로 유지됩니다.
+
+시그널 연결/해제가 GUI 스레드에서 일어나야 하므로 GUI 스레드에서 호출합니다.
+"""
+
+import threading
+
+from v7_dual_feed_metrics import get_feed_metrics
+from v7_dual_order_book import create_depth_stream
+from v7_dual_ticker_ws import BybitKlineSocketThread, create_ticker_thread
+
+
+STREAM_TICKER = 'ticker'
+STREAM_DEPTH = 'depth'
+KLINE_PREFIX = 'kline.'
+
+
+def kline_stream(interval):
+    """캔들 스트림 이름 (Bybit 간격 문자열, 예: '5', '60', 'D')"""
+    return f"{KLINE_PREFIX}{interval}"
+
+
+def feed_key(exchange, market_type, symbol, stream):
+    """레지스트리 키 (마켓 별칭 linear/inverse와 심볼 대소문자를 통일)"""
+    market = 'dapi' if market_type in ('dapi', 'inverse') else 'fapi'
+    return (exchange, market, symbol.upper(), stream)
+
+
+class _FeedEntry:
+    """공유 피드 1개 + 소비자별 (슬롯, 옵션)"""
+
+    __slots__ = ('feed', 'exchange', 'market_type', 'api_module', 'consumers')
+
+    def __init__(self, feed, exchange, market_type, api_module):
+        self.feed = feed
+        self.exchange = exchange
+        self.market_type = market_type
+        self.api_module = api_module
+        self.consumers = {}  # 소비자 -> (slots, options)
+
+
+class PublicFeedRegistry:
+    """참조 수 기반 공개 피드 공유"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # feed_key -> _FeedEntry
+
+    # ==================== 생성 ====================
+
+    @staticmethod
+    def _create(exchange, market_type, symbol, stream, api_module):
+        if stream == STREAM_TICKER:
+            feed = create_ticker_thread(exchange, market_type, symbol)
+        elif stream == STREAM_DEPTH:
+            feed = create_depth_stream(exchange, market_type, symbol, api_module)
+        elif stream.startswith(KLINE_PREFIX):
+            if exchange != "Bybit":
+                raise ValueError(f"{exchange}는 캔들 웹소켓 피드를 지원하지 않습니다.")
+            feed = BybitKlineSocketThread(market_type, symbol, stream[len(KLINE_PREFIX):])
+        else:
+            raise ValueError(f"알 수 없는 스트림: {stream}")
+        feed.latency_key = f"{stream}({symbol.upper()})"
+        return feed
+
+    def _find(self, feed):
+        for key, entry in self._entries.items():
+            if entry.feed is feed:
+                return key, entry
+        return None, None
+
+    @staticmethod
+    def _connect(feed, slots):
+        for name, slot in slots.items():
+            getattr(feed, name).connect(slot)
+
+    @staticmethod
+    def _disconnect(feed, slots):
+        for name, slot in slots.items():
+            try:
+                getattr(feed, name).disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass  # 이미 해제됨
+
+    @staticmethod
+    def _describe(key):
+        exchange, market, symbol, stream = key
+        return f"{exchange}({market}) {symbol} {stream}"
+
+    # ==================== 외부 API ====================
+
+    def acquire(self, exchange, market_type, symbol, stream, consumer, slots=None, api_module=None, **options):
+        """
+        공유 피드 획득 (없으면 생성 후 시작)
+
+        Args:
+            stream: 'ticker' / 'depth' / kline_stream(interval)
+            consumer: 소비자 이름 (예: "panel(long)") - 같은 소비자가 다시 획득하면 슬롯/옵션만 교체
+            slots: {시그널 이름: 슬롯} - 이 소비자 몫으로 연결하고 release() 때 해제
+            api_module: 호가창 REST 스냅샷용 (depth 생성 시에만 사용)
+            options: 스트림별 소비자 옵션 (티커: tick_sink, price_source)
+
+        Returns:
+            MuxStream (지원하지 않는 거래소/스트림이면 ValueError)
+        """
+        key = feed_key(exchange, market_type, symbol, stream)
+        slots = dict(slots or {})
+        with self._lock:
+            entry = self._entries.get(key)
+            created = entry is None
+            if created:
+                feed = self._create(exchange, market_type, symbol, stream, api_module)
+                entry = self._entries[key] = _FeedEntry(feed, exchange, market_type, api_module)
+            previous = entry.consumers.get(consumer)
+            entry.consumers[consumer] = (slots, options)
+            consumer_count = len(entry.consumers)
+
+        feed = entry.feed
+        if previous is not None:
+            self._disconnect(feed, previous[0])
+        self._connect(feed, slots)
+        feed.attach_consumer(consumer, **options)
+        if created:
+            feed.start()
+            print(f"[공유 피드] {self._describe(key)} 시작 ({consumer})")
+        elif previous is None:
+            print(f"[공유 피드] {self._describe(key)} 공유 ({consumer}, 소비자 {consumer_count})")
+        return feed
+
+    def update_consumer(self, feed, consumer, **options):
+        """소비자 옵션 변경 (예: 티커 가격 소스) - switch() 때도 새 옵션을 사용"""
+        with self._lock:
+            _, entry = self._find(feed)
+            if entry is None or consumer not in entry.consumers:
+                return
+            slots, old_options = entry.consumers[consumer]
+            entry.consumers[consumer] = (slots, {**old_options, **options})
+        feed.attach_consumer(consumer, **options)
+
+    def release(self, feed, consumer):
+        """
+        소비자 반환 (마지막 소비자면 스트림 중지)
+
+        Returns:
+            bool: 스트림이 중지되었으면 True
+        """
+        with self._lock:
+            key, entry = self._find(feed)
+            if entry is None:
+                return False
+            state = entry.consumers.pop(consumer, None)
+            if state is None:
+                return False
+            last = not entry.consumers
+            if last:
+                del self._entries[key]
+
+        self._disconnect(feed, state[0])
+        feed.detach_consumer(consumer)
+        if last:
+            feed.stop()
+            get_feed_metrics().forget(feed.latency_key)
+            print(f"[공유 피드] {self._describe(key)} 종료 (마지막 소비자 {consumer})")
+        return last
+
+    def switch(self, feed, consumer, symbol=None, stream=None):
+        """
+        소비자의 피드를 다른 심볼/스트림으로 교체 (새 피드 획득 -> 이전 피드 반환)
+
+        Returns:
+            새 피드 (키가 같거나 등록되지 않은 소비자면 기존 feed)
+        """
+        with self._lock:
+            key, entry = self._find(feed)
+            if entry is None or consumer not in entry.consumers:
+                return feed
+            slots, options = entry.consumers[consumer]
+            exchange, market_type, api_module = entry.exchange, entry.market_type, entry.api_module
+        new_symbol = symbol or key[2]
+        new_stream = stream or key[3]
+        if feed_key(exchange, market_type, new_symbol, new_stream) == key:
+            return feed
+
+        new_feed = self.acquire(exchange, market_type, new_symbol, new_stream, consumer, slots, api_module, **options)
+        self.release(feed, consumer)
+        return new_feed
+
+    def release_all(self, consumer):
+        """소비자가 가진 피드 전체 반환 (패널 재연결/종료 시)"""
+        with self._lock:
+            feeds = [entry.feed for entry in self._entries.values() if consumer in entry.consumers]
+        for feed in feeds:
+            self.release(feed, consumer)
+        return len(feeds)
+
+    def owns(self, feed):
+        """레지스트리가 관리 중인 피드인지 (직접 stop()하면 다른 소비자까지 끊김)"""
+        with self._lock:
+            return self._find(feed)[1] is not None
+
+    def snapshot(self):
+        """진단용: {'거래소(마켓) 심볼 스트림': [소비자, ...]}"""
+        with self._lock:
+            return {self._describe(key): list(entry.consumers) for key, entry in self._entries.items()}
+
+
+_feed_registry = None
+_feed_registry_lock = threading.Lock()
+
+
+def get_feed_registry():
+    """프로세스 전역 PublicFeedRegistry 반환 (두 패널이 공유)"""
+    global _feed_registry
+    with _feed_registry_lock:
+        if _feed_registry is None:
+            _feed_registry = PublicFeedRegistry()
+        return _feed_registry
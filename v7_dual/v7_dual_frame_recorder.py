@@ -0,0 +1,348 @@
+"""
+웹소켓 원본 프레임 기록/재생 (장애 재현, 처리량 측정, 전략 회귀 테스트용)
+
+기록 (opt-in, app_settings["ws_capture_enabled"]):
+- 공개 스트림 멀티플렉서(티커/캔들/호가창)와 사용자 데이터 스트림이 받은 원본 텍스트 프레임을
+  소켓 수신 시각과 함께 gzip 압축 바이너리 로그에 이어 씁니다.
+- 수신 경로(리액터 스레드)에서는 큐에 넣기만 하고, 압축/파일 쓰기는 전용 스레드에서 처리합니다.
+  큐는 크기 제한이 있어 디스크가 밀리면 프레임을 버리고 dropped로 집계합니다 (수신 경로는 막지 않음).
+- 파일 크기(압축 전) 또는 시간 기준으로 새 파일로 교체하고, 오래된 파일은 max_files개만 남깁니다.
+
+파일 형식 (gzip 안):
+    b"V7WSCAP1"
+    'S' <H 소스 id> <H 이름 길이> 이름      - 소스 정의 (파일마다 처음 쓸 때 1회)
+    'F' <d 수신 시각> <H 소스 id> <I 길이> 프레임  - 원본 프레임 (UTF-8)
+
+소스 이름:
+- "mux/{거래소}/{fapi|dapi}": 공개 스트림 멀티플렉서 (재생 시 같은 멀티플렉서의 디스패치로 전달)
+- "user/{거래소}/{side}": 사용자 데이터 스트림 (재생 시 bind()로 연결한 WebSocketThread로 전달)
+
+재생 (FrameReplayer): 기록된 프레임을 같은 처리 경로(디코딩 -> 토픽 리스너 / 주문·계정 이벤트)로 다시 넣습니다.
+speed=1.0 원래 속도, 2.0 두 배속, 0 최대 속도. 재생 전 set_replay_mode(True)로 공개 스트림의 실제 연결을 막습니다.
+재생 중 피드 지연 계측의 network/total 구간은 기록 시점 이벤트 시각 기준이므로 의미가 없고, queue/handler 구간만 유효합니다.
+"""
+
+import asyncio
+import glob
+import gzip
+import os
+import queue
+import struct
+import threading
+import time
+from datetime import datetime
+
+from v7_dual_config_manager import SCRIPT_DIR
+
+
+CAPTURE_DIR = os.path.join(SCRIPT_DIR, "ws_capture")
+CAPTURE_MAGIC = b"V7WSCAP1"
+CAPTURE_PATTERN = "ws_capture_*.bin.gz"
+
+DEFAULT_MAX_FILE_MB = 256       # 압축 전 기준 파일 교체 크기
+DEFAULT_ROTATE_SEC = 3600       # 파일 교체 주기 (초)
+DEFAULT_MAX_FILES = 24          # 보관 파일 수
+COMPRESS_LEVEL = 3              # 수신량 대비 CPU 부담이 적은 압축 수준
+FLUSH_INTERVAL = 5.0            # 비정상 종료 시 잃는 구간 상한 (초)
+DEFAULT_QUEUE_SIZE = 50000      # 기록 대기 프레임 상한 (넘치면 버림)
+REPLAY_YIELD_EVERY = 500        # 최대 속도 재생 시 이벤트 루프 양보 간격 (프레임)
+
+_SOURCE = struct.Struct('<HH')
+_FRAME = struct.Struct('<dHI')
+_STOP = object()
+
+
+def mux_source(exchange, market_type):
+    """공개 스트림 멀티플렉서 소스 이름"""
+    market = 'dapi' if market_type in ('dapi', 'inverse') else 'fapi'
+    return f"mux/{exchange}/{market}"
+
+
+def user_source(exchange, side):
+    """사용자 데이터 스트림 소스 이름"""
+    return f"user/{exchange}/{side}"
+
+
+class FrameRecorder:
+    """원본 프레임 기록기 (record()는 아무 스레드에서나 호출, 쓰기는 전용 스레드)"""
+
+    def __init__(self, directory=CAPTURE_DIR, max_file_mb=DEFAULT_MAX_FILE_MB,
+                 rotate_sec=DEFAULT_ROTATE_SEC, max_files=DEFAULT_MAX_FILES,
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        self.directory = directory
+        self.max_file_bytes = int(max_file_mb * 1024 * 1024)
+        self.rotate_sec = rotate_sec
+        self.max_files = max(1, int(max_files))
+
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.current_path = None
+
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._running = True
+        self._thread.start()
+
+    def record(self, source, frame, recv_ts):
+        """프레임 1건 기록 요청 (수신 경로용, 큐에 넣기만 함 - 큐가 가득 차면 버림)"""
+        if self._running:
+            try:
+                self._queue.put_nowait((source, frame, recv_ts))
+            except queue.Full:
+                self.dropped += 1
+
+    def close(self, timeout=5):
+        """남은 프레임을 쓰고 파일을 닫음"""
+        if not self._running:
+            return
+        self._running = False
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("[프레임 기록] 종료 신호 전달 실패 (큐 가득 참)")
+            return
+        self._thread.join(timeout)
+
+    # ==================== 기록 스레드 ====================
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"ws_capture_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.bin.gz")
+        f = gzip.open(path, 'wb', compresslevel=COMPRESS_LEVEL)
+        f.write(CAPTURE_MAGIC)
+        self.current_path = path
+        self._prune()
+        print(f"[프레임 기록] 새 파일: {path}")
+        return f
+
+    def _prune(self):
+        """오래된 기록 파일 삭제 (max_files개 유지)"""
+        files = sorted(glob.glob(os.path.join(self.directory, CAPTURE_PATTERN)))
+        for path in files[:-self.max_files]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"[프레임 기록] 오래된 파일 삭제 실패 ({path}): {e}")
+
+    def _run(self):
+        f = None
+        source_ids = {}
+        file_bytes = 0
+        opened_at = last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = None
+
+                now = time.monotonic()
+                if item is _STOP:
+                    break
+                if item is not None:
+                    if f is None or file_bytes >= self.max_file_bytes or now - opened_at >= self.rotate_sec:
+                        if f is not None:
+                            f.close()
+                        f = self._open()
+                        source_ids = {}
+                        file_bytes = len(CAPTURE_MAGIC)
+                        opened_at = now
+
+                    source, frame, recv_ts = item
+                    if isinstance(frame, str):
+                        frame = frame.encode('utf-8')
+                    source_id = source_ids.get(source)
+                    if source_id is None:
+                        source_id = source_ids[source] = len(source_ids)
+                        name = source.encode('utf-8')
+                        f.write(b'S' + _SOURCE.pack(source_id, len(name)) + name)
+                    f.write(b'F' + _FRAME.pack(recv_ts, source_id, len(frame)))
+                    f.write(frame)
+                    file_bytes += 1 + _FRAME.size + len(frame)
+                    self.frames_written += 1
+                    self.bytes_written += len(frame)
+
+                if f is not None and now - last_flush >= FLUSH_INTERVAL:
+                    f.flush()
+                    last_flush = now
+        except Exception as e:
+            self._running = False
+            print(f"[프레임 기록] 기록 중단 (오류: {e})")
+        finally:
+            if f is not None:
+                f.close()
+            print(f"[프레임 기록] 종료 - 프레임 {self.frames_written}건 ({self.bytes_written / 1024 / 1024:.1f}MB), "
+                  f"버림 {self.dropped}건")
+
+
+def iter_capture(path):
+    """
+    기록 파일 1개 읽기
+
+    Yields:
+        (recv_ts, source, frame_str)
+    """
+    sources = {}
+    with gzip.open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"프레임 기록 파일이 아닙니다: {path}")
+        while True:
+            kind = f.read(1)
+            if not kind:
+                return
+            if kind == b'S':
+                header = f.read(_SOURCE.size)
+                if len(header) < _SOURCE.size:
+                    return  # 비정상 종료로 잘린 꼬리
+                source_id, length = _SOURCE.unpack(header)
+                sources[source_id] = f.read(length).decode('utf-8')
+            elif kind == b'F':
+                header = f.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    return
+                recv_ts, source_id, length = _FRAME.unpack(header)
+                frame = f.read(length)
+                if len(frame) < length:
+                    return
+                yield recv_ts, sources.get(source_id, f"#{source_id}"), frame.decode('utf-8')
+            else:
+                raise ValueError(f"손상된 프레임 기록 파일: {path}")
+
+
+def list_captures(directory=CAPTURE_DIR):
+    """기록 파일 목록 (시간순)"""
+    return sorted(glob.glob(os.path.join(directory, CAPTURE_PATTERN)))
+
+
+class FrameReplayer:
+    """
+    기록 파일 재생기
+
+    사용 예:
+        set_replay_mode(True)
+        replayer = FrameReplayer(list_captures()[-2:], speed=0)
+        replayer.bind(user_source("Binance", "long"), ws_thread.replay_frame)
+        future = replayer.start()   # 네트워크 리액터에서 재생, future.result()가 통계
+
+    mux/* 소스는 자동으로 같은 거래소/마켓 멀티플렉서(get_stream_mux)에 전달되므로,
+    재생 전에 스트림(티커/캔들 등)을 평소처럼 구독해 두면 같은 핸들러로 처리됩니다.
+    """
+
+    def __init__(self, paths, speed=1.0, start_ts=None, end_ts=None):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.speed = speed or 0
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self._handlers = {}
+        self._stopped = False
+
+    def bind(self, source, handler):
+        """소스를 처리할 함수 지정 handler(frame, recv_ts) - 리액터 스레드에서 호출"""
+        self._handlers[source] = handler
+
+    def stop(self):
+        self._stopped = True
+
+    def _resolve(self, source):
+        handler = self._handlers.get(source)
+        if handler is None and source.startswith("mux/"):
+            from v7_dual_stream_mux import get_stream_mux  # 재생 시에만 필요
+            _, exchange, market = source.split('/', 2)
+            handler = self._handlers[source] = get_stream_mux(exchange, market).replay_frame
+        return handler
+
+    def frames(self):
+        for path in self.paths:
+            for recv_ts, source, frame in iter_capture(path):
+                if self.start_ts is not None and recv_ts < self.start_ts:
+                    continue
+                if self.end_ts is not None and recv_ts > self.end_ts:
+                    return
+                yield recv_ts, source, frame
+
+    async def play(self):
+        """
+        재생 (네트워크 리액터 이벤트 루프에서 실행)
+
+        Returns:
+            dict: {'frames', 'skipped', 'elapsed_sec', 'frames_per_sec', 'span_sec', 'sources': {소스: 건수}}
+        """
+        counts = {}
+        skipped = 0
+        frames = 0
+        first_ts = last_ts = None
+        wall_start = time.monotonic()
+        print(f"[프레임 재생] 시작 - 파일 {len(self.paths)}개, 속도 {'최대' if self.speed <= 0 else f'x{self.speed:g}'}")
+
+        for recv_ts, source, frame in self.frames():
+            if self._stopped:
+                break
+            if first_ts is None:
+                first_ts = recv_ts
+            last_ts = recv_ts
+
+            if self.speed > 0:
+                delay = (recv_ts - first_ts) / self.speed - (time.monotonic() - wall_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif frames % REPLAY_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+            handler = self._resolve(source)
+            if handler is None:
+                skipped += 1
+                continue
+            try:
+                handler(frame, time.time())
+            except Exception as e:
+                print(f"[프레임 재생] 처리 오류 ({source}): {e}")
+            frames += 1
+            counts[source] = counts.get(source, 0) + 1
+
+        elapsed = time.monotonic() - wall_start
+        stats = {
+            'frames': frames,
+            'skipped': skipped,
+            'elapsed_sec': elapsed,
+            'frames_per_sec': frames / elapsed if elapsed > 0 else 0.0,
+            'span_sec': (last_ts - first_ts) if first_ts is not None else 0.0,
+            'sources': counts,
+        }
+        print(f"[프레임 재생] 완료 - {frames}건 / {elapsed:.2f}초 ({stats['frames_per_sec']:.0f}건/초), "
+              f"원래 구간 {stats['span_sec']:.1f}초, 미연결 소스 {skipped}건")
+        return stats
+
+    def start(self):
+        """네트워크 리액터에서 재생 시작 (concurrent.futures.Future 반환)"""
+        from v7_dual_network_reactor import NetworkReactor  # 재생 시에만 필요
+        return NetworkReactor.get().submit(self.play())
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_frame_recorder():
+    """기록 중이면 FrameRecorder, 아니면 None (수신 경로에서 매 프레임 호출)"""
+    return _recorder
+
+
+def start_capture(directory=CAPTURE_DIR, max_file_mb=DEFAULT_MAX_FILE_MB,
+                  rotate_sec=DEFAULT_ROTATE_SEC, max_files=DEFAULT_MAX_FILES):
+    """프레임 기록 시작 (이미 기록 중이면 기존 기록기 반환)"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = FrameRecorder(directory, max_file_mb, rotate_sec, max_files)
+            print(f"[프레임 기록] 시작 - {directory} (파일당 {max_file_mb}MB / {rotate_sec}초, 최대 {max_files}개)")
+        return _recorder
+
+
+def stop_capture():
+    """프레임 기록 중지 (남은 프레임을 쓰고 파일을 닫음)"""
+    global _recorder
+    with _recorder_lock:
+        recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
@@ -4,6 +4,7 @@ import requests
 import time
 import pandas as pd
 import logging
+import functools
 from datetime import datetime
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QTableWidget, QHeaderView, QLabel,
@@ -29,11 +30,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from v7_dual_api import BinanceAPI, BybitAPI
+from v7_dual_async_api import make_async_api, SharedEventLoop
+from v7_dual_rate_limiter import get_rate_limit_governor
+from v7_dual_instrument_cache import get_instrument_store
+from v7_dual_kline_store import get_kline_store
 from v7_dual_ticker_ws import TickerSocketThread, BybitTickerSocketThread
+from v7_dual_feed_registry import get_feed_registry, kline_stream, STREAM_DEPTH, STREAM_TICKER
+from v7_dual_tick_conflator import TickConflator, DEFAULT_GUI_FPS, PRICE_SOURCE_LAST, PRICE_SOURCES
+from v7_dual_worker_queue import WorkerEventQueue
 import v7_dual_config_manager as config_manager
 from v7_dual_ws_manager import WebSocketThread
 from v7_dual_auto_trader import AutoTradeWorker
+from v7_dual_dca_state_machine import DcaJournal
 from v7_dual_resource_monitor import ResourceMonitor
+from v7_dual_feed_metrics import get_feed_metrics, DEFAULT_LAG_ALERT_MS
+from v7_dual_frame_recorder import (start_capture, stop_capture, CAPTURE_DIR, DEFAULT_MAX_FILE_MB,
+                                    DEFAULT_MAX_FILES, DEFAULT_ROTATE_SEC)
 
 # ========== 심볼 자동 변환 매핑 테이블 ==========
 
@@ -116,7 +128,7 @@ class ConnectAPIThread(QThread):
     """오래 걸리는 API 연결 작업을 백그라운드에서 처리합니다."""
     connection_finished = pyqtSignal(str, dict)  # v7_dual: (side, result)
 
-    def __init__(self, accounts, account_name, market_type, current_interval, old_ws_thread, old_ticker_thread, exchange, current_symbol="BTCUSDT", side='long', parent=None):
+    def __init__(self, accounts, account_name, market_type, current_interval, old_ws_thread, old_ticker_thread, exchange, current_symbol="BTCUSDT", side='long', create_ticker=True, parent=None):
         super().__init__(parent)
         self.accounts = accounts
         self.account_name = account_name
@@ -127,6 +139,7 @@ class ConnectAPIThread(QThread):
         self.exchange = exchange
         self.current_symbol = current_symbol  # GUI에서 선택한 심볼
         self.side = side  # v7_dual: 'long' 또는 'short' 패널 구분자
+        self.create_ticker = create_ticker  # False: 티커는 GUI가 공유 피드 레지스트리에서 획득
         self.running = True
 
     def run(self):
@@ -191,82 +204,33 @@ class ConnectAPIThread(QThread):
             self.api_module.set_active_market(actual_market_type)
             self.api_module.set_active_api_keys(account_info['api_key'], account_info['api_secret'])
             
-            if self.exchange == "Bybit":
-                try:
-                    print("Worker: Bybit 서버 시간과 로컬 시간 동기화 상태 확인 중...")
-                    server_time_ms = self.api_module.get_server_time()
-                    local_time_ms = int(time.time() * 1000)
-
-                    if server_time_ms:
-                        diff_ms = server_time_ms - local_time_ms
-                        # pandas가 이미 import 되어 있으므로 to_datetime 사용
-                        server_time_str = pd.to_datetime(server_time_ms, unit='ms')
-                        local_time_str = pd.to_datetime(local_time_ms, unit='ms')
-
-                        print("="*50)
-                        print(f"  [시간 동기화 검사 결과]")
-                        print(f"  Bybit 서버 시간: {server_time_str} ({server_time_ms} ms)")
-                        print(f"  로컬 PC 시간:   {local_time_str} ({local_time_ms} ms)")
-                        print(f"  시간 차이 (Server - Local): {diff_ms} ms")
-                        print("="*50)
-
-                        # 시간 차이가 1초 이상이면 자동 윈도우 시간 동기화 실행
-                        if abs(diff_ms) > 1000:
-                            print(f"  [경고] 시간 차이가 {abs(diff_ms)} ms로 감지되었습니다.")
-                            print(f"  [자동 조치] 윈도우 시간 동기화를 실행합니다...")
-                            print(f"  [참고] 관리자 권한으로 실행 시 자동 동기화가 성공합니다.")
-
-                            try:
-                                import subprocess
-
-                                # w32tm /resync 명령 실행 (관리자 권한 필요)
-                                sync_result = subprocess.run(
-                                    ["w32tm", "/resync"],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=5,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-                                )
-
-                                if sync_result.returncode == 0:
-                                    print(f"  [성공] 시간 동기화 완료")
-
-                                    # 동기화 후 재확인
-                                    time.sleep(1)
-                                    new_server_time = self.api_module.get_server_time()
-                                    if new_server_time and new_server_time > 0:
-                                        new_local_time_ms = int(time.time() * 1000)
-                                        new_diff_ms = new_server_time - new_local_time_ms
-                                        print(f"  [재확인] 동기화 후 시간 차이: {new_diff_ms} ms")
-
-                                        if abs(new_diff_ms) > 1000:
-                                            print(f"  [경고] 동기화 후에도 {new_diff_ms}ms 차이가 있습니다 (recv_window={self.api_module._recv_window}ms 내에서 정상 작동)")
-                                        else:
-                                            print(f"  [완료] 시간 동기화가 성공적으로 완료되었습니다")
-                                else:
-                                    # 동기화 실패 (권한 부족)
-                                    print(f"  [실패] 자동 시간 동기화 실패 (관리자 권한 필요)")
-                                    print(f"  ")
-                                    print(f"  ※ 해결 방법:")
-                                    print(f"  1) 프로그램을 관리자 권한으로 실행 (우클릭 > 관리자 권한으로 실행)")
-                                    print(f"  2) 또는 Windows 설정에서 수동 동기화:")
-                                    print(f"     Win+I > 시간 및 언어 > 날짜 및 시간 > '지금 동기화' 클릭")
-                                    print(f"  ")
-                                    print(f"  [참고] recv_window가 {self.api_module._recv_window//1000}초로 설정되어 API는 정상 작동할 수 있습니다")
-
-                            except subprocess.TimeoutExpired:
-                                print(f"  [실패] 시간 동기화 명령 시간 초과")
-                            except Exception as e:
-                                print(f"  [실패] 시간 동기화 오류: {e}")
-
-                        else:
-                            print(f"  [정보] 시간 차이가 {diff_ms}ms로 정상 범위입니다.")
-
-                    else:
-                        print("Worker: Bybit 서버 시간을 가져오는 데 실패했습니다. (공개 API 문제)")
+            # 서버 시간 오프셋 추정 (서명 요청 타임스탬프/recvWindow 자동 보정)
+            # 로컬 시계를 직접 맞추지 않으므로 관리자 권한/w32tm 불필요
+            try:
+                print(f"Worker: {self.exchange} 서버 시간 오프셋 추정 중...")
+                clock_stats = self.api_module.sync_clock()
+                if clock_stats.get('samples'):
+                    print("="*50)
+                    print(f"  [시간 동기화 결과]")
+                    print(f"  시간 차이 (Server - Local): {clock_stats['offset_ms']:.0f} ms")
+                    print(f"  RTT: {clock_stats['rtt_ms']:.0f} ms (지터 {clock_stats['jitter_ms']:.0f} ms)")
+                    print(f"  서명 요청은 보정된 타임스탬프를 사용합니다 (recvWindow {self.api_module._get_clock().recv_window_ms()} ms)")
+                    print("="*50)
+                    if abs(clock_stats['offset_ms']) > 1000:
+                        print(f"  [정보] 로컬 시계가 {abs(clock_stats['offset_ms']):.0f} ms 어긋나 있지만 자동 보정됩니다.")
+                else:
+                    print(f"Worker: {self.exchange} 서버 시간을 가져오는 데 실패했습니다. (공개 API 문제)")
+            except Exception as e:
+                print(f"Worker: 서버 시간 확인 중 오류 발생: {e}")
 
-                except Exception as e:
-                    print(f"Worker: 서버 시간 확인 중 오류 발생: {e}")
+            # 거래 규칙 디스크 캐시가 비었거나 만료됐으면 전체 심볼을 1회 일괄 조회
+            # (이후 패널 설정/자동매매 시작 시 심볼별 REST 조회 생략)
+            try:
+                rules_category = 'inverse' if actual_market_type == 'dapi' else 'linear'
+                if not get_instrument_store().has_fresh_category(self.exchange, rules_category):
+                    self.api_module.prefetch_instruments()
+            except Exception as e:
+                print(f"Worker: 거래 규칙 일괄 조회 중 오류 발생 (무시): {e}")
             
             if not self.running: return
 
@@ -296,7 +260,8 @@ class ConnectAPIThread(QThread):
 
             # 8. OHLCV 데이터 로드 (네트워크 I/O)
             print(f"Worker: {api_symbol_to_use} ({self.current_interval}) 캔들 데이터 로드 중...")
-            klines = self.api_module.get_ohlcv_data(api_symbol_to_use, self.current_interval, 500) # ◀◀◀ 500개로 제한 (성능 최적화)
+            # 로컬 캔들 저장소 + 마지막 저장 이후 꼬리 구간만 조회
+            klines = get_kline_store().load(self.api_module, api_symbol_to_use, self.current_interval, 500)
             
             # ▼▼▼ [ 9. 웹소켓 스레드 생성 (거래소별 분리) ] ▼▼▼
             if self.exchange == "Binance":
@@ -311,7 +276,7 @@ class ConnectAPIThread(QThread):
                     market_type=actual_market_type,
                     side=self.side
                 )
-                new_ticker_thread = TickerSocketThread(actual_market_type, api_symbol_to_use)
+                new_ticker_thread = TickerSocketThread(actual_market_type, api_symbol_to_use) if self.create_ticker else None
 
             elif self.exchange == "Bybit":
                 print("Worker: Bybit 웹소켓 스레드 생성 중 (Auth 방식)...")
@@ -326,7 +291,7 @@ class ConnectAPIThread(QThread):
                     market_type=actual_market_type,
                     side=self.side
                 )
-                new_ticker_thread = BybitTickerSocketThread(actual_market_type, api_symbol_to_use)
+                new_ticker_thread = BybitTickerSocketThread(actual_market_type, api_symbol_to_use) if self.create_ticker else None
 
             else:
                 raise Exception(f"Unsupported exchange for WebSockets: {self.exchange}")
@@ -1545,6 +1510,7 @@ class AutoTraderGUI(QMainWindow):
         # WebSocket 스레드 (side별로 분리)
         self.ws_threads = {'long': None, 'short': None}
         self.ticker_threads = {'long': None, 'short': None}
+        self.order_book_streams = {'long': None, 'short': None}  # 로컬 L2 호가창 (depth 스트림)
         self.kline_threads = {'long': None, 'short': None}
         self.listen_keys = {'long': None, 'short': None}
         self.config_data = {}
@@ -1579,6 +1545,7 @@ class AutoTraderGUI(QMainWindow):
         self.symbol_combos = {'long': None, 'short': None}
         self.direction_combos = {'long': None, 'short': None}  # LONG/SHORT 방향 선택
         self.market_type_combos = {'long': None, 'short': None}  # Linear/Inverse 선택
+        self.price_source_combos = {'long': None, 'short': None}  # 트리거 판단 가격 소스 선택
         self.account_combos = {'long': None, 'short': None}
         self.connect_buttons = {'long': None, 'short': None}
         self.connection_status_labels = {'long': None, 'short': None}
@@ -1594,6 +1561,9 @@ class AutoTraderGUI(QMainWindow):
         # 각 패널이 독립적으로 LONG 또는 SHORT 포지션을 운용할 수 있음
         self.side_modes = {'long': 'LONG', 'short': 'SHORT'}  # 기본값: 왼쪽=LONG, 오른쪽=SHORT
 
+        # === v7_dual: 워커 트리거 판단 가격 소스 (side별) ===
+        self.price_sources = {'long': PRICE_SOURCE_LAST, 'short': PRICE_SOURCE_LAST}
+
         # 누적 통계
         self.total_cycles_completed = 0  # 완료된 사이클 수
         self.cumulative_pnl = 0.0  # 누적 손익
@@ -1708,6 +1678,14 @@ class AutoTraderGUI(QMainWindow):
         }
         self.auto_trade_workers['long'].moveToThread(self.auto_trade_threads['long'])
         self.auto_trade_workers['short'].moveToThread(self.auto_trade_threads['short'])
+        for side, t in self.auto_trade_threads.items():
+            t.setObjectName(f"TradingThread({side})")
+
+        # DCA 상태 저널 (config의 dca_state_{side}는 체크포인트, 저장마다 바뀐 값만 저널에 추가)
+        self.dca_journals = {
+            side: DcaJournal(os.path.join(config_manager.SCRIPT_DIR, f"dca_journal_{side}.jsonl"))
+            for side in ('long', 'short')
+        }
 
         # 하위 호환성: self.auto_trade_worker = LONG worker
         self.auto_trade_worker = self.auto_trade_workers['long']
@@ -1720,12 +1698,16 @@ class AutoTraderGUI(QMainWindow):
             worker.log_message.connect(lambda msg, s=side: self.on_auto_trade_log_for_side(s, msg))
             # side별로 분리된 주문 실행 (LONG/SHORT 계정 분리)
             worker.execute_trade_signal.connect(
-                lambda symbol, order_side, qty, is_hedge, s=side:
-                self.on_auto_trade_execute_for_side(s, symbol, order_side, qty, is_hedge)
+                lambda symbol, order_side, qty, is_hedge, client_order_id, hedge_trigger, s=side:
+                self.on_auto_trade_execute_for_side(s, symbol, order_side, qty, is_hedge, client_order_id, hedge_trigger)
             )
             worker.execute_limit_order_signal.connect(
-                lambda symbol, order_side, quantity, price, is_hedge, s=side:
-                self.on_auto_trade_limit_order_for_side(s, symbol, order_side, quantity, price, is_hedge)
+                lambda symbol, order_side, quantity, price, is_hedge, client_order_id, s=side:
+                self.on_auto_trade_limit_order_for_side(s, symbol, order_side, quantity, price, is_hedge, client_order_id)
+            )
+            worker.execute_batch_orders_signal.connect(
+                lambda orders, s=side:
+                self.on_auto_trade_batch_orders_for_side(s, orders)
             )
 
             # 차트 마커 업데이트 (양쪽 패널 모두)
@@ -1802,6 +1784,15 @@ class AutoTraderGUI(QMainWindow):
         for t in self.auto_trade_threads.values():
             t.start()
 
+        # 티커 병합 단계: GUI는 프레임 단위 최신 가격만, 워커는 워커 스레드에서 모든 가격 변화 수신
+        # 워커 이벤트 큐: 틱/포지션/주문/캔들 확정을 들어온 순서대로 워커 스레드에서 처리
+        self.tick_conflator = TickConflator(DEFAULT_GUI_FPS, self)
+        self.tick_conflator.snapshot_ready.connect(self.on_tick_snapshot)
+        self.worker_queues = {}
+        for side, worker in self.auto_trade_workers.items():
+            self.worker_queues[side] = WorkerEventQueue(worker, name=f"worker({side})")
+            self.tick_conflator.attach_feed(side, self.worker_queues[side])
+
         # 로그 파일 초기화
         self.log_file = None
         self.log_file_path = None
@@ -1817,12 +1808,20 @@ class AutoTraderGUI(QMainWindow):
         self.resource_memory_label = None
         self.resource_cpu_label = None
         self.resource_cleanup_label = None
+        self.resource_api_budget_label = None
+        self.resource_api_latency_label = None
+        self.resource_feed_latency_label = None
+        self.resource_worker_queue_label = None
 
         # 리소스 모니터링 시스템 초기화
         self.resource_monitor = ResourceMonitor(self)
         self.resource_monitor.memory_warning.connect(self.on_memory_warning)
         self.resource_monitor.cleanup_completed.connect(self.on_cleanup_completed)
         self.resource_monitor.resource_updated.connect(self.on_resource_updated)
+        self.resource_monitor.request_metrics_updated.connect(self.on_request_metrics_updated)
+        self.resource_monitor.feed_latency_updated.connect(self.on_feed_latency_updated)
+        self.resource_monitor.feed_lag_alert.connect(self.on_feed_lag_alert)
+        self.resource_monitor.worker_queue_updated.connect(self.on_worker_queue_updated)
         self.resource_monitor.start()
 
         self.initUI()
@@ -2282,6 +2281,18 @@ class AutoTraderGUI(QMainWindow):
         self.market_type_combos[side] = market_combo
         symbol_layout.addWidget(market_combo)
 
+        # Trigger Price 콤보박스 (워커 판단 가격 소스)
+        price_source_combo = QComboBox()
+        price_source_combo.setMinimumHeight(35)
+        for source, label in zip(PRICE_SOURCES, ["Trigger: Last", "Trigger: Mid", "Trigger: Bid/Ask", "Trigger: Mark"]):
+            price_source_combo.addItem(label, source)
+        price_source_combo.setCurrentIndex(max(0, price_source_combo.findData(self.price_sources.get(side, PRICE_SOURCE_LAST))))
+        price_source_combo.currentIndexChanged.connect(
+            lambda index, s=side, c=price_source_combo: self.on_price_source_changed_for_side(s, c.itemData(index))
+        )
+        self.price_source_combos[side] = price_source_combo
+        symbol_layout.addWidget(price_source_combo)
+
         layout.addWidget(symbol_box)
 
         # === 3. Price 표시 ===
@@ -2660,6 +2671,7 @@ class AutoTraderGUI(QMainWindow):
         dialog.exec_()
         # 다이얼로그에서 Auto Balance 체크박스 변경했을 수 있으므로 config 재로드
         self.config_data = config_manager.load_config_data()
+        self._replay_dca_journals()
         self.auto_balance_enabled = self.config_data.get("app_settings", {}).get("auto_balance_enabled", False)
 
     def on_account_settings_clicked(self):
@@ -3456,6 +3468,7 @@ class AutoTraderGUI(QMainWindow):
         self.settings_hedge_protocol_tp_ratio = QLineEdit()  # 헷지 프로토콜 익절 비율
         self.settings_main_liquidation_safety_margin = QLineEdit()  # 메인 청산가 안전 마진
         self.settings_hedge_liquidation_safety_margin = QLineEdit()  # 헷지 청산가 안전 마진
+        self.settings_market_exit_max_slippage = QLineEdit()  # 시장가 익절 허용 슬리피지 (호가창 기준)
         self.settings_test_quantity_mode = QCheckBox("활성화")
         self.settings_hedge_frontload = QCheckBox("활성화")
         
@@ -3635,6 +3648,11 @@ class AutoTraderGUI(QMainWindow):
         label_hedge_protocol_tp_ratio.setToolTip("익절하는 헷지 수량 비율\n예: 50% → 헷지 수량의 50%만 익절")
         hedge_protocol_layout.addRow(label_hedge_protocol_tp_ratio, self.settings_hedge_protocol_tp_ratio)
 
+        label_market_exit_max_slippage = QLabel("익절 허용 슬리피지 (%):")
+        label_market_exit_max_slippage.setMinimumWidth(180)
+        label_market_exit_max_slippage.setToolTip("호가창 기준 시장가 익절의 최대 허용 슬리피지\n초과 시 허용 범위 안의 유동성만큼만 익절\n0 → 추정치만 로그에 기록 (수량 조정 안 함)")
+        hedge_protocol_layout.addRow(label_market_exit_max_slippage, self.settings_market_exit_max_slippage)
+
         label_hedge_liquidation_safety_margin = QLabel("헷지 청산가 안전마진 (%):")
         label_hedge_liquidation_safety_margin.setMinimumWidth(180)
         label_hedge_liquidation_safety_margin.setToolTip("헷지 포지션: 안전망 주문을 청산가에서 N% 떨어진 위치에 설정\n예: 0.5% → 청산가 ± 0.5% 위치에 안전망 주문\n(기존 -1틱보다 훨씬 안전)")
@@ -3859,6 +3877,42 @@ class AutoTraderGUI(QMainWindow):
         self.resource_cleanup_label.setStyleSheet("font-size: 9pt; color: #888888;")
         resource_layout.addWidget(self.resource_cleanup_label)
 
+        # API 레이트 리밋 잔여 예산
+        self.resource_api_budget_label = QLabel("API Budget: --")
+        self.resource_api_budget_label.setStyleSheet("font-size: 9pt;")
+        resource_layout.addWidget(self.resource_api_budget_label)
+
+        # API 요청 지연 / 오류율 (거래소별 p50/p95/p99)
+        self.resource_api_latency_label = QLabel("API Latency: --")
+        self.resource_api_latency_label.setStyleSheet("font-size: 9pt;")
+        self.resource_api_latency_label.setToolTip("거래소 REST 요청 지연 백분위 / 오류율 / 재시도 (프로그램 시작 이후 누적)")
+        resource_layout.addWidget(self.resource_api_latency_label)
+
+        self.resource_feed_latency_label = QLabel("Feed Latency: --")
+        self.resource_feed_latency_label.setStyleSheet("font-size: 9pt;")
+        self.resource_feed_latency_label.setToolTip(
+            "실시간 피드 지연 (최근 30~60초)\n"
+            "net: 거래소 이벤트 -> 소켓 수신 (서버 시간 보정)\n"
+            "queue: 소켓 수신 -> GUI/워커 전달\n"
+            "total: 거래소 이벤트 -> 워커 처리 완료"
+        )
+        resource_layout.addWidget(self.resource_feed_latency_label)
+
+        self.resource_worker_queue_label = QLabel("Worker Queue: --")
+        self.resource_worker_queue_label.setStyleSheet("font-size: 9pt;")
+        self.resource_worker_queue_label.setToolTip(
+            "자동매매 워커 이벤트 큐 (틱/포지션/주문/캔들 확정)\n"
+            "depth: 현재 대기 이벤트 (괄호: 최대)\n"
+            "wait: 큐 대기 p95, tick/order: 처리 시간 p95, slowest: 가장 오래 걸린 이벤트"
+        )
+        resource_layout.addWidget(self.resource_worker_queue_label)
+
+        # 요청 계측 상세를 logs 폴더에 JSON으로 저장
+        self.dump_metrics_button = QPushButton("Dump API Metrics")
+        self.dump_metrics_button.setStyleSheet("font-size: 9pt;")
+        self.dump_metrics_button.clicked.connect(self.on_dump_metrics_clicked)
+        resource_layout.addWidget(self.dump_metrics_button)
+
         parent_layout.addWidget(resource_box)
         # ▲▲▲ [리소스 모니터 박스] ▲▲▲
 
@@ -4281,9 +4335,28 @@ class AutoTraderGUI(QMainWindow):
 
     def load_config_data(self):
         self.config_data = config_manager.load_config_data()
+        self._replay_dca_journals()
         self.accounts = self.config_data.get("accounts", {})
         app_settings = self.config_data.get("app_settings", {})
 
+        # GUI 가격 갱신 프레임 레이트
+        if hasattr(self, 'tick_conflator'):
+            self.tick_conflator.set_fps(app_settings.get("gui_tick_fps", DEFAULT_GUI_FPS))
+
+        # 피드 지연 경보 임계값 (total p95, ms)
+        get_feed_metrics().set_alert_threshold(app_settings.get("feed_lag_alert_ms", DEFAULT_LAG_ALERT_MS))
+
+        # 웹소켓 원본 프레임 기록 (장애 재현/재생용, 기본 꺼짐)
+        if app_settings.get("ws_capture_enabled", False):
+            start_capture(
+                directory=app_settings.get("ws_capture_dir") or CAPTURE_DIR,
+                max_file_mb=app_settings.get("ws_capture_max_mb", DEFAULT_MAX_FILE_MB),
+                rotate_sec=app_settings.get("ws_capture_rotate_sec", DEFAULT_ROTATE_SEC),
+                max_files=app_settings.get("ws_capture_max_files", DEFAULT_MAX_FILES)
+            )
+        else:
+            stop_capture()
+
         # Auto Balance 설정 로드
         self.auto_balance_enabled = app_settings.get("auto_balance_enabled", False)
 
@@ -4305,6 +4378,16 @@ class AutoTraderGUI(QMainWindow):
                 self.side_modes[side] = saved_directions[side]
                 print(f"[{side.upper()} 패널] 저장된 방향 복원: {saved_directions[side]}")
 
+        # v7_dual: 저장된 트리거 가격 소스 복원
+        saved_sources = self.config_data.get("panel_price_sources", {})
+        for side in ['long', 'short']:
+            if saved_sources.get(side) in PRICE_SOURCES:
+                self.price_sources[side] = saved_sources[side]
+                self.auto_trade_workers[side].price_source = saved_sources[side]
+                if self.price_source_combos.get(side):
+                    combo = self.price_source_combos[side]
+                    combo.setCurrentIndex(max(0, combo.findData(saved_sources[side])))
+
         self.strategy_settings = self.config_data.get("strategy_settings", {})
         self.settings_steps.setText(str(self.strategy_settings.get("STEPS", 10)))
         self.settings_timeframe.setText(str(self.strategy_settings.get("TIMEFRAME", "15")))
@@ -4332,6 +4415,7 @@ class AutoTraderGUI(QMainWindow):
         # 헷지 프로토콜 항상 활성화 (체크박스 제거됨)
         self.settings_hedge_protocol_retracement.setText(str(self.strategy_settings.get("HEDGE_PROTOCOL_RETRACEMENT", 50.0)))
         self.settings_hedge_protocol_tp_ratio.setText(str(self.strategy_settings.get("HEDGE_PROTOCOL_TAKE_PROFIT_RATIO", 50.0)))
+        self.settings_market_exit_max_slippage.setText(str(self.strategy_settings.get("MARKET_EXIT_MAX_SLIPPAGE_PERCENT", 0.0)))
         self.settings_main_liquidation_safety_margin.setText(str(self.strategy_settings.get("MAIN_LIQUIDATION_SAFETY_MARGIN", 0.5)))
         self.settings_hedge_liquidation_safety_margin.setText(str(self.strategy_settings.get("HEDGE_LIQUIDATION_SAFETY_MARGIN", 0.5)))
         self.settings_hedge_frontload.setChecked(self.strategy_settings.get("HEDGE_FRONTLOAD_FINAL_STEP", False))
@@ -4674,13 +4758,14 @@ class AutoTraderGUI(QMainWindow):
         except Exception as e:
             print(f"[{side.upper()}] 오버레이 표시 오류: {e}")
 
-        # 기존 WebSocket/Ticker 스레드 저장
+        # 기존 WebSocket 스레드 저장
         old_ws = self.ws_threads.get(side)
-        old_ticker = self.ticker_threads.get(side)
+
+        # 공개 피드(티커/캔들/호가창) 반환 - 새 연결에서 다시 획득 (다른 패널이 쓰는 피드는 유지)
+        self._release_public_feeds(side)
 
         # 초기화
         self.ws_threads[side] = None
-        self.ticker_threads[side] = None
 
         # 차트 정리 (해당 side)
         # remove_all_position_lines_from_chart는 전역이므로 side별 구현 필요 시 수정
@@ -4689,6 +4774,7 @@ class AutoTraderGUI(QMainWindow):
         # API 모듈 초기화
         if self.api_modules.get(side):
             self.api_modules[side].set_active_api_keys(None, None)
+            self.api_modules[side].close()  # keep-alive 커넥션 풀 반환
         self.api_modules[side] = None
 
         # 테이블 초기화
@@ -4731,10 +4817,11 @@ class AutoTraderGUI(QMainWindow):
             market_type=market_type,
             current_interval=self.current_interval,
             old_ws_thread=old_ws,
-            old_ticker_thread=old_ticker,
+            old_ticker_thread=None,
             exchange=exchange,
             current_symbol=self.current_symbols.get(side, "BTCUSDT"),
-            side=side  # v7_dual: side 파라미터 전달
+            side=side,  # v7_dual: side 파라미터 전달
+            create_ticker=False
         )
         self.connect_threads[side].connection_finished.connect(self.on_connection_finished_for_side)
         self.connect_threads[side].start()
@@ -4791,12 +4878,16 @@ class AutoTraderGUI(QMainWindow):
             print("[디버그] 6. 차트 업데이트 완료")
 
             print("[디버그] 7. WebSocket 스레드 시작")
-            self.ws_thread.account_update_received.connect(self.handle_account_update)
-            self.ws_thread.order_update_received.connect(self.handle_order_update)
+            # 기존 단일 패널 핸들러는 Binance 형식 dict를 사용
+            self.ws_thread.account_update_received.connect(lambda _side, update: self.handle_account_update(update.to_binance()))
+            self.ws_thread.order_update_received.connect(lambda _side, update: self.handle_order_update(update))
+            self.ws_thread.set_backfill_source(self.api_module, lambda: self.current_symbol)
             self.ws_thread.start()
 
             print("[디버그] 8. 티커 스레드 시작")
-            self.ticker_thread.ticker_update.connect(self.handle_ticker_update)
+            self.ticker_thread.set_tick_sink(functools.partial(self.tick_conflator.push, 'long'))
+            self.ticker_thread.set_price_source(self.price_sources.get('long', PRICE_SOURCE_LAST))
+            self.ticker_thread.reconnected.connect(lambda downtime: self.on_public_stream_reconnected('long', downtime))
             self.ticker_thread.start()
             print("[디버그] 9. 모든 스레드 시작 완료")
 
@@ -4902,7 +4993,6 @@ class AutoTraderGUI(QMainWindow):
 
             print(f"[{side.upper()} 패널] 2. 스레드 객체 저장")
             self.ws_threads[side] = data['new_ws_thread']
-            self.ticker_threads[side] = data['new_ticker_thread']
 
             print(f"[{side.upper()} 패널] 3. 초기 데이터 채우기 시작")
             # Side별 데이터 채우기 (Phase 7에서 구현 예정)
@@ -4955,32 +5045,13 @@ class AutoTraderGUI(QMainWindow):
             print(f"[{side.upper()} 패널] 7. WebSocket 스레드 시작")
             self.ws_threads[side].account_update_received.connect(self.handle_account_update_for_side)
             self.ws_threads[side].order_update_received.connect(self.handle_order_update_for_side)
+            # 재연결 시 끊긴 구간의 주문/포지션을 REST로 보충 (같은 핸들러로 전달됨)
+            self.ws_threads[side].set_backfill_source(data['api_module'], lambda s=side: self.current_symbols.get(s))
             self.ws_threads[side].start()
 
-            print(f"[{side.upper()} 패널] 8. 티커 스레드 시작")
-            self.ticker_threads[side].ticker_update.connect(lambda ticker_list, s=side: self.handle_ticker_update_for_side(s, ticker_list))
-            # LONG 패널: 차트 업데이트도 연결 (price_line_item, 캔들 업데이트 등)
-            if side == 'long':
-                self.ticker_threads[side].ticker_update.connect(self.handle_ticker_update)
-            self.ticker_threads[side].start()
-            print(f"[{side.upper()} 패널] 9. 모든 스레드 시작 완료")
-
-            print(f"[{side.upper()} 패널] 10. Bybit 캔들 WebSocket 확인 중...")
-            # Bybit 실시간 캔들 WebSocket 시작
-            if data['exchange'] == "Bybit":
-                print(f"[{side.upper()} 패널] 10-1. Bybit 캔들 WebSocket 시작")
-                bybit_interval = self._convert_interval_to_bybit(self.current_interval)
-
-                from v7_dual_ticker_ws import BybitKlineSocketThread
-                self.kline_threads[side] = BybitKlineSocketThread(
-                    market_type=data['market_type'],
-                    symbol=current_symbol,
-                    interval=bybit_interval,
-                    parent=self
-                )
-                self.kline_threads[side].kline_update.connect(lambda kline_data, s=side: self.handle_kline_update_for_side(s, kline_data))
-                self.kline_threads[side].start()
-                print(f"[{side.upper()} 패널] Bybit 실시간 캔들 스트림 시작: {current_symbol}/{bybit_interval}")
+            print(f"[{side.upper()} 패널] 8. 공개 피드(티커/캔들/호가창) 획득")
+            self._acquire_public_feeds(side, data['exchange'], data['market_type'], current_symbol, data['api_module'])
+            print(f"[{side.upper()} 패널] 9. 모든 스트림 시작 완료")
 
             # 차트 갱신 타이머 (side별 타이머 필요시 추가)
             # 일단 LONG 패널만 타이머 시작
@@ -5146,85 +5217,24 @@ class AutoTraderGUI(QMainWindow):
                 print(f"[{side.upper()}] 심볼 변경으로 차트 업데이트: {new_symbol} / {interval}")
                 self.update_chart(new_symbol, interval)
 
-        # 티커 스레드 재시작
-        if side in self.ticker_threads and self.ticker_threads[side]:
-            old_ticker = self.ticker_threads[side]
-            print(f"[{side.upper()}] 티커 스레드 재시작: {old_symbol} → {new_symbol}")
-
-            # 기존 티커 스레드 종료
-            if old_ticker.isRunning():
-                old_ticker.stop()
-                old_ticker.wait()
-                print(f"[{side.upper()}] 기존 티커 스레드 종료 완료")
-
-            # 레거시 티커 스레드 정리 (중복 스트리밍 방지)
-            if side == 'long' and hasattr(self, 'ticker_thread') and self.ticker_thread and self.ticker_thread != old_ticker:
+        # 공개 피드 변경 (새 심볼 피드 획득 후 이전 피드 반환, 다른 패널이 쓰는 피드는 유지)
+        if self.ticker_threads.get(side) or self.kline_threads.get(side) or self.order_book_streams.get(side):
+            print(f"[{side.upper()}] 공개 피드 변경: {old_symbol} → {new_symbol}")
+            self.tick_conflator.forget(side)
+            self._switch_public_feeds(side, new_symbol)
+
+        ticker = self.ticker_threads.get(side)
+        if ticker:
+            # 레거시 티커 스레드 정리 (중복 스트리밍 방지, 공유 피드는 레지스트리가 관리)
+            legacy_ticker = getattr(self, 'ticker_thread', None)
+            if side == 'long' and legacy_ticker and legacy_ticker != ticker and not get_feed_registry().owns(legacy_ticker):
                 if self.ticker_thread.isRunning():
                     self.ticker_thread.stop()
-                    self.ticker_thread.wait()
                     print(f"[{side.upper()}] 기존 레거시 티커 스레드 종료 완료")
 
-            # 새로운 티커 스레드 생성
-            market_type = self.current_market_types.get(side, 'linear')
-            connect_thread = self.connect_threads.get(side)
-            if connect_thread:
-                exchange = connect_thread.exchange
-                if exchange == "Binance":
-                    from v7_dual_ticker_ws import TickerSocketThread
-                    new_ticker = TickerSocketThread(market_type, new_symbol)
-                elif exchange == "Bybit":
-                    from v7_dual_ticker_ws import BybitTickerSocketThread
-                    new_ticker = BybitTickerSocketThread(market_type, new_symbol)
-                else:
-                    print(f"[{side.upper()}] 지원되지 않는 거래소: {exchange}")
-                    return
-
-                # 시그널 연결 및 시작
-                new_ticker.ticker_update.connect(lambda ticker_list, s=side: self.handle_ticker_update_for_side(s, ticker_list))
-                # LONG 패널: 차트 업데이트도 연결 (price_line_item, 캔들 업데이트 등)
-                if side == 'long':
-                    new_ticker.ticker_update.connect(self.handle_ticker_update)
-                new_ticker.start()
-                self.ticker_threads[side] = new_ticker
-                print(f"[{side.upper()}] 새 티커 스레드 시작 완료: {new_symbol}")
-
-                # Backward compatibility
-                if side == 'long':
-                    self.ticker_thread = new_ticker
-
-        # Kline 스레드 재시작 (Bybit만)
-        if side in self.kline_threads and self.kline_threads[side]:
-            old_kline = self.kline_threads[side]
-            market_type = self.current_market_types.get(side, 'linear')
-            connect_thread = self.connect_threads.get(side)
-
-            if connect_thread and connect_thread.exchange == "Bybit":
-                print(f"[{side.upper()}] Kline 스레드 재시작: {old_symbol} → {new_symbol}")
-
-                # 기존 Kline 스레드 종료
-                if old_kline.isRunning():
-                    old_kline.stop()
-                    old_kline.wait()
-                    print(f"[{side.upper()}] 기존 Kline 스레드 종료 완료")
-
-                # 새로운 Kline 스레드 생성
-                interval = self.current_interval
-                bybit_interval = self._convert_interval_to_bybit(interval)
-                from v7_dual_ticker_ws import BybitKlineSocketThread
-                new_kline = BybitKlineSocketThread(
-                    market_type=market_type,
-                    symbol=new_symbol,
-                    interval=bybit_interval,
-                    parent=self
-                )
-                new_kline.kline_update.connect(lambda kline_data, s=side: self.handle_kline_update_for_side(s, kline_data))
-                new_kline.start()
-                self.kline_threads[side] = new_kline
-                print(f"[{side.upper()}] 새 Kline 스레드 시작 완료: {new_symbol}/{bybit_interval}")
-
-                # Backward compatibility
-                if side == 'long':
-                    self.kline_thread = new_kline
+            # Backward compatibility
+            if side == 'long':
+                self.ticker_thread = ticker
 
     def on_direction_changed_for_side(self, side, direction):
         """Direction 변경 핸들러 (side별)"""
@@ -5252,6 +5262,28 @@ class AutoTraderGUI(QMainWindow):
         self.config_data["panel_directions"][side] = direction
         config_manager.save_config_data(self.config_data)
 
+    def on_price_source_changed_for_side(self, side, source):
+        """Trigger Price 변경 핸들러 (side별) - 실행 중인 워커에도 즉시 반영"""
+        if source not in PRICE_SOURCES or self.price_sources.get(side) == source:
+            return
+        old_source = self.price_sources.get(side, PRICE_SOURCE_LAST)
+        self.price_sources[side] = source
+        print(f"[{side.upper()} 패널] 트리거 가격 소스 변경: {old_source} → {source}")
+
+        worker = self.auto_trade_workers.get(side)
+        if worker:
+            worker.price_source = source
+
+        # 호가/마크 가격 토픽 구독 변경 (공유 피드는 패널들의 가격 소스 합집합을 구독)
+        ticker = self.ticker_threads.get(side)
+        if ticker:
+            get_feed_registry().update_consumer(ticker, f"panel({side})", price_source=source)
+
+        if "panel_price_sources" not in self.config_data:
+            self.config_data["panel_price_sources"] = {}
+        self.config_data["panel_price_sources"][side] = source
+        config_manager.save_config_data(self.config_data)
+
     def on_market_type_changed_for_side(self, side, text):
         """Market Type 변경 핸들러 (side별)"""
         # "Linear (USDT)" -> 'linear', "Inverse (COIN)" -> 'inverse'
@@ -5631,63 +5663,72 @@ class AutoTraderGUI(QMainWindow):
             worker.stop_trading()
             print(f"[{side.upper()}] AutoTradeWorker 정지됨")
 
-        # 2. 미체결 주문 전체 취소
+        async_api = make_async_api(api_module)
+
+        # 2. 미체결 주문 전체 취소 (일괄 취소)
         try:
             print(f"[{side.upper()}] 미체결 주문 취소 중...")
             open_orders = api_module.get_initial_open_orders()
-            if not open_orders:
+            cancel_targets = [o for o in (open_orders or []) if str(o.get('symbol', '')) == symbol]
+            if not cancel_targets:
                 print(f"[{side.upper()}] 취소할 미체결 주문 없음")
             else:
-                for order in open_orders:
-                    order_symbol = str(order.get('symbol', ''))
-                    if order_symbol != symbol:
-                        continue
-                    try:
-                        order_id = str(order.get('orderId', ''))
-                        order_category = order.get('orderCategory', 'normal')
-                        api_module.cancel_order(order_symbol, order_id, order_category)
-                        print(f"[{side.upper()}] 주문 취소: {order_symbol} #{order_id}")
-                    except Exception as e:
-                        print(f"[{side.upper()}] 주문 취소 실패 #{order.get('orderId')}: {e}")
+                # 일반/조건부 주문은 일괄 취소, Binance Algo 주문은 개별 취소(동시 전송)
+                batch_targets = [o for o in cancel_targets if o.get('orderCategory', 'normal') != 'algo']
+                single_targets = [o for o in cancel_targets if o.get('orderCategory', 'normal') == 'algo']
+
+                results = []
+                if batch_targets:
+                    results.extend(api_module.cancel_batch_orders(
+                        symbol, [str(o.get('orderId', '')) for o in batch_targets]
+                    ))
+                if single_targets:
+                    results.extend(async_api.run_concurrently([
+                        ('cancel_order', (symbol, str(o.get('orderId', '')), 'algo'), {})
+                        for o in single_targets
+                    ], timeout=30))
+
+                for order, result in zip(batch_targets + single_targets, results):
+                    order_id = str(order.get('orderId', ''))
+                    if not result or (isinstance(result, dict) and result.get('code') not in (None, 0, 200)):
+                        print(f"[{side.upper()}] 주문 취소 실패 #{order_id}: {result}")
+                    else:
+                        print(f"[{side.upper()}] 주문 취소: {symbol} #{order_id}")
                 print(f"[{side.upper()}] 미체결 주문 취소 완료")
         except Exception as e:
             print(f"[{side.upper()}] 미체결 주문 취소 오류: {e}")
 
-        # 3. 포지션 청산 (LONG과 SHORT 모두)
+        # 3. 포지션 청산 (LONG과 SHORT 모두, 동시 전송)
         try:
             print(f"[{side.upper()}] 포지션 청산 중...")
             positions = api_module.get_initial_positions()
 
-            if positions:
-                for pos in positions:
-                    if pos.get('symbol') != symbol:
-                        continue
+            close_targets = []
+            for pos in positions or []:
+                if pos.get('symbol') != symbol:
+                    continue
 
-                    pos_amt = float(pos.get('positionAmt', 0))
-                    pos_side = pos.get('positionSide', 'BOTH')
+                pos_amt = float(pos.get('positionAmt', 0))
+                pos_side = pos.get('positionSide', 'BOTH')
 
-                    if pos_amt == 0:
-                        continue
+                if pos_amt == 0:
+                    continue
 
-                    # 포지션 청산 (반대 방향 주문)
-                    if pos_amt > 0:  # LONG 포지션 -> SELL로 청산
-                        order_side = "SELL"
-                        qty = abs(pos_amt)
-                    else:  # SHORT 포지션 -> BUY로 청산
-                        order_side = "BUY"
-                        qty = abs(pos_amt)
-
-                    print(f"[{side.upper()}] {pos_side} 포지션 청산: {order_side} {qty} {symbol}")
-                    result = api_module.place_market_order(
-                        symbol, order_side, str(qty),
-                        reduce_only=True,
-                        position_side=pos_side
-                    )
+                # 포지션 청산 (반대 방향 주문): LONG -> SELL, SHORT -> BUY
+                order_side = "SELL" if pos_amt > 0 else "BUY"
+                qty = abs(pos_amt)
+                print(f"[{side.upper()}] {pos_side} 포지션 청산: {order_side} {qty} {symbol}")
+                close_targets.append((pos_side, (symbol, order_side, str(qty)),
+                                      {'reduce_only': True, 'position_side': pos_side}))
 
-                    if result and result.get('orderId'):
-                        print(f"[{side.upper()}] {pos_side} 포지션 청산 주문 완료: {result.get('orderId')}")
-                    else:
-                        print(f"[{side.upper()}] {pos_side} 포지션 청산 실패: {result}")
+            results = async_api.run_concurrently(
+                [('place_market_order', args, kwargs) for _, args, kwargs in close_targets], timeout=30
+            )
+            for (pos_side, _, _), result in zip(close_targets, results):
+                if result and result.get('orderId'):
+                    print(f"[{side.upper()}] {pos_side} 포지션 청산 주문 완료: {result.get('orderId')}")
+                else:
+                    print(f"[{side.upper()}] {pos_side} 포지션 청산 실패: {result}")
 
             print(f"[{side.upper()}] 포지션 청산 처리 완료")
 
@@ -5729,22 +5770,20 @@ class AutoTraderGUI(QMainWindow):
         QMessageBox.information(self, "Clear All", f"{side.upper()} 계정 정리가 완료되었습니다.")
         print(f"[{side.upper()}] Clear All 완료")
 
-    def handle_account_update_for_side(self, side, data):
+    def handle_account_update_for_side(self, side, update):
         """
         계정 업데이트 핸들러 (side별)
 
         Args:
             side: 'long' 또는 'short' (패널 구분자)
-            data: WebSocket에서 받은 계정 업데이트 데이터
+            update: WebSocket에서 받은 계정 업데이트 (v7_dual_events.AccountUpdate)
         """
+        deliver_ts = time.time()
         try:
             # 잔액 업데이트
-            balances = data.get('a', {}).get('B', [])
-            for b in balances:
-                asset = b.get('a')
-                balance = b.get('wb')  # Wallet Balance
-                if asset and balance is not None:
-                    self.live_balances_by_side[side][asset] = balance
+            for b in update.balances:
+                if b.asset and b.wallet_balance is not None:
+                    self.live_balances_by_side[side][b.asset] = b.wallet_balance  # Wallet Balance
 
             # UI 업데이트 (잔액) - 통합 패널에서는 LONG:/SHORT: 접두사 추가
             if side in self.balance_labels and self.balance_labels[side]:
@@ -5760,22 +5799,14 @@ class AutoTraderGUI(QMainWindow):
             self.update_realized_pnl_display(side)
 
             # 포지션 업데이트
-            positions = data.get('a', {}).get('P', [])
+            positions = update.positions
             for pos in positions:
-                symbol = pos.get('s')
-                position_side = pos.get('ps')
-                amount_str = pos.get('pa', '0')
-                entry_price_str = pos.get('ep', '0')
-                mark_price_str = pos.get('mp', '0')  # Mark Price 추가
-                liq_price_str = pos.get('lp', '0')   # Liq Price 추가
-
-                try:
-                    amount = float(amount_str)
-                    entry_price = float(entry_price_str)
-                    mark_price = float(mark_price_str)
-                    liq_price = float(liq_price_str)
-                except (ValueError, TypeError):
-                    continue
+                symbol = pos.symbol
+                position_side = pos.position_side
+                amount = pos.amount
+                entry_price = pos.entry_price
+                mark_price = pos.mark_price  # Mark Price
+                liq_price = pos.liq_price    # Liq Price
 
                 # PNL 직접 계산 (Bybit WebSocket의 unrealisedPnl이 0으로 오는 경우가 많음)
                 # LONG: (mark_price - entry_price) * amount
@@ -5872,21 +5903,17 @@ class AutoTraderGUI(QMainWindow):
                     # 4) worker.current_price (마지막 수단)
                     current_price = 0
 
-                    # 1. current_prices_by_side에서 가져오기 (가장 최신 ticker 데이터)
-                    if hasattr(self, 'current_prices_by_side') and side in self.current_prices_by_side:
+                    # 1. 워커 가격 소스 기준 판단 가격, 없으면 current_prices_by_side (가장 최신 ticker 데이터)
+                    current_price = self.tick_conflator.trigger_price(side) or 0
+                    if current_price == 0 and hasattr(self, 'current_prices_by_side') and side in self.current_prices_by_side:
                         current_price = self.current_prices_by_side.get(side, 0)
 
-                    # 2. WebSocket 원본 데이터에서 markPrice 가져오기
+                    # 2. WebSocket 포지션 데이터의 markPrice
                     if current_price == 0:
                         for pos in positions:
-                            if pos.get('s') == current_symbol:
-                                mark_price_str = pos.get('mp', '0')  # Binance 형식 markPrice
-                                try:
-                                    current_price = float(mark_price_str)
-                                    if current_price > 0:
-                                        break
-                                except:
-                                    pass
+                            if pos.symbol == current_symbol and pos.mark_price > 0:
+                                current_price = pos.mark_price
+                                break
 
                     # 3. trade_price_labels에서 가져오기 (ticker WebSocket에서 업데이트됨)
                     if current_price == 0:
@@ -5909,8 +5936,10 @@ class AutoTraderGUI(QMainWindow):
                     cache_key = f'_cached_candle_data_{side}'
                     candle_data = getattr(self, cache_key, None)
 
-                    # process_tick 호출
-                    worker.process_tick(ticker_data, worker_position_data, candle_data)
+                    # process_tick 요청 (워커 스레드에서 실행)
+                    self.worker_queues[side].submit(ticker_data, worker_position_data, candle_data)
+
+            self._record_user_feed_latency(side, update, deliver_ts)
 
         except Exception as e:
             print(f"[{side.upper()}] Account update error: {e}")
@@ -5993,31 +6022,29 @@ class AutoTraderGUI(QMainWindow):
 
             row += 1
 
-    def handle_order_update_for_side(self, side, data):
+    def handle_order_update_for_side(self, side, update):
         """
         주문 업데이트 핸들러 (side별)
 
         Args:
             side: 'long' 또는 'short' (패널 구분자)
-            data: WebSocket에서 받은 주문 업데이트 데이터
+            update: WebSocket에서 받은 주문 업데이트 (v7_dual_events.OrderUpdate)
         """
+        deliver_ts = time.time()
         try:
-            # 자동매매 워커에게 주문 업데이트 전달
+            # 자동매매 워커에게 주문 업데이트 전달 (워커 이벤트 큐 - 워커 스레드에서 순서대로 처리)
             worker = self.auto_trade_workers.get(side)
             if worker and worker.is_running:
-                worker.on_order_update(data)
+                self.worker_queues[side].submit_order(update)
+            self._record_user_feed_latency(side, update, deliver_ts)
 
-            order_data = data.get('o', {})
-            symbol = order_data.get('s')
-            order_id = order_data.get('i')
-            status = order_data.get('X')
-            order_type = order_data.get('o', '')
-            side_str = order_data.get('S', '')
-            price_str = order_data.get('p', '0')
-            amount_str = order_data.get('q', '0')
-            filled_str = order_data.get('z', '0')
+            symbol = update.symbol
+            order_id = update.order_id
+            status = update.status
+            order_type = update.order_type
+            side_str = update.side
 
-            print(f"[{side.upper()}] Order update: {symbol} {order_id} {status}")
+            print(f"[{side.upper()}] Order update: {symbol} {order_id} {status}{' (보충)' if update.backfill else ''}")
 
             # 주문이 체결되거나 취소되면 회색으로 표시 후 잠시 뒤 제거
             if status in ['FILLED', 'CANCELED', 'EXPIRED', 'REJECTED']:
@@ -6037,14 +6064,9 @@ class AutoTraderGUI(QMainWindow):
                     return  # 아래 테이블 업데이트 스킵
             else:
                 # 주문 추가/업데이트 (NEW, PARTIALLY_FILLED 등)
-                try:
-                    price = float(price_str)
-                    amount = float(amount_str)
-                    filled = float(filled_str)
-                except (ValueError, TypeError):
-                    price = 0.0
-                    amount = 0.0
-                    filled = 0.0
+                price = update.price
+                amount = update.qty
+                filled = update.filled_qty
 
                 # 현재 심볼과 일치하는 경우만 처리
                 current_symbol = self.current_symbols.get(side, "")
@@ -6276,7 +6298,7 @@ class AutoTraderGUI(QMainWindow):
             precision = self.price_precisions.get(side, 2)
             self.trade_price_labels[side].setText(f"{price:.{precision}f}")
 
-        # Worker에 process_tick 전달 (헷지 트리거 모니터링 등)
+        # Worker 컨텍스트 갱신 (가격 자체는 병합 단계가 워커 스레드로 직접 전달)
         worker = self.auto_trade_workers.get(side)
         if worker and worker.is_running:
             import time as time_module
@@ -6315,9 +6337,77 @@ class AutoTraderGUI(QMainWindow):
             else:
                 candle_data = getattr(self, cache_key, None)
 
-            ticker_data = {'s': current_symbol, 'c': str(price)}
-            worker_position_data = self.live_position_data_by_side[side].copy()
-            worker.process_tick(ticker_data, worker_position_data, candle_data)
+            # 포지션은 복사본으로 교체 (워커 스레드가 참조하는 동안 GUI가 수정하지 않도록)
+            self.worker_queues[side].update_context(
+                position_data=self.live_position_data_by_side[side].copy(),
+                candle_data=candle_data
+            )
+
+    def _acquire_public_feeds(self, side, exchange, market_type, symbol, api_module):
+        """
+        패널의 공개 피드(티커/캔들/호가창) 획득 (v7_dual_feed_registry)
+
+        다른 패널이 같은 심볼을 쓰고 있으면 같은 스트림을 공유합니다 (구독/해석 1회, 전달만 패널별).
+        """
+        registry = get_feed_registry()
+        consumer = f"panel({side})"
+
+        # 티커는 병합 단계로 전달 (GUI 반영은 on_tick_snapshot, LONG 패널은 차트도 갱신)
+        self.ticker_threads[side] = registry.acquire(
+            exchange, market_type, symbol, STREAM_TICKER, consumer,
+            slots={'reconnected': lambda downtime, s=side: self.on_public_stream_reconnected(s, downtime)},
+            tick_sink=functools.partial(self.tick_conflator.push, side),
+            price_source=self.price_sources.get(side, PRICE_SOURCE_LAST)
+        )
+
+        # Bybit 실시간 캔들
+        if exchange == "Bybit":
+            bybit_interval = self._convert_interval_to_bybit(self.current_interval)
+            self.kline_threads[side] = registry.acquire(
+                exchange, market_type, symbol, kline_stream(bybit_interval), consumer,
+                slots={'kline_update': lambda kline_data, s=side: self.handle_kline_update_for_side(s, kline_data)}
+            )
+
+        # 로컬 L2 호가창 (시장가 청산 전 유동성/슬리피지 확인용)
+        try:
+            book_stream = registry.acquire(exchange, market_type, symbol, STREAM_DEPTH, consumer, api_module=api_module)
+            self.order_book_streams[side] = book_stream
+            self.auto_trade_workers[side].order_book = book_stream.book
+        except ValueError as e:
+            print(f"[{side.upper()} 패널] 호가창 스트림 생성 실패: {e}")
+
+    def _switch_public_feeds(self, side, symbol):
+        """패널의 공개 피드를 새 심볼 피드로 교체 (새 피드 먼저 획득 -> 이전 피드 반환)"""
+        registry = get_feed_registry()
+        consumer = f"panel({side})"
+        if self.ticker_threads.get(side):
+            self.ticker_threads[side] = registry.switch(self.ticker_threads[side], consumer, symbol=symbol)
+        if self.kline_threads.get(side):
+            self.kline_threads[side] = registry.switch(self.kline_threads[side], consumer, symbol=symbol)
+        if self.order_book_streams.get(side):
+            book_stream = registry.switch(self.order_book_streams[side], consumer, symbol=symbol)
+            self.order_book_streams[side] = book_stream
+            self.auto_trade_workers[side].order_book = book_stream.book
+
+    def _release_public_feeds(self, side):
+        """패널의 공개 피드 반환 (마지막 소비자면 레지스트리가 구독 해지)"""
+        get_feed_registry().release_all(f"panel({side})")
+        self.ticker_threads[side] = None
+        self.kline_threads[side] = None
+        if self.order_book_streams.get(side):
+            self.order_book_streams[side] = None
+            self.auto_trade_workers[side].order_book = None
+
+    def on_public_stream_reconnected(self, side, downtime):
+        """
+        공개 스트림(티커/캔들) 재연결 후 끊긴 구간의 캔들 보충
+
+        캔들 스트림은 같은 공유 연결을 쓰므로 티커 스트림 통보 1건으로 처리합니다.
+        차트 새로고침은 로컬 캔들 저장소 + 마지막 저장 이후 꼬리 구간(get_ohlcv_data)만 조회합니다.
+        """
+        print(f"[{side.upper()}] 공개 스트림 재연결 (끊김 {downtime:.1f}초) - 캔들 보충")
+        if side == 'long':  # 차트는 LONG 패널 기준
+            self.refresh_chart_data()
 
     def handle_kline_update_for_side(self, side, kline_data):
         """
@@ -6334,6 +6424,29 @@ class AutoTraderGUI(QMainWindow):
             if symbol == self.current_symbol:
                 self.handle_kline_update(kline_data)
 
+            # 캔들 확정은 워커 이벤트 큐로 전달 (이후 틱부터 새 캔들 기준으로 판단)
+            worker = self.auto_trade_workers.get(side)
+            if kline_data.get('confirm') and worker and worker.is_running and worker.symbol == symbol:
+                close = kline_data['close']
+                candle_data = {
+                    'prev': {
+                        'timestamp': kline_data['start'] / 1000.0,
+                        'open': kline_data['open'],
+                        'close': close,
+                        'high': kline_data['high'],
+                        'low': kline_data['low']
+                    },
+                    'current': {
+                        'timestamp': (kline_data['end'] + 1) / 1000.0,
+                        'open': close,
+                        'close': close,
+                        'high': close,
+                        'low': close
+                    }
+                }
+                setattr(self, f'_cached_candle_data_{side}', candle_data)
+                self.worker_queues[side].push_candle_close(candle_data)
+
         except Exception as e:
             print(f"[{side.upper()}] Kline update error: {e}")
 
@@ -6923,7 +7036,7 @@ class AutoTraderGUI(QMainWindow):
         print(f"Auto-Trade side set to: {self.auto_trade_side_mode}")
     
     @pyqtSlot(str, str, str, bool)
-    def on_auto_trade_execute(self, symbol, side, quantity, is_hedge=False):
+    def on_auto_trade_execute(self, symbol, side, quantity, is_hedge=False, hedge_trigger=None):
         """자동매매 워커(두뇌)로부터 받은 거래 신호를 실행합니다."""
 
         trade_type = "HEDGE" if is_hedge else "MAIN"
@@ -6980,9 +7093,9 @@ class AutoTraderGUI(QMainWindow):
 
                 # 주문 ID를 워커에게 전달
                 if is_hedge:
-                    # 헷지 주문인 경우, 슬리피지 추적을 위해 주문 ID와 트리거 정보를 워커로 전달
-                    if hasattr(self.auto_trade_worker, 'last_hedge_trigger_info') and self.auto_trade_worker.last_hedge_trigger_info:
-                        trigger_price, qty = self.auto_trade_worker.last_hedge_trigger_info
+                    # 헷지 트리거 주문인 경우, 슬리피지 추적을 위해 주문 ID와 트리거 정보(시그널로 받은 값)를 워커로 전달
+                    if hedge_trigger:
+                        trigger_price, qty = hedge_trigger
                         # 시그널 대신 직접 호출 (스레드 간 전달 확실성 보장)
                         self.auto_trade_worker.on_hedge_order_id_received(order_id, trigger_price, qty)
                         print(f"[슬리피지 추적] 헷지 주문 ID {order_id} 워커로 전달 (트리거가: ${trigger_price})")
@@ -7004,31 +7117,12 @@ class AutoTraderGUI(QMainWindow):
             print(f"AutoTraderGUI: 자동매매 주문 중 Python 오류: {e}")
             self.auto_trade_worker.log_message.emit(f"Status: <b style='color: red;'>Order FAILED (Python error)</b>")
 
-    def on_auto_trade_execute_for_side(self, side, symbol, order_side, quantity, is_hedge=False):
-        """Side별 자동매매 워커로부터 받은 거래 신호를 해당 계정으로 실행합니다.
+    def _resolve_auto_trade_order_flags(self, side_mode, order_side, is_hedge):
+        """자동매매 주문의 'reduce_only'와 'position_side'를 결정합니다.
 
-        Args:
-            side: 'long' 또는 'short' (어느 패널/계정에서 온 신호인지)
-            symbol: 거래 심볼
-            order_side: 'BUY' 또는 'SELL'
-            quantity: 주문 수량
-            is_hedge: 헷지 주문 여부
+        Returns:
+            tuple: (reduce_only, position_side)
         """
-        trade_type = "HEDGE" if is_hedge else "MAIN"
-        print(f"AutoTraderGUI [{side.upper()}]: 자동매매 신호 수신 -> [{trade_type}] {order_side} {quantity} {symbol}")
-
-        # side별 API 모듈과 워커 가져오기
-        api_module = self.api_modules.get(side)
-        worker = self.auto_trade_workers.get(side)
-        side_mode = self.side_modes.get(side, 'LONG' if side == 'long' else 'SHORT')
-
-        if not api_module or not api_module.is_api_key_active():
-            print(f"AutoTraderGUI [{side.upper()}]: API가 연결되지 않아 자동매매 주문을 실행할 수 없습니다.")
-            if worker:
-                worker.log_message.emit("Status: <b style='color: red;'>Order FAILED (API not connected)</b>")
-            return
-
-        # 'reduce_only'와 'position_side' 결정
         reduce_only = False
         position_side = "BOTH"
 
@@ -7057,42 +7151,145 @@ class AutoTraderGUI(QMainWindow):
                     position_side = "SHORT"
                     reduce_only = True
 
+        return reduce_only, position_side
+
+    def on_auto_trade_execute_for_side(self, side, symbol, order_side, quantity, is_hedge=False, client_order_id=None,
+                                       hedge_trigger=None):
+        """Side별 자동매매 워커로부터 받은 거래 신호를 해당 계정으로 실행합니다.
+
+        Args:
+            side: 'long' 또는 'short' (어느 패널/계정에서 온 신호인지)
+            symbol: 거래 심볼
+            order_side: 'BUY' 또는 'SELL'
+            quantity: 주문 수량
+            is_hedge: 헷지 주문 여부
+            client_order_id: 워커가 생성한 결정적 클라이언트 주문 ID (재전송 시 중복 방지)
+            hedge_trigger: 헷지 트리거 발동 주문이면 (트리거 가격, 수량), 그 외 None
+        """
+        trade_type = "HEDGE" if is_hedge else "MAIN"
+        print(f"AutoTraderGUI [{side.upper()}]: 자동매매 신호 수신 -> [{trade_type}] {order_side} {quantity} {symbol}")
+
+        # side별 API 모듈과 워커 가져오기
+        api_module = self.api_modules.get(side)
+        worker = self.auto_trade_workers.get(side)
+        side_mode = self.side_modes.get(side, 'LONG' if side == 'long' else 'SHORT')
+
+        if not api_module or not api_module.is_api_key_active():
+            print(f"AutoTraderGUI [{side.upper()}]: API가 연결되지 않아 자동매매 주문을 실행할 수 없습니다.")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: red;'>Order FAILED (API not connected)</b>")
+            return
+
+        # 'reduce_only'와 'position_side' 결정
+        reduce_only, position_side = self._resolve_auto_trade_order_flags(side_mode, order_side, is_hedge)
+
         try:
             print(f"Placing order [{side.upper()}]: {order_side} {quantity} {symbol} (reduceOnly={reduce_only}, positionSide={position_side})")
 
-            result = api_module.place_market_order(symbol, order_side, quantity, reduce_only, position_side)
+            result = api_module.place_market_order(symbol, order_side, quantity, reduce_only, position_side,
+                                                   client_order_id=client_order_id or None)
+            self._handle_auto_trade_market_result(side, worker, result, is_hedge, hedge_trigger)
 
-            if result and result.get('orderId'):
-                order_id = str(result.get('orderId'))
-                print(f"[{side.upper()}] 자동매매 주문 ID {order_id}가 접수되었습니다.")
+        except Exception as e:
+            print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문 중 Python 오류: {e}")
+            if worker:
+                worker.log_message.emit(f"Status: <b style='color: red;'>Order FAILED (Python error)</b>")
+
+    def _handle_auto_trade_market_result(self, side, worker, result, is_hedge, hedge_trigger=None):
+        """자동매매 시장가 주문 결과 처리 (주문 ID를 워커에 전달, 헷지 트리거 정보는 시그널로 받은 값 사용)"""
+        if result and result.get('orderId'):
+            order_id = str(result.get('orderId'))
+            print(f"[{side.upper()}] 자동매매 주문 ID {order_id}가 접수되었습니다.")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: blue;'>Order Placed!</b>")
+
+            # 주문 ID를 워커에게 전달
+            if is_hedge:
+                if worker and hedge_trigger:
+                    trigger_price, qty = hedge_trigger
+                    worker.on_hedge_order_id_received(order_id, trigger_price, qty)
+                    print(f"[{side.upper()}][슬리피지 추적] 헷지 주문 ID {order_id} 워커로 전달 (트리거가: ${trigger_price})")
+            else:
                 if worker:
-                    worker.log_message.emit("Status: <b style='color: blue;'>Order Placed!</b>")
+                    worker.order_id_received.emit(order_id)
+                    print(f"[{side.upper()}][메인 주문] 주문 ID {order_id} 워커로 전달")
 
-                # 주문 ID를 워커에게 전달
-                if is_hedge:
-                    if worker and hasattr(worker, 'last_hedge_trigger_info') and worker.last_hedge_trigger_info:
-                        trigger_price, qty = worker.last_hedge_trigger_info
-                        worker.on_hedge_order_id_received(order_id, trigger_price, qty)
-                        print(f"[{side.upper()}][슬리피지 추적] 헷지 주문 ID {order_id} 워커로 전달 (트리거가: ${trigger_price})")
-                else:
-                    if worker:
-                        worker.order_id_received.emit(order_id)
-                        print(f"[{side.upper()}][메인 주문] 주문 ID {order_id} 워커로 전달")
+        elif result and (result.get('code') or result.get('retCode')):
+            msg = result.get('msg', result.get('retMsg', 'Unknown API error'))
+            print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문이 API에서 거부됨: {msg}")
+            if worker:
+                worker.log_message.emit(f"Status: <b style='color: red;'>Order REJECTED: {msg}</b>")
+        else:
+            print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문 API 요청 실패. {result}")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: red;'>Order FAILED (API request)</b>")
 
-            elif result and (result.get('code') or result.get('retCode')):
-                msg = result.get('msg', result.get('retMsg', 'Unknown API error'))
-                print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문이 API에서 거부됨: {msg}")
-                if worker:
-                    worker.log_message.emit(f"Status: <b style='color: red;'>Order REJECTED: {msg}</b>")
+    def on_auto_trade_batch_orders_for_side(self, side, orders):
+        """Side별 자동매매 워커로부터 받은 일괄 주문 신호를 한 번의 요청으로 실행합니다.
+
+        Args:
+            side: 'long' 또는 'short' (어느 패널/계정에서 온 신호인지)
+            orders: [{'symbol', 'side', 'quantity', 'order_type', 'price', 'is_hedge', 'client_order_id'}, ...]
+        """
+        if not orders:
+            return
+
+        print(f"AutoTraderGUI [{side.upper()}]: 일괄 주문 신호 수신 -> {len(orders)}건")
+
+        api_module = self.api_modules.get(side)
+        worker = self.auto_trade_workers.get(side)
+        side_mode = self.side_modes.get(side, 'LONG' if side == 'long' else 'SHORT')
+
+        if not api_module or not api_module.is_api_key_active():
+            print(f"AutoTraderGUI [{side.upper()}]: API가 연결되지 않아 일괄 주문을 실행할 수 없습니다.")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: red;'>Order FAILED (API not connected)</b>")
+            return
+
+        # 1건이면 단건 경로 사용 (일괄 API 오버헤드 불필요)
+        if len(orders) == 1:
+            o = orders[0]
+            if o.get('order_type', 'MARKET').upper() == 'LIMIT':
+                self.on_auto_trade_limit_order_for_side(side, o['symbol'], o['side'], o['quantity'], o['price'],
+                                                        o.get('is_hedge', False), o.get('client_order_id'))
             else:
-                print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문 API 요청 실패. {result}")
-                if worker:
-                    worker.log_message.emit("Status: <b style='color: red;'>Order FAILED (API request)</b>")
+                self.on_auto_trade_execute_for_side(side, o['symbol'], o['side'], o['quantity'],
+                                                    o.get('is_hedge', False), o.get('client_order_id'))
+            return
+
+        api_orders = []
+        for o in orders:
+            reduce_only, position_side = self._resolve_auto_trade_order_flags(side_mode, o['side'], o.get('is_hedge', False))
+            api_orders.append({
+                'symbol': o['symbol'],
+                'side': o['side'],
+                'quantity': o['quantity'],
+                'order_type': o.get('order_type', 'MARKET'),
+                'price': o.get('price'),
+                'reduce_only': reduce_only,
+                'position_side': position_side,
+                'client_order_id': o.get('client_order_id'),
+            })
+            print(f"Placing batch item [{side.upper()}]: {o['side']} {o['quantity']} {o['symbol']} "
+                  f"({o.get('order_type', 'MARKET')}, reduceOnly={reduce_only}, positionSide={position_side})")
 
+        try:
+            results = api_module.place_batch_orders(api_orders)
         except Exception as e:
-            print(f"AutoTraderGUI [{side.upper()}]: 자동매매 주문 중 Python 오류: {e}")
+            print(f"AutoTraderGUI [{side.upper()}]: 일괄 주문 중 Python 오류: {e}")
             if worker:
                 worker.log_message.emit(f"Status: <b style='color: red;'>Order FAILED (Python error)</b>")
+            return
+
+        # 항목별 결과를 단건 주문과 동일하게 처리
+        for o, result in zip(orders, results):
+            try:
+                if o.get('order_type', 'MARKET').upper() == 'LIMIT':
+                    self._handle_auto_trade_limit_result(side, worker, result, o.get('is_hedge', False))
+                else:
+                    self._handle_auto_trade_market_result(side, worker, result, o.get('is_hedge', False))
+            except Exception as e:
+                print(f"AutoTraderGUI [{side.upper()}]: 일괄 주문 결과 처리 오류: {e}")
 
     @pyqtSlot(str, str, str, str, bool)
     def on_auto_trade_limit_order(self, symbol, side, quantity, price, is_hedge=False):
@@ -7174,7 +7371,7 @@ class AutoTraderGUI(QMainWindow):
             print(f"AutoTraderGUI: 지정가 주문 중 Python 오류: {e}")
             self.auto_trade_worker.log_message.emit(f"Status: <b style='color: red;'>Limit Order FAILED (Python error)</b>")
 
-    def on_auto_trade_limit_order_for_side(self, side, symbol, order_side, quantity, price, is_hedge=False):
+    def on_auto_trade_limit_order_for_side(self, side, symbol, order_side, quantity, price, is_hedge=False, client_order_id=None):
         """Side별 자동매매 워커로부터 받은 지정가 주문 신호를 해당 계정으로 실행합니다.
 
         Args:
@@ -7184,6 +7381,7 @@ class AutoTraderGUI(QMainWindow):
             quantity: 주문 수량
             price: 지정가
             is_hedge: 헷지 주문 여부
+            client_order_id: 워커가 생성한 결정적 클라이언트 주문 ID (재전송 시 중복 방지)
         """
         trade_type = "HEDGE" if is_hedge else "MAIN"
         print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문 신호 수신 -> [{trade_type}] {order_side} {quantity} {symbol} @ ${price}")
@@ -7200,69 +7398,49 @@ class AutoTraderGUI(QMainWindow):
             return
 
         # 'reduce_only'와 'position_side' 결정
-        reduce_only = False
-        position_side = "BOTH"
-
-        if is_hedge:
-            if side_mode == "LONG":
-                position_side = "SHORT"
-                reduce_only = False
-            elif side_mode == "SHORT":
-                position_side = "LONG"
-                reduce_only = False
-        else:
-            if side_mode == "LONG":
-                if order_side.upper() == "BUY":
-                    position_side = "LONG"
-                    reduce_only = False
-                elif order_side.upper() == "SELL":
-                    position_side = "LONG"
-                    reduce_only = True
-            elif side_mode == "SHORT":
-                if order_side.upper() == "SELL":
-                    position_side = "SHORT"
-                    reduce_only = False
-                elif order_side.upper() == "BUY":
-                    position_side = "SHORT"
-                    reduce_only = True
+        reduce_only, position_side = self._resolve_auto_trade_order_flags(side_mode, order_side, is_hedge)
 
         try:
             print(f"Placing limit order [{side.upper()}]: {order_side} {quantity} {symbol} @ ${price} (reduceOnly={reduce_only}, positionSide={position_side})")
 
-            result = api_module.place_limit_order(symbol, order_side, quantity, price, reduce_only, position_side)
-
-            if result and (result.get('orderId') or result.get('retCode') == 0):
-                order_id = str(result.get('orderId', result.get('retCode', 'N/A')))
-                print(f"[{side.upper()}] 지정가 주문 ID {order_id}가 접수되었습니다.")
-                if worker:
-                    worker.log_message.emit("Status: <b style='color: blue;'>Limit Order Placed!</b>")
-
-                # 주문 ID와 현재 Step 매핑 저장 (차트 라벨용)
-                if worker and hasattr(worker, 'current_step'):
-                    step_for_order = worker.current_step + 1
-                    self.order_step_map[order_id] = step_for_order
-                    print(f"[{side.upper()}][차트] 주문 ID {order_id}를 Step {step_for_order + 1}로 매핑")
-
-                # 주문 ID를 워커로 전달 (다음 단계 진입 주문인 경우에만)
-                if not is_hedge and worker:
-                    worker.order_id_received.emit(order_id)
-                    print(f"[{side.upper()}][DCA] 다음 단계 주문 ID {order_id}를 워커에 전달")
-
-            elif result and (result.get('code') or result.get('retCode')):
-                msg = result.get('msg', result.get('retMsg', 'Unknown API error'))
-                print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문이 API에서 거부됨: {msg}")
-                if worker:
-                    worker.log_message.emit(f"Status: <b style='color: red;'>Limit Order REJECTED: {msg}</b>")
-            else:
-                print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문 API 요청 실패. {result}")
-                if worker:
-                    worker.log_message.emit("Status: <b style='color: red;'>Limit Order FAILED (API request)</b>")
+            result = api_module.place_limit_order(symbol, order_side, quantity, price, reduce_only, position_side,
+                                                  client_order_id=client_order_id or None)
+            self._handle_auto_trade_limit_result(side, worker, result, is_hedge)
 
         except Exception as e:
             print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문 중 Python 오류: {e}")
             if worker:
                 worker.log_message.emit(f"Status: <b style='color: red;'>Limit Order FAILED (Python error)</b>")
 
+    def _handle_auto_trade_limit_result(self, side, worker, result, is_hedge):
+        """자동매매 지정가 주문 결과 처리 (Step 매핑 저장 및 주문 ID를 워커에 전달)"""
+        if result and (result.get('orderId') or result.get('retCode') == 0):
+            order_id = str(result.get('orderId', result.get('retCode', 'N/A')))
+            print(f"[{side.upper()}] 지정가 주문 ID {order_id}가 접수되었습니다.")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: blue;'>Limit Order Placed!</b>")
+
+            # 주문 ID와 현재 Step 매핑 저장 (차트 라벨용)
+            if worker and hasattr(worker, 'current_step'):
+                step_for_order = worker.current_step + 1
+                self.order_step_map[order_id] = step_for_order
+                print(f"[{side.upper()}][차트] 주문 ID {order_id}를 Step {step_for_order + 1}로 매핑")
+
+            # 주문 ID를 워커로 전달 (다음 단계 진입 주문인 경우에만)
+            if not is_hedge and worker:
+                worker.order_id_received.emit(order_id)
+                print(f"[{side.upper()}][DCA] 다음 단계 주문 ID {order_id}를 워커에 전달")
+
+        elif result and (result.get('code') or result.get('retCode')):
+            msg = result.get('msg', result.get('retMsg', 'Unknown API error'))
+            print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문이 API에서 거부됨: {msg}")
+            if worker:
+                worker.log_message.emit(f"Status: <b style='color: red;'>Limit Order REJECTED: {msg}</b>")
+        else:
+            print(f"AutoTraderGUI [{side.upper()}]: 지정가 주문 API 요청 실패. {result}")
+            if worker:
+                worker.log_message.emit("Status: <b style='color: red;'>Limit Order FAILED (API request)</b>")
+
     @pyqtSlot(str, float)
     def on_adjust_next_step_order(self, order_id, slippage, panel_side=None):
         """슬리피지 발생 시 다음 단계 진입 주문 가격 조정"""
@@ -7335,7 +7513,7 @@ class AutoTraderGUI(QMainWindow):
                 print(f"[슬리피지 조정] 새 주문 ID {new_order_id} 생성 성공")
 
                 # 새 주문 ID를 워커에 전달
-                worker.next_step_order_id = new_order_id
+                worker.set_next_step_order_id(new_order_id)
                 worker.order_id_received.emit(new_order_id)
 
                 # 차트에 주문 라인 업데이트
@@ -7380,16 +7558,10 @@ class AutoTraderGUI(QMainWindow):
             else:
                 self.remove_m4_order_marker()
 
-            # 2. 헷지 트리거 초기화 (소프트 트리거이므로 API 취소 불필요, 내부 상태만 초기화)
-            if worker.hedge_trigger_prices:
-                print(f"[{_el}] 헷지 트리거 {len(worker.hedge_trigger_prices)}개 비활성화")
-
-                # 워커의 헷지 관련 상태 초기화
-                worker.hedge_trigger_prices.clear()
-                worker.remaining_hedge_qty = 0
-
-                # 슬리피지 추적용 딕셔너리도 정리
-                worker.pending_hedge_orders.clear()
+            # 2. 헷지 트리거 초기화 (소프트 트리거이므로 API 취소 불필요, 워커 상태는 워커 락 안에서 초기화)
+            cleared = worker.cancel_hedge_triggers()
+            if cleared:
+                print(f"[{_el}] 헷지 트리거 {cleared}개 비활성화 (슬리피지 추적 포함)")
 
                 # 차트에서 해당 side의 헷지 트리거 마커만 제거
                 if panel_side:
@@ -7399,11 +7571,10 @@ class AutoTraderGUI(QMainWindow):
                 print(f"[{_el}] 헷지 트리거 마커 제거 완료")
 
             # 3. 메인 포지션 시장가 진입
-            next_step = worker.current_step + 1
-            if next_step < len(worker.entry_qty_list):
-                next_entry_qty = worker.entry_qty_list[next_step]
-                side = "BUY" if worker.side_mode == "LONG" else "SELL"
-                position_side = worker.side_mode  # "LONG" 또는 "SHORT"
+            next_step, next_entry_qty, side_mode = worker.snapshot_next_entry()
+            if next_entry_qty is not None:
+                side = "BUY" if side_mode == "LONG" else "SELL"
+                position_side = side_mode  # "LONG" 또는 "SHORT"
 
                 print(f"[{_el}] 시장가 즉시 진입: {side} {next_entry_qty} {self.current_symbol} (positionSide={position_side})")
 
@@ -7412,8 +7583,8 @@ class AutoTraderGUI(QMainWindow):
                 )
 
                 if result and result.get('orderId'):
-                    worker.next_step_order_id = str(result.get('orderId'))
-                    log_color = "green" if worker.side_mode == "LONG" else "red"
+                    worker.set_next_step_order_id(str(result.get('orderId')))
+                    log_color = "green" if side_mode == "LONG" else "red"
                     worker.log_message.emit(f"Status: <b style='color: {log_color};'>Uptrend Entry Executed!</b>")
                 else:
                     print(f"[{_el}] 시장가 주문 실패: {result}")
@@ -8315,6 +8486,7 @@ class AutoTraderGUI(QMainWindow):
                 "HEDGE_PROTOCOL_ENABLED": True,  # 항상 활성화
                 "HEDGE_PROTOCOL_RETRACEMENT": float(self.settings_hedge_protocol_retracement.text()),
                 "HEDGE_PROTOCOL_TAKE_PROFIT_RATIO": float(self.settings_hedge_protocol_tp_ratio.text()),
+                "MARKET_EXIT_MAX_SLIPPAGE_PERCENT": float(self.settings_market_exit_max_slippage.text()),
                 "MAIN_LIQUIDATION_SAFETY_MARGIN": float(self.settings_main_liquidation_safety_margin.text()),
                 "HEDGE_LIQUIDATION_SAFETY_MARGIN": float(self.settings_hedge_liquidation_safety_margin.text()),
                 "HEDGE_FRONTLOAD_FINAL_STEP": self.settings_hedge_frontload.isChecked(),
@@ -8927,6 +9099,20 @@ class AutoTraderGUI(QMainWindow):
 
         print(f"포지션 행 인덱스 재정렬 완료. (활성: {len(self.live_position_data)})")
 
+    def on_tick_snapshot(self, snapshot):
+        """
+        병합 단계의 GUI 프레임 (패널별 마지막 프레임 이후 최신 가격만 전달)
+
+        Args:
+            snapshot: {side: (symbol, price)}
+        """
+        for side, (symbol, price) in snapshot.items():
+            ticker_list = [{'s': symbol, 'c': str(price)}]
+            self.handle_ticker_update_for_side(side, ticker_list)
+            # LONG 패널: 차트 업데이트도 반영 (price_line_item, 캔들 업데이트 등)
+            if side == 'long':
+                self.handle_ticker_update(ticker_list)
+
     @pyqtSlot(list)
     def handle_ticker_update(self, ticker_list):
         try:
@@ -8934,45 +9120,8 @@ class AutoTraderGUI(QMainWindow):
             current_time = time_module.time()
 
             for item in ticker_list:
+                # 워커 process_tick은 병합 단계 -> 워커 이벤트 큐가 워커 스레드에서 호출
                 if self.auto_trade_worker and self.auto_trade_worker.is_running:
-                    # 캔들 데이터 추출 Rate Limiting (1초에 1번만) - 성능 최적화
-                    candle_data = None
-                    should_extract_candle = current_time - getattr(self, '_last_candle_extract_time', 0) >= 1.0
-
-                    if should_extract_candle:
-                        if self.candlestick_item and hasattr(self.candlestick_item, 'data'):
-                            df = self.candlestick_item.data
-                            if not df.empty and len(df) >= 2:
-                                # 마지막 2개 봉 추출
-                                prev_candle = df.iloc[-2]
-                                current_candle = df.iloc[-1]
-
-                                candle_data = {
-                                    'prev': {
-                                        'timestamp': prev_candle['time'],
-                                        'open': prev_candle['open'],
-                                        'close': prev_candle['close'],
-                                        'high': prev_candle['high'],
-                                        'low': prev_candle['low']
-                                    },
-                                    'current': {
-                                        'timestamp': current_candle['time'],
-                                        'open': current_candle['open'],
-                                        'close': current_candle['close'],
-                                        'high': current_candle['high'],
-                                        'low': current_candle['low']
-                                    }
-                                }
-                                # 캔들 데이터 캐싱
-                                self._cached_candle_data = candle_data
-                                self._last_candle_extract_time = current_time
-                    else:
-                        # 캐시된 캔들 데이터 사용
-                        candle_data = getattr(self, '_cached_candle_data', None)
-
-                    # 워커의 process_tick 슬롯을 호출 (현재 포지션 정보 + 캔들 데이터)
-                    self.auto_trade_worker.process_tick(item, self.live_position_data, candle_data)
-
                     # Insight 탭에 현재가 업데이트 (Rate Limiting: 1초 간격)
                     current_price = float(item.get('c', 0))
                     if current_price > 0:
@@ -9180,13 +9329,13 @@ class AutoTraderGUI(QMainWindow):
             self.pending_chart_update = False
 
     @pyqtSlot(dict)
-    def handle_order_update(self, data):
+    def handle_order_update(self, update):
         try:
-            # 자동매매 워커에게 주문 업데이트 전달
+            # 자동매매 워커에게 주문 업데이트 전달 (LONG 워커 이벤트 큐)
             if hasattr(self, 'auto_trade_worker') and self.auto_trade_worker:
-                self.auto_trade_worker.on_order_update(data)
+                self.worker_queues['long'].submit_order(update)
 
-            o = data.get('o', {}); order_id = str(o.get('i')); status = o.get('X')
+            o = update.to_binance()['o']; order_id = str(o.get('i')); status = o.get('X')
             if order_id in self.pending_market_orders:
                 if status == 'FILLED':
                     QMessageBox.information(self, "Order Success (FILLED)", f"Order Filled (Status: {status}):\n{o.get('S')} {o.get('q')} {o.get('s')}\nAvg. Price: {o.get('ap', 'N/A')}")
@@ -9247,7 +9396,7 @@ class AutoTraderGUI(QMainWindow):
 
         klines = klines_data
         if klines is None:
-            klines = self.api_module.get_ohlcv_data(symbol, interval, 500)  # 500개로 제한 (성능 최적화)
+            klines = get_kline_store().load(self.api_module, symbol, interval, 500)  # 로컬 저장분 + 꼬리 구간
         
         if not klines:
             logger.error(f"{symbol} {interval} 캔들 데이터 가져오기 실패")
@@ -9417,33 +9566,13 @@ class AutoTraderGUI(QMainWindow):
         else:
             print("API가 연결되지 않았습니다. 연결 후 차트가 업데이트됩니다.")
 
-        # 티커 스레드 재시작 (가격 실시간 업데이트)
+        # 티커 구독 변경 (가격 실시간 업데이트, 공유 연결에서 토픽만 교체)
         if self.ticker_thread and hasattr(self, 'connect_thread'):
-            print(f"티커 스레드 재시작 중: {old_symbol} → {new_symbol}")
-
-            # 기존 티커 스레드 종료
-            if self.ticker_thread.isRunning():
-                self.ticker_thread.stop()
-                self.ticker_thread.wait()
-                print("기존 티커 스레드 종료 완료")
-
-            # 새로운 티커 스레드 생성
-            exchange = self.connect_thread.exchange
-            if exchange == "Binance":
-                new_ticker_thread = TickerSocketThread(self.current_market_type, new_symbol)
-            elif exchange == "Bybit":
-                new_ticker_thread = BybitTickerSocketThread(self.current_market_type, new_symbol)
-            else:
-                print(f"지원되지 않는 거래소: {exchange}")
-                return
-
-            # 시그널 연결 및 시작
-            new_ticker_thread.ticker_update.connect(self.handle_ticker_update)
-            new_ticker_thread.start()
-
-            # 참조 업데이트
-            self.ticker_thread = new_ticker_thread
-            print(f"새 티커 스레드 시작 완료: {new_symbol}")
+            print(f"티커 구독 변경 중: {old_symbol} → {new_symbol}")
+            self.tick_conflator.forget('long')
+            self.ticker_thread.update_symbol(new_symbol)
+            if not self.ticker_thread.isRunning():
+                self.ticker_thread.start()
 
     def change_timeframe(self, timeframe_value):
         if self.current_interval == timeframe_value: return
@@ -9468,38 +9597,17 @@ class AutoTraderGUI(QMainWindow):
         self.update_chart(self.current_symbol, self.current_interval)
         
     def _reconnect_kline_threads_for_new_interval(self):
-        """타임프레임 변경 시 모든 Kline WS 스레드를 새 간격으로 재연결"""
+        """타임프레임 변경 시 모든 Kline 피드를 새 간격 피드로 교체 (공유 연결 유지, 재연결 없음)"""
         bybit_interval = self._convert_interval_to_bybit(self.current_interval)
         for side in ['long', 'short']:
-            old_kline = self.kline_threads.get(side)
-            if not old_kline:
+            kline = self.kline_threads.get(side)
+            if not kline:
                 continue
-            connect_thread = self.connect_threads.get(side)
-            if not connect_thread or connect_thread.exchange != "Bybit":
-                continue
-
-            # 기존 Kline 스레드 종료
-            if old_kline.isRunning():
-                old_kline.stop()
-                old_kline.wait()
 
-            # 새로운 Kline 스레드 생성
-            market_type = self.current_market_types.get(side, 'linear')
             symbol = self.current_symbols.get(side, self.current_symbol)
-            from v7_dual_ticker_ws import BybitKlineSocketThread
-            new_kline = BybitKlineSocketThread(
-                market_type=market_type,
-                symbol=symbol,
-                interval=bybit_interval,
-                parent=self
-            )
-            new_kline.kline_update.connect(lambda kline_data, s=side: self.handle_kline_update_for_side(s, kline_data))
-            new_kline.start()
-            self.kline_threads[side] = new_kline
-            print(f"[{side.upper()}] Kline WS 재연결: {symbol}/{bybit_interval}")
-
-            if side == 'long':
-                self.kline_thread = new_kline
+            self.kline_threads[side] = get_feed_registry().switch(kline, f"panel({side})", symbol=symbol,
+                                                                  stream=kline_stream(bybit_interval))
+            print(f"[{side.upper()}] Kline 구독 변경: {symbol}/{bybit_interval}")
 
     def update_timeframe_buttons(self, new_tf, old_tf):
         if old_tf and old_tf in self.buttons: self.buttons[old_tf].setStyleSheet("")
@@ -11206,6 +11314,19 @@ class AutoTraderGUI(QMainWindow):
             self.log_list_widget.clear()
             print(f"GUI 로그가 클리어되었습니다. (파일은 유지됨: {self.log_file_path})")
 
+    def _replay_dca_journals(self):
+        """config의 DCA 상태 체크포인트에 저널을 재생해 최신 상태로 (config 로드 직후)"""
+        for side, journal in self.dca_journals.items():
+            config_key = f"dca_state_{side}"
+            checkpoint = self.config_data.get(config_key)
+            if not checkpoint:
+                continue
+            dca_state, applied, events = journal.restore(checkpoint)
+            if applied:
+                self.config_data[config_key] = dca_state
+                event_types = ', '.join(e.get('type', '?') for e in events) or '-'
+                print(f"[DCA 상태] [{side.upper()}] 저널 {applied}건 재생 (seq {journal.seq}, 이벤트 {event_types})")
+
     def save_dca_state(self):
         """하위 호환성 래퍼: LONG side의 DCA 상태 저장"""
         self.save_dca_state_for_side('long')
@@ -11225,8 +11346,12 @@ class AutoTraderGUI(QMainWindow):
             config_key = f"dca_state_{side}"
             print(f"[DCA 상태] save_dca_state_for_side({side}) 호출됨 (is_running={worker.is_running})")
 
+            journal = self.dca_journals[side]
+            events = worker.lifecycle.drain()
+
             if not worker.is_running:
                 # DCA가 실행 중이 아니면 저장된 상태 삭제
+                journal.discard()
                 if config_key in self.config_data:
                     del self.config_data[config_key]
                     config_manager.save_config_data(self.config_data)
@@ -11240,6 +11365,8 @@ class AutoTraderGUI(QMainWindow):
                 "side_mode": worker.side_mode,
                 "current_step": worker.current_step,
                 "total_steps": worker.total_steps,
+                "cycle_id": worker.cycle_id,  # 클라이언트 주문 ID 사이클
+                "client_order_seq": worker.client_order_seq_state(),  # 클라이언트 주문 ID 순번 (재시작 후 ID 재사용 방지)
                 "entry_qty_list": worker.entry_qty_list,
                 "hedge_qty_list": worker.hedge_qty_list,
                 "hedge_trigger_prices": worker.hedge_trigger_prices,  # 헷지 트리거 가격 저장
@@ -11285,7 +11412,9 @@ class AutoTraderGUI(QMainWindow):
                 # 사이클 카운트 저장
                 "cycle_count": self.cycles_by_side.get(side, 0),
                 # side 정보 저장
-                "panel_side": side
+                "panel_side": side,
+                # 사이클 단계 (v7_dual_dca_state_machine - 표시/진단용, 복원은 위 플래그 기준)
+                "phase": worker.lifecycle.phase
             }
 
             # 단계 변경 시 모든 주문 라인 제거 (새 주문 생성 시 새로 그려짐)
@@ -11298,12 +11427,21 @@ class AutoTraderGUI(QMainWindow):
                 # 모든 주문 라인 제거 (새 단계 주문 라인은 주문 생성 시 새로 그려짐)
                 self.remove_all_order_lines_from_chart()
 
-            self.config_data[config_key] = dca_state
-            config_manager.save_config_data(self.config_data)
+            # 단계 변경 / 첫 저장 / 저널이 길어졌으면 config 전체 저장(체크포인트), 그 외에는 바뀐 값만 저널에 추가
+            if config_key not in self.config_data or prev_step != current_step or journal.needs_checkpoint():
+                def save_checkpoint(state):
+                    self.config_data[config_key] = state
+                    config_manager.save_config_data(self.config_data)
+                journal.checkpoint(dca_state, save_checkpoint, events)
+                saved_as = f"체크포인트 (이벤트 {', '.join(e.type for e in events) or '-'})"
+            else:
+                changed = journal.append(dca_state, events)
+                self.config_data[config_key] = dca_state
+                saved_as = f"저널 seq {journal.seq} ({changed}개 값, 이벤트 {', '.join(e.type for e in events) or '-'})"
 
             # 표시용 단계 계산 (1-based 표시 - 현재 체결된 단계만 표시)
             display_step = dca_state['current_step'] + 1
-            print(f"[DCA 상태] [{side.upper()}] 저장 완료: {dca_state['symbol']} {dca_state['side_mode']} Step {display_step}/{dca_state['total_steps']} (current_step={worker.current_step}, next_order_placed={dca_state['next_step_orders_placed']}, order_id={dca_state['next_step_order_id']}, profit_target={dca_state['profit_target_price']}, is_uptrend_entry={dca_state['is_uptrend_entry']}, final_protection={dca_state['final_step_protection_placed']})")
+            print(f"[DCA 상태] [{side.upper()}] 저장 완료 [{saved_as}]: {dca_state['symbol']} {dca_state['side_mode']} Step {display_step}/{dca_state['total_steps']} (current_step={worker.current_step}, next_order_placed={dca_state['next_step_orders_placed']}, order_id={dca_state['next_step_order_id']}, profit_target={dca_state['profit_target_price']}, is_uptrend_entry={dca_state['is_uptrend_entry']}, final_protection={dca_state['final_step_protection_placed']})")
 
         except Exception as e:
             print(f"[DCA 상태] [{side.upper()}] 저장 오류: {e}")
@@ -11677,174 +11815,183 @@ class AutoTraderGUI(QMainWindow):
                     label.setText(f"{prefix}: Cycle {saved_cycle_count}")
                 print(f"[DCA 복구] [{side.upper()}] 사이클 카운트 복구: {saved_cycle_count}")
 
-            # 워커 시작 (복구된 상태로)
-            worker.start_trading(
-                dca_state.get("symbol"),
-                0,  # entry_quantity는 복구 시 사용하지 않음 (리스트에서 가져옴)
-                dca_state.get("side_mode"),
-                strategy_settings,
-                dca_state.get("current_step", 0),
-                dca_state.get("total_steps", 10),
-                dca_state.get("entry_qty_list", []),
-                dca_state.get("hedge_qty_list", []),
-                api_module,
-                symbol_info,
-                dca_state.get("category", "linear"),
-                self.insight_data_by_side.get(side, {}).get('current_price', 0)  # 현재 가격
-            )
+            # 워커 시작 + 상태 복원은 state_lock 안에서 (워커 스레드의 틱/주문 처리와 섞이지 않도록)
+            # 차트/Insight 표시는 락을 놓은 뒤 (워커 스레드가 GUI 렌더링을 기다리지 않도록)
+            with worker.state_lock:
+                # 워커 시작 (복구된 상태로)
+                worker.start_trading(
+                    dca_state.get("symbol"),
+                    0,  # entry_quantity는 복구 시 사용하지 않음 (리스트에서 가져옴)
+                    dca_state.get("side_mode"),
+                    strategy_settings,
+                    dca_state.get("current_step", 0),
+                    dca_state.get("total_steps", 10),
+                    dca_state.get("entry_qty_list", []),
+                    dca_state.get("hedge_qty_list", []),
+                    api_module,
+                    symbol_info,
+                    dca_state.get("category", "linear"),
+                    self.insight_data_by_side.get(side, {}).get('current_price', 0)  # 현재 가격
+                )
 
-            # 복구된 상태 플래그 설정 (start_trading 후 다시 설정)
-            worker.initial_entry_done = initial_entry_done_flag
-
-            # [중요] 익절 모니터링 모드면 next_step_orders_placed를 강제로 True로 설정
-            # 역방향진입 후에는 다음 단계 주문이 없는 것이 정상이므로 주문 생성 스킵
-            if is_profit_monitoring_mode:
-                worker.next_step_orders_placed = True
-                print(f"[DCA 상태] 익절 모니터링 모드 - next_step_orders_placed 강제 True 설정 (주문 생성 방지)")
-            # 역방향진입 진행 중이면 next_step_orders_placed를 True로 설정 (시장가 주문 체결 대기)
-            elif is_uptrend_entry:
-                worker.next_step_orders_placed = True
-                _el = "하강진입" if side == "short" else "상승진입"
-                print(f"[DCA 상태] {_el} 진행 중 - next_step_orders_placed 강제 True 설정 (시장가 주문 체결 대기)")
-            else:
-                worker.next_step_orders_placed = next_step_orders_placed_flag
+                # 복구된 상태 플래그 설정 (start_trading 후 다시 설정)
+                worker.initial_entry_done = initial_entry_done_flag
 
-            print(f"[DCA 상태] [{side.upper()}] 플래그 복구 완료: initial_entry_done={initial_entry_done_flag}, next_step_orders_placed={worker.next_step_orders_placed}")
+                # 클라이언트 주문 ID 사이클 + 순번 복원 (재시작 후 새 주문이 이미 쓴 ID를 받지 않도록)
+                # 순번이 없는 이전 형식 상태는 새 사이클 ID를 그대로 사용
+                if dca_state.get("cycle_id") and "client_order_seq" in dca_state:
+                    worker.cycle_id = dca_state["cycle_id"]
+                    worker.restore_client_order_seq(dca_state.get("client_order_seq"))
 
-            # 다음 단계 주문 ID 복원
-            # 우선순위: 1) Config에 저장된 주문 ID (존재하는 경우), 2) GUI 테이블에서 발견한 주문 ID
-            next_step_order_id = None
+                # [중요] 익절 모니터링 모드면 next_step_orders_placed를 강제로 True로 설정
+                # 역방향진입 후에는 다음 단계 주문이 없는 것이 정상이므로 주문 생성 스킵
+                if is_profit_monitoring_mode:
+                    worker.next_step_orders_placed = True
+                    print(f"[DCA 상태] 익절 모니터링 모드 - next_step_orders_placed 강제 True 설정 (주문 생성 방지)")
+                # 역방향진입 진행 중이면 next_step_orders_placed를 True로 설정 (시장가 주문 체결 대기)
+                elif is_uptrend_entry:
+                    worker.next_step_orders_placed = True
+                    _el = "하강진입" if side == "short" else "상승진입"
+                    print(f"[DCA 상태] {_el} 진행 중 - next_step_orders_placed 강제 True 설정 (시장가 주문 체결 대기)")
+                else:
+                    worker.next_step_orders_placed = next_step_orders_placed_flag
 
-            if saved_order_exists and found_order_id:
-                # Config에 저장된 주문 ID가 실제로 존재하면 사용
-                next_step_order_id = found_order_id
-                print(f"[DCA 상태] Config 저장 주문 ID 사용: {next_step_order_id}")
-            elif has_pending_order and found_order_id:
-                # Config에 저장된 주문 ID가 없지만 GUI 테이블에서 발견한 주문 ID 사용
-                next_step_order_id = found_order_id
-                print(f"[DCA 상태] GUI 테이블에서 발견한 주문 ID 사용: {next_step_order_id}")
+                print(f"[DCA 상태] [{side.upper()}] 플래그 복구 완료: initial_entry_done={initial_entry_done_flag}, next_step_orders_placed={worker.next_step_orders_placed}")
 
-            if next_step_order_id:
-                worker.next_step_order_id = next_step_order_id
-                print(f"[DCA 상태] 다음 단계 주문 ID 복원 완료: {next_step_order_id}")
+                # 다음 단계 주문 ID 복원
+                # 우선순위: 1) Config에 저장된 주문 ID (존재하는 경우), 2) GUI 테이블에서 발견한 주문 ID
+                next_step_order_id = None
 
-            # 마지막 진입 주문 가격 복원
-            last_step_entry_price = dca_state.get("last_step_entry_price")
-            if last_step_entry_price is not None:
-                worker.last_step_entry_price = last_step_entry_price
-                print(f"[DCA 상태] 마지막 진입 주문 가격 복원: ${self.fmt_price(last_step_entry_price)}")
+                if saved_order_exists and found_order_id:
+                    # Config에 저장된 주문 ID가 실제로 존재하면 사용
+                    next_step_order_id = found_order_id
+                    print(f"[DCA 상태] Config 저장 주문 ID 사용: {next_step_order_id}")
+                elif has_pending_order and found_order_id:
+                    # Config에 저장된 주문 ID가 없지만 GUI 테이블에서 발견한 주문 ID 사용
+                    next_step_order_id = found_order_id
+                    print(f"[DCA 상태] GUI 테이블에서 발견한 주문 ID 사용: {next_step_order_id}")
 
-            # 헷지 트리거 가격 복원
-            hedge_trigger_prices = dca_state.get("hedge_trigger_prices", [])
+                if next_step_order_id:
+                    worker.next_step_order_id = next_step_order_id
+                    print(f"[DCA 상태] 다음 단계 주문 ID 복원 완료: {next_step_order_id}")
+
+                # 마지막 진입 주문 가격 복원
+                last_step_entry_price = dca_state.get("last_step_entry_price")
+                if last_step_entry_price is not None:
+                    worker.last_step_entry_price = last_step_entry_price
+                    print(f"[DCA 상태] 마지막 진입 주문 가격 복원: ${self.fmt_price(last_step_entry_price)}")
+
+                # 헷지 트리거 가격 복원
+                hedge_trigger_prices = dca_state.get("hedge_trigger_prices", [])
+                if hedge_trigger_prices:
+                    worker.restore_hedge_triggers(hedge_trigger_prices)
+                    print(f"[DCA 상태] 헷지 트리거 가격 복원: {len(hedge_trigger_prices)}개")
+
+                # 익절 관련 상태 복원
+                profit_target_price = dca_state.get("profit_target_price")
+                if profit_target_price is not None:
+                    worker.profit_target_price = profit_target_price
+                    print(f"[DCA 상태] 익절 트리거 가격 복원: ${profit_target_price}")
+
+                entry_price_at_step = dca_state.get("entry_price_at_step")
+                if entry_price_at_step is not None:
+                    worker.entry_price_at_step = entry_price_at_step
+                    print(f"[DCA 상태] 추가진입 시점 가격 복원: ${entry_price_at_step}")
+
+                # 익절 모니터링 모드면 고가/저가 복원 (저장된 값이 있으면 사용, 없으면 entry_price_at_step으로 초기화)
+                if profit_target_price is not None:
+                    high_price_since_entry = dca_state.get("high_price_since_entry")
+                    low_price_since_entry = dca_state.get("low_price_since_entry")
+
+                    if high_price_since_entry is not None and low_price_since_entry is not None:
+                        # 저장된 고가/저가 복원
+                        worker.high_price_since_entry = high_price_since_entry
+                        worker.low_price_since_entry = low_price_since_entry
+                        print(f"[DCA 복구] 익절 고가/저가 복원: High={high_price_since_entry}, Low={low_price_since_entry}")
+                    elif entry_price_at_step is not None:
+                        # 저장된 값이 없으면 진입가로 초기화 (하위 호환성)
+                        worker.high_price_since_entry = entry_price_at_step
+                        worker.low_price_since_entry = entry_price_at_step
+                        print(f"[DCA 복구] 익절 고가/저가 초기화 (저장값 없음): High={entry_price_at_step}, Low={entry_price_at_step}")
+
+                # 상승 중 추가진입 임계값 복원
+                uptrend_threshold_price = dca_state.get("uptrend_threshold_price")
+                if uptrend_threshold_price is not None:
+                    worker.uptrend_threshold_price = uptrend_threshold_price
+                    _el = "하강진입" if side == "short" else "상승진입"
+                    print(f"[DCA 상태] {_el} 임계값 복원: ${uptrend_threshold_price}")
+                else:
+                    # 임계값이 null이면 재계산 트리거 (포지션이 있는 경우)
+                    if has_position or dca_state.get("initial_entry_done"):
+                        worker.step_filled_need_threshold_recalc = True
+                        print(f"[DCA 상태] [{side.upper()}] 임계값이 null → 재계산 플래그 설정")
+
+                # 상승 중 추가진입 2차 임계값 복원
+                uptrend_threshold_price_2 = dca_state.get("uptrend_threshold_price_2")
+                if uptrend_threshold_price_2 is not None:
+                    worker.uptrend_threshold_price_2 = uptrend_threshold_price_2
+                    print(f"[DCA 상태] {_el} 2차 임계값 복원: ${uptrend_threshold_price_2}")
+
+                # 역방향진입 진행 중 플래그 복원
+                if is_uptrend_entry:
+                    worker.is_uptrend_entry = True
+                    print(f"[DCA 상태] {_el} 진행 중 플래그 복원: is_uptrend_entry=True (시장가 주문 체결 대기 중)")
+
+                # 역방향진입 횟수 복원 (헷지 청산 비율 결정용)
+                uptrend_entry_count = dca_state.get("uptrend_entry_count", 0)
+                if uptrend_entry_count > 0:
+                    worker.uptrend_entry_count = uptrend_entry_count
+                    print(f"[DCA 상태] {_el} 횟수 복원: {uptrend_entry_count}회")
+
+                # 최종 단계 손실 방지 상태 복원
+                final_step_protection_placed = dca_state.get("final_step_protection_placed", False)
+                monitoring_final_step_closure = dca_state.get("monitoring_final_step_closure", False)
+                if final_step_protection_placed or monitoring_final_step_closure:
+                    worker.final_step_protection_placed = final_step_protection_placed
+                    worker.monitoring_final_step_closure = monitoring_final_step_closure
+                    print(f"[DCA 상태] 최종 단계 보호 상태 복원: placed={final_step_protection_placed}, monitoring={monitoring_final_step_closure}")
+
+                # 헷지 프로토콜 상태 복원
+                hedge_protocol_active = dca_state.get("hedge_protocol_active", False)
+                hedge_protocol_executed = dca_state.get("hedge_protocol_executed", False)
+                hedge_protocol_lowest_price = dca_state.get("hedge_protocol_lowest_price")
+                hedge_protocol_hedge_avg_price = dca_state.get("hedge_protocol_hedge_avg_price")
+                hedge_protocol_exited_qty = dca_state.get("hedge_protocol_exited_qty", 0)
+                hedge_protocol_waiting_for_be = dca_state.get("hedge_protocol_waiting_for_be", False)
+
+                if hedge_protocol_active or hedge_protocol_executed:
+                    worker.hedge_protocol_active = hedge_protocol_active
+                    worker.hedge_protocol_executed = hedge_protocol_executed
+                    worker.hedge_protocol_exited_qty = hedge_protocol_exited_qty
+                    worker.hedge_protocol_waiting_for_be = hedge_protocol_waiting_for_be
+                    print(f"[DCA 상태] 헷지 프로토콜 상태 복원: active={hedge_protocol_active}, executed={hedge_protocol_executed}, exited_qty={hedge_protocol_exited_qty}")
+
+                    if hedge_protocol_lowest_price is not None:
+                        worker.hedge_protocol_lowest_price = hedge_protocol_lowest_price
+                        print(f"[DCA 상태] 헷지 프로토콜 최저가 복원: ${hedge_protocol_lowest_price}")
+
+                    if hedge_protocol_hedge_avg_price is not None:
+                        worker.hedge_protocol_hedge_avg_price = hedge_protocol_hedge_avg_price
+                        print(f"[DCA 상태] 헷지 프로토콜 평균가 복원: ${hedge_protocol_hedge_avg_price}")
+
+            # 복원한 트리거/임계값 차트 마커 + Insight 탭 표시 (state_lock 밖)
+            restored_side_mode = dca_state.get("side_mode")
+            restored_step = dca_state.get("current_step", 0)
             if hedge_trigger_prices:
-                worker.hedge_trigger_prices = hedge_trigger_prices
-                print(f"[DCA 상태] 헷지 트리거 가격 복원: {len(hedge_trigger_prices)}개")
-                # 차트에 마커 표시
-                self.draw_hedge_trigger_markers_for_side(side, hedge_trigger_prices, dca_state.get("side_mode"), dca_state.get("current_step", 0))
-                # Insight 탭 업데이트
-                self.update_insight_hedge_triggers(side, hedge_trigger_prices, dca_state.get("side_mode"), dca_state.get("current_step", 0))
-
-            # 익절 관련 상태 복원
-            profit_target_price = dca_state.get("profit_target_price")
+                self.draw_hedge_trigger_markers_for_side(side, hedge_trigger_prices, restored_side_mode, restored_step)
+                self.update_insight_hedge_triggers(side, hedge_trigger_prices, restored_side_mode, restored_step)
             if profit_target_price is not None:
-                worker.profit_target_price = profit_target_price
-                print(f"[DCA 상태] 익절 트리거 가격 복원: ${profit_target_price}")
-                # 차트에 마커 표시
                 self.draw_profit_target_marker_for_side(side, profit_target_price)
                 # 익절 모드에서는 H 트리거 마커 제거
                 self.remove_hedge_trigger_markers_for_side(side)
-                # Insight 탭 업데이트
-                self.update_insight_profit_target(side, profit_target_price, dca_state.get("current_step", 0))
-
-            entry_price_at_step = dca_state.get("entry_price_at_step")
-            if entry_price_at_step is not None:
-                worker.entry_price_at_step = entry_price_at_step
-                print(f"[DCA 상태] 추가진입 시점 가격 복원: ${entry_price_at_step}")
-
-            # 익절 모니터링 모드면 고가/저가 복원 (저장된 값이 있으면 사용, 없으면 entry_price_at_step으로 초기화)
-            if profit_target_price is not None:
-                high_price_since_entry = dca_state.get("high_price_since_entry")
-                low_price_since_entry = dca_state.get("low_price_since_entry")
-
-                if high_price_since_entry is not None and low_price_since_entry is not None:
-                    # 저장된 고가/저가 복원
-                    worker.high_price_since_entry = high_price_since_entry
-                    worker.low_price_since_entry = low_price_since_entry
-                    print(f"[DCA 복구] 익절 고가/저가 복원: High={high_price_since_entry}, Low={low_price_since_entry}")
-                elif entry_price_at_step is not None:
-                    # 저장된 값이 없으면 진입가로 초기화 (하위 호환성)
-                    worker.high_price_since_entry = entry_price_at_step
-                    worker.low_price_since_entry = entry_price_at_step
-                    print(f"[DCA 복구] 익절 고가/저가 초기화 (저장값 없음): High={entry_price_at_step}, Low={entry_price_at_step}")
-
-            # 상승 중 추가진입 임계값 복원
-            uptrend_threshold_price = dca_state.get("uptrend_threshold_price")
+                self.update_insight_profit_target(side, profit_target_price, restored_step)
             if uptrend_threshold_price is not None:
-                worker.uptrend_threshold_price = uptrend_threshold_price
-                _el = "하강진입" if side == "short" else "상승진입"
-                print(f"[DCA 상태] {_el} 임계값 복원: ${uptrend_threshold_price}")
-                # 차트에 마커 표시
                 self.draw_uptrend_threshold_marker_for_side(side, uptrend_threshold_price)
-                # Insight 탭 업데이트
                 self.update_insight_uptrend_threshold(side, uptrend_threshold_price)
-            else:
-                # 임계값이 null이면 재계산 트리거 (포지션이 있는 경우)
-                if has_position or dca_state.get("initial_entry_done"):
-                    worker.step_filled_need_threshold_recalc = True
-                    print(f"[DCA 상태] [{side.upper()}] 임계값이 null → 재계산 플래그 설정")
-
-            # 상승 중 추가진입 2차 임계값 복원
-            uptrend_threshold_price_2 = dca_state.get("uptrend_threshold_price_2")
             if uptrend_threshold_price_2 is not None:
-                worker.uptrend_threshold_price_2 = uptrend_threshold_price_2
-                print(f"[DCA 상태] {_el} 2차 임계값 복원: ${uptrend_threshold_price_2}")
-                # 차트에 마커 표시
                 self.draw_uptrend_threshold_2_marker_for_side(side, uptrend_threshold_price_2)
-                # Insight 탭 업데이트
                 self.update_insight_uptrend_threshold_2(side, uptrend_threshold_price_2)
 
-            # 역방향진입 진행 중 플래그 복원
-            if is_uptrend_entry:
-                worker.is_uptrend_entry = True
-                print(f"[DCA 상태] {_el} 진행 중 플래그 복원: is_uptrend_entry=True (시장가 주문 체결 대기 중)")
-
-            # 역방향진입 횟수 복원 (헷지 청산 비율 결정용)
-            uptrend_entry_count = dca_state.get("uptrend_entry_count", 0)
-            if uptrend_entry_count > 0:
-                worker.uptrend_entry_count = uptrend_entry_count
-                print(f"[DCA 상태] {_el} 횟수 복원: {uptrend_entry_count}회")
-
-            # 최종 단계 손실 방지 상태 복원
-            final_step_protection_placed = dca_state.get("final_step_protection_placed", False)
-            monitoring_final_step_closure = dca_state.get("monitoring_final_step_closure", False)
-            if final_step_protection_placed or monitoring_final_step_closure:
-                worker.final_step_protection_placed = final_step_protection_placed
-                worker.monitoring_final_step_closure = monitoring_final_step_closure
-                print(f"[DCA 상태] 최종 단계 보호 상태 복원: placed={final_step_protection_placed}, monitoring={monitoring_final_step_closure}")
-
-            # 헷지 프로토콜 상태 복원
-            hedge_protocol_active = dca_state.get("hedge_protocol_active", False)
-            hedge_protocol_executed = dca_state.get("hedge_protocol_executed", False)
-            hedge_protocol_lowest_price = dca_state.get("hedge_protocol_lowest_price")
-            hedge_protocol_hedge_avg_price = dca_state.get("hedge_protocol_hedge_avg_price")
-            hedge_protocol_exited_qty = dca_state.get("hedge_protocol_exited_qty", 0)
-            hedge_protocol_waiting_for_be = dca_state.get("hedge_protocol_waiting_for_be", False)
-
-            if hedge_protocol_active or hedge_protocol_executed:
-                worker.hedge_protocol_active = hedge_protocol_active
-                worker.hedge_protocol_executed = hedge_protocol_executed
-                worker.hedge_protocol_exited_qty = hedge_protocol_exited_qty
-                worker.hedge_protocol_waiting_for_be = hedge_protocol_waiting_for_be
-                print(f"[DCA 상태] 헷지 프로토콜 상태 복원: active={hedge_protocol_active}, executed={hedge_protocol_executed}, exited_qty={hedge_protocol_exited_qty}")
-
-                if hedge_protocol_lowest_price is not None:
-                    worker.hedge_protocol_lowest_price = hedge_protocol_lowest_price
-                    print(f"[DCA 상태] 헷지 프로토콜 최저가 복원: ${hedge_protocol_lowest_price}")
-
-                if hedge_protocol_hedge_avg_price is not None:
-                    worker.hedge_protocol_hedge_avg_price = hedge_protocol_hedge_avg_price
-                    print(f"[DCA 상태] 헷지 프로토콜 평균가 복원: ${hedge_protocol_hedge_avg_price}")
-
             # 표시용 단계 계산 (1-based 표시 - 현재 체결된 단계만 표시)
             display_step = dca_state.get('current_step') + 1
             print(f"[DCA 상태] 복구 완료: Step {display_step}/{dca_state.get('total_steps')}")
@@ -12618,10 +12765,23 @@ class AutoTraderGUI(QMainWindow):
             self.kline_thread.stop()
             self.kline_thread.terminate()  # 즉시 강제 종료
 
+        # 패널 공개 피드 반환 (공유 티커/캔들/호가창 구독 해지)
+        for side in ('long', 'short'):
+            self._release_public_feeds(side)
+
+        # 프레임 기록 파일 닫기 (기록 중일 때만)
+        stop_capture()
+
         # API 키 정리
         if self.api_module:
             self.api_module.set_active_api_keys(None, None)
 
+        # HTTP 커넥션 풀 정리 (패널별)
+        for api in self.api_modules.values():
+            if api:
+                api.close()
+        SharedEventLoop.shutdown()
+
         print("[종료] 정리 완료. 프로그램 종료.")
         event.accept()
 
@@ -12674,9 +12834,116 @@ class AutoTraderGUI(QMainWindow):
                 f"<span style='color: {cpu_color};'>CPU: {cpu_percent:.1f}%</span>"
             )
 
+            # API 레이트 리밋 잔여 예산 (가장 여유가 적은 버킷 기준)
+            if self.resource_api_budget_label:
+                headroom_pct, bucket_name = get_rate_limit_governor().get_min_headroom()
+                budget_color = "#00ff00"
+                if headroom_pct < 20:
+                    budget_color = "#ff0000"
+                elif headroom_pct < 50:
+                    budget_color = "#ffaa00"
+                bucket_text = f" ({bucket_name})" if bucket_name else ""
+                self.resource_api_budget_label.setText(
+                    f"<span style='color: {budget_color};'>API Budget: {headroom_pct:.0f}%</span>{bucket_text}"
+                )
+
         except Exception as e:
             logger.error(f"[리소스 업데이트] GUI 업데이트 오류: {e}")
 
+    def on_request_metrics_updated(self, summary):
+        """요청 계측 요약 표시 (거래소별 p50/p95/p99, 오류율, 재시도)"""
+        try:
+            if not self.resource_api_latency_label or not summary:
+                return
+
+            lines = []
+            for exchange, m in sorted(summary.items()):
+                color = "#00ff00"
+                if m['error_rate'] > 0.05 or m['p95_ms'] > 2000:
+                    color = "#ff0000"
+                elif m['error_rate'] > 0.01 or m['p95_ms'] > 800:
+                    color = "#ffaa00"
+                lines.append(
+                    f"<span style='color: {color};'>{exchange}: p50 {m['p50_ms']:.0f} / p95 {m['p95_ms']:.0f} / "
+                    f"p99 {m['p99_ms']:.0f}ms</span> | err {m['error_rate'] * 100:.1f}% | retry {m['retries']}"
+                )
+            self.resource_api_latency_label.setText("<br>".join(lines))
+
+        except Exception as e:
+            logger.error(f"[리소스 업데이트] 요청 계측 표시 오류: {e}")
+
+    def on_feed_latency_updated(self, summary):
+        """피드 지연 표시 (스트림별 net p50/p95, queue p95, total p95)"""
+        try:
+            if not self.resource_feed_latency_label or not summary:
+                return
+
+            threshold = get_feed_metrics().alert_threshold_ms
+            lines = []
+            for stream, m in sorted(summary.items()):
+                if m['idle_sec'] > 120:
+                    continue  # 끊긴/멈춘 스트림은 표시 생략
+                total_p95 = m['total_p95_ms']
+                color = "#00ff00"
+                if total_p95 > threshold:
+                    color = "#ff0000"
+                elif total_p95 > threshold * 0.5:
+                    color = "#ffaa00"
+                total_text = f"{total_p95:.0f}ms" if m['total_count'] else "--"
+                lines.append(
+                    f"<span style='color: {color};'>{stream}: total p95 {total_text}</span> | "
+                    f"net {m['network_p50_ms']:.0f}/{m['network_p95_ms']:.0f} | queue {m['queue_p95_ms']:.0f}"
+                )
+            self.resource_feed_latency_label.setText("<br>".join(lines) if lines else "Feed Latency: --")
+
+        except Exception as e:
+            logger.error(f"[리소스 업데이트] 피드 지연 표시 오류: {e}")
+
+    def on_worker_queue_updated(self, stats):
+        """워커 이벤트 큐 표시 (깊이, 대기 p95, 종류별 처리 p95)"""
+        try:
+            if not self.resource_worker_queue_label or not stats:
+                return
+
+            lines = []
+            for name, q in sorted(stats.items()):
+                color = "#00ff00"
+                if q['depth'] > 100 or q['wait_p95_ms'] > 1000:
+                    color = "#ff0000"
+                elif q['depth'] > 10 or q['wait_p95_ms'] > 200:
+                    color = "#ffaa00"
+                handle_text = " | ".join(f"{kind} {h['p95_ms']:.0f}ms" for kind, h in sorted(q['handle'].items()))
+                lines.append(
+                    f"<span style='color: {color};'>{name}: depth {q['depth']} (max {q['max_depth']}) | "
+                    f"wait p95 {q['wait_p95_ms']:.0f}ms | conflated {q.get('conflated', 0)}</span>"
+                    + (f" | {handle_text}" if handle_text else "")
+                    + f" | slowest {q['slowest_ms']:.0f}ms"
+                )
+            self.resource_worker_queue_label.setText("<br>".join(lines))
+
+        except Exception as e:
+            logger.error(f"[리소스 업데이트] 워커 큐 표시 오류: {e}")
+
+    def on_feed_lag_alert(self, stream, p95_ms, alerting):
+        """피드 지연 경보 / 해제 로그"""
+        threshold = get_feed_metrics().alert_threshold_ms
+        if alerting:
+            print(f"[피드 지연] ⚠️ {stream} total p95 {p95_ms:.0f}ms > {threshold:.0f}ms - 시세가 늦게 반영되고 있습니다")
+        else:
+            print(f"[피드 지연] {stream} 정상화 (total p95 {p95_ms:.0f}ms)")
+
+    def _record_user_feed_latency(self, side, update, deliver_ts):
+        """사용자 데이터 스트림 이벤트 지연 기록 (REST 보충 이벤트 제외)"""
+        if update.backfill or not update.recv_ts:
+            return
+        ws_thread = self.ws_threads.get(side)
+        get_feed_metrics().record(f"user({side})", update.event_time, update.recv_ts, deliver_ts, time.time(),
+                                  ws_thread.clock_name if ws_thread else None)
+
+    def on_dump_metrics_clicked(self):
+        """요청 계측 상세 파일 저장 버튼"""
+        self.resource_monitor.dump_request_metrics()  # 저장 경로는 [계측] 로그로 출력
+
     def on_cleanup_completed(self, freed_mb):
         """메모리 정리 완료 핸들러"""
         try:
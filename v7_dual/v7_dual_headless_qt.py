@@ -0,0 +1,91 @@
+"""
+GUI 없는 환경용 QtCore 대체 모듈 (백테스트 / 테스트)
+
+AutoTradeWorker는 QObject / pyqtSignal / pyqtSlot만 사용합니다.
+PyQt5가 없는 서버에서 워커를 구동할 때 install_headless_qt()를 워커 import 전에 호출합니다
+(v7_dual_backtest.main, 저장소 루트 conftest.py). import만으로는 sys.modules를 바꾸지 않습니다.
+
+대체 시그널의 emit은 연결된 함수를 그 자리에서 동기 호출합니다 (큐 연결 / 이벤트 루프 / QTimer 없음).
+"""
+
+import sys
+import types
+
+
+class _BoundSignal:
+    __slots__ = ('_slots',)
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot, *args):
+        self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._slots.clear()
+        else:
+            self._slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in tuple(self._slots):
+            slot(*args)
+
+
+class pyqtSignal:
+    def __init__(self, *types_, **kwargs):
+        self._attr = None
+
+    def __set_name__(self, owner, name):
+        self._attr = '_signal_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__.get(self._attr)
+        if bound is None:
+            bound = obj.__dict__[self._attr] = _BoundSignal()
+        return bound
+
+
+class QObject:
+    def __init__(self, parent=None):
+        self._parent = parent
+
+    def moveToThread(self, thread):
+        pass
+
+    def thread(self):
+        return None
+
+
+def pyqtSlot(*types_, **kwargs):
+    return lambda fn: fn
+
+
+def install_headless_qt():
+    """
+    PyQt5가 없으면 대체 QtCore를 sys.modules에 등록 (설치돼 있으면 아무것도 하지 않음, 반복 호출 가능)
+
+    Returns:
+        bool: 대체 모듈 사용 여부
+    """
+    qtcore = sys.modules.get('PyQt5.QtCore')
+    if qtcore is not None:
+        return qtcore.QObject is QObject
+    try:
+        import PyQt5.QtCore  # noqa: F401 (설치돼 있으면 실제 시그널 사용)
+        return False
+    except ImportError:
+        pass
+
+    qtcore = types.ModuleType('PyQt5.QtCore')
+    qtcore.QObject = QObject
+    qtcore.pyqtSignal = pyqtSignal
+    qtcore.pyqtSlot = pyqtSlot
+    package = types.ModuleType('PyQt5')
+    package.QtCore = qtcore
+    package.__path__ = []
+    sys.modules['PyQt5'] = package
+    sys.modules['PyQt5.QtCore'] = qtcore
+    return True
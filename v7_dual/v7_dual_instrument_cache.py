@@ -0,0 +1,203 @@
+"""
+거래 규칙(Instrument Rules) 디스크 캐시 모듈
+
+tickSize / qtyStep / minOrderQty / minNotional 같은 거래 규칙은 거의 바뀌지 않지만,
+재시작(워치독 --auto-restore 포함)할 때마다 심볼별 REST 호출을 순차적으로 다시 보내고 있었습니다.
+이 모듈은 규칙을 JSON 파일에 TTL과 함께 저장하여 프로세스/재시작 간에 공유합니다.
+
+- 키: "거래소:카테고리:심볼" (예: "Bybit:linear:XRPUSDT")
+- 규칙은 Bybit V5 형식(priceFilter / lotSizeFilter)으로 정규화해 저장합니다.
+- 저장 시 디스크 파일과 병합 후 임시 파일 -> os.replace 로 원자적으로 교체합니다.
+  (두 패널/두 프로세스가 동시에 써도 파일이 깨지지 않음)
+- 주문이 정밀도 오류로 거부되면 invalidate()로 해당 심볼만 무효화합니다.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from v7_dual_config_manager import SCRIPT_DIR
+
+CACHE_FILE = os.path.join(SCRIPT_DIR, "instrument_rules_cache.json")
+DEFAULT_TTL_SECONDS = 6 * 60 * 60  # 6시간
+
+
+def make_key(exchange, category, symbol):
+    """캐시 키 생성 (예: "Bybit:linear:XRPUSDT")"""
+    return f"{exchange}:{category}:{symbol.upper()}"
+
+
+class InstrumentRulesStore:
+    """
+    TTL 기반 거래 규칙 저장소 (메모리 + JSON 파일)
+
+    Args:
+        path: 캐시 파일 경로
+        ttl_seconds: 규칙 유효 시간 (초)
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}   # key -> {"fetched_at": epoch, "rules": {...}}
+        self._prefetched = {}  # "거래소:카테고리" -> 전체 일괄 조회 시각 (epoch)
+        self._mtime = None
+        self._hits = 0
+        self._misses = 0
+        self._load()
+
+    # ==================== 파일 입출력 ====================
+
+    def _read_file(self):
+        """디스크의 캐시 항목을 읽습니다 (없거나 손상되면 빈 dict)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get('entries', {})
+            prefetched = data.get('prefetched', {})
+            return (entries if isinstance(entries, dict) else {},
+                    prefetched if isinstance(prefetched, dict) else {})
+        except FileNotFoundError:
+            return {}, {}
+        except (OSError, ValueError) as e:
+            print(f"[InstrumentCache] 캐시 파일 읽기 실패 (무시): {e}")
+            return {}, {}
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _load(self):
+        with self._lock:
+            self._entries, self._prefetched = self._read_file()
+            self._mtime = self._file_mtime()
+
+    def _reload_if_changed(self):
+        """다른 프로세스가 파일을 갱신했으면 다시 읽습니다 (lock 보유 상태에서 호출)."""
+        mtime = self._file_mtime()
+        if mtime is not None and mtime != self._mtime:
+            entries, prefetched = self._read_file()
+            self._entries.update(entries)
+            self._prefetched.update(prefetched)
+            self._mtime = mtime
+
+    def _flush(self, removed_keys=()):
+        """디스크 파일과 병합 후 원자적으로 저장합니다 (lock 보유 상태에서 호출)."""
+        merged, prefetched = self._read_file()
+        for name, fetched_at in self._prefetched.items():
+            prefetched[name] = max(fetched_at, prefetched.get(name, 0))
+        self._prefetched = prefetched
+        for key in removed_keys:
+            merged.pop(key, None)
+        for key, entry in self._entries.items():
+            current = merged.get(key)
+            if current is None or current.get('fetched_at', 0) <= entry.get('fetched_at', 0):
+                merged[key] = entry
+        self._entries = merged
+
+        directory = os.path.dirname(self.path) or '.'
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.instrument_rules_', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'prefetched': prefetched, 'entries': merged}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = self._file_mtime()
+        except OSError as e:
+            print(f"[InstrumentCache] 캐시 파일 저장 실패: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    # ==================== 조회 / 저장 ====================
+
+    def _fresh_rules(self, key):
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            return None
+        return entry.get('rules')
+
+    def get(self, exchange, category, symbol):
+        """
+        유효한(TTL 이내) 규칙을 반환합니다.
+
+        Returns:
+            dict 또는 None (없거나 만료)
+        """
+        key = make_key(exchange, category, symbol)
+        with self._lock:
+            rules = self._fresh_rules(key)
+            if rules is None:
+                # 다른 프로세스가 방금 받아 둔 규칙이 있을 수 있음
+                self._reload_if_changed()
+                rules = self._fresh_rules(key)
+            if rules is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return rules
+
+    def put(self, exchange, category, symbol, rules):
+        """규칙 1건 저장"""
+        self.put_many(exchange, category, {symbol: rules})
+
+    def put_many(self, exchange, category, rules_by_symbol, complete=False):
+        """
+        여러 심볼 규칙을 한 번의 파일 쓰기로 저장합니다 (일괄 프리페치용).
+
+        Args:
+            rules_by_symbol: {symbol: rules_dict}
+            complete: 카테고리 전체 목록이면 True (has_fresh_category 판단에 사용)
+        """
+        if not rules_by_symbol:
+            return
+        now = time.time()
+        with self._lock:
+            for symbol, rules in rules_by_symbol.items():
+                if rules:
+                    self._entries[make_key(exchange, category, symbol)] = {'fetched_at': now, 'rules': rules}
+            if complete:
+                self._prefetched[f"{exchange}:{category}"] = now
+            self._flush()
+
+    def invalidate(self, exchange, category, symbol):
+        """심볼 규칙 무효화 (정밀도 오류로 주문 거부 시)"""
+        key = make_key(exchange, category, symbol)
+        with self._lock:
+            existed = self._entries.pop(key, None) is not None
+            self._flush(removed_keys=(key,))
+        if existed:
+            print(f"[InstrumentCache] {key} 규칙 무효화 (다음 조회 시 재다운로드)")
+
+    def has_fresh_category(self, exchange, category):
+        """카테고리 전체 일괄 조회 결과가 아직 TTL 이내인지"""
+        with self._lock:
+            self._reload_if_changed()
+            fetched_at = self._prefetched.get(f"{exchange}:{category}", 0)
+        return time.time() - fetched_at <= self.ttl_seconds
+
+    def get_stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'prefetched': dict(self._prefetched), 'hits': self._hits, 'misses': self._misses}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_instrument_store():
+    """프로세스 전역 InstrumentRulesStore 반환 (최초 호출 시 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InstrumentRulesStore()
+        return _store
@@ -0,0 +1,326 @@
+"""
+캔들(OHLCV) 로컬 저장소 (Binance & Bybit)
+
+get_ohlcv_data는 1회 최대 1000~1500개만 받으므로, 긴 구간은 페이지로 나눠
+병렬로 가져오고(레이트 리밋은 PooledHttpClient의 RateLimitGovernor가 조절)
+확정된 캔들만 디스크에 이어 붙입니다.
+
+저장 형식: 거래소/카테고리/심볼/인터벌별 디렉토리에 컬럼당 float64 바이너리 파일 1개
+    kline_cache/Bybit_linear_XRPUSDT_5m/time.f8, open.f8, high.f8, ...
+- 추가(append)는 각 컬럼 파일 끝에 쓰기만 하므로 기존 데이터를 다시 쓰지 않음
+- numpy가 있으면 np.memmap으로 필요한 구간만 읽음 (없으면 array 모듈로 전체 읽기)
+  load()는 같은 파일을 다시 쓰므로 memmap 대신 복사본으로 읽음 (Windows는 매핑된 파일을 자를 수 없음)
+- 거래소에 더 오래된 캔들이 없으면 HEAD_MARKER 파일을 남겨 앞쪽 이력 보충을 다시 시도하지 않음
+
+차트 로드 / 전략 워밍업은 load()로 "로컬 파일 + 마지막 저장 캔들 이후 꼬리 구간"만 받아옵니다.
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from v7_dual_config_manager import SCRIPT_DIR
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없이도 동작 (memmap 대신 전체 읽기)
+    np = None
+
+
+CACHE_DIR = os.path.join(SCRIPT_DIR, "kline_cache")
+
+# 저장 컬럼 (kline 응답 인덱스: 0=open time, 1~5=OHLCV, 7=quote volume/turnover)
+COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume', 'quote_volume')
+SOURCE_INDEX = (0, 1, 2, 3, 4, 5, 7)
+ITEM_SIZE = 8  # float64
+
+# 고정 길이 인터벌만 캐시 ('1M'은 월마다 길이가 달라 직접 조회)
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '12h': 43_200_000, '1d': 86_400_000, '1w': 604_800_000,
+}
+
+PAGE_LIMIT = 1000          # 페이지당 캔들 수 (Bybit 최대 1000, Binance 최대 1500)
+MAX_WORKERS = 4            # 병렬 페이지 요청 수
+MAX_GAP_CANDLES = 50_000   # 마지막 저장 이후 공백이 이보다 크면 파일을 새로 시작
+HEAD_MARKER = "head_exhausted"  # 첫 저장 캔들보다 오래된 캔들이 거래소에 없음 (상장 직후 심볼 등)
+
+
+class KlineStore:
+    """
+    거래소/심볼/인터벌별 캔들 로컬 저장소 (스레드 안전)
+
+    GUI 연결 스레드, 차트 새로고침, 자동매매 워밍업이 같은 파일을 읽고 쓰므로
+    키별 락으로 추가 작업을 직렬화합니다.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, page_limit=PAGE_LIMIT, max_workers=MAX_WORKERS):
+        self.cache_dir = cache_dir
+        self.page_limit = page_limit
+        self.max_workers = max_workers
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ==================== 파일 I/O ====================
+
+    def _key_dir(self, exchange, category, symbol, interval):
+        return os.path.join(self.cache_dir, f"{exchange}_{category}_{symbol}_{interval}")
+
+    def _lock_for(self, key_dir):
+        with self._locks_guard:
+            lock = self._locks.get(key_dir)
+            if lock is None:
+                lock = self._locks[key_dir] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _stored_length(key_dir):
+        """모든 컬럼에 온전히 기록된 행 수 (쓰기 도중 종료된 경우 가장 짧은 컬럼 기준)"""
+        sizes = []
+        for col in COLUMNS:
+            path = os.path.join(key_dir, f"{col}.f8")
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // ITEM_SIZE)
+        return min(sizes)
+
+    def _read_columns(self, key_dir, start_index=0, copy=False):
+        """
+        컬럼별 배열 반환 (numpy 있으면 읽기 전용 memmap, copy=True면 메모리로 읽은 복사본)
+
+        같은 파일을 이후에 다시 쓰는 경우 copy=True를 사용해야 합니다 (열린 매핑이 남아 있으면
+        Windows에서 파일 재작성/truncate가 PermissionError로 실패).
+
+        Returns:
+            (dict, int): ({컬럼: 배열}, 전체 행 수)
+        """
+        n = self._stored_length(key_dir)
+        start_index = max(0, min(start_index, n))
+        count = n - start_index
+        columns = {}
+        for col in COLUMNS:
+            path = os.path.join(key_dir, f"{col}.f8")
+            if count <= 0:
+                columns[col] = np.empty(0) if np is not None else array('d')
+            elif np is not None and copy:
+                columns[col] = np.fromfile(path, dtype='<f8', count=count, offset=start_index * ITEM_SIZE)
+            elif np is not None:
+                columns[col] = np.memmap(path, dtype='<f8', mode='r',
+                                         offset=start_index * ITEM_SIZE, shape=(count,))
+            else:
+                values = array('d')
+                with open(path, 'rb') as f:
+                    f.seek(start_index * ITEM_SIZE)
+                    values.fromfile(f, count)
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                columns[col] = values
+        return columns, n
+
+    @staticmethod
+    def _write_rows(key_dir, rows, n_valid, mode):
+        """행 목록을 컬럼 파일에 기록 (mode='ab' 추가 / 'wb' 재작성)"""
+        os.makedirs(key_dir, exist_ok=True)
+        for i, col in enumerate(COLUMNS):
+            path = os.path.join(key_dir, f"{col}.f8")
+            with open(path, mode) as f:
+                if mode == 'ab':
+                    f.truncate(n_valid * ITEM_SIZE)  # 불완전하게 기록된 꼬리 제거
+                    f.seek(0, os.SEEK_END)
+                values = array('d', (row[i] for row in rows))
+                if sys.byteorder == 'big':
+                    values.byteswap()  # 파일은 리틀 엔디언 고정
+                values.tofile(f)
+
+    @staticmethod
+    def _head_exhausted(key_dir):
+        return os.path.exists(os.path.join(key_dir, HEAD_MARKER))
+
+    @staticmethod
+    def _set_head_exhausted(key_dir, exhausted):
+        path = os.path.join(key_dir, HEAD_MARKER)
+        try:
+            if exhausted:
+                os.makedirs(key_dir, exist_ok=True)
+                with open(path, 'w'):
+                    pass
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"[캔들 저장소] 이력 시작 표시 갱신 실패 ({path}): {e}")
+
+    # ==================== 원격 조회 ====================
+
+    def _fetch_page(self, api, symbol, interval, start_ms, end_ms, interval_ms):
+        limit = min(self.page_limit, (end_ms - start_ms) // interval_ms + 1)
+        klines = api.get_ohlcv_data(symbol, interval, limit, start_time=start_ms, end_time=end_ms)
+        if klines is None:
+            return None
+        rows = []
+        for k in klines:
+            try:
+                rows.append(tuple(float(k[idx]) for idx in SOURCE_INDEX))
+            except (TypeError, ValueError, IndexError):
+                continue
+        return rows
+
+    def fetch_range(self, api, symbol, interval, start_ms, end_ms, require_complete=False):
+        """
+        구간 [start_ms, end_ms]의 캔들을 페이지 단위 병렬 요청으로 가져옵니다.
+
+        페이지 하나라도 실패하면 그 앞까지만 반환합니다 (저장 파일에 공백이 생기지 않도록).
+        require_complete=True면 실패 시 None을 반환합니다 ("캔들 없음"과 구분).
+
+        Returns:
+            list: 시간 오름차순 (time, open, high, low, close, volume, quote_volume) 튜플 목록
+        """
+        interval_ms = INTERVAL_MS[interval]
+        span = self.page_limit * interval_ms
+        pages = []
+        t = int(start_ms)
+        while t <= end_ms:
+            pages.append((t, min(t + span - 1, int(end_ms))))
+            t += span
+        if not pages:
+            return []
+
+        if len(pages) == 1:
+            results = [self._fetch_page(api, symbol, interval, pages[0][0], pages[0][1], interval_ms)]
+        else:
+            print(f"[캔들 저장소] {symbol} {interval} {len(pages)}페이지 병렬 조회")
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages)),
+                                    thread_name_prefix="kline-fetch") as executor:
+                results = list(executor.map(
+                    lambda page: self._fetch_page(api, symbol, interval, page[0], page[1], interval_ms), pages))
+
+        merged = {}
+        for page_rows in results:
+            if page_rows is None:
+                if require_complete:
+                    return None
+                break
+            for row in page_rows:
+                merged[row[0]] = row
+        return [merged[t] for t in sorted(merged)]
+
+    # ==================== 공개 API ====================
+
+    def load(self, api, symbol, interval, limit=500):
+        """
+        최근 limit개 캔들을 반환합니다 (로컬 파일 + 꼬리 구간 조회).
+
+        확정된(종료된) 캔들만 파일에 추가하고, 진행 중인 마지막 캔들은 응답에만 포함합니다.
+
+        Returns:
+            list: get_ohlcv_data와 같은 12컬럼 kline 목록 (실패 시 None)
+        """
+        interval_ms = INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            return api.get_ohlcv_data(symbol, interval, limit)
+
+        exchange, category = api.get_market_key()
+        key_dir = self._key_dir(exchange, category, symbol, interval)
+
+        with self._lock_for(key_dir):
+            now_ms = int(time.time() * 1000)
+            target_start = now_ms - limit * interval_ms
+            columns, n = self._read_columns(key_dir, start_index=max(0, self._stored_length(key_dir) - 1), copy=True)
+            last_time = float(columns['time'][-1]) if n else None
+            del columns
+
+            if last_time is not None and (now_ms - last_time) // interval_ms > MAX_GAP_CANDLES:
+                print(f"[캔들 저장소] {symbol} {interval} 공백이 커서 캐시를 새로 시작합니다")
+                n, last_time = 0, None
+
+            if last_time is None:
+                fresh = self.fetch_range(api, symbol, interval, target_start, now_ms)
+                if not fresh:
+                    return api.get_ohlcv_data(symbol, interval, limit)
+                closed = [r for r in fresh if r[0] + interval_ms <= now_ms]
+                self._write_rows(key_dir, closed, 0, 'wb')
+                self._set_head_exhausted(key_dir, False)
+                n = len(closed)
+            else:
+                fresh = self.fetch_range(api, symbol, interval, int(last_time) + interval_ms, now_ms)
+                closed = [r for r in fresh if r[0] > last_time and r[0] + interval_ms <= now_ms]
+                if closed:
+                    self._write_rows(key_dir, closed, n, 'ab')
+                    n += len(closed)
+
+                # 저장분이 limit보다 적으면 앞쪽 이력을 채움 (이전에 더 짧게 받아둔 경우)
+                # 거래소에 더 오래된 캔들이 없다고 확인된 키는 다시 조회하지 않음
+                first_time = None
+                if n < limit and not self._head_exhausted(key_dir):
+                    first_columns, _ = self._read_columns(key_dir, copy=True)
+                    first_time = float(first_columns['time'][0]) if n else now_ms
+                # (구간이 1캔들보다 짧으면 시작 시각이 들어 있을 수 없으므로 조회하지 않음)
+                if first_time is not None and target_start <= first_time - interval_ms:
+                    older = self.fetch_range(api, symbol, interval, target_start, int(first_time) - 1,
+                                             require_complete=True)
+                    if older:
+                        existing = list(zip(*(first_columns[col] for col in COLUMNS)))
+                        del first_columns
+                        self._write_rows(key_dir, older + existing, 0, 'wb')
+                        n += len(older)
+                    elif older is not None:
+                        self._set_head_exhausted(key_dir, True)
+
+            open_rows = [r for r in fresh if r[0] + interval_ms > now_ms]
+            stored, n = self._read_columns(key_dir, start_index=n - max(0, limit - len(open_rows)), copy=True)
+            rows = list(zip(*(stored[col] for col in COLUMNS))) + open_rows
+
+        return [
+            [int(r[0]), r[1], r[2], r[3], r[4], r[5], int(r[0]) + interval_ms - 1, r[6], 0, 0, 0, 0]
+            for r in rows[-limit:]
+        ]
+
+    def read(self, exchange, category, symbol, interval, start_ms=None, end_ms=None):
+        """
+        로컬 파일만 읽어 컬럼별 배열을 반환합니다 (네트워크 조회 없음, 백테스트/워밍업용).
+
+        numpy가 있으면 memmap 슬라이스이므로, 같은 프로세스에서 load()가 같은 키를 갱신할 수 있으면
+        결과를 오래 보관하지 말고 필요한 구간만 복사해서 사용하세요.
+
+        Returns:
+            dict: {컬럼: 배열} (numpy 있으면 memmap 슬라이스)
+        """
+        key_dir = self._key_dir(exchange, category, symbol, interval)
+        columns, n = self._read_columns(key_dir)
+        if not n or (start_ms is None and end_ms is None):
+            return columns
+        times = columns['time']
+        if np is not None:
+            lo = 0 if start_ms is None else int(np.searchsorted(times, start_ms, side='left'))
+            hi = n if end_ms is None else int(np.searchsorted(times, end_ms, side='right'))
+        else:
+            lo = 0 if start_ms is None else bisect.bisect_left(times, start_ms)
+            hi = n if end_ms is None else bisect.bisect_right(times, end_ms)
+        return {col: values[lo:hi] for col, values in columns.items()}
+
+    def invalidate(self, exchange, category, symbol, interval):
+        """해당 키의 로컬 파일 삭제"""
+        key_dir = self._key_dir(exchange, category, symbol, interval)
+        with self._lock_for(key_dir):
+            for name in [f"{col}.f8" for col in COLUMNS] + [HEAD_MARKER]:
+                try:
+                    os.remove(os.path.join(key_dir, name))
+                except FileNotFoundError:
+                    pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_kline_store():
+    """프로세스 전역 KlineStore 반환 (두 패널이 공유)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = KlineStore()
+        return _store
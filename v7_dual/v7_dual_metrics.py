@@ -0,0 +1,277 @@
+"""
+거래소 REST 요청 계측 (Binance & Bybit)
+
+(거래소, 계정, 엔드포인트)별로 다음을 집계합니다.
+- 지연시간 히스토그램 (p50 / p95 / p99)
+- HTTP 상태 코드 / 거래소 응답 코드(code, retCode) 분포
+- 재시도 횟수 (타임스탬프 재동기화, 주문 결과 불확실 등 사유별)
+- 송수신 바이트
+
+PooledHttpClient가 모든 요청을 자동으로 기록하고, API 클래스가 응답 코드와 재시도를 덧붙입니다.
+프로세스 내에서 get_request_metrics().snapshot()으로 조회하거나 dump()로 파일에 저장합니다.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from v7_dual_config_manager import SCRIPT_DIR
+
+
+METRICS_DIR = os.path.join(SCRIPT_DIR, "logs")
+
+
+def _build_bucket_bounds(start_ms=0.5, factor=1.25, limit_ms=60000.0):
+    """로그 간격 버킷 상한 목록 (0.5ms ~ 60초, 버킷당 약 25% 오차)"""
+    bounds = []
+    bound = start_ms
+    while bound < limit_ms:
+        bounds.append(round(bound, 3))
+        bound *= factor
+    bounds.append(limit_ms)
+    return tuple(bounds)
+
+
+class LatencyHistogram:
+    """
+    고정 버킷 지연시간 히스토그램
+
+    샘플을 보관하지 않으므로 장기 가동 중에도 메모리가 늘지 않습니다.
+    백분위수는 해당 버킷의 상한값(관측 최대값으로 제한)으로 근사합니다.
+    """
+
+    BOUNDS = _build_bucket_bounds()
+
+    __slots__ = ('counts', 'count', 'total_ms', 'min_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # 마지막 칸: 상한 초과
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.counts[bisect.bisect_left(self.BOUNDS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.min_ms is None or elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.total_ms += other.total_ms
+        if other.min_ms is not None and (self.min_ms is None or other.min_ms < self.min_ms):
+            self.min_ms = other.min_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q):
+        """q (0~100) 백분위 지연시간 (ms). 샘플이 없으면 0.0"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(self.count * q / 100.0 + 0.4999)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                upper = self.BOUNDS[i] if i < len(self.BOUNDS) else self.max_ms
+                return min(upper, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'avg_ms': self.total_ms / self.count if self.count else 0.0,
+            'min_ms': self.min_ms or 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+        }
+
+
+class _EndpointMetrics:
+    """(거래소, 계정, 엔드포인트) 1개 항목의 집계값"""
+
+    __slots__ = ('latency', 'status', 'codes', 'retries', 'errors', 'bytes_sent', 'bytes_received')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.status = {}    # HTTP 상태 코드(또는 예외 이름) -> 횟수
+        self.codes = {}     # 거래소 응답 코드 -> 횟수
+        self.retries = {}   # 재시도 사유 -> 횟수
+        self.errors = 0     # 네트워크 예외 / HTTP 4xx·5xx
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class RequestMetrics:
+    """
+    프로세스 전역 REST 요청 계측기 (스레드 안전)
+
+    키: (exchange, account, endpoint). account는 레이트 리밋과 동일하게 API 키 끝 6자리
+    (공개 요청은 None)를 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._started_at = time.time()
+
+    def _entry(self, exchange, account, endpoint):
+        key = (exchange, account, endpoint)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _EndpointMetrics()
+            self._entries[key] = entry
+        return entry
+
+    # ==================== 기록 ====================
+
+    def record_request(self, exchange, account, endpoint, elapsed_ms, status,
+                       bytes_sent=0, bytes_received=0):
+        """
+        HTTP 요청 1건 기록 (PooledHttpClient에서 호출)
+
+        Args:
+            status: HTTP 상태 코드 (int) 또는 네트워크 예외 클래스 이름 (str)
+        """
+        with self._lock:
+            entry = self._entry(exchange, account, endpoint)
+            entry.latency.add(elapsed_ms)
+            entry.status[status] = entry.status.get(status, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                entry.errors += 1
+            entry.bytes_sent += bytes_sent
+            entry.bytes_received += bytes_received
+
+    def record_code(self, exchange, account, endpoint, code):
+        """거래소 응답 코드 기록 (Binance code / Bybit retCode, 정상은 0)"""
+        with self._lock:
+            codes = self._entry(exchange, account, endpoint).codes
+            codes[code] = codes.get(code, 0) + 1
+
+    def record_retry(self, exchange, account, endpoint, reason):
+        """재시도 1회 기록 (reason: 'timestamp', 'order_ambiguous' 등)"""
+        with self._lock:
+            retries = self._entry(exchange, account, endpoint).retries
+            retries[reason] = retries.get(reason, 0) + 1
+
+    # ==================== 조회 ====================
+
+    def snapshot(self, exchange=None):
+        """
+        항목별 통계 스냅샷
+
+        Returns:
+            list: [{'exchange', 'account', 'endpoint', 'latency': {...}, 'status', 'codes',
+                    'retries', 'errors', 'error_rate', 'bytes_sent', 'bytes_received'}, ...]
+        """
+        with self._lock:
+            result = []
+            for (ex, account, endpoint), e in self._entries.items():
+                if exchange is not None and ex != exchange:
+                    continue
+                count = e.latency.count
+                result.append({
+                    'exchange': ex,
+                    'account': account,
+                    'endpoint': endpoint,
+                    'latency': e.latency.to_dict(),
+                    'status': {str(k): v for k, v in e.status.items()},
+                    'codes': {str(k): v for k, v in e.codes.items()},
+                    'retries': dict(e.retries),
+                    'errors': e.errors,
+                    'error_rate': e.errors / count if count else 0.0,
+                    'bytes_sent': e.bytes_sent,
+                    'bytes_received': e.bytes_received,
+                })
+            return result
+
+    def summary(self):
+        """
+        거래소별 합계 (GUI 리소스 박스 표시용)
+
+        Returns:
+            dict: {exchange: {'count', 'p50_ms', 'p95_ms', 'p99_ms', 'errors', 'error_rate',
+                              'retries', 'bytes_sent', 'bytes_received'}}
+        """
+        with self._lock:
+            merged = {}
+            for (ex, _account, _endpoint), e in self._entries.items():
+                m = merged.get(ex)
+                if m is None:
+                    m = merged[ex] = {'latency': LatencyHistogram(), 'errors': 0, 'retries': 0,
+                                      'bytes_sent': 0, 'bytes_received': 0}
+                m['latency'].merge(e.latency)
+                m['errors'] += e.errors
+                m['retries'] += sum(e.retries.values())
+                m['bytes_sent'] += e.bytes_sent
+                m['bytes_received'] += e.bytes_received
+
+        result = {}
+        for ex, m in merged.items():
+            hist = m.pop('latency')
+            result[ex] = dict(
+                m,
+                count=hist.count,
+                p50_ms=hist.percentile(50),
+                p95_ms=hist.percentile(95),
+                p99_ms=hist.percentile(99),
+                error_rate=m['errors'] / hist.count if hist.count else 0.0,
+            )
+        return result
+
+    def dump(self, path=None):
+        """
+        현재 통계를 JSON 파일로 저장합니다.
+
+        Args:
+            path: 저장 경로 (기본값: logs/request_metrics_YYYYmmdd_HHMMSS.json)
+
+        Returns:
+            str: 저장한 파일 경로 (실패 시 None)
+        """
+        if path is None:
+            path = os.path.join(METRICS_DIR, f"request_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        payload = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'uptime_seconds': round(time.time() - self._started_at, 1),
+            'summary': self.summary(),
+            'endpoints': self.snapshot(),
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            print(f"[계측] 요청 통계 저장: {path}")
+            return path
+        except OSError as e:
+            print(f"[계측] 요청 통계 저장 실패: {e}")
+            return None
+
+    def reset(self):
+        """모든 집계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self._started_at = time.time()
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_request_metrics():
+    """프로세스 전역 RequestMetrics 반환 (두 패널이 공유)"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = RequestMetrics()
+        return _metrics
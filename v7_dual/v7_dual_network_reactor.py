@@ -0,0 +1,249 @@
+"""
+공유 네트워크 리액터 (WebSocket 스트림 + 비동기 REST 공용)
+
+기존에는 티커/캔들/사용자 데이터 스트림마다 QThread와 asyncio 이벤트 루프를 따로 만들어
+두 패널 기준 4~6개의 OS 스레드가 돌고, 심볼 변경 때마다 루프 종료/재생성을 반복했습니다.
+
+- NetworkReactor: 프로세스 전역 스레드 1개 + asyncio 루프 1개. 모든 스트림이 태스크로 실행됩니다.
+- QtBridge: 리액터 스레드 -> Qt GUI 스레드 전달 창구 (큐 연결 시그널 1개)
+- ReactorStream: 스트림 기반 클래스. 기존 QThread 스트림과 같은 start()/stop()/wait()/isRunning()
+  인터페이스를 유지하므로 GUI 코드는 그대로 사용할 수 있습니다.
+
+패널/심볼이 늘어도 스레드 수는 그대로이며, 스트림 재시작은 태스크 취소 + 새 태스크 예약이라
+루프를 다시 만들 필요가 없습니다.
+"""
+
+import asyncio
+import threading
+
+from PyQt5.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+
+
+# =============================================================================
+# 리액터 (스레드 1개 + 이벤트 루프 1개)
+# =============================================================================
+
+class NetworkReactor:
+    """
+    프로세스 전역 asyncio 이벤트 루프 (데몬 스레드에서 run_forever)
+
+    WebSocket 스트림과 AsyncExchangeAPI(SharedEventLoop)가 같은 루프를 사용합니다.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="network-reactor", daemon=True)
+        self.thread.start()
+        self._ready.wait(timeout=5)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            # 남은 스트림 태스크 정리
+            try:
+                pending = asyncio.all_tasks(self.loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            except Exception as e:
+                print(f"[리액터] 태스크 취소 중 오류 (무시): {e}")
+            try:
+                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            except Exception:
+                pass
+            self.loop.close()
+            print("[리액터] 네트워크 리액터 종료 완료.")
+
+    @classmethod
+    def get(cls):
+        """리액터 인스턴스 반환 (최초 호출 시 생성)"""
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.thread.is_alive():
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls, timeout=2):
+        """리액터 종료 (프로그램 종료 시). 실행 중인 스트림은 모두 취소됩니다."""
+        with cls._instance_lock:
+            inst = cls._instance
+            cls._instance = None
+        if inst is None:
+            return
+        inst.loop.call_soon_threadsafe(inst.loop.stop)
+        inst.thread.join(timeout=timeout)
+
+    def submit(self, coro):
+        """
+        코루틴을 리액터 루프에 예약합니다 (아무 스레드에서나 호출 가능).
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def active_task_count(self):
+        """리액터에서 실행 중인 태스크 수 (진단용)"""
+        try:
+            return len(asyncio.all_tasks(self.loop))
+        except RuntimeError:
+            return 0
+
+
+def get_reactor_loop():
+    """공유 리액터 이벤트 루프를 반환합니다."""
+    return NetworkReactor.get().loop
+
+
+# =============================================================================
+# Qt 브리지 (리액터 스레드 -> GUI 스레드)
+# =============================================================================
+
+class QtBridge(QObject):
+    """
+    리액터 스레드에서 발생한 스트림 이벤트를 GUI 스레드로 넘기는 단일 창구
+
+    post()는 어느 스레드에서나 호출할 수 있고, 실제 시그널 emit은 GUI 스레드에서 일어납니다.
+    """
+
+    _posted = pyqtSignal(object, str, tuple)  # (stream, signal_name, args)
+
+    def __init__(self):
+        super().__init__()
+        self._posted.connect(self._deliver, Qt.QueuedConnection)
+
+    def post(self, stream, signal_name, args):
+        self._posted.emit(stream, signal_name, args)
+
+    def _deliver(self, stream, signal_name, args):
+        if not stream.running:
+            return  # 중지된 스트림의 잔여 이벤트는 버림 (심볼 변경 직후 이전 심볼 가격 방지)
+        try:
+            getattr(stream, signal_name).emit(*args)
+        except RuntimeError:
+            pass  # 스트림 객체가 이미 삭제됨
+
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def _move_to_gui_thread(obj):
+    """QObject를 GUI(QApplication) 스레드로 옮깁니다 (부모가 없는 경우에만 가능)."""
+    app = QCoreApplication.instance()
+    if app is not None and obj.parent() is None and obj.thread() is not app.thread():
+        obj.moveToThread(app.thread())
+
+
+def get_qt_bridge():
+    """GUI 스레드에 속한 전역 QtBridge 반환"""
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = QtBridge()
+            _move_to_gui_thread(_bridge)
+        return _bridge
+
+
+# =============================================================================
+# 스트림 기반 클래스
+# =============================================================================
+
+class ReactorStream(QObject):
+    """
+    리액터에서 태스크로 실행되는 스트림 (기존 QThread 스트림과 같은 제어 인터페이스)
+
+    하위 클래스는 async listen()을 구현하고, 수신 데이터는 self.publish('시그널이름', ...)로
+    GUI 스레드에 전달합니다.
+    """
+
+    STOP_WAIT_SECONDS = 2.0  # wait() 기본 대기 한도 (close 핸드셰이크 지연 대비)
+
+    def __init__(self, log_prefix, parent=None):
+        super().__init__(parent)
+        _move_to_gui_thread(self)  # 연결 스레드에서 생성돼도 시그널은 GUI 스레드 기준으로 동작
+        self.log_prefix = log_prefix
+        self.running = True
+        self._loop = None
+        self._task = None       # 리액터 스레드 전용
+        self._done = threading.Event()
+
+    async def listen(self):
+        raise NotImplementedError
+
+    async def _run(self):
+        try:
+            await self.listen()
+        finally:
+            print(f"{self.log_prefix}: 스트림 종료 완료.")
+
+    def _spawn(self):
+        """리액터 스레드: 태스크 생성 (예약 전에 stop()됐으면 바로 종료 처리)"""
+        if not self.running:
+            self._done.set()
+            return
+        self._task = self._loop.create_task(self._run())
+        # 태스크 완료 콜백은 코루틴의 finally(소켓 종료, 구독 해지 등)가 모두 끝난 뒤 호출됨
+        self._task.add_done_callback(lambda _t: self._done.set())
+
+    def _cancel_task(self):
+        """리액터 스레드: 태스크 취소"""
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+
+    def start(self):
+        """리액터에 스트림 태스크를 예약합니다 (스레드 생성 없음)."""
+        if self.isRunning():
+            return
+        self.running = True
+        self._done.clear()
+        self._task = None
+        self._loop = NetworkReactor.get().loop
+        self._loop.call_soon_threadsafe(self._spawn)
+
+    def publish(self, signal_name, *args):
+        """수신 데이터를 GUI 스레드로 전달 (리액터 스레드에서 호출)"""
+        if self.running:
+            get_qt_bridge().post(self, signal_name, args)
+
+    def stop(self):
+        """스트림을 중지합니다 (리액터에 태스크 취소 요청, 즉시 반환 - 정리 완료는 wait()로 확인)."""
+        print(f"{self.log_prefix}: 종료 요청 수신")
+        self.running = False
+        loop = self._loop
+        if loop is not None and not self._done.is_set():
+            try:
+                loop.call_soon_threadsafe(self._cancel_task)
+            except RuntimeError:
+                self._done.set()  # 리액터 루프가 이미 닫힘
+
+    def terminate(self):
+        """QThread 호환용 (스레드가 없으므로 stop()과 동일)"""
+        self.stop()
+
+    def wait(self, msecs=None):
+        """
+        스트림 태스크 종료를 기다립니다 (QThread.wait 호환).
+
+        listen()의 finally 정리(소켓 종료, 하위 태스크 취소)까지 끝나야 True를 반환합니다.
+
+        Returns:
+            bool: 종료되었으면 True
+        """
+        if self._loop is None:
+            return True
+        timeout = msecs / 1000.0 if msecs is not None else self.STOP_WAIT_SECONDS
+        return self._done.wait(timeout)
+
+    def isRunning(self):
+        """QThread 호환용 실행 여부"""
+        return self._loop is not None and not self._done.is_set()
@@ -0,0 +1,434 @@
+"""
+로컬 L2 호가창 (Binance & Bybit)
+
+지금까지 슬리피지 판단과 헷지 프로토콜 익절은 마지막 체결가만 사용했습니다.
+이 모듈은 depth 스트림으로 로컬 호가창을 유지하고, 시장가 주문 전에 실제 유동성 기준의
+체결가/슬리피지를 추정할 수 있게 합니다.
+
+- Binance: {symbol}@depth@100ms diff + REST 스냅샷(lastUpdateId) 동기화
+  (U <= lastUpdateId <= u 인 첫 이벤트부터 적용, 이후 pu == 직전 u 가 아니면 재동기화)
+- Bybit:   orderbook.50.{symbol} (snapshot 메시지로 초기화, delta 적용)
+
+호가는 side별 가격 오름차순 array('d') 2개(가격/수량)에 보관하며 bisect로 갱신합니다.
+스트림은 리액터 스레드에서 갱신하고, 조회는 워커/GUI 스레드에서 락으로 보호해 호출합니다.
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from array import array
+
+from v7_dual_stream_mux import MuxStream
+
+
+BINANCE_SNAPSHOT_LIMIT = 1000  # REST 스냅샷 깊이
+BYBIT_DEPTH = 50               # Bybit 구독 깊이 (orderbook.50)
+MAX_BUFFERED_EVENTS = 200      # 스냅샷 대기 중 보관할 diff 이벤트 수
+
+
+class BookSide:
+    """
+    호가 한쪽 (가격 오름차순 배열)
+
+    bids는 마지막 원소가, asks는 첫 원소가 최우선 호가입니다.
+    """
+
+    __slots__ = ('prices', 'sizes', 'is_bid')
+
+    def __init__(self, is_bid):
+        self.is_bid = is_bid
+        self.prices = array('d')
+        self.sizes = array('d')
+
+    def __len__(self):
+        return len(self.prices)
+
+    def clear(self):
+        self.prices = array('d')
+        self.sizes = array('d')
+
+    def update(self, price, size):
+        """가격 레벨 갱신 (수량 0이면 삭제)"""
+        prices = self.prices
+        i = bisect.bisect_left(prices, price)
+        if i < len(prices) and prices[i] == price:
+            if size > 0:
+                self.sizes[i] = size
+            else:
+                del prices[i]
+                del self.sizes[i]
+        elif size > 0:
+            prices.insert(i, price)
+            self.sizes.insert(i, size)
+
+    def best(self):
+        """최우선 호가 (가격, 수량) 또는 None"""
+        if not self.prices:
+            return None
+        i = -1 if self.is_bid else 0
+        return self.prices[i], self.sizes[i]
+
+    def iter_levels(self):
+        """최우선 호가부터 바깥쪽으로 (가격, 수량)"""
+        n = len(self.prices)
+        indices = range(n - 1, -1, -1) if self.is_bid else range(n)
+        prices, sizes = self.prices, self.sizes
+        for i in indices:
+            yield prices[i], sizes[i]
+
+    def volume_to_price(self, limit_price):
+        """최우선 호가부터 limit_price까지(포함) 누적 수량"""
+        prices = self.prices
+        if self.is_bid:
+            lo = bisect.bisect_left(prices, limit_price)
+            return sum(self.sizes[lo:])
+        hi = bisect.bisect_right(prices, limit_price)
+        return sum(self.sizes[:hi])
+
+    def truncate(self, max_levels):
+        """최우선 호가 기준 max_levels개만 유지 (먼 호가 제거)"""
+        extra = len(self.prices) - max_levels
+        if extra <= 0:
+            return
+        if self.is_bid:
+            del self.prices[:extra]
+            del self.sizes[:extra]
+        else:
+            del self.prices[max_levels:]
+            del self.sizes[max_levels:]
+
+
+class LocalOrderBook:
+    """
+    심볼 1개의 로컬 L2 호가창 (스레드 안전)
+
+    조회 메서드는 동기화 전(synced=False)이면 None을 반환합니다.
+    """
+
+    def __init__(self, symbol, tick_size=None, max_levels=BINANCE_SNAPSHOT_LIMIT):
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.max_levels = max_levels
+        self._lock = threading.Lock()
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = None
+        self.synced = False
+        self.updated_at = 0.0   # 마지막 갱신 시각 (time.time)
+
+    # ==================== 갱신 (스트림 스레드) ====================
+
+    def reset(self, symbol=None):
+        """호가 비우기 (심볼 변경/재동기화)"""
+        with self._lock:
+            if symbol is not None:
+                self.symbol = symbol
+            self.bids.clear()
+            self.asks.clear()
+            self.last_update_id = None
+            self.synced = False
+
+    def apply_snapshot(self, bids, asks, update_id=None):
+        """스냅샷으로 전체 교체 (bids/asks: [[가격, 수량], ...] 문자열 또는 숫자)"""
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            self._apply(bids, asks)
+            self.last_update_id = update_id
+            self.synced = True
+
+    def apply_levels(self, bids, asks, update_id=None):
+        """변경된 레벨만 반영 (수량 0은 삭제)"""
+        with self._lock:
+            self._apply(bids, asks)
+            if update_id is not None:
+                self.last_update_id = update_id
+
+    def _apply(self, bids, asks):
+        for price, size in bids:
+            self.bids.update(float(price), float(size))
+        for price, size in asks:
+            self.asks.update(float(price), float(size))
+        self.bids.truncate(self.max_levels)
+        self.asks.truncate(self.max_levels)
+        self.updated_at = time.time()
+
+    # ==================== 조회 (아무 스레드) ====================
+
+    def best_bid(self):
+        """최우선 매수호가 (가격, 수량)"""
+        with self._lock:
+            return self.bids.best() if self.synced else None
+
+    def best_ask(self):
+        """최우선 매도호가 (가격, 수량)"""
+        with self._lock:
+            return self.asks.best() if self.synced else None
+
+    def mid_price(self):
+        with self._lock:
+            if not self.synced:
+                return None
+            bid, ask = self.bids.best(), self.asks.best()
+            if bid is None or ask is None:
+                return None
+            return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        with self._lock:
+            if not self.synced:
+                return None
+            bid, ask = self.bids.best(), self.asks.best()
+            if bid is None or ask is None:
+                return None
+            return ask[0] - bid[0]
+
+    def depth_within_ticks(self, side, ticks, tick_size=None):
+        """
+        최우선 호가에서 N틱 이내 누적 수량
+
+        Args:
+            side: 'bid' 또는 'ask'
+            ticks: 틱 수 (0이면 최우선 호가만)
+            tick_size: 생략 시 생성 시 지정한 tickSize
+        """
+        tick_size = tick_size or self.tick_size
+        if not tick_size:
+            return None
+        with self._lock:
+            book_side = self.bids if side == 'bid' else self.asks
+            best = book_side.best() if self.synced else None
+            if best is None:
+                return None
+            offset = ticks * tick_size + tick_size * 0.5  # 부동소수점 경계 포함
+            limit_price = best[0] - offset if side == 'bid' else best[0] + offset
+            return book_side.volume_to_price(limit_price)
+
+    def estimate_fill(self, order_side, quantity):
+        """
+        시장가 주문 체결 추정 (BUY는 매도호가, SELL은 매수호가를 소진)
+
+        Returns:
+            dict: {'avg_price', 'worst_price', 'filled_qty', 'levels', 'complete'} 또는 None (동기화 전/호가 없음)
+        """
+        if quantity <= 0:
+            return None
+        with self._lock:
+            if not self.synced:
+                return None
+            book_side = self.asks if order_side == "BUY" else self.bids
+            remaining = quantity
+            notional = 0.0
+            worst = None
+            levels = 0
+            for price, size in book_side.iter_levels():
+                take = size if size < remaining else remaining
+                notional += take * price
+                remaining -= take
+                worst = price
+                levels += 1
+                if remaining <= 0:
+                    break
+        filled = quantity - remaining
+        if filled <= 0:
+            return None
+        return {
+            'avg_price': notional / filled,
+            'worst_price': worst,
+            'filled_qty': filled,
+            'levels': levels,
+            'complete': remaining <= 0,
+        }
+
+    def slippage_percent(self, order_side, quantity, reference_price=None):
+        """
+        추정 평균 체결가의 기준가 대비 불리한 방향 슬리피지 (%)
+
+        기준가 생략 시 중간가 사용. 호가가 부족해 전량 체결되지 않으면 체결 가능분 기준입니다.
+        """
+        fill = self.estimate_fill(order_side, quantity)
+        reference_price = reference_price or self.mid_price()
+        if fill is None or not reference_price:
+            return None
+        diff = fill['avg_price'] - reference_price
+        if order_side == "SELL":
+            diff = -diff
+        return diff / reference_price * 100
+
+    def max_qty_within_slippage(self, order_side, max_slippage_percent, reference_price=None):
+        """가장 불리한 체결가가 기준가 대비 max_slippage_percent 이내인 최대 수량"""
+        reference_price = reference_price or self.mid_price()
+        if not reference_price:
+            return None
+        with self._lock:
+            if not self.synced:
+                return None
+            if order_side == "BUY":
+                return self.asks.volume_to_price(reference_price * (1 + max_slippage_percent / 100))
+            return self.bids.volume_to_price(reference_price * (1 - max_slippage_percent / 100))
+
+    def snapshot(self, levels=10):
+        """상위 N개 호가 (진단/표시용)"""
+        with self._lock:
+            bids, asks = [], []
+            for level in self.bids.iter_levels():
+                if len(bids) >= levels:
+                    break
+                bids.append(level)
+            for level in self.asks.iter_levels():
+                if len(asks) >= levels:
+                    break
+                asks.append(level)
+            return {'symbol': self.symbol, 'synced': self.synced, 'bids': bids, 'asks': asks,
+                    'update_id': self.last_update_id, 'updated_at': self.updated_at}
+
+
+# =============================================================================
+# depth 스트림
+# =============================================================================
+
+class BinanceDepthStream(MuxStream):
+    """
+    Binance {symbol}@depth@100ms diff 스트림 + REST 스냅샷으로 로컬 호가창 유지
+
+    스냅샷 수신 전 이벤트는 버퍼에 두었다가 lastUpdateId 기준으로 이어 붙이고,
+    pu(직전 이벤트 u)가 맞지 않으면 호가창을 비우고 스냅샷부터 다시 받습니다.
+    """
+
+    def __init__(self, market_type, symbol, api, tick_size=None, parent=None):
+        super().__init__("Binance", market_type, f"{symbol.lower()}@depth@100ms",
+                         f"BinanceDepthStream({symbol})", parent)
+        self.api = api
+        self.symbol = symbol.upper()
+        self.book = LocalOrderBook(self.symbol, tick_size)
+        self._buffer = []
+        self._snapshot_pending = False
+        self._awaiting_first = False  # 스냅샷 직후 첫 이벤트는 pu 대신 U/u 범위로 확인
+
+    def handle_message(self, data, message):
+        if not isinstance(data, dict) or data.get('e') != 'depthUpdate':
+            return
+        if data.get('s') != self.book.symbol:
+            return
+
+        if not self.book.synced:
+            self._buffer.append(data)
+            if len(self._buffer) > MAX_BUFFERED_EVENTS:
+                del self._buffer[0]
+            if not self._snapshot_pending:
+                self._request_snapshot()
+            return
+
+        self._apply_event(data)
+
+    def _apply_event(self, data):
+        """diff 이벤트 1건 적용 (시퀀스가 끊기면 재동기화하고 False 반환)"""
+        last_update_id = self.book.last_update_id
+        if self._awaiting_first:
+            if data.get('u', 0) < last_update_id:
+                return True  # 스냅샷에 이미 반영된 이벤트
+            if data.get('U', 0) > last_update_id:
+                print(f"{self.log_prefix}: 스냅샷 이후 이벤트 누락 (U={data.get('U')}, lastUpdateId={last_update_id}) - 재동기화")
+                self._resync(data)
+                return False
+            self._awaiting_first = False
+        elif data.get('pu') != last_update_id:
+            print(f"{self.log_prefix}: 시퀀스 불일치 (pu={data.get('pu')}, 마지막 u={last_update_id}) - 재동기화")
+            self._resync(data)
+            return False
+        self.book.apply_levels(data.get('b', ()), data.get('a', ()), data.get('u'))
+        return True
+
+    def _resync(self, data=None):
+        self.book.reset()
+        self._awaiting_first = False
+        self._buffer = [data] if data else []
+        if not self._snapshot_pending:
+            self._request_snapshot()
+
+    def _request_snapshot(self):
+        """REST 스냅샷 요청 (블로킹 HTTP는 실행기 스레드에서)"""
+        self._snapshot_pending = True
+        loop = asyncio.get_running_loop()
+        symbol = self.book.symbol
+        future = loop.run_in_executor(None, self.api.get_order_book, symbol, BINANCE_SNAPSHOT_LIMIT)
+        future.add_done_callback(lambda f, s=symbol: self._on_snapshot(f, s))
+
+    def _on_snapshot(self, future, symbol):
+        self._snapshot_pending = False
+        if symbol != self.book.symbol or not self.running:
+            return  # 요청 중 심볼이 바뀌었거나 중지됨
+        try:
+            snapshot = future.result()
+        except Exception as e:
+            snapshot = None
+            print(f"{self.log_prefix}: 스냅샷 요청 실패: {e}")
+        if not snapshot or snapshot.get('lastUpdateId') is None:
+            self._buffer = []  # 다음 diff 수신 시 다시 요청
+            return
+
+        events = self._buffer
+        self._buffer = []
+        self.book.apply_snapshot(snapshot.get('bids', ()), snapshot.get('asks', ()), snapshot['lastUpdateId'])
+        self._awaiting_first = True
+        for event in events:
+            if not self._apply_event(event):
+                return
+        print(f"{self.log_prefix}: 호가창 동기화 완료 (lastUpdateId={snapshot['lastUpdateId']})")
+
+    def on_link_down(self):
+        """연결이 끊기면 호가창을 비움 (재연결 후 첫 diff 수신 시 스냅샷부터 다시 동기화)"""
+        self.book.reset()
+        self._awaiting_first = False
+        self._buffer = []
+
+    def update_symbol(self, symbol):
+        """재연결 없이 심볼 변경 (호가창은 새로 동기화)"""
+        self.symbol = symbol.upper()
+        self.book.reset(self.symbol)
+        self._buffer = []
+        self.switch_topic(f"{symbol.lower()}@depth@100ms")
+
+
+class BybitDepthStream(MuxStream):
+    """Bybit orderbook.50.{symbol} 스트림으로 로컬 호가창 유지 (snapshot -> delta)"""
+
+    def __init__(self, market_type, symbol, api=None, tick_size=None, parent=None):
+        super().__init__("Bybit", market_type, f"orderbook.{BYBIT_DEPTH}.{symbol}",
+                         f"BybitDepthStream({symbol})", parent)
+        self.symbol = symbol
+        self.book = LocalOrderBook(symbol, tick_size, max_levels=BYBIT_DEPTH)
+
+    def handle_message(self, data, message):
+        if not isinstance(data, dict) or data.get('s') != self.book.symbol:
+            return
+        # u == 1 은 서비스 재시작에 따른 스냅샷 재전송 (delta로 와도 초기화)
+        if message.get('type') == 'snapshot' or data.get('u') == 1:
+            self.book.apply_snapshot(data.get('b', ()), data.get('a', ()), data.get('u'))
+        elif self.book.synced:
+            self.book.apply_levels(data.get('b', ()), data.get('a', ()), data.get('u'))
+
+    def on_link_down(self):
+        """연결이 끊기면 호가창을 비움 (재구독 시 스냅샷부터 다시 수신)"""
+        self.book.reset()
+
+    def update_symbol(self, symbol):
+        """재연결 없이 심볼 변경 (새 토픽 구독 시 스냅샷부터 수신)"""
+        self.symbol = symbol
+        self.book.reset(symbol)
+        self.switch_topic(f"orderbook.{BYBIT_DEPTH}.{symbol}")
+
+
+def create_depth_stream(exchange, market_type, symbol, api, tick_size=None, parent=None):
+    """
+    거래소에 맞는 호가창 스트림을 생성합니다 (stream.book이 LocalOrderBook).
+
+    Args:
+        api: Binance는 REST 스냅샷용 API 모듈 (get_order_book)
+    """
+    if exchange == "Binance":
+        return BinanceDepthStream(market_type, symbol, api, tick_size, parent)
+    elif exchange == "Bybit":
+        return BybitDepthStream(market_type, symbol, api, tick_size, parent)
+    raise ValueError(f"지원되지 않는 거래소: {exchange}")
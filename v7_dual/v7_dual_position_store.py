@@ -0,0 +1,210 @@
+"""
+계정별 포지션/청산가 저장소 (사용자 데이터 스트림 기준 + 느린 REST 동기화)
+
+워커는 청산가/평균 진입가 1개를 읽기 위해 get_initial_positions()로 전체 포지션 목록을
+REST 조회했습니다 (_get_liquidation_price, _get_hedge_liquidation_price, 최종 단계 보호, 헷지 안전망).
+사용자 데이터 스트림의 포지션 이벤트(v7_dual_events.PositionUpdate)에 이미 같은 정보가 있으므로
+WebSocketThread가 이벤트를 전달할 때 저장소에도 반영하고, 워커는 메모리에서 읽습니다.
+
+- apply(): AccountUpdate 반영 (리액터 스레드). 보충(backfill) 이벤트는 REST 값으로 취급
+- reconcile(): REST 전체 목록으로 동기화 (RECONCILE_INTERVAL_SEC마다 + 워커가 오래된 값을 만났을 때)
+- get(): 신선한 스냅샷만 반환. 오래됐거나 (need_liq) 수량 변경 후 청산가가 아직 갱신되지 않았으면 None
+
+신선도:
+- updated_at: 마지막 확인 시각 (스트림 이벤트 또는 REST 동기화) - STALE_AFTER_SEC 지나면 오래된 값
+- size_ts:    수량/평균가가 바뀐 시각
+- liq_ts:     청산가를 받은 시각 - size_ts 이전이면 청산가를 신뢰하지 않음
+  Binance ACCOUNT_UPDATE에는 청산가가 없으므로 수량 변경 후 첫 조회는 REST로 보완됩니다.
+  Bybit position 이벤트는 liqPrice를 함께 주므로 REST 조회 없이 읽힙니다.
+- event_ms:   마지막 반영 이벤트의 거래소 시각 (REST는 조회 시작 시각) - 워커는 체결 직후
+              since_ms(체결 이벤트 시각)로 그 체결이 반영된 포지션만 받음 (포지션 이벤트가 주문 이벤트보다 늦을 수 있음)
+
+저장소는 API 모듈(계정)마다 1개이며 get_position_store(api_module)로 얻습니다.
+"""
+
+import threading
+import time
+import weakref
+
+from v7_dual_events import PositionUpdate
+
+
+RECONCILE_INTERVAL_SEC = 60.0   # 스트림 연결 중 REST 동기화 주기
+STALE_AFTER_SEC = 150.0         # 마지막 확인 이후 이 시간이 지나면 REST로 다시 조회
+
+
+class PositionSnapshot:
+    """포지션 1건 + 신선도 시각 (amount: LONG 양수 / SHORT 음수, 0이면 포지션 없음)"""
+
+    __slots__ = ('symbol', 'position_side', 'amount', 'entry_price', 'liq_price', 'mark_price',
+                 'source', 'updated_at', 'size_ts', 'liq_ts', 'stream_ts', 'event_ms')
+
+    def __init__(self, symbol, position_side):
+        self.symbol = symbol
+        self.position_side = position_side
+        self.amount = 0.0
+        self.entry_price = 0.0
+        self.liq_price = 0.0
+        self.mark_price = 0.0
+        self.source = None
+        self.updated_at = 0.0
+        self.size_ts = 0.0
+        self.liq_ts = 0.0
+        self.stream_ts = 0.0   # 마지막 스트림 이벤트 시각 (REST 응답보다 새 값인지 판단)
+        self.event_ms = 0      # 마지막 반영 이벤트의 거래소 시각 (ms, REST는 조회 시각)
+
+    @property
+    def qty(self):
+        return abs(self.amount)
+
+    def age(self, now=None):
+        return (now or time.time()) - self.updated_at
+
+    def __repr__(self):
+        return (f"PositionSnapshot({self.symbol} {self.position_side} {self.amount} @ {self.entry_price}, "
+                f"liq {self.liq_price}, {self.source} {self.age():.1f}s)")
+
+
+class PositionStore:
+    """계정 1개의 포지션 상태 (스레드 안전 - 리액터/실행기/워커 스레드에서 호출)"""
+
+    def __init__(self, name="account"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._positions = {}  # (symbol, position_side) -> PositionSnapshot
+        self.reconciled_at = 0.0
+        self.stream_events = 0
+        self.rest_reconciles = 0
+
+    # ==================== 반영 ====================
+
+    def _apply_position(self, p, source, now, event_ms):
+        key = (p.symbol, p.position_side)
+        snap = self._positions.get(key)
+        if snap is None:
+            snap = self._positions[key] = PositionSnapshot(p.symbol, p.position_side)
+        if p.amount != snap.amount or p.entry_price != snap.entry_price:
+            snap.size_ts = now
+        snap.amount = p.amount
+        snap.entry_price = p.entry_price
+        if p.mark_price:
+            snap.mark_price = p.mark_price
+        # REST 값은 청산가 0(교차 마진 등 조회 불가)도 그대로 확정, 스트림은 값이 있을 때만 갱신
+        if source == 'rest' or p.liq_price > 0 or p.amount == 0:
+            snap.liq_price = p.liq_price if p.amount != 0 else 0.0
+            snap.liq_ts = now
+        snap.source = source
+        snap.updated_at = now
+        snap.event_ms = max(snap.event_ms, event_ms)
+        if source == 'ws':
+            snap.stream_ts = now
+
+    def apply(self, update):
+        """사용자 데이터 스트림 AccountUpdate 반영 (보충 이벤트는 REST 값)"""
+        if not update.positions:
+            return
+        source = 'rest' if update.backfill else 'ws'
+        now = time.time()
+        with self._lock:
+            for p in update.positions:
+                self._apply_position(p, source, now, update.event_time)
+            self.stream_events += 1
+
+    def reconcile(self, api_module):
+        """
+        REST 전체 포지션 목록으로 동기화
+
+        REST 응답 이후 도착한 스트림 이벤트가 더 새 값이므로, 조회 시작 뒤에 스트림으로 갱신된
+        포지션은 덮어쓰지 않습니다. 목록에 없는 포지션은 수량 0(청산)으로 기록합니다.
+
+        Returns:
+            bool: 조회 성공 여부
+        """
+        started = time.time()
+        try:
+            positions = api_module.get_initial_positions()
+        except Exception as e:
+            print(f"[포지션 저장소] {self.name} REST 동기화 실패: {e}")
+            return False
+        if positions is None:
+            return False
+
+        now = time.time()
+        started_ms = int(started * 1000)
+        with self._lock:
+            seen = set()
+            for raw in positions:
+                p = PositionUpdate.from_rest(raw)
+                key = (p.symbol, p.position_side)
+                seen.add(key)
+                snap = self._positions.get(key)
+                if snap is not None and snap.stream_ts > started:
+                    continue
+                self._apply_position(p, 'rest', now, started_ms)
+            for key, snap in self._positions.items():
+                if key not in seen and snap.stream_ts <= started:
+                    self._apply_position(PositionUpdate(key[0], key[1], 0.0), 'rest', now, started_ms)
+            self.reconciled_at = now
+            self.rest_reconciles += 1
+        return True
+
+    # ==================== 조회 ====================
+
+    def get(self, symbol, position_side, max_age=STALE_AFTER_SEC, need_liq=False, since_ms=0):
+        """
+        신선한 포지션 스냅샷 (복사본)
+
+        Args:
+            max_age: 마지막 확인 이후 허용 시간 (초)
+            need_liq: 수량 변경 이후 받은 청산가가 있어야 함
+            since_ms: 이 거래소 시각(ms) 이후 이벤트가 반영된 값이어야 함 (체결 직후 조회)
+
+        Returns:
+            PositionSnapshot: 포지션이 없으면 amount 0 스냅샷 (최근 REST 동기화로 확인된 경우)
+            None: 모르는 값 / 오래된 값 / 청산가 미갱신 / since_ms 이전 값 -> 호출 측이 reconcile()
+        """
+        now = time.time()
+        with self._lock:
+            snap = self._positions.get((symbol, position_side))
+            if snap is None:
+                if now - self.reconciled_at <= max_age and self.reconciled_at * 1000 >= since_ms:
+                    snap = PositionSnapshot(symbol, position_side)
+                    snap.source = 'rest'
+                    snap.updated_at = snap.size_ts = snap.liq_ts = self.reconciled_at
+                    snap.event_ms = int(self.reconciled_at * 1000)
+                    return snap
+                return None
+            if now - snap.updated_at > max_age or snap.event_ms < since_ms:
+                return None
+            if need_liq and snap.amount != 0 and snap.liq_ts < snap.size_ts:
+                return None
+            copy = PositionSnapshot(snap.symbol, snap.position_side)
+            for field in PositionSnapshot.__slots__:
+                setattr(copy, field, getattr(snap, field))
+            return copy
+
+    def needs_reconcile(self, interval=RECONCILE_INTERVAL_SEC):
+        return time.time() - self.reconciled_at >= interval
+
+    def snapshot(self):
+        """진단용: [PositionSnapshot, ...] (수량 0 제외)"""
+        with self._lock:
+            return [s for s in self._positions.values() if s.amount != 0]
+
+    def reset(self):
+        with self._lock:
+            self._positions.clear()
+            self.reconciled_at = 0.0
+
+
+_stores = weakref.WeakKeyDictionary()
+_stores_lock = threading.Lock()
+
+
+def get_position_store(api_module):
+    """API 모듈(계정)별 PositionStore 반환 (WebSocketThread와 워커가 같은 저장소 공유)"""
+    with _stores_lock:
+        store = _stores.get(api_module)
+        if store is None:
+            store = _stores[api_module] = PositionStore(type(api_module).__name__)
+        return store
@@ -0,0 +1,425 @@
+"""
+클라이언트측 레이트 리밋 관리자 (Binance & Bybit)
+
+두 패널 + 예비자금/잔액 폴링 타이머가 동시에 요청을 보내면
+Binance -1003 / Bybit 10006 (요청 과다) 차단이 발생할 수 있습니다.
+(거래소, 계정, 엔드포인트 분류)별 토큰 버킷으로 요청을 조절하고,
+응답 헤더로 서버측 사용량을 동기화합니다.
+
+- Binance: X-MBX-USED-WEIGHT-1M (IP 단위 가중치), X-MBX-ORDER-COUNT-10S (계정 단위 주문 수)
+- Bybit:   X-Bapi-Limit / X-Bapi-Limit-Status / X-Bapi-Limit-Reset-Timestamp
+- 429/418 응답의 Retry-After 동안 해당 버킷 차단
+
+우선순위: 주문/취소(order) > 계정 조회(account) > 시세/캔들(market)
+낮은 우선순위 요청은 버킷에 예비분(reserve)을 남겨두고 대기하므로
+잔액 새로고침이나 OHLCV 로드가 주문 예산을 소진하지 않습니다.
+"""
+
+import threading
+import time
+
+
+# 엔드포인트 분류별 우선순위 (숫자가 작을수록 우선)
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET = 2
+
+ENDPOINT_CLASS_PRIORITY = {
+    'order': PRIORITY_ORDER,
+    'account': PRIORITY_ACCOUNT,
+    'market': PRIORITY_MARKET,
+}
+
+# 우선순위별로 버킷에 남겨둘 예비 비율 (이 비율 이하로는 소진하지 않음)
+PRIORITY_RESERVE = {
+    PRIORITY_ORDER: 0.0,
+    PRIORITY_ACCOUNT: 0.2,
+    PRIORITY_MARKET: 0.35,
+}
+
+# 우선순위별 최대 대기 시간 (초). 주문은 대기 후에도 전송(거래소 판단에 맡김)
+PRIORITY_MAX_WAIT = {
+    PRIORITY_ORDER: 5.0,
+    PRIORITY_ACCOUNT: 15.0,
+    PRIORITY_MARKET: 30.0,
+}
+
+# 버킷 기본 한도: 이름 -> (용량, 기간(초))
+DEFAULT_LIMITS = {
+    'Binance': {
+        'weight': (2400, 60.0),   # IP 단위 요청 가중치 / 1분
+        'order': (300, 10.0),     # 계정 단위 주문 수 / 10초
+    },
+    'Bybit': {
+        'order': (10, 1.0),       # UID 단위 주문/취소 (초당)
+        'account': (10, 1.0),     # UID 단위 조회 (초당, 헤더로 보정)
+        'market': (600, 5.0),     # IP 단위 공개 API / 5초
+    },
+}
+
+# 분류별로 소모할 버킷: (버킷 이름, IP 공유 여부)
+_BUCKET_ROUTES = {
+    'Binance': {
+        'order': [('order', False), ('weight', True)],
+        'account': [('weight', True)],
+        'market': [('weight', True)],
+    },
+    'Bybit': {
+        'order': [('order', False)],
+        'account': [('account', False)],
+        'market': [('market', True)],
+    },
+}
+
+IP_ACCOUNT = "ip"  # IP 단위로 공유되는 버킷의 계정 키
+
+
+def classify_endpoint(method, endpoint_path):
+    """
+    엔드포인트를 레이트 리밋 분류로 변환합니다.
+
+    Returns:
+        str: 'order' / 'account' / 'market'
+    """
+    path = endpoint_path or ""
+    method = (method or "GET").upper()
+
+    # 주문 생성/취소/일괄 처리
+    if method in ('POST', 'DELETE'):
+        if ('/order' in path or 'batchOrders' in path
+                or path.startswith('/v5/order/') or '/algo/futures/' in path):
+            return 'order'
+
+    # 공개 시세 데이터
+    if (path.startswith('/v5/market/') or '/klines' in path or path.endswith('/time')
+            or '/exchangeInfo' in path or '/depth' in path or '/ticker' in path
+            or '/premiumIndex' in path):
+        return 'market'
+
+    return 'account'
+
+
+def binance_request_weight(endpoint_path, params=None):
+    """Binance 요청 가중치 추정 (문서 기준 근사치)"""
+    params = params or {}
+    path = endpoint_path or ""
+
+    if '/klines' in path:
+        limit = int(params.get('limit', 500) or 500)
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        if limit <= 1000:
+            return 5
+        return 10
+    if '/openOrders' in path:
+        return 1 if params.get('symbol') else 40
+    if '/depth' in path:
+        limit = int(params.get('limit', 500) or 500)
+        return 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+    if '/balance' in path or '/positionRisk' in path or '/account' in path:
+        return 5
+    if '/exchangeInfo' in path:
+        return 1
+    if '/allOrders' in path:
+        return 5
+    if 'batchOrders' in path:
+        return 5
+    return 1
+
+
+class TokenBucket:
+    """단순 토큰 버킷 (잠금은 RateLimitGovernor가 관리)"""
+
+    def __init__(self, capacity, period):
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0      # monotonic 기준 차단 해제 시각
+        self.server_remaining = None  # 마지막으로 헤더에서 읽은 잔여량
+        self.server_synced_at = 0.0
+        self.waiting = [0, 0, 0]      # 우선순위별 대기 중인 요청 수
+
+    @property
+    def refill_rate(self):
+        return self.capacity / self.period if self.period > 0 else self.capacity
+
+    def refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated_at = now
+
+    def available_for(self, priority):
+        """해당 우선순위가 사용할 수 있는 토큰 수 (예비분 제외)"""
+        reserve = PRIORITY_RESERVE.get(priority, 0.0) * self.capacity
+        return self.tokens - reserve
+
+    def wait_time_for(self, cost, priority, now):
+        """cost만큼 사용 가능해질 때까지 필요한 시간 (초)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        shortfall = cost - self.available_for(priority)
+        if shortfall <= 0:
+            return 0.0
+        return shortfall / self.refill_rate
+
+    def headroom(self):
+        """잔여 비율 (0.0 ~ 1.0)"""
+        if self.capacity <= 0:
+            return 0.0
+        return max(0.0, min(1.0, self.tokens / self.capacity))
+
+
+class RateLimitGovernor:
+    """
+    (거래소, 계정, 버킷)별 토큰 버킷 관리자 (프로세스 전역 공유)
+
+    사용법:
+        governor = get_rate_limit_governor()
+        if governor.acquire("Bybit", account, "order"):
+            response = ...
+            governor.update_from_headers("Bybit", account, "order", response.headers, response.status_code)
+    """
+
+    LOW_HEADROOM_LOG_INTERVAL = 10.0  # 예산 부족 경고 로그 최소 간격 (초)
+
+    def __init__(self, limits=None):
+        self._limits = limits or DEFAULT_LIMITS
+        self._cond = threading.Condition()
+        self._buckets = {}  # (exchange, account, bucket_name) -> TokenBucket
+        self._throttled_count = 0
+        self._throttled_seconds = 0.0
+        self._last_low_log = 0.0
+
+    # ==================== 내부 유틸 ====================
+
+    def _bucket(self, exchange, account, name):
+        key = (exchange, account, name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, period = self._limits.get(exchange, {}).get(name, (1000, 1.0))
+            bucket = TokenBucket(capacity, period)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _route(self, exchange, account, endpoint_class, weight):
+        """분류에 해당하는 (버킷, 비용) 목록"""
+        routes = _BUCKET_ROUTES.get(exchange, {}).get(endpoint_class, [])
+        result = []
+        for name, ip_shared in routes:
+            bucket_account = IP_ACCOUNT if ip_shared else (account or IP_ACCOUNT)
+            cost = weight if name == 'weight' else 1
+            result.append((self._bucket(exchange, bucket_account, name), cost))
+        return result
+
+    def _higher_priority_waiting(self, bucket, priority):
+        return any(bucket.waiting[p] > 0 for p in range(priority))
+
+    # ==================== 공개 API ====================
+
+    def acquire(self, exchange, account, endpoint_class, weight=1, timeout=None):
+        """
+        요청 전 예산을 확보합니다 (필요 시 대기).
+
+        Args:
+            exchange: "Binance" / "Bybit"
+            account: 계정 식별자 (API 키 끝자리 등, 공개 API는 None)
+            endpoint_class: 'order' / 'account' / 'market'
+            weight: Binance 요청 가중치
+            timeout: 최대 대기 시간 (None이면 우선순위 기본값)
+
+        Returns:
+            bool: True면 전송 가능. 주문(order)은 대기 시간 초과 시에도 True를 반환합니다.
+        """
+        priority = ENDPOINT_CLASS_PRIORITY.get(endpoint_class, PRIORITY_ACCOUNT)
+        max_wait = PRIORITY_MAX_WAIT[priority] if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + max_wait
+
+        with self._cond:
+            route = self._route(exchange, account, endpoint_class, weight)
+            if not route:
+                return True
+
+            for bucket, _ in route:
+                bucket.waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = 0.0
+                    for bucket, cost in route:
+                        bucket.refill(now)
+                        w = bucket.wait_time_for(cost, priority, now)
+                        # 상위 우선순위가 대기 중이면 양보
+                        if w == 0.0 and self._higher_priority_waiting(bucket, priority):
+                            w = 0.05
+                        wait = max(wait, w)
+
+                    if wait <= 0.0:
+                        for bucket, cost in route:
+                            bucket.tokens -= cost
+                        break
+
+                    if now + wait > deadline:
+                        if priority == PRIORITY_ORDER:
+                            # 주문은 로컬에서 거부하지 않음 (토큰은 음수로 차감되어 후속 요청이 대기)
+                            for bucket, cost in route:
+                                bucket.tokens -= cost
+                            print(f"[RateLimit] {exchange} {endpoint_class}: 예산 부족 상태로 주문 전송 (대기 {now - start:.2f}s)")
+                            break
+                        print(f"[RateLimit] {exchange} {endpoint_class}: 대기 시간 초과 ({max_wait:.1f}s) - 요청 보류")
+                        return False
+
+                    self._cond.wait(timeout=min(wait, 0.5))
+            finally:
+                for bucket, _ in route:
+                    bucket.waiting[priority] -= 1
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            if waited > 0.01:
+                self._throttled_count += 1
+                self._throttled_seconds += waited
+                if waited > 0.5:
+                    print(f"[RateLimit] {exchange} {endpoint_class}: {waited:.2f}s 대기 후 전송")
+        return True
+
+    def update_from_headers(self, exchange, account, endpoint_class, headers, status_code=200):
+        """
+        응답 헤더로 서버측 사용량을 동기화합니다.
+
+        Args:
+            headers: requests 응답 헤더 (대소문자 무시 dict)
+            status_code: HTTP 상태 코드 (429/418이면 Retry-After 동안 차단)
+        """
+        if headers is None:
+            return
+        now = time.monotonic()
+
+        with self._cond:
+            if exchange == 'Binance':
+                used_weight = headers.get('X-MBX-USED-WEIGHT-1M')
+                if used_weight is not None:
+                    self._sync_bucket(self._bucket(exchange, IP_ACCOUNT, 'weight'),
+                                      remaining=None, used=used_weight, now=now)
+                order_count = headers.get('X-MBX-ORDER-COUNT-10S')
+                if order_count is not None and account:
+                    self._sync_bucket(self._bucket(exchange, account, 'order'),
+                                      remaining=None, used=order_count, now=now)
+            elif exchange == 'Bybit':
+                remaining = headers.get('X-Bapi-Limit-Status')
+                if remaining is not None:
+                    for name, ip_shared in _BUCKET_ROUTES['Bybit'].get(endpoint_class, []):
+                        bucket = self._bucket(exchange, IP_ACCOUNT if ip_shared else (account or IP_ACCOUNT), name)
+                        limit = headers.get('X-Bapi-Limit')
+                        if limit:
+                            try:
+                                bucket.capacity = float(limit)
+                            except ValueError:
+                                pass
+                        self._sync_bucket(bucket, remaining=remaining, used=None, now=now)
+                        reset_ts = headers.get('X-Bapi-Limit-Reset-Timestamp')
+                        if reset_ts and bucket.server_remaining is not None and bucket.server_remaining <= 0:
+                            try:
+                                delay = max(0.0, int(reset_ts) / 1000.0 - time.time())
+                                bucket.blocked_until = max(bucket.blocked_until, now + min(delay, 60.0))
+                            except ValueError:
+                                pass
+
+            if status_code in (418, 429):
+                retry_after = headers.get('Retry-After')
+                try:
+                    delay = float(retry_after) if retry_after else 5.0
+                except ValueError:
+                    delay = 5.0
+                for (ex, _acc, _name), bucket in self._buckets.items():
+                    if ex == exchange:
+                        bucket.blocked_until = max(bucket.blocked_until, now + delay)
+                        bucket.tokens = min(bucket.tokens, 0.0)
+                print(f"[RateLimit] {exchange} HTTP {status_code} 수신 - {delay:.0f}초 동안 요청 차단")
+
+            self._maybe_log_low_headroom(exchange, now)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _sync_bucket(bucket, remaining, used, now):
+        """서버 잔여량/사용량으로 로컬 토큰 보정 (서버가 더 적게 남았다고 하면 그 값을 따름)"""
+        try:
+            if used is not None:
+                remaining = bucket.capacity - float(used)
+            else:
+                remaining = float(remaining)
+        except (TypeError, ValueError):
+            return
+        bucket.refill(now)
+        bucket.server_remaining = remaining
+        bucket.server_synced_at = now
+        if remaining < bucket.tokens:
+            bucket.tokens = remaining
+
+    def _maybe_log_low_headroom(self, exchange, now):
+        if now - self._last_low_log < self.LOW_HEADROOM_LOG_INTERVAL:
+            return
+        for (ex, acc, name), bucket in self._buckets.items():
+            if ex == exchange and bucket.headroom() < 0.2:
+                self._last_low_log = now
+                print(f"[RateLimit] {ex} {name}({acc}) 예산 부족: 잔여 {bucket.headroom() * 100:.0f}%")
+                break
+
+    def get_budget_snapshot(self, exchange=None):
+        """
+        현재 예산 현황을 반환합니다 (GUI/로그 표시용).
+
+        Returns:
+            list[dict]: [{'exchange', 'account', 'bucket', 'tokens', 'capacity',
+                          'headroom_pct', 'server_remaining', 'blocked_for'}]
+        """
+        now = time.monotonic()
+        result = []
+        with self._cond:
+            for (ex, acc, name), bucket in sorted(self._buckets.items()):
+                if exchange and ex != exchange:
+                    continue
+                bucket.refill(now)
+                result.append({
+                    'exchange': ex,
+                    'account': acc,
+                    'bucket': name,
+                    'tokens': round(bucket.tokens, 1),
+                    'capacity': bucket.capacity,
+                    'headroom_pct': round(bucket.headroom() * 100, 1),
+                    'server_remaining': bucket.server_remaining,
+                    'blocked_for': round(max(0.0, bucket.blocked_until - now), 1),
+                })
+        return result
+
+    def get_min_headroom(self, exchange=None):
+        """가장 여유가 적은 버킷의 잔여 비율(%)과 이름을 반환합니다."""
+        snapshot = self.get_budget_snapshot(exchange)
+        if not snapshot:
+            return 100.0, None
+        worst = min(snapshot, key=lambda b: b['headroom_pct'])
+        return worst['headroom_pct'], f"{worst['exchange']}:{worst['bucket']}"
+
+    def get_stats(self):
+        """대기(스로틀) 발생 통계"""
+        return {
+            'throttled_count': self._throttled_count,
+            'throttled_seconds': round(self._throttled_seconds, 3),
+        }
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_limit_governor():
+    """프로세스 전역 RateLimitGovernor 반환 (두 패널이 공유)"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateLimitGovernor()
+        return _governor
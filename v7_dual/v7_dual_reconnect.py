@@ -0,0 +1,154 @@
+"""
+웹소켓 재연결 감독 + 끊김 구간 REST 보충 (Binance & Bybit)
+
+기존에는 모든 스트림이 고정 3초 대기 후 재연결했고, 끊긴 동안의 캔들 확정/주문 체결 이벤트는
+다음 수동 동기화 전까지 알 수 없었습니다.
+
+- ReconnectBackoff: 지터를 섞은 지수 백오프 + 끊김 시간 측정
+  (연결이 STABLE_SECONDS 이상 유지된 뒤 끊기면 대기 시간을 처음부터 다시 셈)
+- OrderStateTracker: 주문별 마지막으로 전달한 (상태, 누적 체결 수량) 기록
+  보충 이벤트 중 이미 실시간으로 전달된 상태는 걸러서 같은 체결이 두 번 처리되지 않게 합니다.
+  아직 종료되지 않은 주문 목록(open_order_ids)은 재연결 시 주문별 상태 조회 대상이 됩니다.
+- order_to_event / positions_to_event: REST 응답을 사용자 데이터 스트림 이벤트 레코드(v7_dual_events)로 변환
+  보충 이벤트는 실시간 이벤트와 같은 시그널/핸들러로 전달되며 backfill=True 표시가 붙습니다.
+"""
+
+import random
+import time
+from collections import OrderedDict
+
+from v7_dual_events import AccountUpdate, OrderUpdate, PositionUpdate
+
+
+BACKOFF_BASE = 1.0        # 첫 재연결 대기 (초)
+BACKOFF_CAP = 60.0        # 최대 재연결 대기 (초)
+BACKOFF_FACTOR = 2.0
+BACKOFF_JITTER = 0.5      # 대기 시간의 최대 50%를 무작위로 줄임 (동시 재연결 분산)
+STABLE_SECONDS = 30.0     # 이 시간 이상 유지된 연결이 끊기면 백오프 초기화
+
+BACKFILL_LOOKBACK_MS = 5_000   # 끊김 직전 이벤트 누락 대비 주문/체결 내역 조회 여유 구간
+BACKFILL_MAX_ORDER_LOOKUPS = 50  # 재연결 1회당 주문별 상태 조회 최대 건수 (요청 한도 보호)
+MAX_TRACKED_ORDERS = 2_000
+
+
+class ReconnectBackoff:
+    """
+    재연결 대기 시간 계산 + 끊김 구간 기록
+
+    사용 순서: 연결 성공 시 mark_up(), 끊기면 mark_down() 후 next_delay()만큼 대기
+    """
+
+    def __init__(self, base=BACKOFF_BASE, cap=BACKOFF_CAP, factor=BACKOFF_FACTOR,
+                 jitter=BACKOFF_JITTER, stable_after=STABLE_SECONDS):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.jitter = jitter
+        self.stable_after = stable_after
+
+        self.attempts = 0
+        self.connected_at = None    # 현재 연결 시작 (monotonic)
+        self.down_since = None      # 끊긴 시각 (monotonic), 연결 중이면 None
+        self.down_since_ms = None   # 끊긴 시각 (epoch ms, REST 보충 기준)
+
+    def mark_up(self):
+        """
+        연결 성공 기록
+
+        Returns:
+            float: 직전 끊김 지속 시간(초). 첫 연결이면 None
+        """
+        now = time.monotonic()
+        self.connected_at = now
+        if self.down_since is None:
+            return None
+        downtime = now - self.down_since
+        self.down_since = None
+        return downtime
+
+    def mark_down(self):
+        """
+        연결 끊김/연결 실패 기록
+
+        Returns:
+            bool: 연결된 상태에서 새로 끊긴 경우 True (재시도 중 실패는 False)
+        """
+        now = time.monotonic()
+        connected_at = self.connected_at
+        self.connected_at = None
+        if connected_at is None:
+            return False
+        if now - connected_at >= self.stable_after:
+            self.attempts = 0
+        self.down_since = now
+        self.down_since_ms = int(time.time() * 1000)
+        return True
+
+    def next_delay(self):
+        """다음 재연결까지 대기 시간 (초)"""
+        delay = min(self.cap, self.base * self.factor ** min(self.attempts, 16))
+        self.attempts += 1
+        return delay * (1.0 - self.jitter * random.random())
+
+    def downtime(self):
+        """현재 끊김 지속 시간 (연결 중이면 0)"""
+        if self.down_since is None:
+            return 0.0
+        return time.monotonic() - self.down_since
+
+
+class OrderStateTracker:
+    """주문별 마지막 전달 상태 (보충 이벤트 중복 제거용, 리액터 스레드 전용)"""
+
+    def __init__(self, max_orders=MAX_TRACKED_ORDERS):
+        self.max_orders = max_orders
+        self._states = OrderedDict()  # order_id -> (status, 누적 체결 수량, 종료 여부)
+
+    def remember(self, update):
+        """전달한 주문 이벤트(OrderUpdate) 기록"""
+        self._states[update.order_id] = (update.status, update.filled_qty, update.is_terminal)
+        self._states.move_to_end(update.order_id)
+        while len(self._states) > self.max_orders:
+            self._states.popitem(last=False)
+
+    def open_order_ids(self):
+        """마지막으로 전달한 상태가 종료(FILLED/CANCELED 등)가 아닌 주문 ID 목록 (오래된 순)"""
+        return [order_id for order_id, (_, _, terminal) in self._states.items() if not terminal]
+
+    def is_new(self, update):
+        """이미 전달한 상태보다 진행된 이벤트인지"""
+        prev = self._states.get(update.order_id)
+        if prev is None:
+            return True
+        prev_status, prev_filled, prev_terminal = prev
+        if prev_terminal:
+            return False
+        if update.filled_qty < prev_filled or (update.status == prev_status and update.filled_qty == prev_filled):
+            return False
+        return True
+
+
+def order_to_event(order, status=None):
+    """
+    REST 주문(allOrders / openOrders 정규화 형식)을 OrderUpdate 보충 이벤트로 변환
+
+    Args:
+        order: {'orderId', 'symbol', 'status', 'type', 'side', 'price', 'origQty', 'executedQty', 'avgPrice', ...}
+        status: 지정하면 order['status'] 대신 사용 (미체결 주문 목록은 상태 필드가 없을 수 있음)
+    """
+    return OrderUpdate.from_rest(order, status)
+
+
+def positions_to_event(positions, symbol):
+    """
+    REST 포지션 목록(get_initial_positions)을 AccountUpdate 보충 이벤트로 변환
+
+    get_initial_positions는 수량 0인 포지션을 빼고 주므로, 심볼의 비어 있는 방향은
+    수량 0으로 채워서 끊긴 동안 청산된 포지션이 GUI/워커에서 지워지도록 합니다.
+    """
+    entries = [PositionUpdate.from_rest(p) for p in positions or () if p.get('symbol') == symbol]
+    seen_sides = {p.position_side for p in entries}
+    for position_side in ('LONG', 'SHORT', 'BOTH'):
+        if position_side not in seen_sides:
+            entries.append(PositionUpdate(symbol, position_side, 0.0))
+    return AccountUpdate(positions=tuple(entries), backfill=True)
@@ -8,12 +8,19 @@ import logging
 from datetime import datetime
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
+from v7_dual_feed_metrics import get_feed_metrics
+from v7_dual_metrics import get_request_metrics
+from v7_dual_worker_queue import get_worker_queue_stats
+
 logger = logging.getLogger(__name__)
 
 
 class ResourceMonitor(QObject):
     """
     시스템 리소스(메모리, CPU) 모니터링 및 자동 정리
+    + 거래소 REST 요청 계측(지연 p50/p95/p99, 오류율, 재시도) 요약 전달
+    + 실시간 피드 지연(거래소 이벤트 -> 워커 처리) 요약 / 지연 경보 전달
+    + 워커 이벤트 큐 깊이 / 처리 시간 전달
     """
     # 경고 시그널 (메모리 사용량, 경고 레벨: "warning" | "critical")
     memory_warning = pyqtSignal(float, str)
@@ -24,12 +31,25 @@ class ResourceMonitor(QObject):
     # GUI 업데이트 시그널 (메모리 MB, CPU %, 최대 메모리 MB)
     resource_updated = pyqtSignal(float, float, float)
 
+    # 요청 계측 요약 시그널 ({거래소: {'count', 'p50_ms', 'p95_ms', 'p99_ms', 'error_rate', 'retries', ...}})
+    request_metrics_updated = pyqtSignal(dict)
+
+    # 피드 지연 요약 시그널 ({스트림: {'network_p95_ms', 'queue_p95_ms', 'total_p95_ms', ...}})
+    feed_latency_updated = pyqtSignal(dict)
+
+    # 피드 지연 경보 시그널 (스트림, total p95 ms, 경보 여부 - False면 해제)
+    feed_lag_alert = pyqtSignal(str, float, bool)
+
+    # 워커 이벤트 큐 통계 시그널 ({큐 이름: {'depth', 'max_depth', 'wait_p95_ms', 'handle', ...}})
+    worker_queue_updated = pyqtSignal(dict)
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         # 모니터링 설정
         self.monitor_interval = 60000  # 1분마다 체크
         self.cleanup_interval = 300000  # 5분마다 자동 정리
+        self.feed_interval = 2000  # 2초마다 피드 지연 / 워커 큐 갱신
 
         # 메모리 임계값 (MB)
         self.memory_warning_threshold = 500  # 500MB 이상 경고
@@ -42,6 +62,9 @@ class ResourceMonitor(QObject):
         self.cleanup_timer = QTimer()
         self.cleanup_timer.timeout.connect(self.auto_cleanup)
 
+        self.feed_timer = QTimer()
+        self.feed_timer.timeout.connect(self.check_feed_latency)
+
         # 통계
         self.max_memory_usage = 0.0
         self.total_cleanups = 0
@@ -53,12 +76,14 @@ class ResourceMonitor(QObject):
         """모니터링 시작"""
         self.monitor_timer.start(self.monitor_interval)
         self.cleanup_timer.start(self.cleanup_interval)
+        self.feed_timer.start(self.feed_interval)
         logger.info(f"[리소스 모니터] 시작 - 모니터링: {self.monitor_interval/1000}초, 정리: {self.cleanup_interval/1000}초")
 
     def stop(self):
         """모니터링 중지"""
         self.monitor_timer.stop()
         self.cleanup_timer.stop()
+        self.feed_timer.stop()
         logger.info("[리소스 모니터] 중지")
 
     def check_resources(self):
@@ -79,6 +104,7 @@ class ResourceMonitor(QObject):
 
             # GUI 업데이트 시그널 발송 (로그 출력 제거 - GUI에 표시)
             self.resource_updated.emit(memory_mb, cpu_percent, self.max_memory_usage)
+            self.request_metrics_updated.emit(get_request_metrics().summary())
 
             # 경고 체크 (로그 출력 제거 - GUI에서 처리)
             if memory_mb > self.memory_critical_threshold:
@@ -91,6 +117,24 @@ class ResourceMonitor(QObject):
         except Exception as e:
             logger.error(f"[리소스 모니터] 리소스 체크 오류: {e}")
 
+    def check_feed_latency(self):
+        """피드 지연 요약 전달 + 경보 상태 변화 알림 + 워커 큐 통계 전달"""
+        try:
+            queue_stats = get_worker_queue_stats()
+            if queue_stats:
+                self.worker_queue_updated.emit(queue_stats)
+
+            feed_metrics = get_feed_metrics()
+            summary = feed_metrics.summary()
+            if not summary:
+                return
+            self.feed_latency_updated.emit(summary)
+            for stream, p95_ms, alerting in feed_metrics.update_alerts(summary):
+                self.feed_lag_alert.emit(stream, p95_ms, alerting)
+
+        except Exception as e:
+            logger.error(f"[리소스 모니터] 피드 지연 체크 오류: {e}")
+
     def auto_cleanup(self):
         """자동 메모리 정리"""
         try:
@@ -124,8 +168,13 @@ class ResourceMonitor(QObject):
                 "max_memory_mb": self.max_memory_usage,
                 "cpu_percent": cpu_percent,
                 "total_cleanups": self.total_cleanups,
-                "last_cleanup": self.last_cleanup_time.strftime("%Y-%m-%d %H:%M:%S")
+                "last_cleanup": self.last_cleanup_time.strftime("%Y-%m-%d %H:%M:%S"),
+                "requests": get_request_metrics().summary()
             }
         except Exception as e:
             logger.error(f"[리소스 모니터] 통계 조회 오류: {e}")
             return None
+
+    def dump_request_metrics(self, path=None):
+        """요청 계측 상세(엔드포인트/계정별)를 JSON 파일로 저장하고 경로를 반환합니다."""
+        return get_request_metrics().dump(path)
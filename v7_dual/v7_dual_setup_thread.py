@@ -4,6 +4,7 @@ SetupAutoTradeThread: 자동매매 설정을 백그라운드에서 처리하는
 from PyQt5.QtCore import QThread, pyqtSignal
 from decimal import Decimal, ROUND_UP
 import v7_dual_trading_utils as trading_utils
+from v7_dual_async_api import make_async_api
 
 
 class SetupAutoTradeThread(QThread):
@@ -29,20 +30,29 @@ class SetupAutoTradeThread(QThread):
 
         self.log_prefix = f"{self._lp} SetupAutoTradeThread"
 
-    def _get_min_order_value(self, symbol):
+    def _get_min_order_value(self, symbol, rules=None):
         """
         코인별 최소 주문 금액(USDT)을 반환합니다.
 
-        Bybit 거래소의 일반적인 최소 주문 금액:
+        거래 규칙에 minNotionalValue가 있으면 그 값을 사용하고,
+        없으면 Bybit 거래소의 일반적인 최소 주문 금액을 사용합니다:
         - BTC, ETH: 20 USDT
         - 기타 대부분: 5 USDT
 
         Args:
             symbol: 거래 심볼 (예: "BTCUSDT", "XRPUSDT")
+            rules: get_instrument_info() 결과 (선택)
 
         Returns:
             float: 최소 주문 금액 (USDT)
         """
+        min_notional = ((rules or {}).get('lotSizeFilter') or {}).get('minNotionalValue')
+        try:
+            if min_notional and float(min_notional) > 0:
+                return float(min_notional)
+        except (TypeError, ValueError):
+            pass
+
         # BTC, ETH는 20 USDT
         high_value_symbols = ['BTC', 'ETH']
 
@@ -59,11 +69,19 @@ class SetupAutoTradeThread(QThread):
         print(f"{self.log_prefix}: 자동매매 설정 스레드 시작...")
         params = {}
         try:
-            # 0. 기존 포지션 확인 (포지션이 있으면 레버리지 설정 건너뛰기)
+            # 0. 서로 독립적인 조회(포지션/거래 규칙/마크 가격)는 동시에 요청
+            self.log_message.emit("Status: <b style='color: yellow;'>0/6: 포지션/거래 규칙/가격 동시 조회 중...</b>")
+            async_api = make_async_api(self.api_module)
+            positions, rules, mark_price = async_api.run_concurrently([
+                ('get_initial_positions', (), {}),
+                ('get_instrument_info', (self.category, self.symbol), {}),
+                ('get_mark_price', (self.category, self.symbol), {}),
+            ])
+
+            # 기존 포지션 확인 (포지션이 있으면 레버리지 설정 건너뛰기)
             has_existing_position = False
             try:
-                positions = self.api_module.get_initial_positions()
-                if positions:
+                if isinstance(positions, list):
                     for pos in positions:
                         if pos.get('symbol') == self.symbol:
                             pos_amt = abs(float(pos.get('positionAmt', 0)))
@@ -90,22 +108,17 @@ class SetupAutoTradeThread(QThread):
                 if not self.api_module.set_margin_and_leverage(self.category, self.symbol, margin_mode=1, leverage=leverage):
                     raise Exception("격리 마진 모드 또는 레버리지 설정 실패. API 권한을 확인하세요.")
 
-            # 3. 거래 규칙 조회
-            self.log_message.emit("Status: <b style='color: yellow;'>3/5: 거래 규칙 조회 중...</b>")
-
-            # 4. 거래 규칙 조회
-            self.log_message.emit("Status: <b style='color: yellow;'>4/6: 거래 규칙 조회 중...</b>")
-            rules = self.api_module.get_instrument_info(self.category, self.symbol)
-            if not rules:
-                raise Exception("거래 규칙 조회 실패.")
+            # 3~4. 거래 규칙 확인 (0단계에서 동시 조회)
+            self.log_message.emit("Status: <b style='color: yellow;'>4/6: 거래 규칙 확인 중...</b>")
+            if not rules or 'lotSizeFilter' not in rules:
+                raise Exception(f"거래 규칙 조회 실패. ({rules})")
 
             qty_step = float(rules['lotSizeFilter']['qtyStep'])
             min_order_qty = float(rules['lotSizeFilter']['minOrderQty'])
 
-            # 5. 현재 가격 조회
-            self.log_message.emit("Status: <b style='color: yellow;'>5/6: 현재 가격 조회 중...</b>")
-            mark_price = self.api_module.get_mark_price(self.category, self.symbol)
-            if mark_price == 0.0:
+            # 5. 현재 가격 확인 (0단계에서 동시 조회)
+            self.log_message.emit("Status: <b style='color: yellow;'>5/6: 현재 가격 확인 중...</b>")
+            if not isinstance(mark_price, (int, float)) or mark_price <= 0.0:
                 raise Exception("현재 가격 조회 실패.")
 
             # 6. 자금 계산 (test_entry_calculation.py 로직 사용)
@@ -151,7 +164,7 @@ class SetupAutoTradeThread(QThread):
                 qty_precision = trading_utils.count_decimal_places(qty_step)
 
                 # 코인별 최소 주문 금액 조회
-                min_order_value = self._get_min_order_value(self.symbol)
+                min_order_value = self._get_min_order_value(self.symbol, rules)
                 print(f"[{self.log_prefix}] [테스트 모드] {self.symbol} 최소 주문 금액: ${min_order_value} USDT")
 
                 # 최소 주문 금액을 만족하는 수량 계산
@@ -206,25 +219,12 @@ class SetupAutoTradeThread(QThread):
                 qty_precision = trading_utils.count_decimal_places(qty_step)
 
                 # 헷지 수량 목록 계산 (누적 기반)
-                hedge_start = self.strategy_settings.get("HEDGE_START_PERCENT", 40)
-                hedge_end = self.strategy_settings.get("HEDGE_END_PERCENT", 100)
-                hedge_qty_list = []
-                cumulative_entry = 0
-                cumulative_hedge = 0
-                for i, entry_qty in enumerate(entry_qty_list):
-                    cumulative_entry += entry_qty
-                    hedge_qty_raw = trading_utils.calculate_hedge_quantity(
-                        entry_qty, i, strat_config.STEPS,
-                        cumulative_entry, cumulative_hedge,
-                        hedge_start, hedge_end, test_mode=False,
-                        frontload_final_step=self.strategy_settings.get("HEDGE_FRONTLOAD_FINAL_STEP", False)
-                    )
-                    # 헷지 수량도 qtyStep에 맞춰 조정
-                    hedge_qty_adjusted = trading_utils.adjust_quantity(
-                        hedge_qty_raw, qty_step, qty_precision, min_order_qty
-                    )
-                    hedge_qty_list.append(hedge_qty_adjusted)
-                    cumulative_hedge += hedge_qty_adjusted
+                hedge_qty_list = trading_utils.calculate_hedge_qty_list(
+                    entry_qty_list, strat_config.STEPS, qty_step, min_order_qty,
+                    hedge_start_percent=self.strategy_settings.get("HEDGE_START_PERCENT", 40),
+                    hedge_end_percent=self.strategy_settings.get("HEDGE_END_PERCENT", 100),
+                    frontload_final_step=self.strategy_settings.get("HEDGE_FRONTLOAD_FINAL_STEP", False)
+                )
 
                 print(f"[{self.log_prefix}] 계산 완료. 진입 수량 10단계 목록: {entry_qty_list}")
                 print(f"[{self.log_prefix}] 계산 완료. 헷지 수량 10단계 목록: {hedge_qty_list}")
@@ -243,7 +243,7 @@ class SetupAutoTradeThread(QThread):
                 )
 
                 # 코인별 최소 주문 금액 조회
-                min_order_value = self._get_min_order_value(self.symbol)
+                min_order_value = self._get_min_order_value(self.symbol, rules)
                 print(f"[{self.log_prefix}] {self.symbol} 최소 주문 금액: ${min_order_value} USDT")
 
                 # 각 분할 수량의 주문 금액 확인
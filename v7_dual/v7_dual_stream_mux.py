@@ -0,0 +1,385 @@
+"""
+공개 스트림 멀티플렉서 (Binance & Bybit)
+
+거래소/마켓별로 공개 웹소켓 연결을 1개만 열고, 모든 공개 토픽(티커/캔들 등)을
+그 연결 위에서 구독/해지합니다.
+
+- Binance: combined stream (/stream) + {"method": "SUBSCRIBE" / "UNSUBSCRIBE"}
+- Bybit:   /v5/public/{category} + {"op": "subscribe" / "unsubscribe"}
+
+심볼/타임프레임 변경은 살아 있는 연결에서 "새 토픽 구독 -> 이전 토픽 해지" 순서로 처리하므로
+재연결 공백이 없고 전환 중에도 틱이 끊기지 않습니다.
+연결이 끊기면 지수 백오프(지터 포함, v7_dual_reconnect)로 재연결하고 현재 구독 중인 토픽 전체를 재구독합니다.
+끊김/재연결은 각 스트림의 on_link_down()/on_link_up()으로 알려서 스트림별로 상태를 정리하거나
+끊긴 구간을 보충할 수 있게 합니다 (MuxStream.reconnected 시그널).
+
+멀티플렉서 상태는 네트워크 리액터 스레드에서만 변경합니다 (외부 호출은 call_soon_threadsafe로 전달).
+프레임 기록이 켜져 있으면 수신한 원본 프레임을 v7_dual_frame_recorder에 넘기고,
+재생 모드(set_replay_mode)에서는 연결하지 않고 replay_frame()으로 들어온 프레임만 처리합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+import websockets
+from PyQt5.QtCore import pyqtSignal
+
+import v7_dual_fast_json as fast_json
+from v7_dual_clock_sync import clock_name_for
+from v7_dual_feed_metrics import get_feed_metrics
+from v7_dual_frame_recorder import get_frame_recorder, mux_source
+from v7_dual_network_reactor import NetworkReactor, ReactorStream
+from v7_dual_reconnect import ReconnectBackoff
+
+
+SUBSCRIBE_CHUNK = 10     # 구독 요청 1건당 토픽 수 (Bybit 권장 상한)
+BYBIT_PING_INTERVAL = 20  # Bybit V5 앱 레벨 heartbeat (초)
+
+_replay_mode = False
+
+
+def set_replay_mode(enabled):
+    """재생 모드 설정 (True면 공개 스트림이 거래소에 연결하지 않음 - 기록 재생 전용)"""
+    global _replay_mode
+    _replay_mode = bool(enabled)
+
+
+def _public_ws_url(exchange, market_type):
+    """거래소/마켓별 공개 스트림 URL"""
+    if exchange == "Binance":
+        host = "dstream.binance.com" if market_type == 'dapi' else "fstream.binance.com"
+        return f"wss://{host}/stream"
+    if exchange == "Bybit":
+        category = "inverse" if market_type in ('dapi', 'inverse') else "linear"
+        return f"wss://stream.bybit.com/v5/public/{category}"
+    raise ValueError(f"지원되지 않는 거래소: {exchange}")
+
+
+class PublicStreamMux:
+    """
+    거래소/마켓별 공개 웹소켓 연결 1개를 공유하는 구독 관리자
+
+    리스너 콜백은 리액터 스레드에서 callback(topic, data, message, recv_ts)로 호출됩니다.
+    (data: 메시지의 'data' 필드, message: 디코딩된 원본 메시지, recv_ts: 소켓 수신 시각 time.time())
+    """
+
+    def __init__(self, exchange, market_type):
+        self.exchange = exchange
+        self.market_type = market_type
+        self.url = _public_ws_url(exchange, market_type)
+        self.log_prefix = f"[스트림 MUX] {exchange}({self.url.rsplit('/', 1)[-1]})"
+        self.clock_name = clock_name_for(exchange, market_type)  # 수신 지연 계측용 서버 시간 오프셋
+        self.capture_source = mux_source(exchange, market_type)  # 프레임 기록 소스 이름
+
+        self._listeners = {}  # topic -> [callback, ...]
+        self._link_listeners = []  # 연결 상태를 통보받을 스트림 (on_link_down / on_link_up)
+        self._backoff = ReconnectBackoff()
+        self._ws = None
+        self._task = None
+        self._req_id = 0
+
+    # ==================== 외부 API (아무 스레드에서나 호출) ====================
+
+    def subscribe(self, topic, callback):
+        """토픽 구독 (첫 리스너일 때만 거래소에 SUBSCRIBE 전송)"""
+        NetworkReactor.get().loop.call_soon_threadsafe(self._add_listener, topic, callback)
+
+    def unsubscribe(self, topic, callback):
+        """토픽 구독 해지 (마지막 리스너가 빠질 때만 거래소에 UNSUBSCRIBE 전송)"""
+        NetworkReactor.get().loop.call_soon_threadsafe(self._remove_listener, topic, callback)
+
+    def add_link_listener(self, stream):
+        """연결 끊김/재연결 통보 대상 등록"""
+        NetworkReactor.get().loop.call_soon_threadsafe(self._set_link_listener, stream, True)
+
+    def remove_link_listener(self, stream):
+        NetworkReactor.get().loop.call_soon_threadsafe(self._set_link_listener, stream, False)
+
+    def get_topics(self):
+        """현재 구독 중인 토픽 목록 (진단용)"""
+        return list(self._listeners)
+
+    def replay_frame(self, message, recv_ts):
+        """기록된 원본 프레임 재생 (리액터 스레드, v7_dual_frame_recorder.FrameReplayer)"""
+        self._dispatch(message, recv_ts)
+
+    # ==================== 리액터 스레드 내부 ====================
+
+    def _add_listener(self, topic, callback):
+        listeners = self._listeners.setdefault(topic, [])
+        if callback in listeners:
+            return
+        listeners.append(callback)
+        if len(listeners) == 1:
+            self._send_control(True, [topic])
+        if _replay_mode:
+            return  # 기록 재생 중에는 연결하지 않음
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _set_link_listener(self, stream, add):
+        if add and stream not in self._link_listeners:
+            self._link_listeners.append(stream)
+        elif not add and stream in self._link_listeners:
+            self._link_listeners.remove(stream)
+
+    def _notify_link(self, up, downtime=None):
+        for stream in list(self._link_listeners):
+            try:
+                if up:
+                    stream.on_link_up(downtime)
+                else:
+                    stream.on_link_down()
+            except Exception as e:
+                print(f"{self.log_prefix}: 연결 상태 통보 오류 ({stream.log_prefix}): {e}")
+
+    def _remove_listener(self, topic, callback):
+        listeners = self._listeners.get(topic)
+        if not listeners or callback not in listeners:
+            return
+        listeners.remove(callback)
+        if listeners:
+            return
+        del self._listeners[topic]
+        self._send_control(False, [topic])
+        if not self._listeners and self._task is not None:
+            # 구독 토픽이 하나도 없으면 연결 종료 (다음 구독 시 다시 연결, 재연결로 취급하지 않음)
+            self._task.cancel()
+            self._task = None
+            self._backoff = ReconnectBackoff()
+
+    def _send_control(self, subscribe, topics):
+        """살아 있는 연결에 구독/해지 요청 (연결 전이면 연결 직후 전체 재구독으로 처리)"""
+        if self._ws is not None:
+            asyncio.get_running_loop().create_task(self._send(self._ws, subscribe, topics))
+
+    async def _send(self, ws, subscribe, topics):
+        for i in range(0, len(topics), SUBSCRIBE_CHUNK):
+            chunk = topics[i:i + SUBSCRIBE_CHUNK]
+            self._req_id += 1
+            if self.exchange == "Binance":
+                msg = {"method": "SUBSCRIBE" if subscribe else "UNSUBSCRIBE", "params": chunk, "id": self._req_id}
+            else:
+                msg = {"op": "subscribe" if subscribe else "unsubscribe", "args": chunk, "req_id": str(self._req_id)}
+            try:
+                await ws.send(fast_json.dumps(msg))
+                print(f"{self.log_prefix}: {'구독' if subscribe else '해지'} {chunk}")
+            except Exception as e:
+                # 연결이 끊긴 경우 재연결 시 현재 토픽 전체를 다시 구독함
+                print(f"{self.log_prefix}: 구독 요청 전송 실패 ({e})")
+
+    async def _heartbeat(self, ws):
+        """Bybit V5 Heartbeat - 20초마다 ping 전송"""
+        try:
+            while True:
+                await asyncio.sleep(BYBIT_PING_INTERVAL)
+                await ws.send('{"op":"ping"}')
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"{self.log_prefix}: Heartbeat 오류: {e}")
+
+    async def _run(self):
+        try:
+            while self._listeners:
+                heartbeat_task = None
+                try:
+                    async with websockets.connect(self.url, ping_interval=20, ping_timeout=30, close_timeout=1) as ws:
+                        self._ws = ws
+                        print(f"{self.log_prefix}: 연결됨 (토픽 {len(self._listeners)}개)")
+                        await self._send(ws, True, list(self._listeners))
+                        if self.exchange == "Bybit":
+                            heartbeat_task = asyncio.create_task(self._heartbeat(ws))
+                        downtime = self._backoff.mark_up()
+                        if downtime is not None:
+                            print(f"{self.log_prefix}: 재연결 완료 (끊김 {downtime:.1f}초)")
+                            self._notify_link(True, downtime)
+
+                        async for message in ws:
+                            self._dispatch(message)
+
+                except websockets.exceptions.ConnectionClosed:
+                    if self._listeners:
+                        print(f"{self.log_prefix}: 연결 끊김.")
+                except Exception as e:
+                    if self._listeners:
+                        print(f"{self.log_prefix}: 오류: {e}.")
+                finally:
+                    self._ws = None
+                    if heartbeat_task:
+                        heartbeat_task.cancel()
+
+                if self._listeners:
+                    if self._backoff.mark_down():
+                        self._notify_link(False)
+                    delay = self._backoff.next_delay()
+                    print(f"{self.log_prefix}: {delay:.1f}초 후 재연결 시도 "
+                          f"({self._backoff.attempts}회째, 끊김 {self._backoff.downtime():.0f}초)")
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            print(f"{self.log_prefix}: 연결 종료.")
+
+    def _dispatch(self, message, recv_ts=None):
+        """수신 메시지를 토픽 리스너에게 전달 (디코딩은 메시지당 1회, v7_dual_fast_json)"""
+        if recv_ts is None:
+            recv_ts = time.time()
+            recorder = get_frame_recorder()
+            if recorder is not None:
+                recorder.record(self.capture_source, message, recv_ts)
+        try:
+            msg = fast_json.loads(message)
+        except fast_json.DecodeError:
+            print(f"{self.log_prefix}: JSON 디코딩 오류: {message}")
+            return
+
+        if self.exchange == "Binance":
+            topic = msg.get('stream')
+            if topic is None:
+                if msg.get('error'):
+                    print(f"{self.log_prefix}: 요청 오류: {msg['error']}")
+                return
+        else:
+            topic = msg.get('topic')
+            if topic is None:
+                if msg.get('op') in ('subscribe', 'unsubscribe') and not msg.get('success', True):
+                    print(f"{self.log_prefix}: {msg.get('op')} 실패: {msg.get('ret_msg')}")
+                return
+
+        data = msg.get('data')
+        for callback in list(self._listeners.get(topic, ())):
+            try:
+                callback(topic, data, msg, recv_ts)
+            except Exception as e:
+                print(f"{self.log_prefix}: 리스너 처리 오류 ({topic}): {e}")
+
+
+_muxes = {}
+_muxes_lock = threading.Lock()
+
+
+def get_stream_mux(exchange, market_type):
+    """거래소/마켓별 공유 PublicStreamMux 반환"""
+    key = (exchange, _public_ws_url(exchange, market_type))
+    with _muxes_lock:
+        mux = _muxes.get(key)
+        if mux is None:
+            mux = _muxes[key] = PublicStreamMux(exchange, market_type)
+        return mux
+
+
+# =============================================================================
+# 멀티플렉서 기반 스트림
+# =============================================================================
+
+class MuxStream(ReactorStream):
+    """
+    공유 연결의 토픽을 구독하는 스트림 (ReactorStream과 같은 제어 인터페이스)
+
+    주 토픽(topic) 1개 + 보조 토픽(extra_topics, 예: bookTicker/markPrice)을 구독합니다.
+    start()/stop()은 구독/해지만 하므로 즉시 반환하고,
+    switch_topic()/set_extra_topics()는 연결을 유지한 채 새 토픽 구독 후 이전 토픽을 해지합니다.
+    하위 클래스는 handle_message(data, message)를 구현합니다 (보조 토픽은 message로 구분).
+
+    공유 연결이 끊겼다가 다시 연결되면 reconnected(끊김 초) 시그널을 보냅니다.
+    메시지마다 거래소 이벤트 시각/수신/처리 시각을 latency_key 이름으로 피드 지연 계측에 기록하며,
+    handle_message() 안에서는 self.event_ms / self.recv_ts로 현재 메시지의 시각을 참조할 수 있습니다.
+    끊긴 동안 유지하면 안 되는 상태가 있으면 on_link_down()을 재정의합니다 (리액터 스레드에서 호출).
+    여러 소비자가 공유하는 스트림(v7_dual_feed_registry)은 attach_consumer()/detach_consumer()로
+    소비자별 설정을 받습니다 (기본 동작 없음).
+    """
+    reconnected = pyqtSignal(float)  # 끊김 지속 시간 (초)
+
+    def __init__(self, exchange, market_type, topic, log_prefix, parent=None):
+        super().__init__(log_prefix, parent)
+        self.topic = topic
+        self.extra_topics = ()
+        self._mux = get_stream_mux(exchange, market_type)
+        self._subscribed = False
+        self.latency_key = log_prefix  # 피드 지연 계측 스트림 이름 (GUI가 패널 이름으로 바꿈)
+        self.event_ms = None  # 처리 중인 메시지의 거래소 이벤트 시각 (ms)
+        self.recv_ts = 0.0    # 처리 중인 메시지의 소켓 수신 시각
+
+    def start(self):
+        if self._subscribed:
+            return
+        self.running = True
+        self._subscribed = True
+        self._mux.add_link_listener(self)
+        for topic in (self.topic,) + tuple(self.extra_topics):
+            self._mux.subscribe(topic, self._on_message)
+
+    def stop(self):
+        print(f"{self.log_prefix}: 종료 요청 수신")
+        self.running = False
+        if self._subscribed:
+            self._subscribed = False
+            self._mux.remove_link_listener(self)
+            for topic in (self.topic,) + tuple(self.extra_topics):
+                self._mux.unsubscribe(topic, self._on_message)
+
+    def wait(self, msecs=None):
+        return True  # 해지는 리액터에서 비동기로 처리되며 기다릴 자원이 없음
+
+    def isRunning(self):
+        return self._subscribed
+
+    def switch_topic(self, new_topic):
+        """재연결 없이 구독 토픽 변경 (새 토픽 먼저 구독 -> 이전 토픽 해지)"""
+        old_topic = self.topic
+        if new_topic == old_topic:
+            return
+        self.topic = new_topic
+        if self._subscribed:
+            self._mux.subscribe(new_topic, self._on_message)
+            self._mux.unsubscribe(old_topic, self._on_message)
+        print(f"{self.log_prefix}: 구독 변경 {old_topic} -> {new_topic}")
+
+    def set_extra_topics(self, topics):
+        """보조 토픽 목록 교체 (새 토픽 먼저 구독 -> 빠진 토픽 해지)"""
+        old_topics = tuple(self.extra_topics)
+        new_topics = tuple(t for t in topics if t != self.topic)
+        self.extra_topics = new_topics
+        if self._subscribed:
+            for topic in new_topics:
+                if topic not in old_topics:
+                    self._mux.subscribe(topic, self._on_message)
+            for topic in old_topics:
+                if topic not in new_topics:
+                    self._mux.unsubscribe(topic, self._on_message)
+        if old_topics != new_topics:
+            print(f"{self.log_prefix}: 보조 토픽 변경 {list(old_topics)} -> {list(new_topics)}")
+
+    def _on_message(self, topic, data, message, recv_ts):
+        if topic != self.topic and topic not in self.extra_topics:
+            return  # 전환 직후 도착한 이전 토픽 메시지는 무시
+        deliver_ts = time.time()
+        # Bybit는 메시지의 ts, Binance는 data의 E (이벤트 시각)
+        event_ms = message.get('ts')
+        if event_ms is None and isinstance(data, dict):
+            event_ms = data.get('E')
+        self.event_ms = event_ms
+        self.recv_ts = recv_ts
+        self.handle_message(data, message)
+        get_feed_metrics().record(self.latency_key, event_ms, recv_ts, deliver_ts, time.time(),
+                                  self._mux.clock_name)
+
+    def handle_message(self, data, message):
+        raise NotImplementedError
+
+    def attach_consumer(self, consumer, **options):
+        """공유 피드 소비자 등록 통보 (소비자별 옵션이 있는 스트림만 재정의)"""
+        if options:
+            print(f"{self.log_prefix}: 지원하지 않는 소비자 옵션 무시 {sorted(options)}")
+
+    def detach_consumer(self, consumer):
+        """공유 피드 소비자 해제 통보"""
+
+    def on_link_down(self):
+        """공유 연결 끊김 통보 (기본 동작 없음)"""
+
+    def on_link_up(self, downtime):
+        """공유 연결 재연결 통보 - 토픽 재구독은 멀티플렉서가 처리"""
+        self.publish('reconnected', downtime)
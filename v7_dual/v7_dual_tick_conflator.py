@@ -0,0 +1,187 @@
+"""
+티커 병합(Conflation) 단계 (WebSocket -> GUI / 자동매매 워커)
+
+기존에는 @ticker 메시지마다 GUI 스레드로 큐 시그널이 쌓이고, 그 핸들러에서 라벨 갱신 +
+포지션 복사 + AutoTradeWorker.process_tick 동기 호출까지 처리해서 급변 구간에 GUI가
+수 초씩 밀렸습니다.
+
+- TickConflator: 키(패널)별 최신 가격만 보관 (latest-value-wins).
+  GUI에는 설정된 프레임 레이트(app_settings.gui_tick_fps)로 변경분 스냅샷만 전달합니다.
+- 워커 전달자(v7_dual_worker_queue.WorkerEventQueue): 판단 가격이 바뀔 때마다 워커 이벤트 큐에 넣어
+  워커 스레드에서 process_tick을 호출합니다. GUI 페인트 이벤트를 기다리지 않으며, 가격 변화는 순서대로 모두 전달됩니다.
+
+워커가 판단에 쓰는 가격은 워커별 price_source로 고릅니다 (compute_trigger_price 참고).
+- last:   최근 체결가 (@ticker 'c' / lastPrice)
+- mid:    (최우선 매수호가 + 최우선 매도호가) / 2
+- bidask: 주 포지션을 청산할 쪽 호가 (LONG=매수호가 bid, SHORT=매도호가 ask)
+- mark:   마크 가격
+선택한 소스의 값이 아직 없으면 체결가를 사용합니다.
+
+push()는 리액터 스레드(웹소켓 수신)에서 바로 호출되므로 GUI 이벤트 큐를 거치지 않습니다.
+워커에 전달된 가격은 워커 이벤트 큐가 거래소 이벤트 시각 -> 수신 -> 워커 전달 -> process_tick 완료 시각을
+피드 지연 계측(v7_dual_feed_metrics)에 "worker(키)" 이름으로 기록합니다.
+"""
+
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+DEFAULT_GUI_FPS = 10   # GUI 스냅샷 프레임 레이트 (초당)
+MIN_GUI_FPS = 1
+MAX_GUI_FPS = 60
+
+PRICE_SOURCE_LAST = 'last'
+PRICE_SOURCES = ('last', 'mid', 'bidask', 'mark')
+
+
+def compute_trigger_price(quote, source, side_mode="LONG"):
+    """
+    호가 상태에서 가격 소스에 맞는 판단 가격 계산
+
+    Args:
+        quote: {'last': float, 'bid': float, 'ask': float, 'mark': float} (없는 필드는 생략)
+        source: PRICE_SOURCES 중 하나
+        side_mode: 주 포지션 방향 ("LONG" / "SHORT") - bidask에서 사용
+
+    Returns:
+        float 또는 None
+    """
+    if source == 'mid':
+        bid, ask = quote.get('bid'), quote.get('ask')
+        if bid and ask:
+            return (bid + ask) / 2
+    elif source == 'bidask':
+        price = quote.get('bid') if side_mode == "LONG" else quote.get('ask')
+        if price:
+            return price
+    elif source == 'mark':
+        if quote.get('mark'):
+            return quote['mark']
+    return quote.get('last')
+
+
+class TickConflator(QObject):
+    """
+    키(패널)별 최신 호가 상태 보관 + GUI 스로틀 스냅샷 + 워커 즉시 전달
+
+    snapshot_ready: {key: (symbol, price)} - 마지막 프레임 이후 체결가가 바뀐 키만 포함
+    """
+
+    snapshot_ready = pyqtSignal(dict)
+
+    def __init__(self, fps=DEFAULT_GUI_FPS, parent=None):
+        """GUI 스레드에서 생성해야 합니다 (QTimer가 GUI 스레드에서 동작)"""
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._latest = {}   # key -> (symbol, 체결가)
+        self._quotes = {}   # key -> (symbol, {'last', 'bid', 'ask', 'mark'})
+        self._dirty = set()
+        self._feeds = {}    # key -> 워커 전달자 (WorkerEventQueue)
+        self._fed = {}      # key -> 워커에 마지막으로 전달한 (symbol, 판단 가격)
+
+        # 통계 (진단용)
+        self.pushed = 0
+        self.frames = 0
+        self.gui_updates = 0
+
+        self.fps = DEFAULT_GUI_FPS
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._flush)
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """GUI 스냅샷 프레임 레이트 변경"""
+        try:
+            fps = int(fps)
+        except (TypeError, ValueError):
+            fps = DEFAULT_GUI_FPS
+        self.fps = max(MIN_GUI_FPS, min(MAX_GUI_FPS, fps))
+        self._timer.start(int(1000 / self.fps))
+
+    def attach_feed(self, key, feed):
+        """키에 워커 전달자 연결 (None이면 해제)"""
+        with self._lock:
+            if feed is None:
+                self._feeds.pop(key, None)
+            else:
+                self._feeds[key] = feed
+
+    def push(self, key, symbol, field, price, stamp=None):
+        """
+        가격 수신 (아무 스레드에서나 호출, 보통 리액터 스레드)
+
+        Args:
+            field: 'last' / 'bid' / 'ask' / 'mark'
+            stamp: 지연 계측용 (거래소 이벤트 시각 ms, 소켓 수신 시각, 서버 시간 추정기 이름)
+
+        같은 값의 반복 틱은 버리고, 워커의 판단 가격이 바뀌면 워커에 즉시 전달합니다.
+        GUI에는 다음 프레임에 최신 체결가 1개만 반영됩니다.
+        """
+        with self._lock:
+            self.pushed += 1
+            entry = self._quotes.get(key)
+            if entry is None or entry[0] != symbol:
+                entry = self._quotes[key] = (symbol, {})
+            quote = entry[1]
+            if quote.get(field) == price:
+                return
+            quote[field] = price
+            if field == 'last':
+                self._latest[key] = (symbol, price)
+                self._dirty.add(key)
+
+            feed = self._feeds.get(key)
+            if feed is None:
+                return
+            price = compute_trigger_price(quote, feed.price_source, feed.side_mode)
+            if price is None or self._fed.get(key) == (symbol, price):
+                return
+            self._fed[key] = (symbol, price)
+        feed.push_tick(symbol, price, stamp)
+
+    def latest(self, key):
+        """키의 최신 (symbol, 체결가) (없으면 None)"""
+        with self._lock:
+            return self._latest.get(key)
+
+    def trigger_price(self, key):
+        """키에 연결된 워커의 가격 소스 기준 현재 판단 가격 (없으면 None)"""
+        with self._lock:
+            entry = self._quotes.get(key)
+            feed = self._feeds.get(key)
+            if entry is None:
+                return None
+            if feed is None:
+                return entry[1].get('last')
+            return compute_trigger_price(entry[1], feed.price_source, feed.side_mode)
+
+    def forget(self, key):
+        """키의 최신 값 삭제 (심볼 변경/연결 해제 시)"""
+        with self._lock:
+            self._latest.pop(key, None)
+            self._quotes.pop(key, None)
+            self._fed.pop(key, None)
+            self._dirty.discard(key)
+
+    def _flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {key: self._latest[key] for key in self._dirty if key in self._latest}
+            self._dirty.clear()
+        self.frames += 1
+        self.gui_updates += len(snapshot)
+        self.snapshot_ready.emit(snapshot)
+
+    def get_stats(self):
+        """병합 통계 (수신 틱 / GUI 반영 / 병합으로 생략된 틱)"""
+        with self._lock:
+            pushed = self.pushed
+        return {
+            'fps': self.fps,
+            'pushed': pushed,
+            'frames': self.frames,
+            'gui_updates': self.gui_updates,
+            'conflated': max(0, pushed - self.gui_updates),
+        }
@@ -1,236 +1,196 @@
 """
 통합 티커 웹소켓 모듈 (Binance & Bybit)
 실시간 가격(Last Price) 데이터를 수신합니다.
+가격 소스(set_price_source)에 따라 최우선 호가(bid/ask)와 마크 가격 토픽도 함께 구독합니다.
+
+- Binance: {symbol}@ticker (체결가, 약 1초 주기) + @bookTicker (실시간 호가) / @markPrice@1s
+- Bybit:   tickers.{symbol} (체결가/마크 가격, 100ms) + orderbook.1.{symbol} (최우선 호가, 10ms)
+
+모든 공개 스트림은 거래소/마켓별 공유 연결(v7_dual_stream_mux)의 토픽 구독으로 동작하며,
+공유 네트워크 리액터(v7_dual_network_reactor)에서 실행됩니다.
+두 패널이 같은 심볼을 쓰면 스트림 자체를 v7_dual_feed_registry로 공유하고, 틱 sink/가격 소스는 소비자별로 등록합니다.
+(클래스 이름의 Thread는 기존 코드 호환용이며, 스트림별 OS 스레드/이벤트 루프/소켓은 없습니다)
 """
 
-import asyncio
-import websockets
-import json
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
+
+from v7_dual_stream_mux import MuxStream
+from v7_dual_tick_conflator import PRICE_SOURCE_LAST, PRICE_SOURCES
 
 
-class BinanceTickerSocketThread(QThread):
+class _TickerStream(MuxStream):
     """
-    Binance 특정 심볼의 실시간 티커(Last Price) 데이터를 수신합니다.
+    티커 스트림 공통 처리
+
+    set_tick_sink(sink)로 sink(symbol, field, price, stamp)를 지정하면 메시지마다 GUI로 시그널을 보내지 않고
+    리액터 스레드에서 sink를 바로 호출합니다 (v7_dual_tick_conflator 병합 단계용).
+    field: 'last' / 'bid' / 'ask' / 'mark'
+    stamp: (거래소 이벤트 시각 ms, 소켓 수신 시각, 서버 시간 추정기 이름) - 워커까지의 지연 계측용
+
+    공유 피드(v7_dual_feed_registry)에서는 attach_consumer()로 소비자마다 sink/가격 소스를 등록하며,
+    메시지는 한 번만 해석하고 등록된 sink 전체에 전달합니다. 보조 토픽은 소비자 가격 소스의 합집합입니다.
     """
     ticker_update = pyqtSignal(list)
 
+    price_source = PRICE_SOURCE_LAST
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tick_sinks = ()       # ((소비자, sink), ...) - 리액터 스레드는 튜플 교체만 관찰
+        self._price_sources = {}   # 소비자 -> 가격 소스
+
+    def set_tick_sink(self, sink):
+        """단일 소비자용 sink 지정 (None이면 GUI 티커 시그널로 전달)"""
+        self.tick_sinks = ((None, sink),) if sink else ()
+
+    def set_price_source(self, source, consumer=None):
+        """가격 소스에 필요한 보조 토픽(호가/마크 가격) 구독"""
+        if source not in PRICE_SOURCES:
+            print(f"{self.log_prefix}: 알 수 없는 가격 소스 {source} - last 사용")
+            source = PRICE_SOURCE_LAST
+        self.price_source = source
+        self._price_sources[consumer] = source
+        self._update_price_topics()
+
+    def attach_consumer(self, consumer, tick_sink=None, price_source=None):
+        """공유 피드 소비자의 sink / 가격 소스 등록 (같은 소비자는 교체)"""
+        if tick_sink is not None:
+            self.tick_sinks = tuple((c, s) for c, s in self.tick_sinks if c != consumer) + ((consumer, tick_sink),)
+        if price_source is not None:
+            self.set_price_source(price_source, consumer)
+
+    def detach_consumer(self, consumer):
+        self.tick_sinks = tuple((c, s) for c, s in self.tick_sinks if c != consumer)
+        if self._price_sources.pop(consumer, None) is not None:
+            self._update_price_topics()
+
+    def _update_price_topics(self):
+        topics = []
+        for source in self._price_sources.values():
+            for topic in self._price_topics(source):
+                if topic not in topics:
+                    topics.append(topic)
+        self.set_extra_topics(topics)
+
+    def _price_topics(self, source):
+        """가격 소스별 보조 토픽 목록 (하위 클래스 구현)"""
+        return ()
+
+    def _deliver_ticker(self, ticker_list):
+        if not self.tick_sinks:
+            self.publish('ticker_update', ticker_list)
+            return
+        item = ticker_list[0]
+        self._deliver_field(item.get('s'), 'last', item.get('c'))
+
+    def _deliver_field(self, symbol, field, price_str):
+        """호가/마크 가격 전달 (병합 단계가 없으면 GUI 티커 시그널은 체결가만 사용)"""
+        sinks = self.tick_sinks
+        if not sinks or not self.running or not symbol:
+            return
+        try:
+            price = float(price_str)
+        except (TypeError, ValueError):
+            return
+        if price > 0:
+            stamp = (self.event_ms, self.recv_ts, self._mux.clock_name)
+            for _, sink in sinks:
+                sink(symbol, field, price, stamp)
+
+
+class BinanceTickerSocketThread(_TickerStream):
+    """
+    Binance 특정 심볼의 실시간 티커(Last Price) 데이터를 수신합니다.
+    (combined stream의 {symbol}@ticker 토픽, 가격 소스에 따라 @bookTicker / @markPrice@1s)
+    """
+
     def __init__(self, market_type, symbol="BTCUSDT", parent=None):
-        super().__init__(parent)
+        super().__init__("Binance", market_type, f"{symbol.lower()}@ticker",
+                         f"BinanceTickerThread({symbol})", parent)
         self.market_type = market_type
         self.symbol = symbol.lower()  # Binance는 소문자 심볼 사용
 
-        # 특정 심볼의 티커 스트림 구독
-        if self.market_type == 'dapi':
-            self.ws_url = f"wss://dstream.binance.com/ws/{self.symbol}@ticker"
-        else:  # 'fapi' (default)
-            self.ws_url = f"wss://fstream.binance.com/ws/{self.symbol}@ticker"
+        print(f"{self.log_prefix}: {self._mux.url} ({self.topic}) 구독 준비...")
+
+    def _price_topics(self, source):
+        if source in ('mid', 'bidask'):
+            return (f"{self.symbol}@bookTicker",)
+        if source == 'mark':
+            return (f"{self.symbol}@markPrice@1s",)
+        return ()
+
+    def handle_message(self, data, message):
+        if not isinstance(data, dict):
+            return
+        event = data.get('e')
+        if event == 'bookTicker':
+            # {'e': 'bookTicker', 's': 'BTCUSDT', 'b': 최우선 매수호가, 'a': 최우선 매도호가, ...}
+            self._deliver_field(data.get('s'), 'bid', data.get('b'))
+            self._deliver_field(data.get('s'), 'ask', data.get('a'))
+        elif event == 'markPriceUpdate':
+            self._deliver_field(data.get('s'), 'mark', data.get('p'))
+        else:
+            # 단일 심볼 티커 데이터를 리스트로 감싸서 emit
+            self._deliver_ticker([data])
 
-        self.running = True
-        self.loop = asyncio.new_event_loop()
-        self.main_task = None
-        self.log_prefix = f"BinanceTickerThread({symbol})"
+    def update_symbol(self, symbol):
+        """재연결 없이 티커 심볼 변경"""
+        self.symbol = symbol.lower()
+        self.switch_topic(f"{self.symbol}@ticker")
+        self._update_price_topics()
 
-        print(f"{self.log_prefix}: {self.ws_url} 연결 준비...")
 
-    def run(self):
-        asyncio.set_event_loop(self.loop)
-        try:
-            self.main_task = self.loop.create_task(self.listen())
-            self.loop.run_forever()
-        except Exception as e:
-            if self.running:
-                print(f"Asyncio 루프 실행 중 오류 ({self.log_prefix}): {e}")
-        finally:
-            # 모든 pending tasks 취소 및 정리
-            try:
-                pending = asyncio.all_tasks(self.loop)
-                for task in pending:
-                    task.cancel()
-                if pending:
-                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            except Exception as e:
-                print(f"{self.log_prefix}: 태스크 취소 중 오류 (무시): {e}")
-
-            try:
-                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            except Exception as e:
-                print(f"{self.log_prefix}: Asyncgens 종료 중 오류 (무시): {e}")
-
-            try:
-                self.loop.close()
-            except Exception as e:
-                print(f"{self.log_prefix}: 루프 종료 중 오류 (무시): {e}")
-
-            print(f"{self.log_prefix}: 스레드 및 루프 종료 완료.")
-
-    async def listen(self):
-        try:
-            while self.running:
-                try:
-                    async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=30) as ws:
-                        print(f"WebSocket Connected (Ticker Stream: Binance {self.market_type})")
-                        
-                        async for message in ws:
-                            if not self.running:
-                                break 
-                            
-                            try:
-                                data = json.loads(message)
-                                # 단일 심볼 티커 데이터를 리스트로 감싸서 emit
-                                if isinstance(data, dict):
-                                    self.ticker_update.emit([data])
-
-                            except json.JSONDecodeError:
-                                print(f"JSON 디코딩 오류 (Ticker): {message}")
-
-                except websockets.exceptions.ConnectionClosed:
-                    if self.running:
-                        print("Binance Ticker 웹소켓 연결 끊김. 3초 후 재연결 시도...")
-                except Exception as e:
-                    if self.running:
-                        print(f"Binance Ticker 웹소켓 오류: {e}. 3초 후 재연결 시도...")
-                
-                if self.running:
-                    await asyncio.sleep(3) 
-
-        except asyncio.CancelledError:
-            print(f"{self.log_prefix}: listen() 코루틴 취소됨.")
-        finally:
-            print(f"{self.log_prefix}: listen() 코루틴 종료.")
-
-    def stop(self):
-        """스레드를 안전하게 종료합니다."""
-        print(f"{self.log_prefix}: 종료 요청 수신")
-        self.running = False
-        
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-            
-        if self.main_task:
-            self.loop.call_soon_threadsafe(self.main_task.cancel)
-
-
-class BybitTickerSocketThread(QThread):
+class BybitTickerSocketThread(_TickerStream):
     """
     Bybit V5 특정 심볼의 실시간 티커(Last Price) 데이터를 수신합니다.
-    
+
     [중요] Bybit 티커를 Binance 티커 형식으로 변환하여 GUI로 전송합니다.
+    마크 가격은 tickers 토픽의 markPrice를, 호가는 orderbook.1 토픽을 사용합니다.
     """
-    ticker_update = pyqtSignal(list)
 
     def __init__(self, market_type, symbol, parent=None):
-        super().__init__(parent)
+        super().__init__("Bybit", market_type, f"tickers.{symbol}", "BybitTickerThread", parent)
         self.market_type = market_type
-        
-        self.ws_url = "wss://stream.bybit.com/v5/public/linear"  # fapi (linear)
-        self.category = "linear"
-        if self.market_type == 'dapi':
-            self.ws_url = "wss://stream.bybit.com/v5/public/inverse"
-            self.category = "inverse"
-            
-        self.topic = f"tickers.{symbol}"
-            
-        self.running = True
-        self.loop = asyncio.new_event_loop()
-        self.main_task = None
-        self.log_prefix = "BybitTickerThread"
-        
-        print(f"{self.log_prefix}: {self.ws_url} ({self.topic}) 연결 준비...")
-
-    def run(self):
-        asyncio.set_event_loop(self.loop)
-        try:
-            self.main_task = self.loop.create_task(self.listen())
-            self.loop.run_forever()
-        except Exception as e:
-            if self.running:
-                print(f"Asyncio 루프 실행 중 오류 ({self.log_prefix}): {e}")
-        finally:
-            # 모든 pending tasks 취소 및 정리
-            try:
-                pending = asyncio.all_tasks(self.loop)
-                for task in pending:
-                    task.cancel()
-                if pending:
-                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            except Exception as e:
-                print(f"{self.log_prefix}: 태스크 취소 중 오류 (무시): {e}")
-
-            try:
-                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            except Exception as e:
-                print(f"{self.log_prefix}: Asyncgens 종료 중 오류 (무시): {e}")
-
-            try:
-                self.loop.close()
-            except Exception as e:
-                print(f"{self.log_prefix}: 루프 종료 중 오류 (무시): {e}")
-
-            print(f"{self.log_prefix}: 스레드 및 루프 종료 완료.")
-
-    async def listen(self):
-        try:
-            while self.running:
-                try:
-                    async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=30) as ws:
-                        # 구독 메시지 전송
-                        subscribe_msg = {
-                            "op": "subscribe",
-                            "args": [self.topic]
-                        }
-                        await ws.send(json.dumps(subscribe_msg))
-                        
-                        print(f"WebSocket Connected (Ticker Stream: Bybit {self.category})")
-                        
-                        async for message in ws:
-                            if not self.running:
-                                break 
-                            
-                            try:
-                                data = json.loads(message)
-                                
-                                # Bybit 티커 데이터를 Binance 형식으로 변환
-                                if data.get('topic') == self.topic and data.get('data'):
-                                    bybit_ticker = data['data']
-                                    
-                                    # Binance 형식: [{'s': 'BTCUSDT', 'c': '25000.5'}]
-                                    binance_formatted = [{
-                                        's': bybit_ticker.get('symbol'),
-                                        'c': bybit_ticker.get('lastPrice')
-                                    }]
-                                    
-                                    if binance_formatted[0]['s'] and binance_formatted[0]['c']:
-                                        self.ticker_update.emit(binance_formatted)
-                                    
-                            except json.JSONDecodeError:
-                                print(f"JSON 디코딩 오류 (Ticker): {message}")
-
-                except websockets.exceptions.ConnectionClosed:
-                    if self.running:
-                        print("Bybit Ticker 웹소켓 연결 끊김. 3초 후 재연결 시도...")
-                except Exception as e:
-                    if self.running:
-                        print(f"Bybit Ticker 웹소켓 오류: {e}. 3초 후 재연결 시도...")
-                
-                if self.running:
-                    await asyncio.sleep(3) 
-
-        except asyncio.CancelledError:
-            print(f"{self.log_prefix}: listen() 코루틴 취소됨.")
-        finally:
-            print(f"{self.log_prefix}: listen() 코루틴 종료.")
-
-    def stop(self):
-        """스레드를 안전하게 종료합니다."""
-        print(f"{self.log_prefix}: 종료 요청 수신")
-        self.running = False
-        
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-            
-        if self.main_task:
-            self.loop.call_soon_threadsafe(self.main_task.cancel)
+        self.symbol = symbol
+        self.category = "inverse" if market_type == 'dapi' else "linear"
+
+        print(f"{self.log_prefix}: {self._mux.url} ({self.topic}) 구독 준비...")
+
+    def _price_topics(self, source):
+        if source in ('mid', 'bidask'):
+            return (f"orderbook.1.{self.symbol}",)
+        return ()
+
+    def handle_message(self, data, message):
+        if not data:
+            return
+
+        if message.get('topic', '').startswith('orderbook.'):
+            # {'s': 'BTCUSDT', 'b': [['가격', '수량']], 'a': [['가격', '수량']]} (수량 '0'은 삭제된 호가)
+            for field, key in (('bid', 'b'), ('ask', 'a')):
+                for price_str, size_str in data.get(key) or ():
+                    if size_str != '0':
+                        self._deliver_field(data.get('s'), field, price_str)
+            return
+
+        # tickers는 스냅샷 이후 변경 필드만 오는 delta 메시지이므로 없는 필드는 건너뜀
+        if data.get('markPrice'):
+            self._deliver_field(data.get('symbol'), 'mark', data.get('markPrice'))
+
+        # Binance 형식: [{'s': 'BTCUSDT', 'c': '25000.5'}]
+        binance_formatted = [{
+            's': data.get('symbol'),
+            'c': data.get('lastPrice')
+        }]
+
+        if binance_formatted[0]['s'] and binance_formatted[0]['c']:
+            self._deliver_ticker(binance_formatted)
+
+    def update_symbol(self, symbol):
+        """재연결 없이 티커 심볼 변경"""
+        self.symbol = symbol
+        self.switch_topic(f"tickers.{symbol}")
+        self._update_price_topics()
 
 
 # =============================================================================
@@ -239,23 +199,23 @@ class BybitTickerSocketThread(QThread):
 
 def create_ticker_thread(exchange, market_type, symbol=None, parent=None):
     """
-    거래소에 맞는 티커 웹소켓 스레드를 생성합니다.
-    
+    거래소에 맞는 티커 웹소켓 스트림을 생성합니다.
+
     Args:
         exchange (str): "Binance" 또는 "Bybit"
         market_type (str): "fapi" 또는 "dapi"
-        symbol (str, optional): Bybit의 경우 필수 (예: "BTCUSDT")
+        symbol (str, optional): Bybit의 경우 필수 (예: "BTCUSDT"), Binance는 생략 시 BTCUSDT
         parent (QObject, optional): 부모 객체
-    
+
     Returns:
-        QThread: 거래소별 티커 웹소켓 스레드
-    
+        MuxStream: 거래소별 티커 웹소켓 스트림
+
     Examples:
         >>> ticker_thread = create_ticker_thread("Binance", "fapi")
         >>> ticker_thread = create_ticker_thread("Bybit", "fapi", "BTCUSDT")
     """
     if exchange == "Binance":
-        return BinanceTickerSocketThread(market_type, parent)
+        return BinanceTickerSocketThread(market_type, symbol or "BTCUSDT", parent=parent)
     elif exchange == "Bybit":
         if not symbol:
             raise ValueError("Bybit 티커 스레드는 symbol 파라미터가 필요합니다.")
@@ -264,7 +224,7 @@ def create_ticker_thread(exchange, market_type, symbol=None, parent=None):
         raise ValueError(f"지원되지 않는 거래소: {exchange}")
 
 
-class BybitKlineSocketThread(QThread):
+class BybitKlineSocketThread(MuxStream):
     """
     Bybit V5 실시간 캔들(Kline) 데이터를 수신합니다.
 
@@ -279,141 +239,49 @@ class BybitKlineSocketThread(QThread):
             symbol (str): 심볼 (예: "XRPUSDT")
             interval (str): 캔들 간격 (1, 3, 5, 15, 30, 60, 120, 240, 360, 720, D, W, M)
         """
-        super().__init__(parent)
+        super().__init__("Bybit", market_type, f"kline.{interval}.{symbol}",
+                         f"BybitKlineThread({symbol}/{interval})", parent)
         self.market_type = market_type
         self.symbol = symbol
         self.interval = interval
+        self.category = "inverse" if market_type == 'dapi' else "linear"
 
-        # WebSocket URL 설정
-        if market_type == 'dapi':
-            self.ws_url = "wss://stream.bybit.com/v5/public/inverse"
-            self.category = "inverse"
-        else:
-            self.ws_url = "wss://stream.bybit.com/v5/public/linear"
-            self.category = "linear"
-
-        self.topic = f"kline.{interval}.{symbol}"
+        print(f"{self.log_prefix}: {self._mux.url} ({self.topic}) 구독 준비...")
 
-        self.running = True
-        self.loop = asyncio.new_event_loop()
-        self.main_task = None
-        self.log_prefix = f"BybitKlineThread({symbol}/{interval})"
-
-        print(f"{self.log_prefix}: {self.ws_url} ({self.topic}) 연결 준비...")
-
-    def run(self):
-        asyncio.set_event_loop(self.loop)
+    def handle_message(self, data, message):
+        if not data:
+            return
         try:
-            self.main_task = self.loop.create_task(self.listen())
-            self.loop.run_forever()
+            kline_data = data[0] if isinstance(data, list) else data
+
+            # 캔들 데이터 변환 및 emit
+            # Bybit V5 kline 응답은 symbol 필드가 없으므로 토픽에서 추출한 심볼 사용
+            parsed_kline = {
+                'symbol': message['topic'].split('.', 2)[2],
+                'interval': kline_data.get('interval'),
+                'start': int(kline_data.get('start')),  # 시작 시간 (밀리초)
+                'end': int(kline_data.get('end')),      # 종료 시간 (밀리초)
+                'open': float(kline_data.get('open')),
+                'high': float(kline_data.get('high')),
+                'low': float(kline_data.get('low')),
+                'close': float(kline_data.get('close')),
+                'volume': float(kline_data.get('volume')),
+                'confirm': kline_data.get('confirm'),  # True: 캔들 확정, False: 진행 중
+                'timestamp': int(kline_data.get('timestamp'))  # 업데이트 시간
+            }
+
+            self.publish('kline_update', parsed_kline)
+
         except Exception as e:
-            if self.running:
-                print(f"Asyncio 루프 실행 중 오류 ({self.log_prefix}): {e}")
-        finally:
-            # 모든 pending tasks 취소 및 정리
-            try:
-                pending = asyncio.all_tasks(self.loop)
-                for task in pending:
-                    task.cancel()
-                if pending:
-                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            except Exception as e:
-                print(f"{self.log_prefix}: 태스크 취소 중 오류 (무시): {e}")
-
-            try:
-                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            except Exception as e:
-                print(f"{self.log_prefix}: Asyncgens 종료 중 오류 (무시): {e}")
-
-            try:
-                self.loop.close()
-            except Exception as e:
-                print(f"{self.log_prefix}: 루프 종료 중 오류 (무시): {e}")
-
-            print(f"{self.log_prefix}: 스레드 및 루프 종료 완료.")
-
-    async def listen(self):
-        try:
-            while self.running:
-                try:
-                    async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=30) as ws:
-                        # 구독 메시지 전송
-                        subscribe_msg = {
-                            "op": "subscribe",
-                            "args": [self.topic]
-                        }
-                        await ws.send(json.dumps(subscribe_msg))
-
-                        print(f"WebSocket Connected (Kline Stream: Bybit {self.category} {self.symbol}/{self.interval})")
-
-                        async for message in ws:
-                            if not self.running:
-                                break
-
-                            try:
-                                data = json.loads(message)
-
-                                # Bybit 캔들 데이터 처리
-                                if data.get('topic') == self.topic and data.get('data'):
-                                    kline_data = data['data'][0] if isinstance(data['data'], list) else data['data']
-
-                                    # 캔들 데이터 변환 및 emit
-                                    # Bybit V5 kline 응답은 symbol 필드가 없으므로 구독한 심볼 사용
-                                    parsed_kline = {
-                                        'symbol': self.symbol,  # topic에서 추출한 심볼 사용
-                                        'interval': kline_data.get('interval'),
-                                        'start': int(kline_data.get('start')),  # 시작 시간 (밀리초)
-                                        'end': int(kline_data.get('end')),      # 종료 시간 (밀리초)
-                                        'open': float(kline_data.get('open')),
-                                        'high': float(kline_data.get('high')),
-                                        'low': float(kline_data.get('low')),
-                                        'close': float(kline_data.get('close')),
-                                        'volume': float(kline_data.get('volume')),
-                                        'confirm': kline_data.get('confirm'),  # True: 캔들 확정, False: 진행 중
-                                        'timestamp': int(kline_data.get('timestamp'))  # 업데이트 시간
-                                    }
-
-                                    self.kline_update.emit(parsed_kline)
-
-                            except json.JSONDecodeError:
-                                print(f"JSON 디코딩 오류 (Kline): {message}")
-                            except Exception as e:
-                                print(f"캔들 데이터 처리 오류: {e}")
-
-                except websockets.exceptions.ConnectionClosed:
-                    if self.running:
-                        print("Bybit Kline 웹소켓 연결 끊김. 3초 후 재연결 시도...")
-                except Exception as e:
-                    if self.running:
-                        print(f"Bybit Kline 웹소켓 오류: {e}. 3초 후 재연결 시도...")
-
-                if self.running:
-                    await asyncio.sleep(3)
-
-        except asyncio.CancelledError:
-            print(f"{self.log_prefix}: listen() 코루틴 취소됨.")
-        finally:
-            print(f"{self.log_prefix}: listen() 코루틴 종료.")
-
-    def stop(self):
-        """스레드를 안전하게 종료합니다."""
-        print(f"{self.log_prefix}: 종료 요청 수신")
-        self.running = False
-
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-
-        if self.main_task:
-            self.loop.call_soon_threadsafe(self.main_task.cancel)
+            print(f"캔들 데이터 처리 오류: {e}")
 
     def update_subscription(self, symbol, interval):
-        """구독 중인 심볼/간격 변경 (재연결 필요)"""
+        """구독 중인 심볼/간격 변경 (같은 연결에서 새 토픽 구독 후 이전 토픽 해지, 재연결 없음)"""
         self.symbol = symbol
         self.interval = interval
-        self.topic = f"kline.{interval}.{symbol}"
-        print(f"{self.log_prefix}: 구독 변경 -> {self.topic}")
+        self.switch_topic(f"kline.{interval}.{symbol}")
 
 
 # Backward Compatibility (기존 코드 호환성)
 # v7_gui.py에서 직접 클래스를 import하는 경우를 위해 별칭 제공
-TickerSocketThread = BinanceTickerSocketThread
\ No newline at end of file
+TickerSocketThread = BinanceTickerSocketThread
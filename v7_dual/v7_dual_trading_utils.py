@@ -2,7 +2,7 @@
 import math
 import logging
 import threading
-from decimal import Decimal, getcontext, ROUND_DOWN, ROUND_UP
+from decimal import Decimal, Context, getcontext, ROUND_DOWN, ROUND_UP
 
 # --- 로깅 설정 ---
 logging.basicConfig(level=logging.INFO,
@@ -50,32 +50,179 @@ def count_decimal_places(number_str):
             else: return 0
     except Exception as e: logging.error(f"{_lp()}소수점 자릿수 계산 오류: {number_str}, 오류: {e}"); return 0
 
+# --- 심볼별 가격/수량 양자화기 ---
+
+class SymbolQuantizer:
+    """
+    거래 규칙(tickSize / qtyStep / minOrderQty)으로 한 번 생성해 재사용하는 양자화기
+
+    tick/step을 "10^소수자릿수 배율의 정수 단위"로 미리 변환해 두고,
+    주문마다 Decimal 생성/자릿수 계산 없이 정수 연산으로 내림/반올림합니다.
+    (전역 decimal 컨텍스트를 건드리지 않으므로 여러 스레드에서 동시에 사용해도 안전)
+
+    float 연산 오차(예: 0.5123 - 0.0001 = 0.51219999...)로 한 틱 아래로 내려가는 것을 막기 위해
+    배율을 곱한 값은 소수 6자리에서 먼저 반올림한 뒤 정수로 자릅니다.
+    """
+
+    # 규칙 문자열 파싱 전용 로컬 컨텍스트 (전역 getcontext()와 분리)
+    _CONTEXT = Context(prec=28, rounding=ROUND_DOWN)
+
+    def __init__(self, tick_size=None, qty_step=None, min_qty=0):
+        self.tick_size, self.price_decimals, self._price_scale, self._tick_units = self._compile(tick_size)
+        self.qty_step, self.qty_decimals, self._qty_scale, self._step_units = self._compile(qty_step)
+        self.min_qty = float(min_qty or 0)
+
+    @classmethod
+    def _compile(cls, unit):
+        """단위 문자열 -> (float 단위, 소수 자릿수, 10^자릿수, 정수 단위). 단위가 없거나 0 이하면 None"""
+        if unit is None:
+            return None, None, None, None
+        d = cls._CONTEXT.create_decimal(str(unit))
+        if not d.is_finite() or d <= 0:
+            return None, None, None, None
+        d = d.normalize(cls._CONTEXT)
+        decimals = max(0, -d.as_tuple().exponent)
+        scale = 10 ** decimals
+        return float(d), decimals, scale, int(d.scaleb(decimals, cls._CONTEXT))
+
+    @classmethod
+    def from_rules(cls, rules, default_tick='0.0001', default_step='0.001', default_min_qty='0.001'):
+        """get_instrument_info() 결과(priceFilter / lotSizeFilter)로 생성"""
+        rules = rules or {}
+        price_filter = rules.get('priceFilter') or {}
+        lot_size_filter = rules.get('lotSizeFilter') or {}
+        return get_quantizer(
+            price_filter.get('tickSize') or default_tick,
+            lot_size_filter.get('qtyStep') or default_step,
+            lot_size_filter.get('minOrderQty') or lot_size_filter.get('minQty') or default_min_qty,
+        )
+
+    # ==================== 정수 단위 연산 ====================
+
+    @staticmethod
+    def _floor(value, scale, units):
+        n = math.floor(round(value * scale, 6))
+        return (n - n % units) / scale
+
+    @staticmethod
+    def _ceil(value, scale, units):
+        n = math.ceil(round(value * scale, 6))
+        return (n + (-n) % units) / scale
+
+    @staticmethod
+    def _nearest(value, scale, units):
+        n = math.floor(round(value * scale, 6) / units + 0.5)
+        return (n * units) / scale
+
+    # ==================== 가격 ====================
+
+    def floor_price(self, price):
+        """tickSize 배수로 내림"""
+        if self._tick_units is None:
+            return float(price)
+        return self._floor(float(price), self._price_scale, self._tick_units)
+
+    def ceil_price(self, price):
+        """tickSize 배수로 올림"""
+        if self._tick_units is None:
+            return float(price)
+        return self._ceil(float(price), self._price_scale, self._tick_units)
+
+    def round_price(self, price):
+        """가장 가까운 tickSize 배수"""
+        if self._tick_units is None:
+            return float(price)
+        return self._nearest(float(price), self._price_scale, self._tick_units)
+
+    def format_price(self, price):
+        """주문 전송용 가격 문자열 (가장 가까운 틱, 틱 자릿수 고정)"""
+        if self._tick_units is None:
+            return str(price)
+        return f"{self.round_price(price):.{self.price_decimals}f}"
+
+    def quantize_prices(self, prices, mode='floor'):
+        """가격 목록 일괄 양자화 (mode: 'floor' / 'ceil' / 'nearest')"""
+        if self._tick_units is None:
+            return [float(p) for p in prices]
+        op = {'floor': self._floor, 'ceil': self._ceil, 'nearest': self._nearest}[mode]
+        scale, units = self._price_scale, self._tick_units
+        return [op(float(p), scale, units) for p in prices]
+
+    # ==================== 수량 ====================
+
+    def floor_qty(self, quantity):
+        """qtyStep 배수로 내림 (최소 수량 검사 없음)"""
+        if self._step_units is None:
+            return float(quantity)
+        return self._floor(float(quantity), self._qty_scale, self._step_units)
+
+    def ceil_qty(self, quantity):
+        """qtyStep 배수로 올림"""
+        if self._step_units is None:
+            return float(quantity)
+        return self._ceil(float(quantity), self._qty_scale, self._step_units)
+
+    def adjust_qty(self, quantity):
+        """qtyStep 배수로 내림 후 최소 주문 수량 미만이면 0.0 (adjust_quantity와 동일한 규칙)"""
+        qty = self.floor_qty(quantity)
+        if qty <= 0 or qty < self.min_qty:
+            return 0.0
+        return qty
+
+    def format_qty(self, quantity):
+        """주문 전송용 수량 문자열 (내림, step 자릿수 고정)"""
+        if self._step_units is None:
+            return str(quantity)
+        return f"{self.floor_qty(quantity):.{self.qty_decimals}f}"
+
+    def quantize_qtys(self, quantities, apply_min=True):
+        """수량 목록 일괄 양자화 (apply_min=True면 최소 수량 미만은 0.0)"""
+        if self._step_units is None:
+            return [float(q) for q in quantities]
+        scale, units, floor_ = self._qty_scale, self._step_units, self._floor
+        result = [floor_(float(q), scale, units) for q in quantities]
+        if apply_min:
+            min_qty = self.min_qty
+            result = [q if q > 0 and q >= min_qty else 0.0 for q in result]
+        return result
+
+
+_quantizer_cache = {}
+_quantizer_lock = threading.Lock()
+
+
+def get_quantizer(tick_size=None, qty_step=None, min_qty=0):
+    """같은 규칙의 SymbolQuantizer를 공유 (규칙 문자열 기준 캐시)"""
+    key = (str(tick_size), str(qty_step), str(min_qty))
+    quantizer = _quantizer_cache.get(key)
+    if quantizer is None:
+        with _quantizer_lock:
+            quantizer = _quantizer_cache.get(key)
+            if quantizer is None:
+                quantizer = SymbolQuantizer(tick_size, qty_step, min_qty)
+                _quantizer_cache[key] = quantizer
+    return quantizer
+
+
 def adjust_quantity(quantity, step_size_str, precision, min_qty_str):
-    """수량을 stepSize에 맞춰 내림 처리하고, 최소 수량 확인 후 포맷팅된 float 반환"""
+    """수량을 stepSize에 맞춰 내림 처리하고, 최소 수량 확인 후 포맷팅된 float 반환 (SymbolQuantizer 사용)"""
     try:
-        step_size = Decimal(str(step_size_str))
-        min_qty = Decimal(str(min_qty_str))
-        qty = Decimal(str(quantity))
+        quantizer = get_quantizer(None, step_size_str, min_qty_str)
 
-        if qty <= 0: return 0.0
-        if step_size <= 0: return 0.0
+        if float(quantity) <= 0: return 0.0
+        if quantizer.qty_step is None: return 0.0
 
-        adjusted_qty = (qty // step_size) * step_size
+        adjusted_qty = quantizer.floor_qty(quantity)
 
-        if adjusted_qty < min_qty:
+        if adjusted_qty < quantizer.min_qty:
             # [참고] test_entry_calculation.py와 달리, 최소 수량보다 작으면 0을 반환하여
             # 첫 스텝(q0, q1)이 0이 되는 것을 방지하고, q1이 min_qty가 되도록 유도합니다.
             # (만약 min_qty로 설정하면, 모든 스텝이 min_qty가 될 수 있음)
-            logging.warning(f"{_lp()}조정된 수량({adjusted_qty})이 최소 주문 수량({min_qty})보다 작아 0.0으로 처리합니다.")
+            logging.warning(f"{_lp()}조정된 수량({adjusted_qty})이 최소 주문 수량({quantizer.min_qty})보다 작아 0.0으로 처리합니다.")
             return 0.0
 
-        # qtyStep의 소수점 자릿수로 포맷팅 (내림 처리는 이미 위에서 완료)
-        # precision이 제대로 전달되지 않을 경우를 대비해 step_size에서 직접 계산
-        step_decimal_places = abs(step_size.as_tuple().exponent)
-        quantized_qty = adjusted_qty.quantize(Decimal('1e-' + str(step_decimal_places)), rounding=ROUND_DOWN)
-        quantized_qty = float(quantized_qty)
-
-        return quantized_qty
+        # qtyStep 자릿수 포맷팅은 정수 단위 연산에서 이미 반영됨 (precision 인자는 호환용)
+        return adjusted_qty
 
     except Exception as e:
         logging.error(f"{_lp()}수량 조정 오류: qty={quantity}, step={step_size_str}, prec={precision}, min={min_qty_str}, error={e}", exc_info=True)
@@ -265,21 +412,21 @@ def calculate_entry_quantities(
 
 
 def adjust_price(price, tick_size_str, price_precision):
-    """가격을 tickSize에 맞춰 내림 처리하고 포맷팅된 float 반환"""
+    """가격을 tickSize에 맞춰 내림 처리하고 포맷팅된 float 반환 (SymbolQuantizer 사용)"""
     try:
-        tick_size = Decimal(str(tick_size_str))
-        price_dec = Decimal(str(price))
+        quantizer = get_quantizer(tick_size_str)
 
-        if tick_size <= 0:
-            return float(price_dec)
+        if quantizer.tick_size is None:
+            return float(price)
 
         # tickSize로 내림 처리
-        adjusted_price = (price_dec // tick_size) * tick_size
+        adjusted_price = quantizer.floor_price(price)
 
-        # 정밀도에 맞춰 quantize
-        quantized_price = adjusted_price.quantize(Decimal('1e-' + str(price_precision)), rounding=ROUND_DOWN)
+        # 요청 정밀도가 tickSize 자릿수보다 작으면 한 번 더 내림
+        if price_precision is not None and price_precision < quantizer.price_decimals:
+            adjusted_price = SymbolQuantizer._floor(adjusted_price, 10 ** price_precision, 1)
 
-        return float(quantized_price)
+        return adjusted_price
 
     except Exception as e:
         logging.error(f"{_lp()}가격 조정 오류: price={price}, tick={tick_size_str}, prec={price_precision}, error={e}", exc_info=True)
@@ -455,4 +602,31 @@ def calculate_hedge_quantity(entry_quantity, current_step, total_steps, cumulati
 
     except Exception as e:
         logging.error(f"{_lp()}헷지 수량 계산 오류: {e}", exc_info=True)
-        return entry_quantity * (hedge_start_percent / 100.0)  # 기본값으로 시작 퍼센트 반환
\ No newline at end of file
+        return entry_quantity * (hedge_start_percent / 100.0)  # 기본값으로 시작 퍼센트 반환
+
+def calculate_hedge_qty_list(entry_qty_list, total_steps, qty_step, min_order_qty, hedge_start_percent=40, hedge_end_percent=100, frontload_final_step=False):
+    """
+    단계별 진입 수량 목록으로 헷지 수량 목록을 계산합니다 (누적 기반, qtyStep 내림).
+
+    SetupAutoTradeThread와 백테스트 엔진이 같은 계산을 사용합니다.
+
+    Returns:
+        list: 단계별 헷지 수량 (증분)
+    """
+    qty_precision = count_decimal_places(qty_step)
+    hedge_qty_list = []
+    cumulative_entry = 0
+    cumulative_hedge = 0
+    for i, entry_qty in enumerate(entry_qty_list):
+        cumulative_entry += entry_qty
+        hedge_qty_raw = calculate_hedge_quantity(
+            entry_qty, i, total_steps,
+            cumulative_entry, cumulative_hedge,
+            hedge_start_percent, hedge_end_percent, test_mode=False,
+            frontload_final_step=frontload_final_step
+        )
+        # 헷지 수량도 qtyStep에 맞춰 조정
+        hedge_qty_adjusted = adjust_quantity(hedge_qty_raw, qty_step, qty_precision, min_order_qty)
+        hedge_qty_list.append(hedge_qty_adjusted)
+        cumulative_hedge += hedge_qty_adjusted
+    return hedge_qty_list
@@ -0,0 +1,139 @@
+"""
+가격 레벨 트리거 북 (헷지 트리거 / 2차 임계값 / 프론트로드 재진입)
+
+AutoTradeWorker.process_tick은 매 틱마다 헷지 트리거 목록을 처음부터 끝까지 돌고,
+2차 임계값과 재진입 가격도 각각의 분기에서 다시 비교했습니다. 이 비교들은 모두
+"가격이 고정된 레벨에 닿으면 1번 실행"이라는 같은 형태입니다.
+
+TriggerBook은 방향별로 정렬된 레벨 배열을 유지합니다.
+- UP:   가격 >= 레벨이면 발동 (오름차순, 낮은 레벨부터 발동)
+- DOWN: 가격 <= 레벨이면 발동 (내림차순으로 발동 - 높은 레벨부터)
+
+check(price)는 가장 가까운 레벨 2개와만 비교하고, 닿은 레벨이 없으면 바로 반환합니다.
+닿은 레벨은 bisect로 찾아 가까운 순서대로 콜백(price)을 호출하고 해제합니다.
+콜백이 False를 반환하면 레벨을 유지합니다 (조건 미충족 - 다음 틱에서 다시 발동).
+
+고점/저점을 따라 움직이는 익절 트레일링과 헷지 프로토콜 되돌림은 레벨이 매 틱 바뀌므로 대상이 아닙니다.
+워커 스레드(워커 이벤트 큐)에서만 사용하므로 별도 락은 없습니다.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+UP = 'up'
+DOWN = 'down'
+
+
+class _Level:
+    """레벨 1개 (키, 가격, 방향, 콜백)"""
+
+    __slots__ = ('key', 'price', 'direction', 'callback')
+
+    def __init__(self, key, price, direction, callback):
+        self.key = key
+        self.price = price
+        self.direction = direction
+        self.callback = callback
+
+
+class TriggerBook:
+    """방향별 정렬 배열 기반 가격 트리거"""
+
+    def __init__(self):
+        self._prices = {UP: [], DOWN: []}   # 방향 -> 정렬된 가격
+        self._levels = {UP: [], DOWN: []}   # 방향 -> 가격과 같은 순서의 _Level
+        self._by_key = {}                   # 키 -> _Level
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    # ==================== 등록 / 해제 ====================
+
+    def arm(self, key, price, direction, callback):
+        """
+        레벨 등록 (같은 키가 있으면 교체)
+
+        Args:
+            key: 레벨 식별자 (예: ('hedge', 1))
+            price: 발동 가격
+            direction: UP (가격 >= 레벨) / DOWN (가격 <= 레벨)
+            callback: callback(price) - False를 반환하면 레벨 유지
+        """
+        if direction not in self._prices:
+            raise ValueError(f"알 수 없는 방향: {direction}")
+        self.disarm(key)
+        level = _Level(key, float(price), direction, callback)
+        prices = self._prices[direction]
+        i = bisect_right(prices, level.price)
+        prices.insert(i, level.price)
+        self._levels[direction].insert(i, level)
+        self._by_key[key] = level
+
+    def disarm(self, key):
+        """레벨 해제 (없으면 False)"""
+        level = self._by_key.pop(key, None)
+        if level is None:
+            return False
+        prices = self._prices[level.direction]
+        levels = self._levels[level.direction]
+        i = bisect_left(prices, level.price)
+        while levels[i] is not level:
+            i += 1
+        del prices[i]
+        del levels[i]
+        return True
+
+    def clear(self):
+        for direction in self._prices:
+            self._prices[direction].clear()
+            self._levels[direction].clear()
+        self._by_key.clear()
+
+    # ==================== 틱 ====================
+
+    def check(self, price):
+        """
+        가격 1건 확인 - 닿은 레벨의 콜백을 가까운 순서대로 호출
+
+        Returns:
+            int: 발동(해제)된 레벨 수
+        """
+        up = self._prices[UP]
+        down = self._prices[DOWN]
+        if (not up or price < up[0]) and (not down or price > down[-1]):
+            return 0
+
+        crossed = []
+        if up:
+            crossed.extend(self._levels[UP][:bisect_right(up, price)])
+        if down:
+            crossed.extend(reversed(self._levels[DOWN][bisect_left(down, price):]))
+
+        fired = 0
+        for level in crossed:
+            if self._by_key.get(level.key) is not level:
+                continue  # 앞선 콜백이 해제/교체함
+            try:
+                keep = level.callback(price) is False
+            except Exception as e:
+                print(f"[트리거] {level.key} 콜백 오류: {e}")
+                continue  # 레벨 유지 - 다음 틱에서 재시도
+            if not keep and self._by_key.get(level.key) is level:
+                self.disarm(level.key)
+                fired += 1
+        return fired
+
+    # ==================== 조회 ====================
+
+    def nearest(self):
+        """(가장 가까운 UP 레벨, 가장 가까운 DOWN 레벨) - 없으면 None"""
+        up = self._prices[UP]
+        down = self._prices[DOWN]
+        return (up[0] if up else None, down[-1] if down else None)
+
+    def snapshot(self):
+        """진단용: [(키, 가격, 방향), ...] (가격 오름차순)"""
+        return sorted(((lv.key, lv.price, lv.direction) for lv in self._by_key.values()), key=lambda x: x[1])
@@ -0,0 +1,240 @@
+"""
+자동매매 워커 이벤트 큐 (워커별 전용 트레이딩 스레드)
+
+AutoTradeWorker는 패널마다 별도 QThread에 배치되어 있지만, 주문 업데이트는 GUI 스레드에서
+worker.on_order_update()를 직접 호출했습니다. process_tick 안의 REST 조회(청산가 확인 등)가
+state_lock을 잡고 있는 동안 GUI 스레드도 함께 멈췄고, 틱/포지션/주문 이벤트의 처리 순서도
+서로 다른 경로(큐 시그널 2종 + 직접 호출)에 흩어져 있었습니다.
+
+WorkerEventQueue는 워커 1개당 순서가 보장되는 이벤트 큐 1개입니다.
+- tick:     가격 변화 (v7_dual_tick_conflator가 리액터 스레드에서 push_tick)
+- position: 포지션 변경으로 인한 process_tick 요청 (GUI 스레드 submit)
+- order:    주문 업데이트 (GUI 스레드 submit_order)
+- candle:   캔들 확정 (GUI 스레드 push_candle_close) - 이후 틱부터 새 캔들 컨텍스트 사용
+
+어느 스레드에서나 넣을 수 있고, 워커 스레드가 들어온 순서대로 꺼내 처리합니다.
+단, 아직 처리되지 않은 틱은 심볼별로 최신 가격 1건으로 합칩니다 (TickConflator와 같은 latest-value-wins).
+워커가 느린 REST 호출로 오래 막혀도 밀린 과거 가격을 하나씩 재생하지 않습니다. 합치는 범위는
+마지막 포지션/주문/캔들 이벤트 이후에 들어온 틱까지라서, 틱과 다른 이벤트 사이의 순서는 그대로 유지됩니다.
+큐가 비어 있다가 채워질 때만 깨우기 시그널을 1번 보내고, 한 번에 MAX_BATCH개까지 처리한 뒤
+다른 Qt 이벤트(워커 슬롯 호출 등)에 차례를 넘깁니다. 결과는 기존처럼 워커 시그널로 GUI에 전달됩니다.
+
+큐 깊이, 대기 시간(넣은 시각 -> 처리 시작), 이벤트 종류별 처리 시간 분포를 get_worker_queue_stats()로 제공합니다.
+"""
+
+import threading
+import time
+import weakref
+from collections import deque
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from v7_dual_feed_metrics import RollingHistogram, get_feed_metrics
+from v7_dual_tick_conflator import PRICE_SOURCE_LAST
+
+
+EVENT_TICK = 'tick'
+EVENT_POSITION = 'position'
+EVENT_ORDER = 'order'
+EVENT_CANDLE = 'candle'
+EVENT_KINDS = (EVENT_TICK, EVENT_POSITION, EVENT_ORDER, EVENT_CANDLE)
+
+MAX_BATCH = 200             # 한 번 깨어났을 때 처리할 최대 이벤트 수
+SLOW_EVENT_MS = 1000.0      # 이 시간보다 오래 걸린 이벤트는 로그
+
+
+class WorkerEventQueue(QObject):
+    """
+    워커 스레드에서 AutoTradeWorker 진입점을 순서대로 호출하는 이벤트 큐
+
+    워커와 같은 스레드에 배치되며, push_tick()/submit()/submit_order()/push_candle_close()는
+    아무 스레드에서나 호출할 수 있습니다.
+    """
+
+    _wake = pyqtSignal()
+
+    def __init__(self, worker, name="worker"):
+        super().__init__()
+        self.worker = worker
+        self.name = name
+        self.latency_key = name  # 피드 지연 계측 스트림 이름
+        self.position_data = None  # GUI가 첫 컨텍스트를 넘기기 전에는 틱을 전달하지 않음
+        self.candle_data = None
+
+        self._lock = threading.Lock()
+        self._events = deque()  # (종류, payload, 넣은 시각)
+        self._tick_slots = {}   # 심볼 -> 큐 끝부분(마지막 비틱 이벤트 이후)의 미처리 틱 payload [symbol, price, stamp]
+        self._scheduled = False
+
+        # 통계 (self._lock 보호)
+        self.delivered = 0
+        self.conflated = 0      # 더 새 가격으로 대체된 틱 수
+        self.max_depth = 0
+        self._processed = dict.fromkeys(EVENT_KINDS, 0)
+        self._wait = RollingHistogram()
+        self._handle = {kind: RollingHistogram() for kind in EVENT_KINDS}
+        self._slowest_ms = 0.0
+
+        self.moveToThread(worker.thread())
+        self._wake.connect(self._drain, Qt.QueuedConnection)
+        _register(self)
+
+    # ==================== 이벤트 넣기 (아무 스레드) ====================
+
+    def _post(self, kind, payload):
+        with self._lock:
+            if kind == EVENT_TICK:
+                slot = self._tick_slots.get(payload[0])
+                if slot is not None:
+                    slot[1:] = payload[1:]  # 대기 중인 같은 심볼 틱을 최신 가격으로 교체 (이미 깨우기 예약됨)
+                    self.conflated += 1
+                    return
+                self._tick_slots[payload[0]] = payload
+            else:
+                self._tick_slots.clear()  # 이후 틱이 이 이벤트보다 앞선 틱에 합쳐지지 않도록
+            self._events.append((kind, payload, time.time()))
+            depth = len(self._events)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def push_tick(self, symbol, price, stamp=None):
+        """가격 변화 1건 (리액터 스레드에서 호출, stamp: (이벤트 ms, 수신 시각, 추정기 이름))"""
+        self._post(EVENT_TICK, [symbol, price, stamp])
+
+    def submit(self, ticker_data, position_data, candle_data=None):
+        """포지션 변경 등 가격 외 이벤트로 process_tick 실행 요청 (GUI 스레드)"""
+        self.position_data = position_data
+        self._post(EVENT_POSITION, (ticker_data, position_data, candle_data))
+
+    def submit_order(self, update):
+        """주문 업데이트 전달 (v7_dual_events.OrderUpdate)"""
+        self._post(EVENT_ORDER, update)
+
+    def push_candle_close(self, candle_data):
+        """캔들 확정 - 큐 순서상 이후 이벤트부터 새 캔들 컨텍스트 사용"""
+        self._post(EVENT_CANDLE, candle_data)
+
+    def update_context(self, position_data=None, candle_data=None):
+        """
+        process_tick에 함께 넘길 포지션/캔들 데이터 갱신 (GUI 스레드)
+
+        전달받은 객체를 그대로 보관하므로 호출 측에서 복사본을 넘겨야 합니다.
+        """
+        if position_data is not None:
+            self.position_data = position_data
+        if candle_data is not None:
+            self.candle_data = candle_data
+
+    @property
+    def price_source(self):
+        return getattr(self.worker, 'price_source', PRICE_SOURCE_LAST)
+
+    @property
+    def side_mode(self):
+        return getattr(self.worker, 'side_mode', "LONG")
+
+    # ==================== 워커 스레드 ====================
+
+    def _drain(self):
+        for _ in range(MAX_BATCH):
+            with self._lock:
+                if not self._events:
+                    self._scheduled = False
+                    return
+                kind, payload, posted_ts = self._events.popleft()
+                if kind == EVENT_TICK and self._tick_slots.get(payload[0]) is payload:
+                    del self._tick_slots[payload[0]]
+
+            start = time.time()
+            try:
+                self._dispatch(kind, payload, start)
+            except Exception as e:
+                print(f"[워커 큐] {self.name} {kind} 이벤트 처리 오류: {e}")
+            end = time.time()
+
+            handle_ms = (end - start) * 1000
+            now = time.monotonic()
+            with self._lock:
+                self._processed[kind] += 1
+                self._wait.add((start - posted_ts) * 1000, now)
+                self._handle[kind].add(handle_ms, now)
+                if handle_ms > self._slowest_ms:
+                    self._slowest_ms = handle_ms
+            if handle_ms > SLOW_EVENT_MS:
+                print(f"[워커 큐] {self.name} {kind} 이벤트 처리 {handle_ms:.0f}ms (대기 {self.depth()}건)")
+
+        # 남은 이벤트는 다음 차례에 처리 (워커 슬롯 호출 등 다른 Qt 이벤트가 끼어들 수 있도록)
+        self._wake.emit()
+
+    def _dispatch(self, kind, payload, deliver_ts):
+        worker = self.worker
+        if kind == EVENT_TICK:
+            if not worker.is_running or self.position_data is None:
+                return  # 포지션 정보 없이 실행하면 "포지션 없음"으로 오판할 수 있음
+            symbol, price, stamp = payload
+            self.delivered += 1
+            worker.process_tick({'s': symbol, 'c': str(price)}, self.position_data, self.candle_data)
+            if stamp is not None:
+                event_ms, recv_ts, clock_name = stamp
+                get_feed_metrics().record(self.latency_key, event_ms, recv_ts, deliver_ts, time.time(), clock_name)
+        elif kind == EVENT_POSITION:
+            if worker.is_running:
+                worker.process_tick(*payload)
+        elif kind == EVENT_ORDER:
+            worker.on_order_update(payload)
+        elif kind == EVENT_CANDLE:
+            self.candle_data = payload
+
+    # ==================== 통계 ====================
+
+    def depth(self):
+        with self._lock:
+            return len(self._events)
+
+    def get_stats(self):
+        """
+        큐 통계
+
+        Returns:
+            dict: {'depth', 'max_depth', 'processed': {종류: 건수}, 'conflated', 'wait_p50_ms', 'wait_p95_ms',
+                   'handle': {종류: {'p50_ms', 'p95_ms', 'count'}}, 'slowest_ms'}
+        """
+        now = time.monotonic()
+        with self._lock:
+            wait = self._wait.merged(now)
+            handle = {}
+            for kind, hist in self._handle.items():
+                merged = hist.merged(now)
+                if merged.count:
+                    handle[kind] = {'p50_ms': merged.percentile(50), 'p95_ms': merged.percentile(95),
+                                    'count': merged.count}
+            return {
+                'depth': len(self._events),
+                'max_depth': self.max_depth,
+                'processed': dict(self._processed),
+                'conflated': self.conflated,
+                'wait_p50_ms': wait.percentile(50),
+                'wait_p95_ms': wait.percentile(95),
+                'handle': handle,
+                'slowest_ms': self._slowest_ms,
+            }
+
+
+_queues = weakref.WeakSet()
+_queues_lock = threading.Lock()
+
+
+def _register(queue):
+    with _queues_lock:
+        _queues.add(queue)
+
+
+def get_worker_queue_stats():
+    """살아 있는 워커 이벤트 큐 전체의 통계 {이름: get_stats()}"""
+    with _queues_lock:
+        queues = list(_queues)
+    return {q.name: q.get_stats() for q in queues}
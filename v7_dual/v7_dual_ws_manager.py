@@ -1,22 +1,41 @@
 import asyncio
 import websockets
-import json
 import time
 import hmac
 import hashlib
-from PyQt5.QtCore import QThread, pyqtSignal
-
-class WebSocketThread(QThread):
+from PyQt5.QtCore import pyqtSignal
+
+import v7_dual_fast_json as fast_json
+from v7_dual_clock_sync import clock_name_for
+from v7_dual_events import AccountUpdate, OrderUpdate
+from v7_dual_frame_recorder import get_frame_recorder, user_source
+from v7_dual_network_reactor import ReactorStream
+from v7_dual_position_store import RECONCILE_INTERVAL_SEC, get_position_store
+from v7_dual_reconnect import (BACKFILL_LOOKBACK_MS, BACKFILL_MAX_ORDER_LOOKUPS, OrderStateTracker,
+                               ReconnectBackoff, order_to_event, positions_to_event)
+
+class WebSocketThread(ReactorStream):
     """
     통합 WebSocket 매니저 (Binance & Bybit)
 
     거래소별 사용자 데이터 스트림에 연결하고,
-    모든 데이터를 Binance 형식으로 변환하여 GUI로 전송합니다.
+    거래소 원본 payload에서 바로 이벤트 레코드(v7_dual_events)를 만들어 GUI로 전송합니다.
+    - order_update_received: (side, OrderUpdate)
+    - account_update_received: (side, AccountUpdate)
+    레코드에는 거래소 이벤트 시각(event_time)과 소켓 수신 시각(recv_ts)이 담깁니다 (피드 지연 계측용).
+    공유 네트워크 리액터의 태스크로 실행됩니다 (스트림별 스레드 없음).
 
     v7_dual: side 파라미터 추가 (LONG/SHORT 구분)
+
+    연결이 끊기면 지수 백오프(지터 포함)로 재연결하고, set_backfill_source()로 API가 지정돼 있으면
+    재연결 직후 끊긴 구간의 주문 내역/체결 주문/미체결 주문/포지션을 REST로 조회해
+    실시간 이벤트와 같은 시그널로 전달합니다 (이미 전달한 주문 상태는 제외).
+
+    API가 지정돼 있으면 포지션 이벤트를 계정별 포지션 저장소(v7_dual_position_store)에도 반영하고,
+    RECONCILE_INTERVAL_SEC마다 REST로 동기화합니다 (워커는 청산가/평균가를 저장소에서 읽음).
     """
-    account_update_received = pyqtSignal(str, dict)  # (side, data)
-    order_update_received = pyqtSignal(str, dict)    # (side, data)
+    account_update_received = pyqtSignal(str, object)  # (side, AccountUpdate)
+    order_update_received = pyqtSignal(str, object)    # (side, OrderUpdate)
 
     def __init__(self, exchange="Binance", listen_key=None, api_key=None, api_secret=None, market_type="fapi", side='long', parent=None):
         """
@@ -28,13 +47,23 @@ class WebSocketThread(QThread):
             market_type: "fapi" (USDⓈ-M/Linear) 또는 "dapi" (COIN-M/Inverse)
             side: 'long' 또는 'short' (v7_dual용 패널 구분자)
         """
-        super().__init__(parent)
+        super().__init__(f"WebSocketThread ({exchange})", parent)
         self.exchange = exchange
         self.listen_key = listen_key
         self.api_key = api_key
         self.api_secret = api_secret
         self.market_type = market_type
         self.side = side  # v7_dual: 패널 구분자 저장
+        self.clock_name = clock_name_for(exchange, market_type)  # 지연 계측용 서버 시간 추정기 이름
+        self._recv_ts = 0.0  # 처리 중인 메시지의 소켓 수신 시각
+        self.capture_source = user_source(exchange, side)  # 프레임 기록 소스 이름
+
+        self._backoff = ReconnectBackoff()
+        self._order_states = OrderStateTracker()
+        self._backfill_api = None
+        self._backfill_symbol = None  # 호출 시 현재 심볼을 반환하는 함수
+        self._backfill_task = None
+        self._position_store = None
 
         # WebSocket URL 설정
         if exchange == "Binance":
@@ -53,55 +82,31 @@ class WebSocketThread(QThread):
         else:
             raise ValueError(f"지원되지 않는 거래소: {exchange}")
 
-        self.running = True
-        self.loop = asyncio.new_event_loop()
-        self.main_task = None
-        self.log_prefix = f"WebSocketThread ({exchange})"
-
         print(f"{self.log_prefix}: {self.market_name} 사용자 데이터 스트림 연결 준비...")
 
-    def run(self):
-        """스레드 메인 루프"""
-        asyncio.set_event_loop(self.loop)
-        try:
-            self.main_task = self.loop.create_task(self.listen())
-            self.loop.run_forever()
-        except Exception as e:
-            if self.running:
-                print(f"Asyncio 루프 실행 중 오류 ({self.log_prefix}): {e}")
-        finally:
-            # 모든 pending tasks 취소 및 정리
-            try:
-                pending = asyncio.all_tasks(self.loop)
-                for task in pending:
-                    task.cancel()
-                # 취소된 태스크들이 완료될 때까지 대기
-                if pending:
-                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            except Exception as e:
-                print(f"{self.log_prefix}: 태스크 취소 중 오류 (무시): {e}")
-
-            # Async generators 종료
-            try:
-                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            except Exception as e:
-                print(f"{self.log_prefix}: Asyncgens 종료 중 오류 (무시): {e}")
-
-            # 이벤트 루프 완전 종료
-            try:
-                self.loop.close()
-            except Exception as e:
-                print(f"{self.log_prefix}: 루프 종료 중 오류 (무시): {e}")
-
-            print(f"{self.log_prefix}: 스레드 및 루프 종료 완료.")
+    def set_backfill_source(self, api_module, symbol_getter):
+        """
+        재연결 후 보충 조회에 사용할 API 모듈과 심볼 지정
+
+        Args:
+            api_module: BinanceAPI / BybitAPI (get_order_history, get_fill_order_ids, get_order,
+                        get_initial_open_orders, get_initial_positions)
+            symbol_getter: 현재 패널 심볼을 반환하는 함수 (심볼 변경을 따라가도록 호출 시점에 조회)
+        """
+        self._backfill_api = api_module
+        self._backfill_symbol = symbol_getter
+        self._position_store = get_position_store(api_module) if api_module is not None else None
 
     async def listen(self):
         """WebSocket 연결 및 메시지 수신"""
         heartbeat_task = None  # 초기화
+        reconcile_task = None
         try:
+            if self._position_store is not None:
+                reconcile_task = asyncio.create_task(self._reconcile_positions())
             while self.running:
                 try:
-                    async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=30) as ws:
+                    async with websockets.connect(self.ws_url, ping_interval=20, ping_timeout=30, close_timeout=1) as ws:
 
                         # Bybit의 경우 인증 및 구독 필요
                         if self.exchange == "Bybit":
@@ -114,25 +119,21 @@ class WebSocketThread(QThread):
 
                         print(f"WebSocket Connected (User Data Stream: {self.market_name})")
 
+                        down_since_ms = self._backoff.down_since_ms
+                        downtime = self._backoff.mark_up()
+                        if downtime is not None:
+                            print(f"{self.log_prefix}: 재연결 완료 (끊김 {downtime:.1f}초) - 누락 이벤트 보충 조회")
+                            self._start_backfill(down_since_ms)
+
                         async for message in ws:
                             if not self.running:
                                 break
 
-                            try:
-                                data = json.loads(message)
-
-                                # Bybit pong 응답 무시
-                                if self.exchange == "Bybit" and data.get('op') == 'pong':
-                                    continue
-
-                                # 거래소별 메시지 처리
-                                if self.exchange == "Binance":
-                                    self._process_binance_message(data)
-                                elif self.exchange == "Bybit":
-                                    self._process_bybit_message(data)
-
-                            except json.JSONDecodeError:
-                                print(f"JSON 디코딩 오류: {message}")
+                            recv_ts = time.time()
+                            recorder = get_frame_recorder()
+                            if recorder is not None:
+                                recorder.record(self.capture_source, message, recv_ts)
+                            self._handle_frame(message, recv_ts)
 
                         # Heartbeat 태스크 정리
                         if self.exchange == "Bybit" and heartbeat_task:
@@ -145,17 +146,25 @@ class WebSocketThread(QThread):
 
                 except websockets.exceptions.ConnectionClosed:
                     if self.running:
-                        print(f"{self.market_name} 웹소켓 연결 끊김. 3초 후 재연결 시도...")
+                        print(f"{self.market_name} 웹소켓 연결 끊김.")
                 except Exception as e:
                     if self.running:
-                        print(f"{self.market_name} 웹소켓 오류: {e}. 3초 후 재연결 시도...")
+                        print(f"{self.market_name} 웹소켓 오류: {e}.")
 
                 if self.running:
-                    await asyncio.sleep(3)
+                    self._backoff.mark_down()
+                    delay = self._backoff.next_delay()
+                    print(f"{self.market_name} {delay:.1f}초 후 재연결 시도 "
+                          f"({self._backoff.attempts}회째, 끊김 {self._backoff.downtime():.0f}초)")
+                    await asyncio.sleep(delay)
 
         except asyncio.CancelledError:
             print(f"{self.log_prefix}: listen() 코루틴 취소됨.")
         finally:
+            if self._backfill_task and not self._backfill_task.done():
+                self._backfill_task.cancel()
+            if reconcile_task and not reconcile_task.done():
+                reconcile_task.cancel()
             # Heartbeat 태스크가 남아있으면 정리
             if heartbeat_task and not heartbeat_task.done():
                 heartbeat_task.cancel()
@@ -165,16 +174,126 @@ class WebSocketThread(QThread):
                     pass
             print(f"{self.log_prefix}: listen() 코루틴 종료.")
 
+    def _handle_frame(self, message, recv_ts):
+        """원본 프레임 1건 디코딩 + 거래소별 처리"""
+        try:
+            self._recv_ts = recv_ts
+            data = fast_json.loads(message)
+
+            # Bybit pong 응답 무시
+            if self.exchange == "Bybit" and data.get('op') == 'pong':
+                return
+
+            # 거래소별 메시지 처리
+            if self.exchange == "Binance":
+                self._process_binance_message(data)
+            elif self.exchange == "Bybit":
+                self._process_bybit_message(data)
+
+        except fast_json.DecodeError:
+            print(f"JSON 디코딩 오류: {message}")
+
+    def replay_frame(self, message, recv_ts):
+        """기록된 원본 프레임 재생 (v7_dual_frame_recorder.FrameReplayer, 소켓 없이 같은 처리 경로)"""
+        self.running = True  # publish()는 running일 때만 GUI로 전달
+        self._handle_frame(message, recv_ts)
+
+    # ==================== 재연결 보충 (REST) ====================
+
+    def _publish_order(self, update):
+        """주문 이벤트(OrderUpdate) 전달 + 상태 기록 (보충 시 중복 제거 기준)"""
+        update.recv_ts = self._recv_ts
+        self._order_states.remember(update)
+        self.publish('order_update_received', self.side, update)  # v7_dual: side 추가
+
+    def _publish_account(self, update):
+        update.recv_ts = self._recv_ts
+        if self._position_store is not None:
+            self._position_store.apply(update)
+        self.publish('account_update_received', self.side, update)  # v7_dual: side 추가
+
+    def _start_backfill(self, down_since_ms):
+        if self._backfill_api is None or self._backfill_symbol is None or down_since_ms is None:
+            return
+        if self._backfill_task and not self._backfill_task.done():
+            self._backfill_task.cancel()
+        self._backfill_task = asyncio.get_running_loop().create_task(self._backfill(down_since_ms))
+
+    async def _backfill(self, down_since_ms):
+        """
+        끊긴 구간의 주문 상태 변화/미체결 주문/포지션을 조회해 이벤트로 전달
+
+        주문 내역(allOrders, /v5/order/history)은 주문 생성 시각 기준이라, 끊기기 전에 낸 DCA/헷지 지정가가
+        끊긴 동안 체결된 경우는 빠집니다. 그래서 끊긴 이후 체결 내역의 주문과, 마지막 상태가 미종료인 추적 주문을
+        주문 ID로 하나씩 다시 조회합니다 (미체결 목록/주문 내역에 이미 있는 주문은 제외).
+        """
+        api = self._backfill_api
+        try:
+            symbol = self._backfill_symbol()
+            if not symbol:
+                return
+            loop = asyncio.get_running_loop()
+            since_ms = down_since_ms - BACKFILL_LOOKBACK_MS
+            # 블로킹 HTTP는 실행기 스레드에서 동시에 조회
+            history, open_orders, positions, fill_ids = await asyncio.gather(
+                loop.run_in_executor(None, api.get_order_history, symbol, since_ms),
+                loop.run_in_executor(None, api.get_initial_open_orders),
+                loop.run_in_executor(None, api.get_initial_positions),
+                loop.run_in_executor(None, api.get_fill_order_ids, symbol, since_ms),
+            )
+
+            known_ids = {str(o.get('orderId')) for o in history or ()}
+            known_ids.update(str(o.get('orderId')) for o in open_orders or () if o.get('symbol') == symbol)
+            lookup_ids = [oid for oid in dict.fromkeys([*(fill_ids or ()), *self._order_states.open_order_ids()])
+                          if oid not in known_ids][:BACKFILL_MAX_ORDER_LOOKUPS]
+            looked_up = await asyncio.gather(
+                *(loop.run_in_executor(None, api.get_order, symbol, oid) for oid in lookup_ids))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"{self.log_prefix}: 보충 조회 실패: {e}")
+            return
+        if not self.running:
+            return
+
+        events = [order_to_event(o) for o in history or ()]
+        events.extend(order_to_event(o) for o in looked_up if o and o.get('symbol') == symbol)
+        history_ids = {e.order_id for e in events}
+        events.sort(key=lambda e: e.event_time)
+        for o in open_orders or ():
+            if o.get('symbol') == symbol and str(o.get('orderId')) not in history_ids:
+                events.append(order_to_event(o))
+
+        sent = 0
+        for event in events:
+            if self._order_states.is_new(event):
+                self._publish_order(event)
+                sent += 1
+        # 포지션은 주문 이벤트 뒤에 전달 (체결 처리 후 최신 포지션으로 덮어씀)
+        self._publish_account(positions_to_event(positions, symbol))
+        print(f"{self.log_prefix}: 보충 완료 - {symbol} 주문 이벤트 {sent}건 전달 "
+              f"(내역 {len(history or ())}건, 주문별 조회 {len(lookup_ids)}건, "
+              f"미체결 {len(open_orders or ())}건), 포지션 동기화")
+
+    async def _reconcile_positions(self):
+        """포지션 저장소 REST 동기화 (느린 주기, 블로킹 HTTP는 실행기 스레드)"""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            store = self._position_store
+            if store is not None and store.needs_reconcile():
+                await loop.run_in_executor(None, store.reconcile, self._backfill_api)
+            await asyncio.sleep(RECONCILE_INTERVAL_SEC / 4)
+
     # ==================== Binance 메시지 처리 ====================
 
     def _process_binance_message(self, data):
-        """Binance 메시지 처리 (이미 표준 형식)"""
+        """Binance 메시지 -> 이벤트 레코드"""
         event_type = data.get('e')
 
         if event_type == 'ACCOUNT_UPDATE':
-            self.account_update_received.emit(self.side, data)  # v7_dual: side 추가
+            self._publish_account(AccountUpdate.from_binance(data))
         elif event_type == 'ORDER_TRADE_UPDATE':
-            self.order_update_received.emit(self.side, data)  # v7_dual: side 추가
+            self._publish_order(OrderUpdate.from_binance(data.get('o') or {}, data.get('E', 0)))
 
     # ==================== Bybit 인증 및 구독 ====================
 
@@ -193,11 +312,11 @@ class WebSocketThread(QThread):
             "op": "auth",
             "args": [self.api_key, expires, signature]
         }
-        await ws.send(json.dumps(auth_msg))
+        await ws.send(fast_json.dumps(auth_msg))
         print(f"{self.log_prefix}: 인증 요청 전송...")
 
         auth_response = await ws.recv()
-        auth_data = json.loads(auth_response)
+        auth_data = fast_json.loads(auth_response)
 
         if auth_data.get('success') == True:
             print(f"{self.log_prefix}: Bybit 웹소켓 인증 성공.")
@@ -216,7 +335,7 @@ class WebSocketThread(QThread):
                 "wallet"     # 잔액
             ]
         }
-        await ws.send(json.dumps(subscribe_msg))
+        await ws.send(fast_json.dumps(subscribe_msg))
         print(f"{self.log_prefix}: 'position', 'order', 'wallet' 토픽 구독 요청.")
 
     async def _bybit_heartbeat(self, ws):
@@ -224,8 +343,7 @@ class WebSocketThread(QThread):
         try:
             while True:
                 await asyncio.sleep(20)
-                ping_msg = {"op": "ping"}
-                await ws.send(json.dumps(ping_msg))
+                await ws.send('{"op":"ping"}')
                 # ping 로그는 생략 (너무 빈번함)
         except asyncio.CancelledError:
             pass  # 정상 종료 시 로그 생략
@@ -235,7 +353,7 @@ class WebSocketThread(QThread):
     # ==================== Bybit 메시지 변환 ====================
 
     def _process_bybit_message(self, data):
-        """Bybit V5 메시지를 Binance 형식으로 변환"""
+        """Bybit V5 메시지 -> 이벤트 레코드 (중간 dict 없이 payload에서 바로 생성)"""
         topic = data.get('topic')
         payload = data.get('data')
 
@@ -243,105 +361,14 @@ class WebSocketThread(QThread):
             return
 
         try:
-            # 1. 잔액 (Wallet)
-            if topic == 'wallet':
-                binance_balances = []
-                for account in payload:
-                    # Bybit V5: payload=[{accountType, coin: [{coin, walletBalance, ...}]}]
-                    coins = account.get('coin', [])
-                    for c in coins:
-                        binance_balances.append({
-                            'a': c.get('coin'),
-                            'wb': c.get('walletBalance')
-                        })
-                formatted_msg = {'e': 'ACCOUNT_UPDATE', 'a': {'B': binance_balances, 'P': []}}
-                self.account_update_received.emit(self.side, formatted_msg)  # v7_dual: side 추가
-
-            # 2. 포지션 (Position)
-            elif topic == 'position':
-                binance_positions = []
-                for p in payload:
-                    # [디버깅] 원본 Bybit 포지션 데이터 출력
-                    print(f"[Bybit Position Update] Raw data: {p}")
-
-                    # positionIdx로 헤지 모드 구분
-                    # 0 = One-Way, 1 = Hedge Long, 2 = Hedge Short
-                    position_idx = p.get('positionIdx', 0)
-                    side = p.get('side', 'None')
-
-                    # positionSide 결정
-                    if position_idx == 1:
-                        position_side = 'LONG'
-                    elif position_idx == 2:
-                        position_side = 'SHORT'
-                    else:
-                        position_side = 'LONG' if side == 'Buy' else 'SHORT' if side == 'Sell' else 'BOTH'
-
-                    # 수량 변환
-                    amt = float(p.get('size', '0'))
-                    if position_side == 'SHORT' and amt > 0:
-                        amt = -amt
-
-                    # Entry Price: avgPrice 또는 entryPrice 사용
-                    entry_price = p.get('avgPrice') or p.get('entryPrice', '0')
-
-                    binance_positions.append({
-                        's': p.get('symbol'),
-                        'ps': position_side,
-                        'pa': str(amt),
-                        'ep': entry_price,
-                        'up': p.get('unrealisedPnl', '0'),
-                        'im': p.get('positionIM', '0'),
-                        'mp': p.get('markPrice', '0'),  # 현재가 (markPrice)
-                        'lp': p.get('liqPrice', '0')    # 청산가 (liqPrice)
-                    })
-                formatted_msg = {'e': 'ACCOUNT_UPDATE', 'a': {'B': [], 'P': binance_positions}}
-                self.account_update_received.emit(self.side, formatted_msg)  # v7_dual: side 추가
-
-            # 3. 주문 (Order)
-            elif topic == 'order':
+            created = data.get('creationTime', 0)  # 이벤트 생성 시각 (ms)
+            if topic == 'order':
                 for o in payload:
-                    formatted_msg = {
-                        'e': 'ORDER_TRADE_UPDATE',
-                        'o': {
-                            'i': o.get('orderId'),
-                            'X': self._map_bybit_order_status(o.get('orderStatus')),
-                            's': o.get('symbol'),
-                            'o': o.get('orderType'),
-                            'S': o.get('side'),
-                            'p': o.get('price'),
-                            'q': o.get('qty'),
-                            'z': o.get('cumExecQty', '0'),
-                            'ap': o.get('avgPrice', '0')  # 평균 체결가 추가
-                        }
-                    }
-                    self.order_update_received.emit(self.side, formatted_msg)  # v7_dual: side 추가
+                    self._publish_order(OrderUpdate.from_bybit(o))
+            elif topic == 'position':
+                self._publish_account(AccountUpdate.from_bybit_positions(payload, created))
+            elif topic == 'wallet':
+                self._publish_account(AccountUpdate.from_bybit_wallet(payload, created))
 
         except Exception as e:
             print(f"Bybit 메시지 변환 오류: {e} (데이터: {data})")
-
-    def _map_bybit_order_status(self, bybit_status):
-        """Bybit 주문 상태를 Binance 형식으로 변환"""
-        mapping = {
-            'Created': 'NEW',
-            'New': 'NEW',
-            'PartiallyFilled': 'PARTIALLY_FILLED',
-            'Filled': 'FILLED',
-            'Cancelled': 'CANCELED',
-            'Deactivated': 'CANCELED',
-            'Rejected': 'REJECTED'
-        }
-        return mapping.get(bybit_status, bybit_status.upper())
-
-    # ==================== 종료 처리 ====================
-
-    def stop(self):
-        """스레드를 안전하게 종료"""
-        print(f"{self.log_prefix}: 종료 요청 수신")
-        self.running = False
-
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-
-        if self.main_task:
-            self.loop.call_soon_threadsafe(self.main_task.cancel)